@@ -0,0 +1,115 @@
+"""Benchmark: AntiPatternValidator on large pages with many matches.
+
+Compares the compiled rule engine (precompiled regexes, literal prefilter,
+bisect line mapping) with the previous per-call loop, kept here as the
+reference implementation:
+
+    for pattern in patterns:
+        for match in re.finditer(pattern.pattern, content, flags):
+            line = content[:match.start()].count("\\n") + 1
+
+Both modes must report the same issues (rule + line); the script checks it.
+No API calls are made.
+
+Usage:
+    python benchmarks/bench_antipatterns.py --size-kb 500 --runs 3
+    python benchmarks/bench_antipatterns.py --content css --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import statistics
+import time
+from typing import Any, Callable
+
+from gemini_mcp.validation.anti_pattern_validator import AntiPatternValidator
+
+# Each block triggers several rules (missing button type, no alt, inline
+# style, arbitrary z-index, hardcoded colors, x-show without x-cloak...)
+HTML_BLOCK = """<div class="relative z-[9999] bg-[#ff0000] text-white p-4 px-[13px]" style="color: red">
+  <button class="rounded-lg bg-blue-600 px-4 py-2" @click="open = !open">Toggle</button>
+  <img src="https://picsum.photos/seed/x/300/200" class="w-[640px]">
+  <div x-show="open" x-text="message" class="text-red-600">Error</div>
+  <input placeholder="Email" class="border">
+</div>
+"""
+
+CSS_BLOCK = """.card { outline: none; width: 1200px; color: #333 !important; }
+.card:focus { outline: 0; }
+.grid > * { margin: 0 !important; }
+"""
+
+
+def build_content(kind: str, target_kb: int) -> str:
+    block = HTML_BLOCK if kind == "html" else CSS_BLOCK
+    return block * (target_kb * 1024 // len(block) + 1)
+
+
+def legacy_validate(validator: AntiPatternValidator, content: str) -> list[tuple[str, int]]:
+    """Pre-engine algorithm: per-call regex matching, prefix counting for lines."""
+    found = []
+    for pattern in validator.patterns:
+        for match in re.finditer(pattern.pattern, content, re.IGNORECASE | re.DOTALL):
+            line = content[:match.start()].count("\n") + 1
+            found.append((f"{pattern.category.value}/{pattern.name}", line))
+    return found
+
+
+def engine_validate(validator: AntiPatternValidator, content: str) -> list[tuple[str, int]]:
+    return [(issue.rule, issue.line) for issue in validator.validate(content).issues]
+
+
+MODES: dict[str, Callable[[AntiPatternValidator, str], list[tuple[str, int]]]] = {
+    "legacy": legacy_validate,
+    "engine": engine_validate,
+}
+
+
+def run(kind: str, size_kb: int, runs: int) -> dict[str, Any]:
+    content = build_content(kind, size_kb)
+    validator = AntiPatternValidator()
+    report: dict[str, Any] = {
+        "content": kind,
+        "size_kb": round(len(content) / 1024, 1),
+        "runs": runs,
+    }
+
+    results = {}
+    for mode, func in MODES.items():
+        samples = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            results[mode] = func(validator, content)
+            samples.append((time.perf_counter() - start) * 1000)
+        report[f"{mode}_ms"] = round(statistics.median(samples), 1)
+
+    report["matches"] = len(results["engine"])
+    report["identical"] = sorted(results["legacy"]) == sorted(results["engine"])
+    report["speedup"] = round(report["legacy_ms"] / report["engine_ms"], 1) if report["engine_ms"] else 0.0
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-kb", type=int, default=500)
+    parser.add_argument("--content", choices=["html", "css"], default="html")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--json", action="store_true", help="Print the raw JSON report")
+    args = parser.parse_args()
+
+    report = run(args.content, args.size_kb, args.runs)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(
+            f"{report['content']} {report['size_kb']}KB, {report['matches']} matches "
+            f"(identical={report['identical']}): legacy {report['legacy_ms']} ms, "
+            f"engine {report['engine_ms']} ms, {report['speedup']}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""Benchmark: disk usage and save latency of auto-save over a long session.
+
+Replays a refinement session against three DraftManager configurations:
+
+- plain: one full readable file per save (the previous behaviour)
+- blobs: content-addressed gzip/zstd blobs, hardlinked identical working
+  copies, retention GC keeping 3 working copies per component
+- delta: blobs + delta encoding against the previous version
+
+Latency on a real disk is dominated by durable writes, so the report also
+counts fsyncs per step (a fast tmpfs hides that cost in the timings).
+
+Session shape per step: an HTML page (~--page-kb) plus its CSS and JS,
+like _auto_save_design_output. Every --repeat-every-th step re-saves the
+previous output unchanged (cache hit / re-run); other steps change one
+section of the page (a refinement) and leave CSS/JS unchanged.
+
+No API calls are made.
+
+Usage:
+    python benchmarks/bench_blob_store.py --steps 200 --page-kb 200
+    python benchmarks/bench_blob_store.py --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from gemini_mcp.state import DraftManager, RetentionPolicy
+
+SECTION = """<!-- SECTION: s{n} -->
+<section id="s{n}" class="relative py-24 px-6 md:px-12 bg-white dark:bg-slate-900">
+  <div class="max-w-7xl mx-auto grid grid-cols-1 md:grid-cols-3 gap-8">
+    <article class="rounded-2xl border border-slate-200 p-8 shadow-sm hover:shadow-xl">
+      <h3 class="text-xl font-semibold text-slate-900">Card {n}.{rev}</h3>
+      <p class="mt-3 text-base leading-relaxed text-slate-600">Body copy for card {n}.</p>
+    </article>
+  </div>
+</section>
+<!-- /SECTION: s{n} -->
+"""
+
+CSS = "".join(f".card-{i} {{ transition: transform 200ms ease; }}\n" for i in range(200))
+JS = "".join(f"document.querySelectorAll('.card-{i}').forEach(el => el.dataset.ready = '1');\n" for i in range(100))
+
+
+def build_page(page_kb: int, revisions: dict[int, int]) -> str:
+    sections = max(1, page_kb * 1024 // len(SECTION.format(n=0, rev=0)))
+    body = "".join(SECTION.format(n=n, rev=revisions.get(n, 0)) for n in range(sections))
+    return f"<!DOCTYPE html><html><head><title>Page</title></head><body>\n{body}</body></html>\n"
+
+
+def disk_usage(root: Path) -> int:
+    """Bytes on disk, counting hardlinked files once."""
+    seen, total = set(), 0
+    for dirpath, _, files in os.walk(root):
+        for name in files:
+            st = os.stat(os.path.join(dirpath, name))
+            if (st.st_dev, st.st_ino) not in seen:
+                seen.add((st.st_dev, st.st_ino))
+                total += st.st_size
+    return total
+
+
+def replay(manager: DraftManager, steps: int, page_kb: int, repeat_every: int) -> list[float]:
+    revisions: dict[int, int] = {}
+    page = build_page(page_kb, revisions)
+    samples = []
+    for step in range(steps):
+        if repeat_every and step % repeat_every != 0:
+            section = (step * 7) % 20
+            revisions[section] = revisions.get(section, 0) + 1
+            page = build_page(page_kb, revisions)
+        start = time.perf_counter()
+        manager.save_artifact(page, "html", "auto_save", component_type="page_landing")
+        manager.save_artifact(CSS, "css", "auto_save", component_type="page_landing_styles")
+        manager.save_artifact(JS, "js", "auto_save", component_type="page_landing_scripts")
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+CONFIGS: dict[str, dict[str, Any]] = {
+    "plain": {"use_blobs": False, "policy": RetentionPolicy(max_versions=0, max_blob_bytes=0, gc_interval=0)},
+    "blobs": {"use_blobs": True, "policy": RetentionPolicy(max_versions=0, max_blob_bytes=0, gc_interval=30)},
+    "delta": {"use_blobs": True, "policy": RetentionPolicy(max_versions=0, max_blob_bytes=0, gc_interval=30,
+                                                           delta=True)},
+}
+
+
+def _counting_fsync(counter: list[int]):
+    real_fsync = os.fsync
+
+    def fsync(fd: int) -> None:
+        counter[0] += 1
+        real_fsync(fd)
+
+    return fsync
+
+
+def run(steps: int, page_kb: int, repeat_every: int) -> dict[str, Any]:
+    report: dict[str, Any] = {"steps": steps, "page_kb": page_kb, "repeat_every": repeat_every}
+    real_fsync = os.fsync
+    for name, kwargs in CONFIGS.items():
+        with tempfile.TemporaryDirectory() as root:
+            manager = DraftManager(root, **kwargs)
+            fsyncs = [0]
+            os.fsync = _counting_fsync(fsyncs)
+            try:
+                samples = replay(manager, steps, page_kb, repeat_every)
+            finally:
+                os.fsync = real_fsync
+            report[f"{name}_fsyncs_per_step"] = round(fsyncs[0] / steps, 2)
+            if manager.blobs is not None:
+                manager.gc()
+            report[f"{name}_disk_kb"] = round(disk_usage(Path(root)) / 1024, 1)
+            report[f"{name}_save_median_ms"] = round(statistics.median(samples), 2)
+            report[f"{name}_save_mean_ms"] = round(statistics.mean(samples), 2)
+            report[f"{name}_codec"] = manager.blobs.codec if manager.blobs else None
+    for name in ("blobs", "delta"):
+        report[f"{name}_disk_ratio"] = round(report[f"{name}_disk_kb"] / report["plain_disk_kb"], 4)
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--steps", type=int, default=200, help="Auto-saves (HTML+CSS+JS each)")
+    parser.add_argument("--page-kb", type=int, default=200)
+    parser.add_argument("--repeat-every", type=int, default=4, help="Every Nth step re-saves unchanged output")
+    parser.add_argument("--json", action="store_true", help="Print the raw JSON report")
+    args = parser.parse_args()
+
+    report = run(args.steps, args.page_kb, args.repeat_every)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{report['steps']} auto-saves of a {report['page_kb']}KB page + CSS + JS:")
+        for name in CONFIGS:
+            ratio = f", {report[name + '_disk_ratio']:.1%} of plain" if name != "plain" else ""
+            print(
+                f"  {name:6s} disk {report[name + '_disk_kb']} KB{ratio}; "
+                f"save median {report[name + '_save_median_ms']} ms, mean {report[name + '_save_mean_ms']} ms, "
+                f"{report[name + '_fsyncs_per_step']} fsyncs/step"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Benchmark: compile_project_drafts on a project with many large drafts.
+
+Compares the previous compiler (kept here as the reference implementation:
+sort the full manifest, read every latest draft whole, regex the body out,
+grow the page with `combined_html +=`, save the string) with the streaming
+draft_compiler.compile_project.
+
+Reports wall time and peak Python heap (tracemalloc) for each, and checks
+that both produce the same page.
+
+No API calls are made.
+
+Usage:
+    python benchmarks/bench_compile_drafts.py --components 300 --versions 2 --draft-kb 64
+    python benchmarks/bench_compile_drafts.py --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable
+
+from gemini_mcp.draft_compiler import COMPILED_COMPONENT, PAGE_HEAD, compile_project
+from gemini_mcp.state import DraftManager, RetentionPolicy
+
+_BODY_CONTENT_PATTERN = re.compile(r'<body[^>]*>(.*?)</body>', re.DOTALL)
+
+CARD = '<article class="rounded-2xl border p-8"><h3 class="text-xl">Card {i}</h3><p>Copy {i}</p></article>\n'
+
+
+def build_draft(component: int, version: int, draft_kb: int) -> str:
+    cards = "".join(CARD.format(i=i) for i in range(draft_kb * 1024 // len(CARD) + 1))
+    return (
+        f"<!DOCTYPE html><html><head><title>c{component}</title></head><body class=\"p-4\">\n"
+        f"<section id=\"c{component}\" data-version=\"{version}\">\n{cards}</section>\n</body></html>\n"
+    )
+
+
+def legacy_compile(manager: DraftManager, project_name: str) -> str:
+    drafts = manager.list_drafts(project_name)
+    unique_components = {}
+    for d in sorted(drafts, key=lambda x: x['created_at']):
+        if d['type'] == 'html' and not d['component_type'].startswith(COMPILED_COMPONENT):
+            unique_components[d['component_type']] = d['path']
+
+    combined_html = PAGE_HEAD + '</head><body class="bg-gray-50">'
+    for c_type, path in unique_components.items():
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+            body_match = _BODY_CONTENT_PATTERN.search(content)
+            if body_match:
+                content = body_match.group(1)
+            combined_html += f"\n<!-- SECTION: {c_type} -->\n{content}\n"
+    combined_html += "</body></html>"
+    return manager.save_artifact(combined_html, "html", project_name, component_type=COMPILED_COMPONENT)
+
+
+def streaming_compile(manager: DraftManager, project_name: str) -> str:
+    return compile_project(manager, project_name).path
+
+
+def _measure(func: Callable[[], str]) -> tuple[float, float, str]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    path = func()
+    elapsed = (time.perf_counter() - start) * 1000
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return round(elapsed, 1), round(peak / 1024 / 1024, 2), path
+
+
+def run(components: int, versions: int, draft_kb: int) -> dict[str, Any]:
+    with tempfile.TemporaryDirectory() as root:
+        manager = DraftManager(root, policy=RetentionPolicy(gc_interval=0, max_versions=0, max_blob_bytes=0))
+        for version in range(versions):
+            for component in range(components):
+                manager.save_artifact(
+                    build_draft(component, version, draft_kb), "html", "site", component_type=f"c{component}"
+                )
+
+        legacy_ms, legacy_mb, legacy_path = _measure(lambda: legacy_compile(manager, "site"))
+        streaming_ms, streaming_mb, streaming_path = _measure(lambda: streaming_compile(manager, "site"))
+        with open(legacy_path, "rb") as a, open(streaming_path, "rb") as b:
+            identical = a.read() == b.read()
+            size_mb = round(b.tell() / 1024 / 1024, 1)
+
+    return {
+        "components": components,
+        "versions": versions,
+        "draft_kb": draft_kb,
+        "page_mb": size_mb,
+        "legacy_ms": legacy_ms,
+        "legacy_peak_mb": legacy_mb,
+        "streaming_ms": streaming_ms,
+        "streaming_peak_mb": streaming_mb,
+        "identical": identical,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--components", type=int, default=300)
+    parser.add_argument("--versions", type=int, default=2, help="Drafts saved per component")
+    parser.add_argument("--draft-kb", type=int, default=64)
+    parser.add_argument("--json", action="store_true", help="Print the raw JSON report")
+    args = parser.parse_args()
+
+    report = run(args.components, args.versions, args.draft_kb)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(
+            f"{report['components']} components x {report['versions']} versions, {report['draft_kb']}KB drafts "
+            f"-> {report['page_mb']}MB page (identical={report['identical']}):\n"
+            f"  legacy    {report['legacy_ms']} ms, peak heap {report['legacy_peak_mb']} MB\n"
+            f"  streaming {report['streaming_ms']} ms, peak heap {report['streaming_peak_mb']} MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
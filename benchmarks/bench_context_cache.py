@@ -0,0 +1,159 @@
+"""Benchmark: agent calls with and without Gemini context caching.
+
+Runs the static prefix of each agent step (system prompt + few-shot block)
+against the live API twice - once sent inline, once served from a
+cached_content handle - and reports per step:
+
+- prompt tokens billed (usage_metadata.prompt_token_count)
+- prompt tokens served from cache (cached_content_token_count)
+- time-to-first-byte of the streamed response
+
+Requires GOOGLE_CLOUD_PROJECT and valid credentials (makes real API calls).
+
+Usage:
+    python benchmarks/bench_context_cache.py --runs 3 --component hero
+    python benchmarks/bench_context_cache.py --json > bench_output.txt
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import Any, Optional
+
+from google.genai import types
+
+from gemini_mcp.agents import AlchemistAgent, ArchitectAgent, PhysicistAgent
+from gemini_mcp.client import GeminiClient
+from gemini_mcp.context_cache import GeminiContextCache
+from gemini_mcp.orchestration.context import AgentContext
+from gemini_mcp.orchestration.orchestrator import AgentOrchestrator
+
+STEPS = {
+    "architect": ArchitectAgent,
+    "alchemist": AlchemistAgent,
+    "physicist": PhysicistAgent,
+}
+
+USER_PROMPT = "## Component Type\n{component}\n\n## Theme\nmodern-minimal\n\nReply with a one-line summary only."
+
+
+async def _stream_once(
+    client: GeminiClient,
+    model: str,
+    contents: str,
+    config: types.GenerateContentConfig,
+) -> dict[str, Any]:
+    """Stream one response and capture TTFB plus final usage metadata."""
+    start = time.perf_counter()
+    ttfb_ms: Optional[float] = None
+    usage = None
+    stream = await client.client.aio.models.generate_content_stream(
+        model=model, contents=contents, config=config
+    )
+    async for chunk in stream:
+        if ttfb_ms is None:
+            ttfb_ms = (time.perf_counter() - start) * 1000
+        if chunk.usage_metadata is not None:
+            usage = chunk.usage_metadata
+    return {
+        "ttfb_ms": ttfb_ms or 0.0,
+        "prompt_tokens": getattr(usage, "prompt_token_count", 0) or 0,
+        "cached_tokens": getattr(usage, "cached_content_token_count", 0) or 0,
+    }
+
+
+async def run(component: str, runs: int, model: str) -> dict[str, Any]:
+    client = GeminiClient()
+    cache = GeminiContextCache(
+        project_id=client.config.project_id,
+        location=client.config.location,
+        client_provider=lambda: client.client,
+    )
+
+    context = AgentContext(component_type=component)
+    AgentOrchestrator(client)._prepare_few_shot_examples(context)
+
+    report: dict[str, Any] = {"component": component, "model": model, "runs": runs, "steps": {}}
+
+    for step, agent_cls in STEPS.items():
+        agent = agent_cls(client)
+        system_prompt = agent.get_system_prompt()
+        few_shot = agent._build_few_shot_section(context)
+        user_prompt = USER_PROMPT.format(component=component)
+        base_config = types.GenerateContentConfig(
+            max_output_tokens=256,
+            thinking_config=types.ThinkingConfig(thinking_level="low"),
+        )
+
+        # Mode off: full system instruction + inline few-shot every call
+        uncached = []
+        for _ in range(runs):
+            config = base_config.model_copy(update={"system_instruction": system_prompt})
+            contents = f"{few_shot}\n\n{user_prompt}" if few_shot else user_prompt
+            uncached.append(await _stream_once(client, model, contents, config))
+
+        # Mode on: static prefix lives in the cached_content handle
+        cached_runs = []
+        handle = await cache.get_or_create(step, system_prompt, model, few_shot or None)
+        if handle is not None:
+            for _ in range(runs):
+                config = base_config.model_copy(update={"cached_content": handle.cache_name})
+                cached_runs.append(await _stream_once(client, model, user_prompt, config))
+
+        report["steps"][step] = {
+            "prefix_chars": len(system_prompt) + len(few_shot),
+            "cache_eligible": handle is not None,
+            "off": _summarize(uncached),
+            "on": _summarize(cached_runs) if cached_runs else None,
+        }
+
+    report["cache_metrics"] = cache.get_metrics()
+    for listed in await cache.list_caches():
+        await cache.delete(listed["content_hash"])
+    return report
+
+
+def _summarize(samples: list[dict[str, Any]]) -> dict[str, float]:
+    return {
+        "ttfb_ms_median": round(statistics.median(s["ttfb_ms"] for s in samples), 1),
+        "prompt_tokens": round(statistics.mean(s["prompt_tokens"] for s in samples)),
+        "cached_tokens": round(statistics.mean(s["cached_tokens"] for s in samples)),
+    }
+
+
+def _print_table(report: dict[str, Any]) -> None:
+    print(f"component={report['component']} model={report['model']} runs={report['runs']}")
+    print(f"{'step':<10} {'mode':<4} {'prompt_tok':>10} {'cached_tok':>10} {'ttfb_ms':>9}")
+    for step, row in report["steps"].items():
+        for mode in ("off", "on"):
+            stats = row[mode]
+            if stats is None:
+                print(f"{step:<10} {mode:<4} {'(prefix below cache minimum)':>31}")
+                continue
+            print(
+                f"{step:<10} {mode:<4} {stats['prompt_tokens']:>10} "
+                f"{stats['cached_tokens']:>10} {stats['ttfb_ms_median']:>9}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--component", default="hero")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--model", default="gemini-3-pro-preview")
+    parser.add_argument("--json", action="store_true", help="Print the raw JSON report")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args.component, args.runs, args.model))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_table(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Benchmark: DNA similarity search at 100k stored entries.
+
+Fills a SQLite DNAStore with synthetic DesignDNA (random palettes, fonts,
+spacing, radii and moods over many projects), then measures:
+
+- index build: first DNAStore.similarity_index() call (reads every entry)
+- incremental save: DNAStore.save() with the index built
+- find_similar by DesignDNA (all entries, and filtered to one project)
+- find_similar by text (a MAESTRO-style project context)
+
+and checks top-k against an exhaustive cosine scan of the same vectors.
+Reports which search path ran (NumPy if installed, else pure Python).
+
+No API calls are made.
+
+Usage:
+    python benchmarks/bench_dna_similarity.py --entries 100000
+    python benchmarks/bench_dna_similarity.py --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from gemini_mcp.orchestration.context import DesignDNA
+from gemini_mcp.orchestration.dna_index import NUMPY_AVAILABLE, dna_features, hash_vector
+from gemini_mcp.orchestration.dna_store import DNAStore
+
+MOODS = ["cyberpunk-neon", "minimal-professional", "playful-colorful", "glassmorphism",
+         "neo-brutalism", "corporate-clean", "luxury-elegant", "retro-vintage"]
+FONTS = ["Inter", "Roboto", "Space Grotesk", "Playfair Display", "JetBrains Mono", "Poppins"]
+COMPONENTS = ["navbar", "hero", "pricing", "footer", "features", "cta"]
+THEMES = ["modern-minimal", "cyberpunk", "gradient", "corporate", "brutalist"]
+
+
+def make_dna(rng: random.Random) -> DesignDNA:
+    return DesignDNA(
+        colors={role: f"#{rng.randrange(1 << 24):06x}" for role in ("primary", "accent", "background")},
+        typography={"heading_font": rng.choice(FONTS), "body_font": rng.choice(FONTS),
+                    "scale": rng.choice(["sm", "lg", "xl"])},
+        spacing={"density": rng.choice(["compact", "comfortable", "spacious"]),
+                 "section_gap": rng.choice(["py-12", "py-24"])},
+        borders={"radius": rng.choice(["rounded-md", "rounded-xl", "rounded-none"])},
+        animation={"style": rng.choice(["smooth", "snappy"])},
+        mood=rng.choice(MOODS),
+    )
+
+
+def _timed(func: Callable[[], Any], repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return round(statistics.median(samples), 2)
+
+
+def recall(store: DNAStore, rng: random.Random, queries: int, k: int) -> float:
+    """Share of exhaustive top-k ids that find_similar also returns."""
+    vectors = {e.dna_id: hash_vector(dna_features(e.dna)) for e in store.backend.iter_entries()}
+    hits = total = 0
+    for _ in range(queries):
+        query_dna = make_dna(rng)
+        query = hash_vector(dna_features(query_dna))
+        scores = {i: sum(w * v.get(d, 0.0) for d, w in query.items()) for i, v in vectors.items()}
+        expected = sorted(scores, key=scores.__getitem__, reverse=True)[:k]
+        found = {e.dna_id for e, _ in store.find_similar(query_dna, k=k)}
+        # Ties at the k-th score may be ordered either way
+        cutoff = scores[expected[-1]]
+        hits += sum(1 for i in expected if i in found or scores[i] == cutoff)
+        total += k
+    return round(hits / total, 4)
+
+
+def run(entries: int, projects: int, k: int) -> dict[str, Any]:
+    rng = random.Random(0)
+    report: dict[str, Any] = {"entries": entries, "projects": projects, "k": k,
+                              "search_path": "numpy" if NUMPY_AVAILABLE else "python"}
+    with tempfile.TemporaryDirectory() as root:
+        store = DNAStore(str(Path(root) / "dna.db"), max_entries=entries * 2)
+        batch = 5000
+        for start in range(0, entries, batch):
+            store.save_many(
+                (rng.choice(COMPONENTS), rng.choice(THEMES), make_dna(rng), f"project-{rng.randrange(projects)}")
+                for _ in range(min(batch, entries - start))
+            )
+
+        start = time.perf_counter()
+        store.similarity_index()
+        report["index_build_s"] = round(time.perf_counter() - start, 2)
+        report["save_with_index_ms"] = _timed(
+            lambda: store.save(rng.choice(COMPONENTS), rng.choice(THEMES), make_dna(rng), "project-0"), 20
+        )
+        report["query_dna_ms"] = _timed(lambda: store.find_similar(make_dna(rng), k=k), 10)
+        report["query_dna_project_ms"] = _timed(
+            lambda: store.find_similar(make_dna(rng), k=k, project_id=f"project-{rng.randrange(projects)}"), 10
+        )
+        report["query_text_ms"] = _timed(
+            lambda: store.find_similar(f"project-{rng.randrange(projects)} cyberpunk hero", k=k), 10
+        )
+        report["recall_at_k"] = recall(store, rng, queries=3, k=k)
+        store.close()
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=100_000)
+    parser.add_argument("--projects", type=int, default=500)
+    parser.add_argument("-k", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="Print the raw JSON report")
+    args = parser.parse_args()
+
+    report = run(args.entries, args.projects, args.k)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(
+            f"{report['entries']} entries, {report['projects']} projects, top-{report['k']} "
+            f"({report['search_path']} search path):\n"
+            f"  index build      {report['index_build_s']} s (once per process)\n"
+            f"  save, index hot  {report['save_with_index_ms']} ms\n"
+            f"  query by DNA     {report['query_dna_ms']} ms (one project: {report['query_dna_project_ms']} ms)\n"
+            f"  query by text    {report['query_text_ms']} ms\n"
+            f"  recall@k         {report['recall_at_k']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
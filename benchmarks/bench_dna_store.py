@@ -0,0 +1,111 @@
+"""Benchmark: DNAStore write and lookup cost on the JSON and SQLite backends.
+
+Preloads --entries DNA entries (spread over projects, components and
+themes), then measures on each backend:
+
+- save: one DNAStore.save() each (the JSON backend rewrites the whole file
+  per save, like the previous store)
+- batch: --batch saves inside one DNAStore.batch()
+- get_latest / search(project_id=...): the MAESTRO and Strategist lookups
+
+No API calls are made.
+
+Usage:
+    python benchmarks/bench_dna_store.py --entries 5000
+    python benchmarks/bench_dna_store.py --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from gemini_mcp.orchestration.context import DesignDNA
+from gemini_mcp.orchestration.dna_store import DNAStore
+
+COMPONENTS = ["navbar", "hero", "pricing", "footer", "features", "testimonials", "cta", "faq"]
+THEMES = ["modern-minimal", "cyberpunk", "gradient", "corporate", "brutalist"]
+
+
+def make_dna(i: int) -> DesignDNA:
+    return DesignDNA(
+        colors={"primary": f"#{i % 0xFFFFFF:06x}", "secondary": "#0f172a", "accent": "#f59e0b"},
+        typography={"heading_font": "Inter", "body_font": "Inter", "scale": "1.25"},
+        spacing={"section": "py-24", "card": "p-8"},
+        mood="confident",
+    )
+
+
+def item(rng: random.Random, i: int, projects: int) -> tuple[str, str, DesignDNA, str]:
+    return rng.choice(COMPONENTS), rng.choice(THEMES), make_dna(i), f"project-{rng.randrange(projects)}"
+
+
+def _timed(func: Callable[[], Any], repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return round(statistics.median(samples), 3)
+
+
+def run(entries: int, projects: int, saves: int, batch: int) -> dict[str, Any]:
+    report: dict[str, Any] = {"entries": entries, "projects": projects}
+    for backend in ("json", "sqlite"):
+        rng = random.Random(0)
+        with tempfile.TemporaryDirectory() as root:
+            store = DNAStore(str(Path(root) / "dna.db"), max_entries=entries + saves + batch, backend=backend)
+            start = time.perf_counter()
+            store.save_many(item(rng, i, projects) for i in range(entries))
+            report[f"{backend}_preload_ms"] = round((time.perf_counter() - start) * 1000, 1)
+
+            counter = iter(range(entries, entries + saves))
+            report[f"{backend}_save_ms"] = _timed(lambda: store.save(*item(rng, next(counter), projects)), saves)
+
+            def batched() -> None:
+                with store.batch():
+                    for i in range(batch):
+                        store.save(*item(rng, i, projects))
+
+            report[f"{backend}_batch_ms"] = _timed(batched, 1)
+            report[f"{backend}_get_latest_ms"] = _timed(
+                lambda: store.get_latest(rng.choice(COMPONENTS), f"project-{rng.randrange(projects)}"), 200
+            )
+            report[f"{backend}_search_project_ms"] = _timed(
+                lambda: store.search(project_id=f"project-{rng.randrange(projects)}", limit=3), 200
+            )
+            report[f"{backend}_open_ms"] = _timed(lambda: DNAStore(str(store.db_path), backend=backend), 3)
+            store.close()
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=5000, help="Entries preloaded before measuring")
+    parser.add_argument("--projects", type=int, default=50)
+    parser.add_argument("--saves", type=int, default=20, help="Single saves timed")
+    parser.add_argument("--batch", type=int, default=50, help="Saves inside one batch()")
+    parser.add_argument("--json", action="store_true", help="Print the raw JSON report")
+    args = parser.parse_args()
+
+    report = run(args.entries, args.projects, args.saves, args.batch)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{report['entries']} entries over {report['projects']} projects (median ms):")
+        for backend in ("json", "sqlite"):
+            print(
+                f"  {backend:6s} save {report[backend + '_save_ms']}, batch of {args.batch} "
+                f"{report[backend + '_batch_ms']}, get_latest {report[backend + '_get_latest_ms']}, "
+                f"search(project) {report[backend + '_search_project_ms']}, open {report[backend + '_open_ms']}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Benchmark: DraftManager saves and queries on a project with a long history.
+
+Compares the previous manifest.json store (kept here as the reference
+implementation: every save re-reads and rewrites the whole manifest, every
+query loads it and sorts) with the append-only manifest.jsonl + index:
+
+- save: one save_artifact call after N drafts already exist
+- latest: get_latest_draft for one component
+- list: list_drafts
+
+Both stores start from the same N-entry history in separate temp
+directories. No API calls are made.
+
+Usage:
+    python benchmarks/bench_draft_store.py --history 2000 --runs 20
+    python benchmarks/bench_draft_store.py --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable
+
+from gemini_mcp.state import DraftManager
+
+CONTENT = "<section class=\"py-24\">" + "<p class=\"text-slate-600\">copy</p>" * 200 + "</section>"
+
+
+def _history(n: int) -> list[dict]:
+    return [
+        {
+            "id": f"20250101_{i:06d}_section_{i % 12}",
+            "type": "html",
+            "path": f"/tmp/20250101_{i:06d}_section_{i % 12}.html",
+            "created_at": f"20250101_{i:06d}",
+            "component_type": f"section_{i % 12}",
+            "model_used": "unknown",
+        }
+        for i in range(n)
+    ]
+
+
+class LegacyDraftStore:
+    """Reference: pre-JSONL DraftManager save/list/latest."""
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    def save_artifact(self, content: str, extension: str, project_name: str, component_type: str) -> str:
+        project_dir = self.root / project_name
+        project_dir.mkdir(parents=True, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        file_path = project_dir / f"{timestamp}_{component_type}.{extension}"
+        with open(file_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        manifest_path = project_dir / "manifest.json"
+        manifest = {"project": project_name, "artifacts": [], "last_updated": ""}
+        if manifest_path.exists():
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        manifest["artifacts"].append({
+            "id": f"{timestamp}_{component_type}", "type": extension, "path": str(file_path),
+            "created_at": timestamp, "component_type": component_type, "model_used": "unknown",
+        })
+        manifest["last_updated"] = datetime.now().isoformat()
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+        return str(file_path)
+
+    def list_drafts(self, project_name: str) -> list[dict]:
+        with open(self.root / project_name / "manifest.json", "r", encoding="utf-8") as f:
+            return json.load(f).get("artifacts", [])
+
+    def get_latest_draft(self, project_name: str, component_type: str) -> dict | None:
+        drafts = [d for d in self.list_drafts(project_name) if d.get("component_type") == component_type]
+        drafts.sort(key=lambda x: x.get("created_at", ""), reverse=True)
+        return drafts[0] if drafts else None
+
+
+def _seed(root: Path, history: list[dict], jsonl: bool) -> None:
+    project = root / "proj"
+    project.mkdir(parents=True)
+    if jsonl:
+        (project / "manifest.jsonl").write_text("".join(json.dumps(h) + "\n" for h in history))
+    else:
+        (project / "manifest.json").write_text(json.dumps({"project": "proj", "artifacts": history}, indent=2))
+
+
+def _median_ms(func: Callable[[], Any], runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return round(statistics.median(samples), 3)
+
+
+def run(history_size: int, runs: int) -> dict[str, Any]:
+    history = _history(history_size)
+    report: dict[str, Any] = {"history": history_size, "runs": runs}
+
+    with tempfile.TemporaryDirectory() as legacy_dir, tempfile.TemporaryDirectory() as store_dir:
+        _seed(Path(legacy_dir), history, jsonl=False)
+        _seed(Path(store_dir), history, jsonl=True)
+        stores = {"legacy": LegacyDraftStore(Path(legacy_dir)), "indexed": DraftManager(store_dir)}
+
+        for name, store in stores.items():
+            report[f"save_{name}_ms"] = _median_ms(
+                lambda: store.save_artifact(CONTENT, "html", "proj", component_type="section_3"), runs
+            )
+            report[f"latest_{name}_ms"] = _median_ms(lambda: store.get_latest_draft("proj", "section_3"), runs)
+            report[f"list_{name}_ms"] = _median_ms(lambda: store.list_drafts("proj"), runs)
+
+        report["same_count"] = len(stores["legacy"].list_drafts("proj")) == len(stores["indexed"].list_drafts("proj"))
+
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--history", type=int, default=2000, help="Drafts already in the manifest")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--json", action="store_true", help="Print the raw JSON report")
+    args = parser.parse_args()
+
+    report = run(args.history, args.runs)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(
+            f"{report['history']} drafts in history (median of {report['runs']}, "
+            f"same_count={report['same_count']}):\n"
+            f"  save_artifact:    legacy {report['save_legacy_ms']} ms, indexed {report['save_indexed_ms']} ms\n"
+            f"  get_latest_draft: legacy {report['latest_legacy_ms']} ms, indexed {report['latest_indexed_ms']} ms\n"
+            f"  list_drafts:      legacy {report['list_legacy_ms']} ms, indexed {report['list_indexed_ms']} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
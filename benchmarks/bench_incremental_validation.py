@@ -0,0 +1,124 @@
+"""Benchmark: validating a sectioned page after a one-section edit.
+
+Builds a landing page with N feature sections (plus navbar and footer, as
+in bench_validation.py) and compares:
+
+- full: HTML, ID, density, anti-pattern and a11y validators over the whole
+  page with one shared ParsedDocument (what a non-incremental pass costs)
+- cold: IncrementalValidator on an empty cache (every section validated)
+- edit: IncrementalValidator after changing one section's content, with
+  the previous version of the page already cached
+
+No API calls are made.
+
+Usage:
+    python benchmarks/bench_incremental_validation.py --sections 12 --runs 5
+    python benchmarks/bench_incremental_validation.py --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import time
+from typing import Any, Callable
+
+from bench_validation import FOOTER, HEADER, JS, SECTION
+
+from gemini_mcp.orchestration.context import AgentContext
+from gemini_mcp.validation import (
+    AntiPatternValidator,
+    DensityValidator,
+    HTMLValidator,
+    IDValidator,
+    IncrementalValidator,
+)
+from gemini_mcp.validators import A11yValidator
+
+
+def build_page(sections: int) -> str:
+    """Landing page with navbar, footer and `sections` feature sections."""
+    return HEADER + "".join(SECTION.format(n=n) for n in range(sections)) + FOOTER
+
+
+def edit_section(html: str, n: int, run: int) -> str:
+    """Same page with one section's heading text changed."""
+    return html.replace(f">Section {n}<", f">Section {n} (rev {run})<")
+
+
+def validate_full(html: str) -> None:
+    doc = AgentContext(html_output=html).get_parsed_document()
+    HTMLValidator(strict_mode=False).validate(html, document=doc)
+    IDValidator(strict_mode=False).validate(html, JS, document=doc)
+    DensityValidator().validate(html, document=doc)
+    AntiPatternValidator().validate(html, document=doc)
+    A11yValidator().validate(html, document=doc)
+
+
+def _median_ms(samples: list[float]) -> float:
+    return round(statistics.median(samples), 2)
+
+
+def _time(func: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+
+def run(sections: int, runs: int) -> dict[str, Any]:
+    html = build_page(sections)
+    edited_section = sections // 2
+
+    full = [_time(lambda: validate_full(html)) for _ in range(runs)]
+
+    cold = []
+    for _ in range(runs):
+        validator = IncrementalValidator()
+        cold.append(_time(lambda: validator.validate_page(html, JS)))
+
+    edit = []
+    revalidated: list[str] = []
+    validator = IncrementalValidator()
+    validator.validate_page(html, JS)
+    for run_index in range(runs):
+        edited = edit_section(html, edited_section, run_index)
+        start = time.perf_counter()
+        report = validator.validate_page(edited, JS)
+        edit.append((time.perf_counter() - start) * 1000)
+        revalidated = report.revalidated
+
+    report = {
+        "sections": sections + 2,
+        "size_kb": round(len(html) / 1024, 1),
+        "runs": runs,
+        "full_ms": _median_ms(full),
+        "cold_ms": _median_ms(cold),
+        "edit_ms": _median_ms(edit),
+        "revalidated": revalidated,
+    }
+    report["edit_fraction"] = round(report["edit_ms"] / report["full_ms"], 3) if report["full_ms"] else 0.0
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sections", type=int, default=10, help="Feature sections (navbar/footer added)")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="Print the raw JSON report")
+    args = parser.parse_args()
+
+    report = run(args.sections, args.runs)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(
+            f"{report['sections']} sections, {report['size_kb']}KB (median of {report['runs']}): "
+            f"full {report['full_ms']} ms, cold {report['cold_ms']} ms, "
+            f"one-section edit {report['edit_ms']} ms "
+            f"({report['edit_fraction']:.0%} of full, revalidated={report['revalidated']})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""Benchmark: chained section operations on a large marked page.
+
+Compares the previous per-call regex helpers (kept here as the reference
+implementation) with one SectionedPage shared by the whole chain:
+
+- chain: the replace_section_in_page sequence (has markers, list,
+  extract, all sections for the token batch, replace) for one section
+- edits: N successive replace_section calls on different sections of the
+  same page (iterative refinement)
+
+Both modes must produce the same page; the script checks it.
+No API calls are made.
+
+Usage:
+    python benchmarks/bench_section_utils.py --sections 40 --edits 20
+    python benchmarks/bench_section_utils.py --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import statistics
+import time
+from typing import Any, Callable
+
+from gemini_mcp.section_utils import SECTION_PATTERN, SectionedPage
+
+SECTION = """<!-- SECTION: s{n} -->
+<section id="s{n}" class="relative py-24 px-6 md:px-12 bg-white dark:bg-slate-900">
+  <div class="max-w-7xl mx-auto grid grid-cols-1 md:grid-cols-3 gap-8">
+{cards}
+  </div>
+</section>
+<!-- /SECTION: s{n} -->
+"""
+
+CARD = """    <article class="rounded-2xl border border-slate-200 p-8 shadow-sm hover:shadow-xl">
+      <h3 class="text-xl font-semibold text-slate-900">Card {i}</h3>
+      <p class="mt-3 text-base leading-relaxed text-slate-600">Body copy for card {i}.</p>
+    </article>
+"""
+
+
+def build_page(sections: int, cards: int = 12) -> str:
+    body = "".join(CARD.format(i=i) for i in range(cards))
+    return "".join(SECTION.format(n=n, cards=body) for n in range(sections))
+
+
+# Reference: per-call regex helpers as they were before SectionedPage
+def legacy_replace(html: str, name: str, content: str) -> str:
+    pattern = re.compile(
+        rf'(<!-- SECTION: {re.escape(name)} -->)(.*?)(<!-- /SECTION: {re.escape(name)} -->)', re.DOTALL
+    )
+    if not pattern.search(html):
+        raise ValueError(name)
+    return pattern.sub(lambda m: f"{m.group(1)}\n{content.strip()}\n{m.group(3)}", html)
+
+
+def legacy_chain(html: str, name: str, content: str) -> str:
+    assert re.search(r'<!-- SECTION: \w+ -->', html)
+    names = re.findall(r'<!-- SECTION: (\w+) -->', html)
+    assert name in names
+    match = re.search(
+        rf'<!-- SECTION: {re.escape(name)} -->(.*?)<!-- /SECTION: {re.escape(name)} -->', html, re.DOTALL
+    )
+    assert match
+    sections = {m.group(1): m.group(2).strip() for m in SECTION_PATTERN.finditer(html)}
+    assert sections
+    return legacy_replace(html, name, content)
+
+
+def sectioned_chain(html: str, name: str, content: str) -> str:
+    page = SectionedPage(html)
+    assert page.names
+    assert name in page.names
+    assert page.extract(name) is not None
+    sections = dict(page.top_level())
+    assert sections
+    page.replace(name, content)
+    return page.text
+
+
+def legacy_edits(html: str, names: list[str]) -> str:
+    for i, name in enumerate(names):
+        html = legacy_replace(html, name, f"<p>edit {i}</p>")
+    return html
+
+
+def sectioned_edits(html: str, names: list[str]) -> str:
+    page = SectionedPage(html)
+    for i, name in enumerate(names):
+        page.replace(name, f"<p>edit {i}</p>")
+    return page.text
+
+
+def _median_ms(func: Callable[[], str], runs: int) -> tuple[float, str]:
+    samples = []
+    result = ""
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return round(statistics.median(samples), 3), result
+
+
+def run(sections: int, edits: int, runs: int) -> dict[str, Any]:
+    html = build_page(sections)
+    target = f"s{sections - 1}"
+    edit_names = [f"s{(i * 7) % sections}" for i in range(edits)]
+
+    legacy_chain_ms, legacy_page = _median_ms(lambda: legacy_chain(html, target, "<p>new</p>"), runs)
+    sectioned_chain_ms, sectioned_page = _median_ms(lambda: sectioned_chain(html, target, "<p>new</p>"), runs)
+    legacy_edits_ms, legacy_edited = _median_ms(lambda: legacy_edits(html, edit_names), runs)
+    sectioned_edits_ms, sectioned_edited = _median_ms(lambda: sectioned_edits(html, edit_names), runs)
+
+    return {
+        "sections": sections,
+        "size_kb": round(len(html) / 1024, 1),
+        "edits": edits,
+        "runs": runs,
+        "chain_legacy_ms": legacy_chain_ms,
+        "chain_sectioned_ms": sectioned_chain_ms,
+        "edits_legacy_ms": legacy_edits_ms,
+        "edits_sectioned_ms": sectioned_edits_ms,
+        "identical": legacy_page == sectioned_page and legacy_edited == sectioned_edited,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sections", type=int, default=40)
+    parser.add_argument("--edits", type=int, default=20)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="Print the raw JSON report")
+    args = parser.parse_args()
+
+    report = run(args.sections, args.edits, args.runs)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(
+            f"{report['sections']} sections, {report['size_kb']}KB (identical={report['identical']}, "
+            f"median of {report['runs']}):\n"
+            f"  replace_section_in_page chain: legacy {report['chain_legacy_ms']} ms, "
+            f"SectionedPage {report['chain_sectioned_ms']} ms\n"
+            f"  {report['edits']} successive edits: legacy {report['edits_legacy_ms']} ms, "
+            f"SectionedPage {report['edits_sectioned_ms']} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
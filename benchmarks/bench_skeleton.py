@@ -0,0 +1,329 @@
+"""Benchmark: HTML skeleton vs the previous inter-agent HTML compression.
+
+Measures, per document, the size of each compressed form and how much of
+the page structure a downstream agent can still recover from it:
+
+- legacy_summary: CompressedOutput before the skeleton (Sections/IDs/Classes
+  lines plus the first 500 chars of tag-stripped text)
+- legacy_architect: ArchitectAgent._compress_html_context before the
+  skeleton (section names, first 20 IDs, first 30 color/type classes)
+- skeleton: skeletonize_html() with its legend, as agents now receive it
+
+Fidelity is the recall of ids, class tokens, data-* attribute values and
+section names found in the compressed text, plus whether the nested tag
+tree can be rebuilt (the skeleton is expanded and compared to a stdlib
+html.parser walk of the source). The skeleton's round trip
+(skeletonize(expand(s)) == s) is checked too. This is an offline
+structural A/B: no API calls are made, so it says what each form
+preserves, not how a model uses it.
+
+The agent report builds the Alchemist and Physicist prompts for each
+document (unlimited budget) and prices the skeleton as a replacement for
+their compact lists: the Alchemist's selector list plus "Available IDs",
+and the Physicist's flat ID list. The delta is the prompt-size change per
+agent call if those lists were swapped for the skeleton; it is why both
+agents keep the lists and the skeleton only stands in for full HTML.
+
+Usage:
+    python benchmarks/bench_skeleton.py
+    python benchmarks/bench_skeleton.py --page-sections 40 --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import statistics
+import time
+from html.parser import HTMLParser
+from typing import Any, Callable
+
+from gemini_mcp.agents import AlchemistAgent, PhysicistAgent
+from gemini_mcp.agents.prompt_budget import PromptBudget, estimate_tokens, html_skeleton
+from gemini_mcp.few_shot_examples import COMPONENT_EXAMPLES
+from gemini_mcp.orchestration.context import AgentContext
+from gemini_mcp.validation import SKELETON_LEGEND, expand_skeleton, parse_document, skeletonize_html
+from gemini_mcp.validation.skeleton import VOID_ELEMENTS
+
+SECTION_BLOCK = """<!-- SECTION: {name} -->
+<section id="{name}" class="relative py-24 bg-white dark:bg-slate-950" data-interaction="reveal" data-trigger="scroll">
+  <div class="mx-auto max-w-7xl px-6">
+    <h2 class="text-4xl font-bold tracking-tight text-slate-900">Section {name}</h2>
+    <p class="mt-4 text-lg text-slate-600">Supporting copy that explains the value of {name} in a sentence or two.</p>
+    <div class="mt-12 grid grid-cols-1 gap-8 md:grid-cols-3">
+{cards}
+    </div>
+    <button id="{name}-cta" type="button" class="rounded-full bg-indigo-600 px-6 py-3 text-white hover:bg-indigo-500" data-interaction="magnetic">Get started</button>
+  </div>
+</section>
+<!-- /SECTION: {name} -->
+"""
+
+CARD_BLOCK = """      <article class="rounded-2xl border border-slate-200 p-8 shadow-sm transition hover:shadow-lg" data-interaction="tilt">
+        <img src="https://picsum.photos/seed/{seed}/400/240" alt="Card {seed}" class="h-40 w-full rounded-xl object-cover">
+        <h3 class="mt-6 text-xl font-semibold text-slate-900">Feature {seed}</h3>
+        <p class="mt-2 text-slate-600">Short description of feature {seed} with enough words to look real.</p>
+      </article>"""
+
+
+def build_page(sections: int, cards: int = 6) -> str:
+    blocks = [
+        SECTION_BLOCK.format(
+            name=f"s{i}",
+            cards="\n".join(CARD_BLOCK.format(seed=i * cards + j) for j in range(cards)),
+        )
+        for i in range(sections)
+    ]
+    return "<main id=\"page\">\n" + "".join(blocks) + "<script>if (a < b) { init(); }</script>\n</main>"
+
+
+def corpus(page_sections: int) -> dict[str, str]:
+    docs = {
+        name: example["output"]["html"]
+        for name, example in COMPONENT_EXAMPLES.items()
+        if isinstance(example.get("output"), dict) and example["output"].get("html")
+    }
+    docs[f"synthetic_page_{page_sections}"] = build_page(page_sections)
+    return docs
+
+
+# =============================================================================
+# Previous compression, kept as the reference implementations
+# =============================================================================
+
+def legacy_summary(html: str) -> str:
+    doc = parse_document(html)
+    lines = []
+    if doc.section_names:
+        lines.append(f"Sections: {', '.join(doc.section_names)}")
+    if doc.ids():
+        lines.append(f"IDs: {', '.join(doc.ids())}")
+    classes = list(doc.class_tokens())
+    if classes:
+        lines.append(f"Classes: {' '.join(classes[:40])}")
+    text = " ".join(re.sub(r"<[^>]+>", " ", html).split())[:500]
+    if text:
+        lines.append(f"Structure: {text}")
+    return "\n".join(lines)
+
+
+def legacy_architect(html: str, max_chars: int = 2000) -> str:
+    if len(html) <= max_chars:
+        return html
+    doc = parse_document(html)
+    parts = []
+    if doc.section_names:
+        parts.append(f"Sections: {', '.join(doc.section_names)}")
+    if doc.ids():
+        parts.append(f"IDs: {', '.join(doc.ids()[:20])}")
+    key = [c for c in doc.class_tokens() if any(p in c for p in ["bg-", "text-", "font-", "rounded-"])]
+    if key:
+        parts.append(f"Key classes: {', '.join(key[:30])}")
+    return "\n".join(parts) if parts else html[:max_chars]
+
+
+def skeleton_prompt(html: str) -> str:
+    return f"{SKELETON_LEGEND}\n{skeletonize_html(html).text}"
+
+
+MODES: dict[str, Callable[[str], str]] = {
+    "legacy_summary": legacy_summary,
+    "legacy_architect": legacy_architect,
+    "skeleton": skeleton_prompt,
+}
+
+
+# =============================================================================
+# Fidelity
+# =============================================================================
+
+class _TreeWalker(HTMLParser):
+    """(depth, tag) sequence of a document; script/style content is not markup."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.tree: list[tuple[int, str]] = []
+        self.stack: list[str] = []
+
+    def handle_starttag(self, tag: str, attrs: list) -> None:
+        self.tree.append((len(self.stack), tag))
+        if tag not in VOID_ELEMENTS:
+            self.stack.append(tag)
+
+    def handle_startendtag(self, tag: str, attrs: list) -> None:
+        self.tree.append((len(self.stack), tag))
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in self.stack:
+            while self.stack.pop() != tag:
+                pass
+
+
+def tag_tree(html: str) -> list[tuple[int, str]]:
+    walker = _TreeWalker()
+    walker.feed(html)
+    return walker.tree
+
+
+def structural_facts(html: str) -> dict[str, set[str]]:
+    doc = parse_document(html)
+    data_values = {
+        value
+        for element in doc.elements
+        for name, value in element.attrs.items()
+        if name.startswith("data-") and value
+    }
+    return {
+        "ids": set(doc.ids()),
+        "classes": set(doc.class_tokens()),
+        "data": data_values,
+        "sections": set(doc.section_names),
+    }
+
+
+def recall(facts: set[str], text: str) -> float:
+    if not facts:
+        return 1.0
+    # Whole-token match, so "p-8" is not found inside "px-p-8"
+    found = sum(
+        1 for fact in facts
+        if re.search(rf"(?<![\w:/-]){re.escape(fact)}(?![\w:/-])", text)
+    )
+    return round(found / len(facts), 3)
+
+
+def tree_preserved(mode: str, html: str, text: str) -> bool:
+    if mode != "skeleton":
+        return text == html  # flat listings carry no nesting; short HTML passes through
+    return tag_tree(expand_skeleton(text.split("\n", 1)[1])) == tag_tree(html)
+
+
+# =============================================================================
+# Agent prompt size
+# =============================================================================
+
+class _NoClient:
+    context_cache_enabled = False
+
+
+def skeleton_agent_section(agent: str, context: AgentContext, html: str) -> str:
+    """The skeleton as it would replace an agent's compact lists."""
+    header = (
+        "## HTML Context (Target These Selectors)" if agent == "alchemist"
+        else "## HTML Structure (Available Element IDs)"
+    )
+    return f"{header}\n{html_skeleton(context, html)}"
+
+
+def agent_prompt_sizes(html: str) -> dict[str, dict[str, int]]:
+    """Prompt tokens per agent, as built and with the skeleton instead of the lists."""
+    sizes = {}
+    alchemist, physicist = AlchemistAgent(_NoClient()), PhysicistAgent(_NoClient())
+    for name, build, sections in (
+        ("alchemist", alchemist._build_alchemist_prompt, ("html_context", "available_ids")),
+        ("physicist", physicist._build_physicist_prompt, ("available_ids",)),
+    ):
+        context = AgentContext(component_type="hero", theme="modern-minimal", html_output=html)
+        context.compress_current_output(html, "html")
+        budget = PromptBudget()
+        prompt_tokens = estimate_tokens(build(context, budget))
+        current = budget.report()["sections"]
+        replaced = sum(current[s]["tokens"] for s in sections if s in current)
+        skeleton = estimate_tokens(skeleton_agent_section(name, context, html))
+        sizes[name] = {
+            "prompt_tokens": prompt_tokens,
+            "skeleton_prompt_tokens": prompt_tokens - replaced + skeleton,
+            "delta": skeleton - replaced,
+        }
+    return sizes
+
+
+def run(page_sections: int, runs: int) -> dict[str, Any]:
+    docs = corpus(page_sections)
+    report: dict[str, Any] = {"documents": {}, "runs": runs}
+
+    for name, html in docs.items():
+        facts = structural_facts(html)
+        entry: dict[str, Any] = {"chars": len(html), "tokens": len(html) // 4}
+        for mode, func in MODES.items():
+            samples = []
+            for _ in range(runs):
+                start = time.perf_counter()
+                text = func(html)
+                samples.append((time.perf_counter() - start) * 1000)
+            entry[mode] = {
+                "tokens": len(text) // 4,
+                "ratio": round(len(html) / len(text), 2) if text else 0.0,
+                "ms": round(statistics.median(samples), 2),
+                "tree": tree_preserved(mode, html, text),
+                **{kind: recall(values, text) for kind, values in facts.items()},
+            }
+        skeleton = skeletonize_html(html)
+        entry["round_trip"] = skeletonize_html(expand_skeleton(skeleton.text)).text == skeleton.text
+        entry["agents"] = agent_prompt_sizes(html)
+        report["documents"][name] = entry
+
+    entries = list(report["documents"].values())
+    report["summary"] = {
+        mode: {
+            "median_ratio": round(statistics.median(e[mode]["ratio"] for e in entries), 2),
+            "total_tokens": sum(e[mode]["tokens"] for e in entries),
+            **{
+                kind: round(statistics.mean(e[mode][kind] for e in entries), 3)
+                for kind in ("ids", "classes", "data", "sections")
+            },
+            "tree": sum(e[mode]["tree"] for e in entries),
+        }
+        for mode in MODES
+    }
+    report["summary"]["agents"] = {
+        agent: {
+            "prompt_tokens": sum(e["agents"][agent]["prompt_tokens"] for e in entries),
+            "skeleton_prompt_tokens": sum(e["agents"][agent]["skeleton_prompt_tokens"] for e in entries),
+            "median_delta": statistics.median(e["agents"][agent]["delta"] for e in entries),
+        }
+        for agent in ("alchemist", "physicist")
+    }
+    report["summary"]["source_tokens"] = sum(e["tokens"] for e in entries)
+    report["summary"]["round_trip"] = all(e["round_trip"] for e in entries)
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--page-sections", type=int, default=20)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--json", action="store_true", help="Print the raw JSON report")
+    args = parser.parse_args()
+
+    report = run(args.page_sections, args.runs)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    for name, entry in report["documents"].items():
+        sk = entry["skeleton"]
+        print(
+            f"{name:28} {entry['tokens']:6} tok -> skeleton {sk['tokens']:5} tok "
+            f"({sk['ratio']}x, {sk['ms']} ms, tree={sk['tree']}, round_trip={entry['round_trip']})"
+        )
+    summary = report["summary"]
+    print(f"\nsource: {summary['source_tokens']} tokens, round_trip={summary['round_trip']}")
+    for mode in MODES:
+        s = summary[mode]
+        print(
+            f"{mode:17} {s['total_tokens']:6} tok, median {s['median_ratio']}x | recall "
+            f"ids {s['ids']} classes {s['classes']} data {s['data']} sections {s['sections']} "
+            f"| tree {s['tree']}/{len(report['documents'])}"
+        )
+    for agent, s in summary["agents"].items():
+        change = s["skeleton_prompt_tokens"] - s["prompt_tokens"]
+        print(
+            f"{agent:17} prompts {s['prompt_tokens']} tok, with skeleton {s['skeleton_prompt_tokens']} tok "
+            f"({change:+d} total, median {s['median_delta']:+} per call)"
+        )
+
+
+if __name__ == "__main__":
+    main()
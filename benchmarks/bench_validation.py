@@ -0,0 +1,190 @@
+"""Benchmark: QA time per page with and without the shared ParsedDocument.
+
+Builds synthetic landing pages (nav, hero, feature cards, forms, footer)
+of increasing size and runs the HTML side of the QA stack on each:
+
+- HTMLValidator, IDValidator, DensityValidator, AntiPatternValidator
+- A11yValidator, ContextAnalyzer.analyze, AgentContext.compress_current_output
+
+Modes:
+- unshared: every consumer gets only the HTML string (scans it itself)
+- shared: one AgentContext.get_parsed_document() passed to every consumer
+
+The unshared mode only uses the pre-ParsedDocument signatures, so running
+it on an older checkout gives the regex-per-validator baseline.
+
+No API calls are made.
+
+Usage:
+    python benchmarks/bench_validation.py --sizes 50 100 200 --runs 5
+    python benchmarks/bench_validation.py --mode unshared --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import time
+from typing import Any, Callable
+
+from gemini_mcp.maestro.decision.context_analyzer import ContextAnalyzer
+from gemini_mcp.orchestration.context import AgentContext
+from gemini_mcp.validation import (
+    AntiPatternValidator,
+    DensityValidator,
+    HTMLValidator,
+    IDValidator,
+)
+from gemini_mcp.validators import A11yValidator
+
+JS = """
+document.getElementById('nav-toggle').addEventListener('click', () => {});
+document.querySelectorAll('.feature-card').forEach(el => el.dataset.reveal = '1');
+document.querySelector('#signup-form [data-animate]');
+"""
+
+SECTION = """<!-- SECTION: feature_{n} -->
+<section id="features-{n}" class="relative py-24 px-6 md:px-12 lg:px-24 bg-white dark:bg-slate-900 overflow-hidden">
+  <div class="max-w-7xl mx-auto grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-8">
+    <h2 class="text-3xl md:text-4xl font-bold tracking-tight text-slate-900 dark:text-white">Section {n}</h2>
+    <article id="card-{n}-a" class="feature-card group rounded-2xl border border-slate-200 bg-white p-8 shadow-sm hover:shadow-xl transition-all duration-300" data-reveal="up">
+      <img src="https://picsum.photos/seed/{n}/640/360" alt="Feature {n}" class="w-full h-48 object-cover rounded-xl" loading="lazy">
+      <h3 class="mt-6 text-xl font-semibold text-slate-900 dark:text-white">Fast by default</h3>
+      <p class="mt-3 text-base leading-relaxed text-slate-600 dark:text-slate-300">Ship pages that load in milliseconds, not seconds.</p>
+      <a href="#" class="mt-4 inline-flex items-center gap-2 text-blue-600 hover:text-blue-700 focus:outline-none focus-visible:ring-2">Learn about speed</a>
+    </article>
+    <article id="card-{n}-b" class="feature-card group rounded-2xl border border-slate-200 bg-white p-8 shadow-sm hover:shadow-xl transition-all duration-300" data-interaction="tilt" data-intensity="0.4">
+      <button type="button" aria-label="Play video {n}" class="inline-flex items-center justify-center w-12 h-12 rounded-full bg-blue-600 text-white hover:bg-blue-700 focus-visible:ring-2 focus-visible:ring-offset-2"><svg class="w-5 h-5" viewBox="0 0 20 20"><path d="M6 4l10 6-10 6z"/></svg></button>
+      <p class="mt-3 text-base leading-relaxed text-slate-600">Accessible components out of the box.</p>
+    </article>
+    <form id="signup-form-{n}" class="flex flex-col sm:flex-row gap-3">
+      <label for="email-{n}" class="sr-only">Email</label>
+      <input id="email-{n}" type="email" placeholder="you@company.com" class="flex-1 rounded-lg border border-slate-300 px-4 py-3 text-base focus:ring-2 focus:ring-blue-500" data-animate="fade">
+      <button type="submit" class="rounded-lg bg-blue-600 px-6 py-3 font-semibold text-white shadow hover:bg-blue-700 focus-visible:ring-2">Sign up</button>
+    </form>
+  </div>
+</section>
+<!-- /SECTION: feature_{n} -->
+"""
+
+HEADER = """<!-- SECTION: navbar -->
+<nav id="nav" class="sticky top-0 z-40 flex items-center justify-between px-6 py-4 bg-white/80 backdrop-blur-md border-b border-slate-200">
+  <a href="/" class="text-xl font-bold text-slate-900 focus-visible:ring-2">Brand</a>
+  <button id="nav-toggle" type="button" aria-label="Open menu" class="md:hidden p-2 rounded-lg hover:bg-slate-100 focus-visible:ring-2">Menu</button>
+</nav>
+<!-- /SECTION: navbar -->
+<main id="main">
+<h1 class="text-5xl font-extrabold tracking-tight text-slate-900">Build faster</h1>
+"""
+
+FOOTER = """</main>
+<!-- SECTION: footer -->
+<footer id="footer" class="py-12 px-6 bg-slate-900 text-slate-300"><p class="text-sm">&copy; 2026 Brand</p></footer>
+<!-- /SECTION: footer -->
+"""
+
+
+def build_page(target_kb: int) -> str:
+    """Landing page of roughly target_kb kilobytes."""
+    parts = [HEADER]
+    n = 0
+    size = len(HEADER) + len(FOOTER)
+    while size < target_kb * 1024:
+        section = SECTION.format(n=n)
+        parts.append(section)
+        size += len(section)
+        n += 1
+    parts.append(FOOTER)
+    return "".join(parts)
+
+
+def qa_unshared(html: str) -> None:
+    """QA stack where every consumer scans the HTML on its own."""
+    HTMLValidator(strict_mode=False).validate(html)
+    IDValidator(strict_mode=False).validate(html, JS)
+    DensityValidator().validate(html)
+    AntiPatternValidator().validate(html)
+    A11yValidator().validate(html)
+    ContextAnalyzer().analyze(html)
+    AgentContext().compress_current_output(html, "html")
+
+
+def qa_shared(html: str) -> None:
+    """QA stack reading one ParsedDocument cached on the context."""
+    context = AgentContext(html_output=html)
+    doc = context.get_parsed_document()
+    HTMLValidator(strict_mode=False).validate(html, document=doc)
+    IDValidator(strict_mode=False).validate(html, JS, document=doc)
+    DensityValidator().validate(html, document=doc)
+    AntiPatternValidator().validate(html, document=doc)
+    A11yValidator().validate(html, document=doc)
+    ContextAnalyzer().analyze(html, document=doc)
+    context.compress_current_output(html, "html")
+
+
+MODES: dict[str, Callable[[str], None]] = {
+    "unshared": qa_unshared,
+    "shared": qa_shared,
+}
+
+
+def _time_ms(func: Callable[[str], None], html: str, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func(html)
+        samples.append((time.perf_counter() - start) * 1000)
+    return round(statistics.median(samples), 2)
+
+
+def run(sizes: list[int], runs: int, modes: list[str]) -> dict[str, Any]:
+    report: dict[str, Any] = {"runs": runs, "pages": []}
+    for size_kb in sizes:
+        html = build_page(size_kb)
+        row: dict[str, Any] = {"size_kb": round(len(html) / 1024, 1)}
+        for mode in modes:
+            row[mode] = _time_ms(MODES[mode], html, runs)
+        if "shared" in modes:
+            from gemini_mcp.validation import parse_document
+
+            row["parse_ms"] = _time_ms(parse_document, html, runs)
+        report["pages"].append(row)
+    return report
+
+
+def _print_table(report: dict[str, Any], modes: list[str]) -> None:
+    print(f"runs={report['runs']} (median ms per page)")
+    header = f"{'size_kb':>8} " + " ".join(f"{mode:>10}" for mode in modes)
+    if "shared" in modes:
+        header += f" {'parse':>8}"
+    if len(modes) == 2:
+        header += f" {'speedup':>8}"
+    print(header)
+    for row in report["pages"]:
+        line = f"{row['size_kb']:>8} " + " ".join(f"{row[mode]:>10}" for mode in modes)
+        if "shared" in modes:
+            line += f" {row['parse_ms']:>8}"
+        if len(modes) == 2 and row["shared"]:
+            line += f" {row['unshared'] / row['shared']:>7.2f}x"
+        print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 100, 200], help="Page sizes in KB")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--mode", choices=["both", *MODES], default="both")
+    parser.add_argument("--json", action="store_true", help="Print the raw JSON report")
+    args = parser.parse_args()
+
+    modes = list(MODES) if args.mode == "both" else [args.mode]
+    report = run(args.sizes, args.runs, modes)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_table(report, modes)
+
+
+if __name__ == "__main__":
+    main()
@@ -58,6 +58,8 @@ __all__ = [
     # Cache
     "DesignCache",
     "CacheEntry",
+    "DiskCacheTier",
+    "NearDuplicateIndex",
     "get_design_cache",
     "clear_design_cache",
     # Error Recovery
@@ -77,6 +79,18 @@ __all__ = [
     "is_auth_error",
     "with_retry_sync",
     "retry_sync",
+    # Error Recovery - Retry Budget
+    "RetryBudget",
+    "RetryBudgetExhausted",
+    "retry_budget",
+    "current_retry_budget",
+    "get_retry_stats",
+    # Rate Limiting
+    "Priority",
+    "AdaptiveLimiter",
+    "RateController",
+    "priority_scope",
+    "get_rate_controller",
     # Few Shot Examples
     "COMPONENT_EXAMPLES",
     "SECTION_CHAIN_EXAMPLES",
@@ -84,6 +98,8 @@ __all__ = [
     # Section Utils
     "SECTION_PATTERN",
     "VALID_SECTION_TYPES",
+    "SectionedPage",
+    "PageSection",
     "extract_section",
     "replace_section",
     "list_sections",
@@ -96,6 +112,9 @@ __all__ = [
     "wrap_content_with_markers",
     "has_section_markers",
     "migrate_to_markers",
+    "ProjectTokenIndex",
+    "get_project_token_index",
+    "reset_project_token_indexes",
     # Theme Factories - Color Utility Functions
     "hex_to_rgb",
     "rgb_to_hex",
@@ -202,6 +221,8 @@ from .schemas import (
 from .cache import (
     DesignCache,
     CacheEntry,
+    DiskCacheTier,
+    NearDuplicateIndex,
     get_design_cache,
     clear_design_cache,
 )
@@ -223,6 +244,20 @@ from .error_recovery import (
     is_auth_error,
     with_retry_sync,
     retry_sync,
+    # Retry Budget
+    RetryBudget,
+    RetryBudgetExhausted,
+    retry_budget,
+    current_retry_budget,
+    get_retry_stats,
+)
+
+from .rate_limiter import (
+    Priority,
+    AdaptiveLimiter,
+    RateController,
+    priority_scope,
+    get_rate_controller,
 )
 
 from .few_shot_examples import (
@@ -235,6 +270,9 @@ from .section_utils import (
     # Section Marker Pattern
     SECTION_PATTERN,
     VALID_SECTION_TYPES,
+    # Single-scan section index
+    SectionedPage,
+    PageSection,
     # Core Functions
     extract_section,
     replace_section,
@@ -250,6 +288,10 @@ from .section_utils import (
     wrap_content_with_markers,
     has_section_markers,
     migrate_to_markers,
+    # Per-project token index
+    ProjectTokenIndex,
+    get_project_token_index,
+    reset_project_token_indexes,
 )
 
 from .theme_factories import (
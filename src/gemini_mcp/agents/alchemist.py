@@ -27,6 +27,7 @@ import re
 from typing import TYPE_CHECKING, Any, Optional
 
 from gemini_mcp.agents.base import AgentConfig, AgentResult, AgentRole, BaseAgent
+from gemini_mcp.agents.prompt_budget import PromptBudget, Priority, dump_json
 from gemini_mcp.prompts.prompt_loader import get_prompt
 from gemini_mcp.validation import CSSValidator
 
@@ -99,15 +100,17 @@ class AlchemistAgent(BaseAgent):
 
         try:
             # Build the prompt
-            prompt = self._build_alchemist_prompt(context)
+            budget = PromptBudget(context.token_budget)
+            prompt = self._build_alchemist_prompt(context, budget)
 
             # Call Gemini API with Gemini 3 optimizations
             response = await self.client.generate_text(
                 prompt=prompt,
                 system_instruction=self.get_system_prompt(),
                 temperature=self.config.temperature,
-                max_output_tokens=self.config.max_output_tokens,
-                thinking_level=self.config.thinking_level,
+                # Model, thinking level and output cap from the routing policy
+                **self.generation_kwargs(context),
+                **self.context_cache_kwargs(self._build_few_shot_section(context)),
             )
 
             # Extract text and thought signature from response
@@ -144,11 +147,13 @@ class AlchemistAgent(BaseAgent):
                 result.success = False
                 result.errors = issues
 
+            result.metadata["prompt_budget"] = budget.report()
+
             logger.info(
                 f"[Alchemist] Generated CSS with {len(result.extracted_css_vars)} variables"
             )
 
-            return result
+            return self.attach_response_metadata(result, response)
 
         except Exception as e:
             logger.error(f"[Alchemist] Execution failed: {e}")
@@ -160,17 +165,38 @@ class AlchemistAgent(BaseAgent):
                 errors=[str(e)],
             )
 
-    def _build_alchemist_prompt(self, context: "AgentContext") -> str:
-        """Build the prompt for CSS generation."""
-        parts = []
+    def _build_few_shot_section(
+        self, context: "AgentContext", max_examples: Optional[int] = None
+    ) -> str:
+        """Build the reference CSS examples block (empty if no example has CSS)."""
+        examples = context.few_shot_examples[:max_examples]
+        if not examples:
+            return ""
+        examples_section = "## REFERENCE CSS EXAMPLES (Follow This Quality Level)\n"
+        for i, example in enumerate(examples, 1):
+            example_type = example.get("component_type", "example")
+            example_css = example.get("css", "")
+            if example_css:
+                examples_section += f"\n### Example {i}: {example_type.upper()} CSS\n"
+                examples_section += f"```css\n{example_css[:1500]}\n```\n"
+        if "Example 1:" not in examples_section:  # Only add if we have actual CSS
+            return ""
+        return examples_section
+
+    def _build_alchemist_prompt(
+        self, context: "AgentContext", budget: Optional[PromptBudget] = None
+    ) -> str:
+        """Build the prompt for CSS generation, fitted into context.token_budget."""
+        if budget is None:
+            budget = PromptBudget(context.token_budget)
 
         # Theme context
         if context.theme:
-            parts.append(f"## Theme\n{context.theme}")
+            budget.add("theme", f"## Theme\n{context.theme}")
 
         # Content language (for comment style)
         if context.content_language:
-            parts.append(f"## Content Language\n{context.content_language}")
+            budget.add("content_language", f"## Content Language\n{context.content_language}")
 
         # === UX Enhancement: Vibe Animation Parameters ===
         # Ensures all CSS animations use consistent timing/easing across the design
@@ -187,7 +213,7 @@ class AlchemistAgent(BaseAgent):
             vibe_section += "2. Hover effects: Use the specified duration\n"
             vibe_section += "3. @keyframes: Duration should be 2-3x the base for complex animations\n"
             vibe_section += f"4. Define CSS variable: `--vibe-transition: all {context.vibe_timing} {context.vibe_easing};`"
-            parts.append(vibe_section)
+            budget.add("vibe_timing", vibe_section)
 
         # Pass vibe CSS variables for consistent theming
         if context.vibe_css_variables:
@@ -195,29 +221,30 @@ class AlchemistAgent(BaseAgent):
             for key, value in context.vibe_css_variables.items():
                 css_vars_section += f"  {key}: {value};\n"
             css_vars_section += "}\n```"
-            parts.append(css_vars_section)
+            budget.add("vibe_css_variables", css_vars_section)
 
         # Design DNA - critical for color/animation consistency
         if context.design_dna:
-            import json
-
-            dna_json = json.dumps(
-                context.design_dna.to_dict(), indent=2, ensure_ascii=False
+            dna = context.design_dna.to_dict()
+            budget.add(
+                "design_dna",
+                f"## Design DNA (Use These Tokens)\n{dump_json(dna)}",
+                Priority.DNA,
+                f"## Design DNA (Use These Tokens)\n{dump_json(dna, minify=True)}",
             )
-            parts.append(f"## Design DNA (Use These Tokens)\n{dna_json}")
 
         # === Phase 1: Few-Shot Examples ===
         # CSS examples to guide animation and effect quality
-        if context.few_shot_examples:
-            examples_section = "## REFERENCE CSS EXAMPLES (Follow This Quality Level)\n"
-            for i, example in enumerate(context.few_shot_examples, 1):
-                example_type = example.get("component_type", "example")
-                example_css = example.get("css", "")
-                if example_css:
-                    examples_section += f"\n### Example {i}: {example_type.upper()} CSS\n"
-                    examples_section += f"```css\n{example_css[:1500]}\n```\n"
-            if "Example 1:" in examples_section:  # Only add if we have actual CSS
-                parts.append(examples_section)
+        # (sent as cached content instead when context caching is on)
+        if not self.uses_context_cache:
+            count = len(context.few_shot_examples)
+            budget.add(
+                "few_shot",
+                self._build_few_shot_section(context),
+                Priority.FEW_SHOT,
+                *[self._build_few_shot_section(context, n) for n in range(count - 1, 0, -1)],
+                "",
+            )
 
         # === UX Enhancement: Micro-Interaction Presets ===
         # Provides Tailwind-based preset classes for CSS conversion
@@ -238,21 +265,33 @@ class AlchemistAgent(BaseAgent):
                     presets_section += f"Tailwind: `{classes}`\n\n"
             presets_section += "**RULE**: Convert these to CSS with consistent timing using vibe variables.\n"
             presets_section += "Example: `hover:-translate-y-1` → `transform: translateY(-4px);`"
-            parts.append(presets_section)
+            budget.add("micro_interaction_presets", presets_section)
 
         # HTML context - the Alchemist needs to know what to style
         if context.html_output:
             # Compress HTML to just IDs and classes
             compressed = self._compress_html_for_css(context.html_output)
-            parts.append(f"## HTML Context (Target These Selectors)\n{compressed}")
+            budget.add(
+                "html_context",
+                f"## HTML Context (Target These Selectors)\n{compressed}",
+                Priority.STRUCTURE,
+            )
         elif context.previous_output:
             compressed = self._compress_html_for_css(context.previous_output)
-            parts.append(f"## HTML Context (Target These Selectors)\n{compressed}")
+            budget.add(
+                "html_context",
+                f"## HTML Context (Target These Selectors)\n{compressed}",
+                Priority.STRUCTURE,
+            )
 
         # Compressed metadata if available
         if context.compressed:
             if context.compressed.element_ids:
-                parts.append(f"## Available IDs\n{', '.join(context.compressed.element_ids)}")
+                budget.add(
+                    "available_ids",
+                    f"## Available IDs\n{', '.join(context.compressed.element_ids)}",
+                    Priority.STRUCTURE,
+                )
             if context.compressed.tailwind_classes:
                 # Filter to key classes for theming
                 theme_classes = [
@@ -260,11 +299,16 @@ class AlchemistAgent(BaseAgent):
                     if any(p in c for p in ["bg-", "text-", "border-", "shadow-"])
                 ]
                 if theme_classes:
-                    parts.append(f"## Key Tailwind Classes\n{', '.join(theme_classes[:30])}")
+                    budget.add(
+                        "key_classes",
+                        f"## Key Tailwind Classes\n{', '.join(theme_classes[:30])}",
+                        Priority.STRUCTURE,
+                    )
 
         # Correction feedback (syntax validation errors)
         if context.correction_feedback:
-            parts.append(
+            budget.add(
+                "correction",
                 f"## CORRECTION REQUIRED\n"
                 f"Previous output had issues:\n{context.correction_feedback}\n"
                 f"Fix these issues in this attempt."
@@ -274,14 +318,15 @@ class AlchemistAgent(BaseAgent):
         if context.critic_feedback:
             iteration_info = f" (Iteration {context.refiner_iteration})" if context.refiner_iteration else ""
             feedback_list = "\n".join(f"- {item}" for item in context.critic_feedback)
-            parts.append(
+            budget.add(
+                "critic_feedback",
                 f"## DESIGN IMPROVEMENT REQUIRED{iteration_info}\n"
                 f"The Critic agent scored the previous CSS below quality threshold.\n"
                 f"Address these design improvements:\n{feedback_list}\n\n"
                 f"Focus on the highest-impact improvements first."
             )
 
-        return "\n\n".join(parts)
+        return budget.render()
 
     def _compress_html_for_css(self, html: str) -> str:
         """
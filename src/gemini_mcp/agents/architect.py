@@ -26,8 +26,9 @@ import re
 from typing import TYPE_CHECKING, Any, Optional
 
 from gemini_mcp.agents.base import AgentConfig, AgentResult, AgentRole, BaseAgent
+from gemini_mcp.agents.prompt_budget import PromptBudget, Priority, dump_json, html_skeleton
 from gemini_mcp.prompts.prompt_loader import get_prompt
-from gemini_mcp.validation import HTMLValidator
+from gemini_mcp.validation import SKELETON_LEGEND, HTMLValidator, ParsedDocument, skeletonize_html
 
 if TYPE_CHECKING:
     from gemini_mcp.client import GeminiClient
@@ -98,15 +99,20 @@ class ArchitectAgent(BaseAgent):
 
         try:
             # Build the prompt
-            prompt = self._build_architect_prompt(context)
+            budget = PromptBudget(context.token_budget)
+            prompt = self._build_architect_prompt(context, budget)
 
             # Call Gemini API with Gemini 3 optimizations
             response = await self.client.generate_text(
                 prompt=prompt,
                 system_instruction=self.get_system_prompt(),
                 temperature=self.config.temperature,
-                max_output_tokens=self.config.max_output_tokens,
-                thinking_level=self.config.thinking_level,
+                # Model, thinking level and output cap from the routing policy
+                **self.generation_kwargs(context),
+                # Full-page generation streams sections as they close;
+                # parallel section architects are reported by the orchestrator
+                on_section=None if context.current_section_type else context.section_callback,
+                **self.context_cache_kwargs(self._build_few_shot_section(context)),
             )
 
             # Extract text and thought signature from response
@@ -138,12 +144,14 @@ class ArchitectAgent(BaseAgent):
                 result.success = False
                 result.errors = issues
 
+            result.metadata["prompt_budget"] = budget.report()
+
             logger.info(
                 f"[Architect] Generated HTML with {len(result.extracted_ids)} IDs, "
                 f"{len(result.extracted_classes)} unique classes"
             )
 
-            return result
+            return self.attach_response_metadata(result, response)
 
         except Exception as e:
             logger.error(f"[Architect] Execution failed: {e}")
@@ -155,51 +163,83 @@ class ArchitectAgent(BaseAgent):
                 errors=[str(e)],
             )
 
-    def _build_architect_prompt(self, context: "AgentContext") -> str:
-        """Build the prompt for HTML generation."""
-        parts = []
+    def _build_few_shot_section(
+        self, context: "AgentContext", max_examples: Optional[int] = None
+    ) -> str:
+        """Build the reference HTML examples block (optionally only the first few)."""
+        examples = context.few_shot_examples[:max_examples]
+        if not examples:
+            return ""
+        examples_section = "## REFERENCE EXAMPLES (Follow This Quality Level)\n"
+        for i, example in enumerate(examples, 1):
+            example_type = example.get("component_type", "example")
+            example_html = example.get("html", "")
+            if example_html:
+                examples_section += f"\n### Example {i}: {example_type.upper()}\n"
+                examples_section += f"```html\n{example_html[:2000]}\n```\n"
+        return examples_section
+
+    def _build_architect_prompt(
+        self, context: "AgentContext", budget: Optional[PromptBudget] = None
+    ) -> str:
+        """Build the prompt for HTML generation, fitted into context.token_budget."""
+        if budget is None:
+            budget = PromptBudget(context.token_budget)
 
         # Component type
         if context.component_type:
-            parts.append(f"## Component Type\n{context.component_type}")
+            budget.add("component_type", f"## Component Type\n{context.component_type}")
 
         # Theme
         if context.theme:
-            parts.append(f"## Theme\n{context.theme}")
+            budget.add("theme", f"## Theme\n{context.theme}")
 
         # Content language
         if context.content_language:
-            parts.append(f"## Content Language\n{context.content_language}")
+            budget.add("content_language", f"## Content Language\n{context.content_language}")
 
         # User content structure
         if context.content_structure:
-            parts.append(f"## User Content\n{context.content_structure}")
+            budget.add(
+                "user_content",
+                f"## User Content\n{context.content_structure}",
+                Priority.USER_CONTENT,
+            )
 
         # Design DNA
         if context.design_dna:
-            import json
-
-            dna_json = json.dumps(
-                context.design_dna.to_dict(), indent=2, ensure_ascii=False
+            dna = context.design_dna.to_dict()
+            budget.add(
+                "design_dna",
+                f"## Design DNA (Follow These Tokens)\n{dump_json(dna)}",
+                Priority.DNA,
+                f"## Design DNA (Follow These Tokens)\n{dump_json(dna, minify=True)}",
             )
-            parts.append(f"## Design DNA (Follow These Tokens)\n{dna_json}")
 
         # === Phase 1: Few-Shot Examples ===
         # High-quality examples to guide output structure and density
-        if context.few_shot_examples:
-            examples_section = "## REFERENCE EXAMPLES (Follow This Quality Level)\n"
-            for i, example in enumerate(context.few_shot_examples, 1):
-                example_type = example.get("component_type", "example")
-                example_html = example.get("html", "")
-                if example_html:
-                    examples_section += f"\n### Example {i}: {example_type.upper()}\n"
-                    examples_section += f"```html\n{example_html[:2000]}\n```\n"
-            parts.append(examples_section)
+        # (sent as cached content instead when context caching is on);
+        # over budget, examples are dropped one at a time from the end
+        if context.few_shot_examples and not self.uses_context_cache:
+            count = len(context.few_shot_examples)
+            budget.add(
+                "few_shot",
+                self._build_few_shot_section(context),
+                Priority.FEW_SHOT,
+                *[self._build_few_shot_section(context, n) for n in range(count - 1, 0, -1)],
+                "",
+            )
+
+        # === Phase 5: Negative Examples (Anti-Laziness) ===
+        negative_examples = context.metadata.get("negative_examples", "")
+        if negative_examples:
+            budget.add("negative_examples", negative_examples, Priority.NEGATIVE_EXAMPLES, "")
 
         # === Phase 4: Micro-Interactions ===
         if context.micro_interactions_enabled and context.interaction_presets:
             presets_str = ", ".join(context.interaction_presets[:10])
-            parts.append(
+            budget.add(
+                "micro_interactions",
                 f"## MICRO-INTERACTIONS REQUIRED\n"
                 f"Add data-interaction attributes for physics effects.\n"
                 f"Available presets: {presets_str}\n"
@@ -218,7 +258,8 @@ class ArchitectAgent(BaseAgent):
             if context.sections and 0 <= section_index < len(context.sections):
                 section_details = context.sections[section_index]
 
-            parts.append(
+            budget.add(
+                "section_task",
                 f"## IMPORTANT: Generate ONLY ONE Section\n"
                 f"You are generating section {section_index + 1}: **{section_type.upper()}**\n"
                 f"Generate ONLY the {section_type} section HTML.\n"
@@ -228,46 +269,72 @@ class ArchitectAgent(BaseAgent):
             )
 
             if section_details:
-                import json
-                details_json = json.dumps(section_details, indent=2, ensure_ascii=False)
-                parts.append(f"Section details:\n{details_json}")
+                budget.add(
+                    "section_details",
+                    f"Section details:\n{dump_json(section_details)}",
+                    Priority.STRUCTURE,
+                    f"Section details:\n{dump_json(section_details, minify=True)}",
+                )
 
         elif context.sections:
             # Full page generation - all sections (legacy fallback)
-            import json
-            sections_json = json.dumps(context.sections, indent=2, ensure_ascii=False)
-            parts.append(f"## Sections to Generate\n{sections_json}")
+            budget.add(
+                "sections",
+                f"## Sections to Generate\n{dump_json(context.sections)}",
+                Priority.STRUCTURE,
+                f"## Sections to Generate\n{dump_json(context.sections, minify=True)}",
+            )
 
         # Target section (for replace_section_in_page)
         if context.target_section:
-            parts.append(
-                f"## Target Section\nReplace ONLY the {context.target_section} section"
+            budget.add(
+                "target_section",
+                f"## Target Section\nReplace ONLY the {context.target_section} section",
             )
 
         # Previous HTML context (for refinement)
         if context.previous_html:
             # Compress to reduce tokens
-            compressed = self._compress_html_context(context.previous_html)
-            parts.append(f"## Previous HTML (Reference)\n{compressed}")
+            previous_html = context.previous_html
+            compressed = self._compress_html_context(
+                previous_html, doc=context.get_parsed_document(previous_html)
+            )
+            fallbacks = [
+                lambda: f"## Previous HTML (Reference)\n{html_skeleton(context, previous_html, outline=True)}"
+            ]
+            if compressed == previous_html:
+                fallbacks.insert(
+                    0, lambda: f"## Previous HTML (Reference)\n{html_skeleton(context, previous_html)}"
+                )
+            budget.add(
+                "previous_html",
+                f"## Previous HTML (Reference)\n{compressed}",
+                Priority.STRUCTURE,
+                *fallbacks,
+            )
 
         # === PHASE 7: Interaction Hints ===
         # Suggest data-* attributes based on component type
         interaction_suggestions = self._get_interaction_suggestions(context.component_type)
         if interaction_suggestions:
-            parts.append(
+            budget.add(
+                "interaction_suggestions",
                 f"## Suggested Interactions (Add data-* Attributes)\n"
-                f"{interaction_suggestions}"
+                f"{interaction_suggestions}",
+                Priority.FEW_SHOT,
+                "",
             )
 
         # Correction feedback (for retry)
         if context.correction_feedback:
-            parts.append(
+            budget.add(
+                "correction",
                 f"## CORRECTION REQUIRED\n"
                 f"Previous output had issues:\n{context.correction_feedback}\n"
                 f"Fix these issues in this attempt."
             )
 
-        return "\n\n".join(parts)
+        return budget.render()
 
     def _get_interaction_suggestions(self, component_type: str | None) -> str:
         """
@@ -353,36 +420,20 @@ class ArchitectAgent(BaseAgent):
 
         return cleaned
 
-    def _compress_html_context(self, html: str, max_chars: int = 2000) -> str:
+    def _compress_html_context(
+        self, html: str, max_chars: int = 2000, doc: Optional[ParsedDocument] = None
+    ) -> str:
         """
         Compress HTML for context passing to reduce tokens.
 
-        Extracts structure and key classes without full content.
+        Short HTML is passed as-is; longer HTML becomes its skeleton (tag
+        tree, ids, class lists, data-* attributes and section markers, with
+        text and repeated siblings elided), so nothing structural is cut off.
         """
         if len(html) <= max_chars:
             return html
-
-        # Extract structure summary
-        structure_parts = []
-
-        # Extract section markers
-        section_pattern = r"<!-- SECTION: (\w+) -->"
-        sections = re.findall(section_pattern, html)
-        if sections:
-            structure_parts.append(f"Sections: {', '.join(sections)}")
-
-        # Extract IDs
-        ids = self.extract_ids(html)
-        if ids:
-            structure_parts.append(f"IDs: {', '.join(ids[:20])}")
-
-        # Extract key Tailwind patterns
-        classes = self.extract_tailwind_classes(html)
-        key_patterns = [c for c in classes if any(p in c for p in ["bg-", "text-", "font-", "rounded-"])]
-        if key_patterns:
-            structure_parts.append(f"Key classes: {', '.join(key_patterns[:30])}")
-
-        return "\n".join(structure_parts) if structure_parts else html[:max_chars]
+        skeleton = skeletonize_html(html, doc)
+        return f"{SKELETON_LEGEND}\n{skeleton.text}"
 
     def validate_output(self, output: str) -> tuple[bool, list[str]]:
         """
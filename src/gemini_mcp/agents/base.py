@@ -16,6 +16,7 @@ Architecture:
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import re
 import time
@@ -25,6 +26,9 @@ from dataclasses import dataclass, field
 from enum import Enum
 from typing import TYPE_CHECKING, Any, Callable, Optional
 
+from gemini_mcp.agents.prompt_budget import PromptBudget, Priority, dump_json, html_skeleton
+from gemini_mcp.error_recovery import current_retry_budget
+
 if TYPE_CHECKING:
     from gemini_mcp.orchestration.context import AgentContext
 
@@ -93,6 +97,8 @@ class AgentResult:
     execution_time_ms: float
 
     # Metadata
+    # Real counts from usage_metadata: input_tokens, output_tokens,
+    # thinking_tokens, cached_tokens (subset of input) and total_tokens
     token_usage: dict[str, int] = field(default_factory=dict)
     warnings: list[str] = field(default_factory=list)
     errors: list[str] = field(default_factory=list)
@@ -109,6 +115,16 @@ class AgentResult:
     extracted_css_vars: list[str] = field(default_factory=list)
     extracted_classes: list[str] = field(default_factory=list)
 
+    @property
+    def total_tokens(self) -> int:
+        """Total billed tokens (cached tokens are already part of the input)."""
+        if "total_tokens" in self.token_usage:
+            return self.token_usage["total_tokens"]
+        return sum(
+            self.token_usage.get(key, 0)
+            for key in ("input_tokens", "output_tokens", "thinking_tokens")
+        )
+
     @property
     def has_warnings(self) -> bool:
         return len(self.warnings) > 0
@@ -126,6 +142,13 @@ class AgentResult:
         logger.error(f"[{self.agent_role.value}] {error}")
 
 
+def merge_token_usage(total: dict[str, int], usage: dict[str, int]) -> dict[str, int]:
+    """Add the counts in ``usage`` into ``total`` (in place) and return it."""
+    for key, value in usage.items():
+        total[key] = total.get(key, 0) + value
+    return total
+
+
 class BaseAgent(ABC):
     """
     Abstract base class for all Trifecta agents.
@@ -169,6 +192,53 @@ class BaseAgent(ABC):
         """Current execution ID for tracking."""
         return self._execution_id
 
+    @property
+    def uses_context_cache(self) -> bool:
+        """Whether this agent's client serves system prompts from the context cache."""
+        client = getattr(self, "client", None)
+        return getattr(client, "context_cache_enabled", False) is True
+
+    def context_cache_kwargs(self, cacheable_prefix: str = "") -> dict[str, Any]:
+        """
+        Extra generate_text() arguments for context-cache mode.
+
+        Args:
+            cacheable_prefix: Static prompt block (few-shot examples) to cache
+                together with the system prompt.
+
+        Returns:
+            Empty dict when the mode is off, so call sites stay unchanged.
+        """
+        if not self.uses_context_cache:
+            return {}
+        return {"cache_agent": self.role.value, "cacheable_prefix": cacheable_prefix}
+
+    def generation_kwargs(self, context: Optional["AgentContext"] = None) -> dict[str, Any]:
+        """
+        model / thinking_level / max_output_tokens for generate_text().
+
+        Uses the route the orchestrator picked for this agent
+        (context.model_routes), else this agent's AgentConfig.
+        """
+        route = context.model_routes.get(self.role.value) if context is not None else None
+        if route is not None:
+            return route.generation_kwargs()
+        return {
+            "model": self.config.model,
+            "thinking_level": self.config.thinking_level,
+            "max_output_tokens": self.config.max_output_tokens,
+        }
+
+    def attach_response_metadata(
+        self, result: AgentResult, response: dict[str, Any]
+    ) -> AgentResult:
+        """Copy client response metadata (token usage, context cache info) onto the result."""
+        if response.get("token_usage"):
+            merge_token_usage(result.token_usage, response["token_usage"])
+        if response.get("context_cache"):
+            result.metadata["context_cache"] = response["context_cache"]
+        return result
+
     @abstractmethod
     def get_system_prompt(self, variables: dict[str, Any] | None = None) -> str:
         """
@@ -216,55 +286,74 @@ class BaseAgent(ABC):
         """
         pass
 
-    def build_prompt(self, context: "AgentContext") -> str:
+    def build_prompt(
+        self, context: "AgentContext", budget: Optional[PromptBudget] = None
+    ) -> str:
         """
         Build the full prompt from system prompt + context.
 
+        Sections are fitted into context.token_budget (see PromptBudget);
+        pass ``budget`` to read its per-section report afterwards.
+
         Can be overridden by subclasses for custom prompt construction.
         """
+        if budget is None:
+            budget = PromptBudget(context.token_budget)
+
         # Extract variables from context for YAML template substitution
         variables = {
             "theme": context.theme or "modern-minimal",
             "component_type": context.component_type or "",
             "content_language": getattr(context, "content_language", "Turkish"),
         }
-        system = self.get_system_prompt(variables)
-
-        # Build context section
-        context_parts = []
+        budget.add("system", self.get_system_prompt(variables))
 
+        # Build context sections
         if context.design_dna:
-            import json
-
-            context_parts.append(
-                f"== DESIGN DNA ==\n{json.dumps(context.design_dna, indent=2, ensure_ascii=False)}"
+            dna = context.design_dna.to_dict()
+            budget.add(
+                "design_dna",
+                f"== DESIGN DNA ==\n{dump_json(dna)}",
+                Priority.DNA,
+                f"== DESIGN DNA ==\n{dump_json(dna, minify=True)}",
             )
 
         if context.component_type:
-            context_parts.append(f"== COMPONENT TYPE ==\n{context.component_type}")
+            budget.add("component_type", f"== COMPONENT TYPE ==\n{context.component_type}")
 
         if context.theme:
-            context_parts.append(f"== THEME ==\n{context.theme}")
+            budget.add("theme", f"== THEME ==\n{context.theme}")
 
         if context.content_structure:
-            context_parts.append(
-                f"== USER CONTENT ==\n{context.content_structure}"
+            budget.add(
+                "user_content",
+                f"== USER CONTENT ==\n{context.content_structure}",
+                Priority.USER_CONTENT,
             )
 
         if context.previous_output:
-            context_parts.append(
-                f"== PREVIOUS AGENT OUTPUT ==\n{context.previous_output}"
+            previous = context.previous_output
+            fallbacks = []
+            if previous.lstrip().startswith("<"):
+                fallbacks += [
+                    lambda: f"== PREVIOUS AGENT OUTPUT (structure) ==\n{html_skeleton(context, previous)}",
+                    lambda: f"== PREVIOUS AGENT OUTPUT (outline) ==\n{html_skeleton(context, previous, outline=True)}",
+                ]
+            budget.add(
+                "previous_output",
+                f"== PREVIOUS AGENT OUTPUT ==\n{previous}",
+                Priority.STRUCTURE,
+                *fallbacks,
             )
 
         if context.correction_feedback:
-            context_parts.append(
+            budget.add(
+                "correction",
                 f"== CORRECTION REQUIRED ==\n{context.correction_feedback}\n"
-                f"Attempt: {context.attempt}"
+                f"Attempt: {context.attempt}",
             )
 
-        context_section = "\n\n".join(context_parts)
-
-        return f"{system}\n\n{context_section}"
+        return budget.render()
 
     async def execute_with_retry(
         self,
@@ -297,11 +386,20 @@ class BaseAgent(ABC):
                     f"[{self.role.value}] Attempt {attempt + 1} failed: {e}"
                 )
 
-                if on_retry and attempt < self.config.max_retries:
+                if attempt >= self.config.max_retries:
+                    break
+
+                # Retries come out of the request's shared budget, if any
+                budget = current_retry_budget()
+                if budget is not None and not budget.consume(
+                    "agent", self.config.retry_delay_seconds
+                ):
+                    break
+
+                if on_retry:
                     on_retry(attempt + 1, e)
 
-                if attempt < self.config.max_retries:
-                    time.sleep(self.config.retry_delay_seconds)
+                await asyncio.sleep(self.config.retry_delay_seconds)
 
         # All retries exhausted
         return AgentResult(
@@ -309,7 +407,7 @@ class BaseAgent(ABC):
             output="",
             agent_role=self.role,
             execution_time_ms=0,
-            errors=[f"All {self.config.max_retries + 1} attempts failed: {last_error}"],
+            errors=[f"All {attempt + 1} attempts failed: {last_error}"],
         )
 
     def extract_ids(self, html: str) -> list[str]:
@@ -18,7 +18,7 @@ import re
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any, Optional
 
-from gemini_mcp.agents.base import AgentConfig, AgentResult, AgentRole, BaseAgent
+from gemini_mcp.agents.base import AgentConfig, AgentResult, AgentRole, BaseAgent, merge_token_usage
 from gemini_mcp.prompts.prompt_loader import get_prompt
 
 if TYPE_CHECKING:
@@ -313,6 +313,10 @@ class CriticAgent(BaseAgent):
         """
         super().__init__(config)
         self.client = client
+        # Local learned scorer that can skip evaluate() (GEMINI_CRITIC_SURROGATE)
+        from gemini_mcp.agents.critic_surrogate import get_critic_surrogate
+
+        self.surrogate = get_critic_surrogate()
 
     @classmethod
     def _default_config(cls) -> AgentConfig:
@@ -358,6 +362,7 @@ class CriticAgent(BaseAgent):
                 temperature=self.config.temperature,
                 max_output_tokens=self.config.max_output_tokens,
                 thinking_level=self.config.thinking_level,
+                **self.context_cache_kwargs(),
             )
 
             # Extract text and thought signature from response
@@ -393,7 +398,7 @@ class CriticAgent(BaseAgent):
                 f"JS changes: {len(critic_report.recommendations.js_changes)}"
             )
 
-            return result
+            return self.attach_response_metadata(result, response)
 
         except Exception as e:
             logger.error(f"[Critic] Execution failed: {e}")
@@ -603,6 +608,7 @@ Output JSON format as specified in your system prompt.
         css: str,
         js: str = "",
         context: Optional["AgentContext"] = None,
+        token_usage: Optional[dict[str, int]] = None,
     ) -> tuple[CriticScores, list[str]]:
         """
         Evaluate design quality and return scores with improvements.
@@ -614,6 +620,7 @@ Output JSON format as specified in your system prompt.
             css: CSS output to evaluate
             js: Optional JS output to evaluate
             context: Optional context for thought signature handling
+            token_usage: If given, the call's token counts are added to it
 
         Returns:
             Tuple of (CriticScores, list of improvement suggestions)
@@ -633,10 +640,13 @@ Output JSON format as specified in your system prompt.
                 temperature=self.config.temperature,
                 max_output_tokens=self.config.max_output_tokens,
                 thinking_level=self.config.thinking_level,
+                **self.context_cache_kwargs(),
             )
 
             # Extract text and thought signature
             response_text = response.get("text", "")
+            if token_usage is not None and response.get("token_usage"):
+                merge_token_usage(token_usage, response["token_usage"])
 
             # Add thought signature to context if provided
             if context and response.get("thought_signature"):
@@ -644,6 +654,8 @@ Output JSON format as specified in your system prompt.
 
             # Parse scores and improvements
             scores, improvements = self._parse_evaluation_response(response_text)
+            if '"scores"' in response_text:  # Not the unparsed-response defaults
+                self._record_sample(html, css, js, scores, context)
 
             logger.info(
                 f"[Critic] Evaluation complete. Overall: {scores.overall:.2f}, "
@@ -658,6 +670,51 @@ Output JSON format as specified in your system prompt.
             # Return default scores on error
             return CriticScores(), [f"Evaluation error: {str(e)}"]
 
+    async def gated_evaluate(
+        self,
+        html: str,
+        css: str,
+        js: str = "",
+        context: Optional["AgentContext"] = None,
+        threshold: Optional[float] = None,
+        token_usage: Optional[dict[str, int]] = None,
+    ) -> tuple[CriticScores, list[str]]:
+        """
+        Evaluate, skipping the API call when the local surrogate is confident.
+
+        With a threshold and a loaded surrogate, the predicted scores are
+        returned if they are confidently above or below the threshold;
+        otherwise (or without a surrogate) this is evaluate(). token_usage
+        is passed through (a skipped call adds nothing).
+        """
+        if threshold is not None and self.surrogate is not None:
+            verdict = self.surrogate.try_skip(html, css, js, threshold, context)
+            if verdict is not None:
+                return verdict
+        return await self.evaluate(
+            html=html, css=css, js=js, context=context, token_usage=token_usage
+        )
+
+    def _record_sample(
+        self,
+        html: str,
+        css: str,
+        js: str,
+        scores: CriticScores,
+        context: Optional["AgentContext"],
+    ) -> None:
+        """Log (features, scores) for surrogate training (GEMINI_CRITIC_SAMPLES)."""
+        from gemini_mcp.agents.critic_surrogate import extract_features, get_sample_log
+
+        sample_log = get_sample_log()
+        if sample_log is None:
+            return
+        try:
+            doc = context.get_parsed_document(html) if context is not None else None
+            sample_log.append(extract_features(html, css, js, doc), scores)
+        except Exception as e:
+            logger.debug(f"[Critic] Could not log surrogate sample: {e}")
+
     def _build_evaluation_prompt(self, html: str, css: str, js: str = "") -> str:
         """Build prompt for design quality evaluation."""
         parts = [
@@ -841,6 +898,7 @@ IMPORTANT: Output ONLY valid JSON. No markdown, no explanation, just the JSON ob
                 temperature=self.config.temperature,
                 max_output_tokens=self.config.max_output_tokens,
                 thinking_level=self.config.thinking_level,
+                **self.context_cache_kwargs(),
             )
 
             # Extract text and thought signature
@@ -1014,8 +1072,14 @@ IMPORTANT: Output ONLY valid JSON. No markdown, no explanation."""
         """
         Quick heuristic-based evaluation without API call.
 
-        Useful for initial filtering before full evaluation.
+        Useful for initial filtering before full evaluation. Uses the
+        trained surrogate's prediction when one is loaded.
         """
+        if self.surrogate is not None:
+            from gemini_mcp.agents.critic_surrogate import extract_features
+
+            return self.surrogate.model.predict(extract_features(html, css))
+
         scores = CriticScores()
 
         # Layout scoring heuristics
@@ -1163,6 +1227,7 @@ IMPORTANT: Output ONLY valid JSON. No markdown, no explanation."""
                 temperature=self.config.temperature,
                 max_output_tokens=self.config.max_output_tokens,
                 thinking_level=self.config.thinking_level,
+                **self.context_cache_kwargs(),
             )
 
             response_text = response.get("text", "")
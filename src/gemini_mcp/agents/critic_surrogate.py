@@ -0,0 +1,590 @@
+"""
+Critic Surrogate - Local Learned Scorer that Gates Remote Critic Calls
+
+Every refiner iteration pays a full Pro call to CriticAgent.evaluate, and
+quick_evaluate is a fixed substring heuristic. The surrogate is a ridge
+regression per CriticScores dimension over features of the parsed
+HTML/CSS/JS (class density, responsive/dark/state prefixes, ARIA and alt
+coverage, semantic tags, WCAG contrast results, Alpine.js usage...).
+
+It is fitted offline from the (features, CriticScores) pairs that real
+Critic evaluations produce (GEMINI_CRITIC_SAMPLES enables the JSONL log)
+and loaded from a JSON model file (GEMINI_CRITIC_SURROGATE). In the refiner
+loop the remote Critic is skipped when the predicted overall score is
+confidently above or below the threshold, i.e. the calibrated interval
+``prediction +/- z * residual_std`` lies entirely on one side of it.
+
+Fitting uses NumPy when installed and a small pure-Python solver otherwise;
+prediction is always pure Python.
+
+Usage:
+    python -m gemini_mcp.agents.critic_surrogate train \\
+        --samples ~/.gemini-mcp/critic_samples.jsonl --out ~/.gemini-mcp/critic_surrogate.json
+    python -m gemini_mcp.agents.critic_surrogate evaluate --model ... --samples ...
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import math
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable, Optional
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    np = None  # type: ignore
+
+from gemini_mcp.agents.critic import CriticScores
+from gemini_mcp.blob_store import atomic_write
+from gemini_mcp.validation.contrast_checker import check_wcag_compliance
+from gemini_mcp.validation.document import ParsedDocument, parse_document
+
+if TYPE_CHECKING:
+    from gemini_mcp.orchestration.context import AgentContext
+
+logger = logging.getLogger(__name__)
+
+MODEL_FORMAT = "critic-surrogate"
+MODEL_VERSION = 1
+
+# Bump when extract_features changes; samples of another version are skipped
+FEATURES_VERSION = 1
+
+DIMENSIONS = tuple(CriticScores().WEIGHTS)
+
+# Width of the confidence interval in residual standard deviations
+DEFAULT_Z = float(os.getenv("GEMINI_CRITIC_SURROGATE_Z", "2.0"))
+
+_INTERACTIVE_TAGS = ("a", "button", "input", "select", "textarea")
+_SEMANTIC_TAGS = ("header", "nav", "main", "section", "article", "aside", "footer")
+_RESPONSIVE_PREFIXES = ("sm:", "md:", "lg:", "xl:", "2xl:")
+_STATE_PREFIXES = ("hover:", "focus:", "focus-visible:", "active:", "group-hover:")
+
+
+# =============================================================================
+# FEATURES
+# =============================================================================
+
+
+def _share(part: float, whole: float) -> float:
+    return part / whole if whole else 0.0
+
+
+def extract_features(
+    html: str,
+    css: str = "",
+    js: str = "",
+    doc: Optional[ParsedDocument] = None,
+) -> dict[str, float]:
+    """
+    Numeric design features of an output, roughly in [0, 1] or log scale.
+
+    Args:
+        html: HTML output
+        css: CSS output
+        js: JS output
+        doc: Shared parse of html (see AgentContext.get_parsed_document)
+
+    Returns:
+        Feature name → value (always the same keys)
+    """
+    doc = doc or parse_document(html)
+    opening = [e for e in doc.elements if not e.closing]
+    elements = len(opening)
+    classed = [e for e in opening if e.attrs.get("class")]
+    tokens = [token for e in classed for token in e.classes]
+    token_count = len(tokens)
+
+    def prefixed(prefixes: tuple[str, ...]) -> int:
+        return sum(1 for token in tokens if token.startswith(prefixes))
+
+    interactive = doc.find_all(*_INTERACTIVE_TAGS)
+    labelled = sum(
+        1 for e in interactive
+        if any(name.startswith("aria-") for name in e.attrs) or "title" in e.attrs
+    )
+    images = doc.find_all("img")
+    with_alt = sum(1 for e in images if e.attrs.get("alt"))
+    contrast = check_wcag_compliance(html)
+
+    return {
+        "elements_log": math.log1p(elements),
+        "classed_share": _share(len(classed), elements),
+        "classes_per_element": _share(token_count, len(classed)) / 10.0,
+        "distinct_class_share": _share(len(doc.class_index), token_count),
+        "responsive_share": _share(prefixed(_RESPONSIVE_PREFIXES), token_count),
+        "dark_share": _share(prefixed(("dark:",)), token_count),
+        "state_share": _share(prefixed(_STATE_PREFIXES), token_count),
+        "focus_visible": float(any(t.startswith("focus-visible:") for t in tokens)),
+        "transition_share": _share(
+            sum(1 for t in tokens if t.startswith(("transition", "duration-", "ease-"))), token_count
+        ),
+        "motion_reduce": float(any(t.startswith("motion-reduce:") for t in tokens)),
+        "layout_share": _share(
+            sum(1 for t in tokens if t.split(":")[-1] in ("flex", "grid") or "gap-" in t), token_count
+        ),
+        "typography_share": _share(
+            sum(1 for t in tokens if t.split(":")[-1].startswith(("font-", "leading-", "tracking-"))),
+            token_count,
+        ),
+        "aria_coverage": _share(labelled, len(interactive)) if interactive else 1.0,
+        "aria_attributes_log": math.log1p(
+            sum(1 for name in doc.attribute_index if name.startswith("aria-"))
+        ),
+        "role_share": _share(len(doc.attribute_index.get("role", ())), elements),
+        "alt_coverage": _share(with_alt, len(images)) if images else 1.0,
+        "semantic_share": _share(len(doc.find_all(*_SEMANTIC_TAGS)), elements),
+        "heading_log": math.log1p(len(doc.find_all("h1", "h2", "h3", "h4", "h5", "h6"))),
+        "div_share": _share(len(doc.tag_index.get("div", ())), elements),
+        "inline_style_share": _share(len(doc.attribute_index.get("style", ())), elements),
+        "contrast_pass_rate": contrast.score / 100.0,
+        "contrast_pairs_log": math.log1p(contrast.color_pairs_checked),
+        "alpine_data": float("x-data" in doc.attribute_index),
+        "alpine_store": float("$store" in html or "Alpine.store" in html or "Alpine.store" in js),
+        "alpine_events_log": math.log1p(
+            sum(len(v) for k, v in doc.attribute_index.items() if k.startswith(("@", "x-on:")))
+        ),
+        "css_log": math.log1p(len(css)) / 10.0,
+        "css_keyframes": float("@keyframes" in css),
+        "css_variables": float("var(--" in css),
+        "js_log": math.log1p(len(js)) / 10.0,
+        "sections_log": math.log1p(len(doc.sections)),
+    }
+
+
+FEATURE_NAMES = tuple(extract_features("<div></div>"))
+
+
+# =============================================================================
+# MODEL
+# =============================================================================
+
+
+def _solve(matrix: list[list[float]], vectors: list[list[float]]) -> list[list[float]]:
+    """Solve A X = B for symmetric positive definite A (Gauss-Jordan, pure Python)."""
+    n = len(matrix)
+    rows = [list(matrix[i]) + [v[i] for v in vectors] for i in range(n)]
+    for col in range(n):
+        pivot = max(range(col, n), key=lambda r: abs(rows[r][col]))
+        rows[col], rows[pivot] = rows[pivot], rows[col]
+        head = rows[col][col]
+        rows[col] = [value / head for value in rows[col]]
+        for r in range(n):
+            if r != col and rows[r][col]:
+                factor = rows[r][col]
+                rows[r] = [a - factor * b for a, b in zip(rows[r], rows[col])]
+    return [[rows[i][n + k] for i in range(n)] for k in range(len(vectors))]
+
+
+def _ridge(
+    x: list[list[float]], ys: list[list[float]], alpha: float
+) -> tuple[list[list[float]], list[float]]:
+    """Ridge weights (one row per target) and intercepts on standardized x."""
+    n, d = len(x), len(x[0])
+    y_means = [sum(y) / n for y in ys]
+    if NUMPY_AVAILABLE:
+        xm = np.asarray(x, dtype=np.float64)
+        ym = np.asarray(ys, dtype=np.float64).T - np.asarray(y_means)
+        weights = np.linalg.solve(xm.T @ xm + alpha * np.eye(d), xm.T @ ym).T
+        return weights.tolist(), y_means
+    gram = [[sum(row[i] * row[j] for row in x) + (alpha if i == j else 0.0) for j in range(d)]
+            for i in range(d)]
+    rhs = [[sum(row[i] * (y[k] - mean) for k, row in enumerate(x)) for i in range(d)]
+           for y, mean in zip(ys, y_means)]
+    return _solve(gram, rhs), y_means
+
+
+@dataclass
+class SurrogateModel:
+    """
+    Standardized ridge regression per Critic dimension.
+
+    Attributes:
+        features: Feature names, in weight order
+        mean / scale: Standardization of each feature
+        weights / bias: Per dimension
+        residual_std: Std of overall-score residuals on held-out samples
+        calibration: Held-out metrics (see calibrate)
+    """
+
+    features: list[str]
+    mean: list[float]
+    scale: list[float]
+    weights: dict[str, list[float]]
+    bias: dict[str, float]
+    residual_std: float = 1.0
+    calibration: dict[str, Any] = field(default_factory=dict)
+    samples: int = 0
+    trained_at: float = 0.0
+
+    @classmethod
+    def fit(
+        cls,
+        samples: list[tuple[dict[str, float], dict[str, float]]],
+        alpha: float = 1.0,
+    ) -> "SurrogateModel":
+        """
+        Fit on (features, scores) pairs.
+
+        Args:
+            samples: Feature dicts and CriticScores.to_dict()-style scores
+            alpha: L2 regularization strength
+
+        Returns:
+            Fitted model (residual_std from the training residuals until
+            calibrate() is run on held-out data)
+        """
+        if len(samples) < 2:
+            raise ValueError(f"Need at least 2 samples to fit, got {len(samples)}")
+        names = list(FEATURE_NAMES)
+        raw = [[float(f.get(name, 0.0)) for name in names] for f, _ in samples]
+        n = len(raw)
+        mean = [sum(col) / n for col in zip(*raw)]
+        scale = [
+            math.sqrt(sum((v - m) ** 2 for v in col) / n) or 1.0
+            for col, m in zip(zip(*raw), mean)
+        ]
+        x = [[(v - m) / s for v, m, s in zip(row, mean, scale)] for row in raw]
+        ys = [[float(s.get(dim, 5.0)) for _, s in samples] for dim in DIMENSIONS]
+        weights, bias = _ridge(x, ys, alpha)
+
+        model = cls(
+            features=names,
+            mean=mean,
+            scale=scale,
+            weights={dim: list(w) for dim, w in zip(DIMENSIONS, weights)},
+            bias=dict(zip(DIMENSIONS, bias)),
+            samples=n,
+            trained_at=time.time(),
+        )
+        residuals = [model.predict(f).overall - _overall(s) for f, s in samples]
+        model.residual_std = max(math.sqrt(sum(r * r for r in residuals) / n), 0.05)
+        return model
+
+    def predict(self, features: dict[str, float]) -> CriticScores:
+        """Predicted scores, each clamped to the 1-10 scale."""
+        x = [
+            (features.get(name, 0.0) - m) / s
+            for name, m, s in zip(self.features, self.mean, self.scale)
+        ]
+        values = {}
+        for dim in DIMENSIONS:
+            value = self.bias[dim] + sum(w * v for w, v in zip(self.weights[dim], x))
+            values[dim] = min(10.0, max(1.0, value))
+        return CriticScores(**values)
+
+    def calibrate(
+        self,
+        holdout: list[tuple[dict[str, float], dict[str, float]]],
+        threshold: float = 7.5,
+        z: float = DEFAULT_Z,
+    ) -> dict[str, Any]:
+        """
+        Measure accuracy on held-out samples and set residual_std from them.
+
+        Reports MAE/RMSE/R² of the overall score, per-dimension MAE, the
+        share of true scores inside the +/- z interval, and for a gating
+        threshold how often the Critic would be skipped and how often a
+        skip decision lands on the wrong side of the threshold.
+        """
+        if not holdout:
+            return self.calibration
+        predicted = [self.predict(f) for f, _ in holdout]
+        truth = [_overall(s) for _, s in holdout]
+        errors = [p.overall - t for p, t in zip(predicted, truth)]
+        n = len(holdout)
+        mean_truth = sum(truth) / n
+        total = sum((t - mean_truth) ** 2 for t in truth)
+        self.residual_std = max(math.sqrt(sum(e * e for e in errors) / n), 0.05)
+
+        skipped = wrong = 0
+        for p, t in zip(predicted, truth):
+            decision = self._decide(p.overall, threshold, z)
+            if decision is not None:
+                skipped += 1
+                if decision != (t >= threshold):
+                    wrong += 1
+
+        self.calibration = {
+            "holdout_samples": n,
+            "mae": round(sum(abs(e) for e in errors) / n, 3),
+            "rmse": round(self.residual_std, 3),
+            "r2": round(1 - sum(e * e for e in errors) / total, 3) if total else 0.0,
+            "dimension_mae": {
+                dim: round(
+                    sum(abs(getattr(p, dim) - s.get(dim, 5.0)) for p, (_, s) in zip(predicted, holdout)) / n,
+                    3,
+                )
+                for dim in DIMENSIONS
+            },
+            "interval_z": z,
+            "interval_coverage": round(sum(abs(e) <= z * self.residual_std for e in errors) / n, 3),
+            "gate_threshold": threshold,
+            "skip_rate": round(skipped / n, 3),
+            "skip_error_rate": round(wrong / skipped, 3) if skipped else 0.0,
+        }
+        return self.calibration
+
+    def _decide(self, overall: float, threshold: float, z: float) -> Optional[bool]:
+        """True/False if confidently above/below threshold, None if unsure."""
+        margin = z * self.residual_std
+        if overall - margin >= threshold:
+            return True
+        if overall + margin < threshold:
+            return False
+        return None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "format": MODEL_FORMAT,
+            "version": MODEL_VERSION,
+            "features_version": FEATURES_VERSION,
+            "features": self.features,
+            "mean": self.mean,
+            "scale": self.scale,
+            "weights": self.weights,
+            "bias": self.bias,
+            "residual_std": self.residual_std,
+            "calibration": self.calibration,
+            "samples": self.samples,
+            "trained_at": self.trained_at,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "SurrogateModel":
+        if data.get("format") != MODEL_FORMAT or data.get("version") != MODEL_VERSION:
+            raise ValueError(f"Not a {MODEL_FORMAT} v{MODEL_VERSION} model file")
+        if data.get("features_version") != FEATURES_VERSION:
+            raise ValueError(
+                f"Model was trained on features v{data.get('features_version')}, "
+                f"current is v{FEATURES_VERSION}; retrain it"
+            )
+        return cls(
+            features=data["features"],
+            mean=data["mean"],
+            scale=data["scale"],
+            weights=data["weights"],
+            bias=data["bias"],
+            residual_std=data.get("residual_std", 1.0),
+            calibration=data.get("calibration", {}),
+            samples=data.get("samples", 0),
+            trained_at=data.get("trained_at", 0.0),
+        )
+
+    def save(self, path: str | Path) -> None:
+        """Write the model file atomically."""
+        path = Path(path).expanduser()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write(path, json.dumps(self.to_dict(), indent=2).encode("utf-8"))
+
+    @classmethod
+    def load(cls, path: str | Path) -> "SurrogateModel":
+        return cls.from_dict(json.loads(Path(path).expanduser().read_text(encoding="utf-8")))
+
+
+def _overall(scores: dict[str, float]) -> float:
+    return CriticScores.from_dict(scores).overall
+
+
+# =============================================================================
+# SAMPLE LOG
+# =============================================================================
+
+
+class SampleLog:
+    """Append-only JSONL log of (features, scores) from real Critic evaluations."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path).expanduser()
+        self._lock = threading.Lock()
+
+    def append(self, features: dict[str, float], scores: CriticScores) -> None:
+        line = json.dumps({
+            "v": FEATURES_VERSION,
+            "ts": round(time.time(), 3),
+            "features": {k: round(v, 6) for k, v in features.items()},
+            "scores": scores.to_dict(),
+        })
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as handle:
+                handle.write(line + "\n")
+
+    def read(self) -> list[tuple[dict[str, float], dict[str, float]]]:
+        """Samples with the current feature version (malformed lines skipped)."""
+        samples = []
+        with open(self.path, encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if record.get("v") == FEATURES_VERSION:
+                    samples.append((record["features"], record["scores"]))
+        return samples
+
+
+# =============================================================================
+# GATE
+# =============================================================================
+
+
+class CriticSurrogate:
+    """
+    Decide from a SurrogateModel whether the remote Critic can be skipped.
+
+    Example:
+        >>> surrogate = CriticSurrogate(SurrogateModel.load(path))
+        >>> verdict = surrogate.try_skip(html, css, threshold=8.0)
+        >>> if verdict is None:
+        ...     scores, improvements = await critic.evaluate(html, css)
+    """
+
+    def __init__(self, model: SurrogateModel, z: float = DEFAULT_Z):
+        self.model = model
+        self.z = z
+        self._stats = {"predictions": 0, "skipped_above": 0, "skipped_below": 0, "deferred": 0}
+
+    def try_skip(
+        self,
+        html: str,
+        css: str,
+        js: str = "",
+        threshold: float = 7.5,
+        context: Optional["AgentContext"] = None,
+    ) -> Optional[tuple[CriticScores, list[str]]]:
+        """
+        Predicted scores and improvements if confident, else None.
+
+        Improvements name the lowest predicted dimensions so a refiner
+        iteration can proceed without the remote Critic's feedback.
+        """
+        doc = context.get_parsed_document(html) if context is not None else None
+        scores = self.model.predict(extract_features(html, css, js, doc))
+        self._stats["predictions"] += 1
+        decision = self.model._decide(scores.overall, threshold, self.z)
+        if decision is None:
+            self._stats["deferred"] += 1
+            return None
+
+        self._stats["skipped_above" if decision else "skipped_below"] += 1
+        improvements = [] if decision else [
+            f"Improve {dim} (predicted {value:.1f}/10)"
+            for dim, value in scores.get_lowest_dimensions(3)
+        ]
+        logger.info(
+            f"[CriticSurrogate] Skipped remote Critic: predicted {scores.overall:.2f} "
+            f"{'>=' if decision else '<'} {threshold} (+/-{self.z * self.model.residual_std:.2f})"
+        )
+        return scores, improvements
+
+    def get_stats(self) -> dict[str, Any]:
+        skipped = self._stats["skipped_above"] + self._stats["skipped_below"]
+        return {
+            **self._stats,
+            "skip_rate": round(skipped / self._stats["predictions"], 3) if self._stats["predictions"] else 0.0,
+            "residual_std": self.model.residual_std,
+        }
+
+
+_surrogate: Optional[CriticSurrogate] = None
+_surrogate_loaded = False
+_sample_log: Optional[SampleLog] = None
+
+
+def get_critic_surrogate() -> Optional[CriticSurrogate]:
+    """Process-wide surrogate from GEMINI_CRITIC_SURROGATE (None if unset or unusable)."""
+    global _surrogate, _surrogate_loaded
+    if not _surrogate_loaded:
+        _surrogate_loaded = True
+        path = os.getenv("GEMINI_CRITIC_SURROGATE", "")
+        if path:
+            try:
+                _surrogate = CriticSurrogate(SurrogateModel.load(path))
+                logger.info(f"[CriticSurrogate] Loaded model from {path}")
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"[CriticSurrogate] Disabled, could not load {path}: {e}")
+    return _surrogate
+
+
+def get_sample_log() -> Optional[SampleLog]:
+    """Process-wide sample log from GEMINI_CRITIC_SAMPLES (None if unset)."""
+    global _sample_log
+    path = os.getenv("GEMINI_CRITIC_SAMPLES", "")
+    if not path:
+        return None
+    if _sample_log is None or _sample_log.path != Path(path).expanduser():
+        _sample_log = SampleLog(path)
+    return _sample_log
+
+
+def reset_critic_surrogate() -> None:
+    """Forget the loaded surrogate and sample log (reloaded from env on next use)."""
+    global _surrogate, _surrogate_loaded, _sample_log
+    _surrogate, _surrogate_loaded, _sample_log = None, False, None
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+
+def train(
+    samples: list[tuple[dict[str, float], dict[str, float]]],
+    holdout: float = 0.2,
+    alpha: float = 1.0,
+    threshold: float = 7.5,
+    z: float = DEFAULT_Z,
+    seed: int = 0,
+) -> SurrogateModel:
+    """Fit on a shuffled split and calibrate on the held-out part."""
+    samples = list(samples)
+    random.Random(seed).shuffle(samples)
+    cut = len(samples) - max(1, int(len(samples) * holdout)) if holdout > 0 else len(samples)
+    model = SurrogateModel.fit(samples[:cut], alpha=alpha)
+    model.calibrate(samples[cut:], threshold=threshold, z=z)
+    return model
+
+
+def main(argv: Optional[Iterable[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Train or evaluate the local Critic surrogate")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    train_cmd = commands.add_parser("train", help="Fit a model from a sample log")
+    train_cmd.add_argument("--samples", required=True, help="JSONL log (GEMINI_CRITIC_SAMPLES)")
+    train_cmd.add_argument("--out", required=True, help="Model file to write")
+    train_cmd.add_argument("--holdout", type=float, default=0.2, help="Share kept for calibration")
+    train_cmd.add_argument("--alpha", type=float, default=1.0, help="Ridge regularization")
+    train_cmd.add_argument("--threshold", type=float, default=7.5, help="Gate threshold to report")
+    train_cmd.add_argument("--z", type=float, default=DEFAULT_Z, help="Interval width in stds")
+
+    eval_cmd = commands.add_parser("evaluate", help="Calibration metrics of a model on a sample log")
+    eval_cmd.add_argument("--model", required=True)
+    eval_cmd.add_argument("--samples", required=True)
+    eval_cmd.add_argument("--threshold", type=float, default=7.5)
+    eval_cmd.add_argument("--z", type=float, default=DEFAULT_Z)
+
+    args = parser.parse_args(list(argv) if argv is not None else None)
+    samples = SampleLog(args.samples).read()
+    if args.command == "train":
+        model = train(samples, args.holdout, args.alpha, args.threshold, args.z)
+        model.save(args.out)
+        print(f"Trained on {model.samples} samples → {args.out}")
+    else:
+        model = SurrogateModel.load(args.model)
+        model.calibrate(samples, threshold=args.threshold, z=args.z)
+    print(json.dumps(model.calibration, indent=2))
+
+
+if __name__ == "__main__":
+    main()
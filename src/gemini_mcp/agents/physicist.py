@@ -27,6 +27,7 @@ import re
 from typing import TYPE_CHECKING, Any, Optional
 
 from gemini_mcp.agents.base import AgentConfig, AgentResult, AgentRole, BaseAgent
+from gemini_mcp.agents.prompt_budget import PromptBudget, Priority, dump_json
 from gemini_mcp.prompts.prompt_loader import get_prompt
 from gemini_mcp.validation import JSValidator
 
@@ -99,15 +100,17 @@ class PhysicistAgent(BaseAgent):
 
         try:
             # Build the prompt
-            prompt = self._build_physicist_prompt(context)
+            budget = PromptBudget(context.token_budget)
+            prompt = self._build_physicist_prompt(context, budget)
 
             # Call Gemini API with Gemini 3 optimizations
             response = await self.client.generate_text(
                 prompt=prompt,
                 system_instruction=self.get_system_prompt(),
                 temperature=self.config.temperature,
-                max_output_tokens=self.config.max_output_tokens,
-                thinking_level=self.config.thinking_level,
+                # Model, thinking level and output cap from the routing policy
+                **self.generation_kwargs(context),
+                **self.context_cache_kwargs(self._build_few_shot_section(context)),
             )
 
             # Extract text and thought signature from response
@@ -141,9 +144,11 @@ class PhysicistAgent(BaseAgent):
                 result.success = False
                 result.errors = issues
 
+            result.metadata["prompt_budget"] = budget.report()
+
             logger.info(f"[Physicist] Generated JS ({len(js_output)} chars)")
 
-            return result
+            return self.attach_response_metadata(result, response)
 
         except Exception as e:
             logger.error(f"[Physicist] Execution failed: {e}")
@@ -155,13 +160,34 @@ class PhysicistAgent(BaseAgent):
                 errors=[str(e)],
             )
 
-    def _build_physicist_prompt(self, context: "AgentContext") -> str:
-        """Build the prompt for JS generation."""
-        parts = []
+    def _build_few_shot_section(
+        self, context: "AgentContext", max_examples: Optional[int] = None
+    ) -> str:
+        """Build the reference JS examples block (empty if no example has JS)."""
+        examples = context.few_shot_examples[:max_examples]
+        if not examples:
+            return ""
+        examples_section = "## REFERENCE JS EXAMPLES (Follow This Quality Level)\n"
+        for i, example in enumerate(examples, 1):
+            example_type = example.get("component_type", "example")
+            example_js = example.get("js", "")
+            if example_js:
+                examples_section += f"\n### Example {i}: {example_type.upper()} Interactions\n"
+                examples_section += f"```javascript\n{example_js[:1500]}\n```\n"
+        if "Example 1:" not in examples_section:  # Only add if we have actual JS
+            return ""
+        return examples_section
+
+    def _build_physicist_prompt(
+        self, context: "AgentContext", budget: Optional[PromptBudget] = None
+    ) -> str:
+        """Build the prompt for JS generation, fitted into context.token_budget."""
+        if budget is None:
+            budget = PromptBudget(context.token_budget)
 
         # Theme context (affects interaction style)
         if context.theme:
-            parts.append(f"## Theme\n{context.theme}")
+            budget.add("theme", f"## Theme\n{context.theme}")
 
         # === UX Enhancement: Vibe Animation Parameters ===
         # Ensures all JS animations use consistent timing/easing across the design
@@ -175,12 +201,15 @@ class PhysicistAgent(BaseAgent):
             vibe_section += "\n**CRITICAL**: All requestAnimationFrame lerp factors and "
             vibe_section += "setTimeout delays MUST align with these timing values.\n"
             vibe_section += "Example: For 300ms duration, use lerp factor ~0.1 (reaches 95% in ~300ms)"
-            parts.append(vibe_section)
+            budget.add("vibe_timing", vibe_section)
 
         # Pass vibe CSS variables for dynamic styling
         if context.vibe_css_variables:
             css_vars = [f"{k}: {v}" for k, v in context.vibe_css_variables.items()]
-            parts.append(f"## Vibe CSS Variables (Reference Only)\n{chr(10).join(css_vars)}")
+            budget.add(
+                "vibe_css_variables",
+                f"## Vibe CSS Variables (Reference Only)\n{chr(10).join(css_vars)}",
+            )
 
         # Available element IDs - critical for targeting
         ids_to_target = []
@@ -198,34 +227,40 @@ class PhysicistAgent(BaseAgent):
         ids_to_target = list(set(ids_to_target))
 
         if ids_to_target:
-            parts.append(f"## Available Element IDs\n{', '.join(ids_to_target)}")
+            budget.add(
+                "available_ids",
+                f"## Available Element IDs\n{', '.join(ids_to_target)}",
+                Priority.STRUCTURE,
+            )
         else:
-            parts.append("## Note\nNo specific IDs provided - create general interaction patterns")
+            budget.add("available_ids", "## Note\nNo specific IDs provided - create general interaction patterns")
 
         # Design DNA for animation style
         if context.design_dna:
-            import json
-
             # Only pass animation-related DNA
             animation_dna = {
                 "animation": context.design_dna.animation,
                 "mood": context.design_dna.mood,
             }
-            dna_json = json.dumps(animation_dna, indent=2, ensure_ascii=False)
-            parts.append(f"## Animation Style (From DNA)\n{dna_json}")
+            budget.add(
+                "design_dna",
+                f"## Animation Style (From DNA)\n{dump_json(animation_dna)}",
+                Priority.DNA,
+                f"## Animation Style (From DNA)\n{dump_json(animation_dna, minify=True)}",
+            )
 
         # === Phase 1: Few-Shot Examples ===
         # JS examples to guide interaction implementation
-        if context.few_shot_examples:
-            examples_section = "## REFERENCE JS EXAMPLES (Follow This Quality Level)\n"
-            for i, example in enumerate(context.few_shot_examples, 1):
-                example_type = example.get("component_type", "example")
-                example_js = example.get("js", "")
-                if example_js:
-                    examples_section += f"\n### Example {i}: {example_type.upper()} Interactions\n"
-                    examples_section += f"```javascript\n{example_js[:1500]}\n```\n"
-            if "Example 1:" in examples_section:  # Only add if we have actual JS
-                parts.append(examples_section)
+        # (sent as cached content instead when context caching is on)
+        if not self.uses_context_cache:
+            count = len(context.few_shot_examples)
+            budget.add(
+                "few_shot",
+                self._build_few_shot_section(context),
+                Priority.FEW_SHOT,
+                *[self._build_few_shot_section(context, n) for n in range(count - 1, 0, -1)],
+                "",
+            )
 
         # === UX Enhancement: Micro-Interaction Presets ===
         # Provides preset definitions for JS implementation
@@ -251,26 +286,31 @@ class PhysicistAgent(BaseAgent):
             presets_section += f"2. Use {context.vibe_easing} easing curve\n"
             presets_section += "3. Check `shouldAnimate()` before running animations\n"
             presets_section += "4. Use lerp factor matching the duration (300ms → 0.1)"
-            parts.append(presets_section)
+            budget.add("micro_interaction_presets", presets_section)
 
         # CSS variables available (for dynamic styling)
         if context.compressed and context.compressed.css_variables:
-            parts.append(f"## Available CSS Variables\n{', '.join(context.compressed.css_variables[:20])}")
+            budget.add(
+                "css_variables",
+                f"## Available CSS Variables\n{', '.join(context.compressed.css_variables[:20])}",
+                Priority.STRUCTURE,
+            )
 
         # === PHASE 7: Structural Map - Use interaction_map from Architect ===
         interaction_specs = self._build_interaction_specs(context)
         if interaction_specs:
-            parts.append(interaction_specs)
+            budget.add("interaction_specs", interaction_specs, Priority.STRUCTURE)
 
         # Correction feedback
         if context.correction_feedback:
-            parts.append(
+            budget.add(
+                "correction",
                 f"## CORRECTION REQUIRED\n"
                 f"Previous output had issues:\n{context.correction_feedback}\n"
                 f"Fix these issues in this attempt."
             )
 
-        return "\n\n".join(parts)
+        return budget.render()
 
     def _build_interaction_specs(self, context: "AgentContext") -> str:
         """
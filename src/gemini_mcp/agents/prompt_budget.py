@@ -0,0 +1,196 @@
+"""
+Prompt Budget - Per-Section Token Accounting for Agent Prompts
+
+Agent prompt builders add each block (user content, Design DNA, previous
+HTML, few-shot examples, negative examples...) to a PromptBudget with a
+priority and optional smaller fallbacks instead of joining strings
+directly. render() estimates tokens per section and, while the prompt is
+over AgentContext.token_budget, shrinks the lowest-priority section that
+can still shrink:
+
+    USER_CONTENT > DNA > STRUCTURE > FEW_SHOT > NEGATIVE_EXAMPLES
+
+Typical fallbacks are minified JSON for DNA, the HTML skeleton (then the
+flat outline) for full HTML, and fewer (then no) examples. REQUIRED sections (task
+instructions, correction feedback) and user content are never shrunk.
+
+report() gives the per-section breakdown, which agents attach to
+AgentResult.metadata["prompt_budget"] for pipeline telemetry.
+
+Usage:
+    budget = PromptBudget(context.token_budget)
+    budget.add("dna", dump_json(dna), Priority.DNA, dump_json(dna, minify=True))
+    budget.add("previous_html", html, Priority.STRUCTURE, lambda: html_skeleton(context, html))
+    budget.add("few_shot", examples, Priority.FEW_SHOT, "")
+    prompt = budget.render()
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import TYPE_CHECKING, Any, Callable, Union
+
+if TYPE_CHECKING:
+    from gemini_mcp.orchestration.context import AgentContext
+
+logger = logging.getLogger(__name__)
+
+# A fallback is either ready text or a callable producing it on demand,
+# so expensive ones (HTML skeletons) are only built when needed
+Fallback = Union[str, Callable[[], str]]
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token, as elsewhere in the package)."""
+    return len(text) // 4
+
+
+def dump_json(data: Any, minify: bool = False) -> str:
+    """JSON for a prompt block: indented for readability, or minified to save tokens."""
+    if minify:
+        return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+
+def html_skeleton(context: "AgentContext", html: str, outline: bool = False) -> str:
+    """
+    CompressedOutput skeleton of ``html``, the STRUCTURE fallback for full HTML.
+
+    ``outline=True`` gives the flat sections/IDs/classes listing instead,
+    the last step before dropping the structure entirely.
+    """
+    from gemini_mcp.orchestration.context import CompressedOutput
+
+    if context.compressed is not None and html == context.html_output:
+        compressed = context.compressed
+    else:
+        compressed = CompressedOutput.from_html(html, context.get_parsed_document(html))
+    return compressed.to_prompt(outline=outline)
+
+
+class Priority(IntEnum):
+    """Prompt section priority; higher values are shrunk first."""
+
+    REQUIRED = 0
+    USER_CONTENT = 1
+    DNA = 2
+    STRUCTURE = 3
+    FEW_SHOT = 4
+    NEGATIVE_EXAMPLES = 5
+
+
+@dataclass
+class PromptSection:
+    """One block of a prompt and the smaller versions it may be shrunk to."""
+
+    name: str
+    text: str
+    priority: Priority
+    fallbacks: list[Fallback] = field(default_factory=list)
+    original_tokens: int = 0
+    shrink_steps: int = 0
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.text)
+
+    @property
+    def can_shrink(self) -> bool:
+        return self.priority > Priority.USER_CONTENT and bool(self.fallbacks)
+
+    def shrink(self) -> None:
+        """Replace the text with the next fallback."""
+        fallback = self.fallbacks.pop(0)
+        self.text = fallback() if callable(fallback) else fallback
+        self.shrink_steps += 1
+
+
+class PromptBudget:
+    """
+    Collects prompt sections and fits them into a token budget.
+
+    Sections render in the order they were added; the budget only decides
+    which of them get shrunk or dropped. A budget of 0 disables shrinking
+    (sections are still measured for the report).
+    """
+
+    def __init__(self, budget_tokens: int = 0, separator: str = "\n\n"):
+        self.budget_tokens = max(0, budget_tokens)
+        self.separator = separator
+        self.sections: list[PromptSection] = []
+
+    def add(
+        self,
+        name: str,
+        text: str,
+        priority: Priority = Priority.REQUIRED,
+        *fallbacks: Fallback,
+    ) -> None:
+        """
+        Add a prompt section.
+
+        Args:
+            name: Section name used in the report
+            text: Full section text (empty text is skipped)
+            priority: Shrink priority
+            fallbacks: Progressively smaller replacements, tried in order;
+                pass "" last to allow dropping the section entirely
+        """
+        if not text:
+            return
+        self.sections.append(
+            PromptSection(
+                name=name,
+                text=text,
+                priority=priority,
+                fallbacks=list(fallbacks),
+                original_tokens=estimate_tokens(text),
+            )
+        )
+
+    @property
+    def total_tokens(self) -> int:
+        return sum(section.tokens for section in self.sections if section.text)
+
+    def render(self) -> str:
+        """Shrink sections until the prompt fits the budget, then join them."""
+        if self.budget_tokens:
+            total = self.total_tokens
+            while total > self.budget_tokens:
+                candidates = [s for s in self.sections if s.can_shrink]
+                if not candidates:
+                    logger.warning(
+                        f"[PromptBudget] Prompt is {total} tokens, over the "
+                        f"{self.budget_tokens} budget with nothing left to shrink"
+                    )
+                    break
+                # Lowest priority first; among equals, the largest section
+                section = max(candidates, key=lambda s: (s.priority, s.tokens))
+                before = section.tokens
+                section.shrink()
+                total -= before - section.tokens
+        return self.separator.join(s.text for s in self.sections if s.text)
+
+    def report(self) -> dict[str, Any]:
+        """Per-section token breakdown (call after render())."""
+        return {
+            "budget": self.budget_tokens,
+            "total_tokens": self.total_tokens,
+            "original_tokens": sum(s.original_tokens for s in self.sections),
+            "sections": {
+                s.name: {
+                    "priority": s.priority.name.lower(),
+                    "tokens": s.tokens,
+                    "original_tokens": s.original_tokens,
+                    "action": (
+                        "kept" if not s.shrink_steps
+                        else "dropped" if not s.text
+                        else "shrunk"
+                    ),
+                }
+                for s in self.sections
+            },
+        }
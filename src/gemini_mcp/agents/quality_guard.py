@@ -22,6 +22,7 @@ from gemini_mcp.agents.base import AgentConfig, AgentResult, AgentRole, BaseAgen
 from gemini_mcp.prompts.prompt_loader import get_prompt
 from gemini_mcp.validation import HTMLValidator, CSSValidator, JSValidator, IDValidator
 from gemini_mcp.validation.anti_pattern_validator import AntiPatternValidator
+from gemini_mcp.validation.document import ParsedDocument, parse_document
 
 if TYPE_CHECKING:
     from gemini_mcp.client import GeminiClient
@@ -144,19 +145,22 @@ class QualityGuardAgent(BaseAgent):
             # Create QA report
             qa_report = QAReport(validation_passed=True)
 
+            # Parse the HTML once; every HTML check reads the same document
+            doc = context.get_parsed_document(html) if html else None
+
             # Validate each layer
-            qa_report = self._validate_html(html, qa_report)
+            qa_report = self._validate_html(html, qa_report, doc)
             qa_report = self._validate_css(css, qa_report)
             qa_report = self._validate_js(js, qa_report)
 
             # Cross-layer validation
             if html and js:
-                qa_report = self._validate_cross_layer(html, js, qa_report)
+                qa_report = self._validate_cross_layer(html, js, qa_report, doc)
 
             # Enterprise anti-pattern validation (27 patterns)
             # This runs BEFORE auto-fixes to detect patterns, then applies fixes
             qa_report, html, css, js = self._validate_antipatterns(
-                html, css, js, qa_report
+                html, css, js, qa_report, doc
             )
 
             # Apply auto-fixes if enabled
@@ -223,12 +227,14 @@ class QualityGuardAgent(BaseAgent):
                 errors=[str(e)],
             )
 
-    def _validate_html(self, html: str, report: QAReport) -> QAReport:
+    def _validate_html(
+        self, html: str, report: QAReport, doc: Optional[ParsedDocument] = None
+    ) -> QAReport:
         """Validate HTML output."""
         if not html:
             return report
 
-        result = self.html_validator.validate(html)
+        result = self.html_validator.validate(html, document=doc)
 
         for issue in result.issues:
             report.issues.append({
@@ -283,9 +289,11 @@ class QualityGuardAgent(BaseAgent):
 
         return report
 
-    def _validate_cross_layer(self, html: str, js: str, report: QAReport) -> QAReport:
+    def _validate_cross_layer(
+        self, html: str, js: str, report: QAReport, doc: Optional[ParsedDocument] = None
+    ) -> QAReport:
         """Validate cross-layer consistency."""
-        result = self.id_validator.validate(html, js)
+        result = self.id_validator.validate(html, js, document=doc)
 
         for issue in result.issues:
             report.issues.append({
@@ -301,7 +309,12 @@ class QualityGuardAgent(BaseAgent):
         return report
 
     def _validate_antipatterns(
-        self, html: str, css: str, js: str, report: QAReport
+        self,
+        html: str,
+        css: str,
+        js: str,
+        report: QAReport,
+        doc: Optional[ParsedDocument] = None,
     ) -> tuple[QAReport, str, str, str]:
         """
         Validate for enterprise anti-patterns and apply auto-fixes.
@@ -339,7 +352,9 @@ class QualityGuardAgent(BaseAgent):
         if self.config.auto_fix:
             # Auto-fix HTML anti-patterns
             if html:
-                fixed_html, html_result = self.anti_pattern_validator.validate_and_fix(html)
+                fixed_html, html_result = self.anti_pattern_validator.validate_and_fix(
+                    html, document=doc
+                )
                 for fix_issue in html_result.issues:
                     if fix_issue.message.startswith("Auto-fixed:"):
                         report.auto_fixes_applied.append(
@@ -658,13 +673,14 @@ class QualityGuardAgent(BaseAgent):
 
         Returns a summary dictionary including anti-pattern detection.
         """
-        html_result = self.html_validator.validate(html) if html else None
+        doc = parse_document(html) if html else None
+        html_result = self.html_validator.validate(html, document=doc) if html else None
         css_result = self.css_validator.validate(css) if css else None
         js_result = self.js_validator.validate(js) if js else None
 
         cross_result = None
         if html and js:
-            cross_result = self.id_validator.validate(html, js)
+            cross_result = self.id_validator.validate(html, js, document=doc)
 
         # Anti-pattern validation (runs on all content)
         combined_content = f"{html or ''}\n{css or ''}\n{js or ''}"
@@ -13,6 +13,7 @@ from __future__ import annotations
 
 import json
 import logging
+import os
 import re
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any, Optional
@@ -24,6 +25,7 @@ from gemini_mcp.prompts.prompt_loader import get_prompt
 if TYPE_CHECKING:
     from gemini_mcp.client import GeminiClient
     from gemini_mcp.orchestration.context import AgentContext
+    from gemini_mcp.orchestration.dna_store import DNAEntry
 
 # Import DNAStore lazily to avoid circular imports
 def _get_dna_store():
@@ -33,6 +35,13 @@ def _get_dna_store():
 
 logger = logging.getLogger(__name__)
 
+# Minimum similarity for a stored DNA of the same project to seed planning
+DNA_SEED_MIN_SCORE = float(os.getenv("GEMINI_DNA_SEED_MIN_SCORE", "0.25"))
+
+# Reuse the stored DNA of the same project/component/theme instead of
+# deriving it again with a Pro call (planning mode only)
+DNA_REUSE_ENABLED = os.getenv("GEMINI_DNA_REUSE", "1") == "1"
+
 
 @dataclass
 class SectionPlan:
@@ -111,6 +120,26 @@ class StrategistAgent(BaseAgent):
         start_time = time.time()
 
         try:
+            # === Seed from stored DNA (planning mode, no DNA given) ===
+            reused = self._seed_from_store(context)
+            if reused is not None:
+                return AgentResult(
+                    success=True,
+                    output=json.dumps(
+                        {"design_dna": reused.dna.to_dict(), "sections": []},
+                        indent=2,
+                        ensure_ascii=False,
+                    ),
+                    agent_role=self.role,
+                    execution_time_ms=(time.time() - start_time) * 1000,
+                    metadata={
+                        "design_dna": reused.dna.to_dict(),
+                        "section_plans": [],
+                        "dna_id": reused.dna_id,
+                        "dna_reused": True,
+                    },
+                )
+
             # Build the prompt
             prompt = self._build_strategist_prompt(context)
 
@@ -121,6 +150,7 @@ class StrategistAgent(BaseAgent):
                 temperature=self.config.temperature,
                 max_output_tokens=self.config.max_output_tokens,
                 thinking_level=self.config.thinking_level,
+                **self.context_cache_kwargs(),
             )
 
             # Extract text and thought signature from response
@@ -188,7 +218,7 @@ class StrategistAgent(BaseAgent):
                 f"Sections: {len(section_plans)}"
             )
 
-            return result
+            return self.attach_response_metadata(result, response)
 
         except Exception as e:
             logger.error(f"[Strategist] Execution failed: {e}")
@@ -371,14 +401,57 @@ class StrategistAgent(BaseAgent):
         """
         if context.project_context:
             # Try to extract project name from context
-            import re
-            match = re.search(r"[Pp]roject:\s*([^\n,]+)", context.project_context)
-            if match:
-                return match.group(1).strip().lower().replace(" ", "-")
+            from gemini_mcp.orchestration.dna_store import project_id_from_context
+
+            project_id = project_id_from_context(context.project_context)
+            if project_id:
+                return project_id
 
         # Default project
         return "default"
 
+    def find_previous_dna(
+        self,
+        component_type: str,
+        theme: Optional[str] = None,
+        project_id: str = "default",
+        min_score: float = DNA_SEED_MIN_SCORE,
+    ) -> tuple[Optional["DNAEntry"], float]:
+        """
+        Find the stored DNA to build a component on.
+
+        The latest entry for the exact component/theme scores 1.0. Otherwise
+        the project's entry nearest to the component and theme (vector
+        similarity over component, theme and mood words) is used if it
+        scores at least min_score.
+
+        Args:
+            component_type: Component type to search for
+            theme: Optional theme filter
+            project_id: Project to search in
+            min_score: Minimum similarity for a non-exact match
+
+        Returns:
+            Tuple of (DNAEntry or None, score)
+        """
+        dna_store = _get_dna_store()
+        exact = dna_store.search(
+            component_type=component_type,
+            theme=theme,
+            project_id=project_id,
+            limit=1,
+        )
+        if exact:
+            return exact[0], 1.0
+
+        query = " ".join(part for part in (component_type, theme) if part)
+        nearest = dna_store.find_similar(
+            query, k=1, project_id=project_id, min_score=min_score
+        ) if query else []
+        if nearest:
+            return nearest[0]
+        return None, 0.0
+
     def try_load_previous_dna(
         self,
         component_type: str,
@@ -388,6 +461,9 @@ class StrategistAgent(BaseAgent):
         """
         Try to load previous DNA from store for a component type.
 
+        Falls back to the most similar DNA of the project when the exact
+        component/theme has none (see find_previous_dna).
+
         Args:
             component_type: Component type to search for
             theme: Optional theme filter
@@ -397,14 +473,10 @@ class StrategistAgent(BaseAgent):
             DesignDNA if found, None otherwise
         """
         try:
-            dna_store = _get_dna_store()
-            context_dna = dna_store.get_latest(
-                component_type=component_type,
-                project_id=project_id,
-                theme=theme,
-            )
+            entry, _ = self.find_previous_dna(component_type, theme, project_id)
 
-            if context_dna:
+            if entry:
+                context_dna = entry.dna
                 # Convert context DNA to local DNA
                 return DesignDNA(
                     colors=context_dna.colors,
@@ -419,6 +491,48 @@ class StrategistAgent(BaseAgent):
 
         return None
 
+    def _seed_from_store(self, context: "AgentContext") -> Optional["DNAEntry"]:
+        """
+        Seed section planning with the nearest stored DNA.
+
+        Only applies when there is no HTML to extract DNA from and no DNA in
+        the context. An exact match (same project, component and theme) in
+        an explicit project is returned for reuse without an API call
+        (GEMINI_DNA_REUSE=0 disables this); a weaker match is put into
+        context.design_dna so the prompt extends it.
+
+        Returns:
+            The DNAEntry to reuse, or None to call the model
+        """
+        if (
+            context.design_dna is not None
+            or context.previous_output
+            or context.html_output
+            or context.previous_html
+        ):
+            return None
+
+        project_id = self._extract_project_id(context)
+        component_type = context.component_type or "page"
+        try:
+            entry, score = self.find_previous_dna(component_type, context.theme or None, project_id)
+        except Exception as e:
+            logger.warning(f"[Strategist] DNA seed lookup failed: {e}")
+            return None
+        if entry is None:
+            return None
+
+        if DNA_REUSE_ENABLED and score >= 1.0 and project_id != "default":
+            logger.info(f"[Strategist] Reusing stored DNA {entry.dna_id} for {component_type}")
+            return entry
+
+        context.design_dna = entry.dna
+        logger.info(
+            f"[Strategist] Seeded planning with DNA {entry.dna_id} "
+            f"({entry.component_type}, score={score:.2f})"
+        )
+        return None
+
     def get_related_dna(
         self,
         component_type: str,
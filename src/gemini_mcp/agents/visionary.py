@@ -259,6 +259,7 @@ class VisionaryAgent(BaseAgent):
                     temperature=self.config.temperature,
                     max_output_tokens=self.config.max_output_tokens,
                     thinking_level=self.config.thinking_level,
+                    **self.context_cache_kwargs(),
                 )
 
                 # === GEMINI 3: Extract text and thought signature ===
@@ -3,10 +3,18 @@
 Supports two authentication methods:
 1. Application Default Credentials (ADC) via google.auth.default()
 2. Fallback to gcloud CLI token via subprocess
+
+Token refresh is a blocking HTTP call (or a gcloud subprocess), so async
+callers use ensure_fresh()/refresh_async(): the refresh runs in a worker
+thread, concurrent callers share one in-flight refresh, and a background
+task refreshes the token shortly before it expires.
 """
 
+import asyncio
 import logging
 import subprocess
+import threading
+from datetime import datetime, timezone
 from typing import Optional, Tuple
 
 import google.auth
@@ -18,6 +26,12 @@ logger = logging.getLogger(__name__)
 # Required scope for Vertex AI
 VERTEX_AI_SCOPE = "https://www.googleapis.com/auth/cloud-platform"
 
+# Refresh this long before the token expires
+REFRESH_MARGIN_SECONDS = 300
+
+# Upper bound for the gcloud CLI call
+GCLOUD_TIMEOUT_SECONDS = 30
+
 
 class AuthManager:
     """Manages OAuth authentication for Vertex AI."""
@@ -26,6 +40,12 @@ class AuthManager:
         """Initialize the auth manager."""
         self._credentials: Optional[Credentials] = None
         self._project_id: Optional[str] = None
+        # Serializes blocking refreshes across threads
+        self._lock = threading.Lock()
+        # Single-flight refresh and proactive refresher (per event loop)
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._background_task: Optional[asyncio.Task] = None
+        self.refresh_count = 0
 
     def get_credentials(self) -> Tuple[Credentials, Optional[str]]:
         """Get valid credentials for Vertex AI.
@@ -57,6 +77,7 @@ class AuthManager:
                 from google.oauth2.credentials import Credentials as OAuth2Credentials
 
                 credentials = OAuth2Credentials(token=token)
+                self._credentials = credentials
                 logger.info("Authenticated via gcloud CLI token")
                 return credentials, None
         except Exception as e:
@@ -94,33 +115,133 @@ class AuthManager:
                 capture_output=True,
                 text=True,
                 check=True,
+                timeout=GCLOUD_TIMEOUT_SECONDS,
             )
             token = result.stdout.strip()
             if token:
                 return token
         except subprocess.CalledProcessError as e:
             logger.error(f"gcloud command failed: {e.stderr}")
+        except subprocess.TimeoutExpired:
+            logger.error(f"gcloud command timed out after {GCLOUD_TIMEOUT_SECONDS}s")
         except FileNotFoundError:
             logger.error("gcloud CLI not found in PATH")
 
         return None
 
     def refresh_if_needed(self) -> None:
-        """Refresh credentials if they are expired or about to expire."""
-        if self._credentials is None:
+        """Refresh credentials if they are expired or about to expire.
+
+        Blocking (waits for a refresh running in a worker thread) - code on
+        the event loop must await ensure_fresh() instead.
+        """
+        with self._lock:
+            if self._credentials is None:
+                self.get_credentials()
+                return
+
+            # Check if refresh is needed
+            if hasattr(self._credentials, "expired") and self._credentials.expired:
+                self._refresh_credentials()
+
+    def _refresh_credentials(self) -> None:
+        """Refresh the current credentials, re-authenticating on failure."""
+        try:
+            request = google.auth.transport.requests.Request()
+            self._credentials.refresh(request)
+            logger.debug("Credentials refreshed successfully")
+        except Exception as e:
+            logger.warning(f"Failed to refresh credentials: {e}")
+            # Re-authenticate
             self.get_credentials()
+
+    def _refresh_blocking(self, force: bool) -> None:
+        """Worker-thread body of refresh_async()."""
+        with self._lock:
+            if self._credentials is None:
+                self.get_credentials()
+            elif force or self.needs_refresh():
+                self._refresh_credentials()
+            self.refresh_count += 1
+
+    def seconds_until_expiry(self) -> Optional[float]:
+        """Seconds until the token expires, or None if unknown."""
+        expiry = getattr(self._credentials, "expiry", None)
+        if not isinstance(expiry, datetime):
+            return None
+        if expiry.tzinfo is None:
+            # google-auth stores expiry as naive UTC
+            expiry = expiry.replace(tzinfo=timezone.utc)
+        return (expiry - datetime.now(timezone.utc)).total_seconds()
+
+    def needs_refresh(self, margin_seconds: float = 0) -> bool:
+        """Whether credentials are missing, expired or expire within the margin."""
+        if self._credentials is None:
+            return True
+        if getattr(self._credentials, "expired", False):
+            return True
+        remaining = self.seconds_until_expiry()
+        return remaining is not None and remaining <= margin_seconds
+
+    async def refresh_async(self, force: bool = False) -> None:
+        """Refresh credentials in a worker thread without blocking the loop.
+
+        Concurrent callers await the same in-flight refresh (single-flight).
+
+        Args:
+            force: Refresh even if the token is not expired (auth errors).
+        """
+        task = self._refresh_task
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(asyncio.to_thread(self._refresh_blocking, force))
+            self._refresh_task = task
+        await asyncio.shield(task)
+
+    async def ensure_fresh(self) -> None:
+        """Make sure credentials are valid, refreshing off the event loop if not.
+
+        Also starts the proactive background refresher.
+        """
+        if self.needs_refresh():
+            await self.refresh_async()
+        self.start_background_refresh()
+
+    def start_background_refresh(self) -> None:
+        """Start refreshing the token REFRESH_MARGIN_SECONDS before expiry.
+
+        Idempotent; requires a running event loop.
+        """
+        task = self._background_task
+        loop = asyncio.get_running_loop()
+        if task is not None and not task.done() and task.get_loop() is loop:
             return
+        self._background_task = loop.create_task(self._background_refresh_loop())
+
+    def stop_background_refresh(self) -> None:
+        """Cancel the proactive background refresher."""
+        if self._background_task is not None:
+            self._background_task.cancel()
+            self._background_task = None
 
-        # Check if refresh is needed
-        if hasattr(self._credentials, "expired") and self._credentials.expired:
+    async def _background_refresh_loop(self) -> None:
+        """Sleep until shortly before expiry, refresh, repeat."""
+        refreshed = False
+        while True:
+            remaining = self.seconds_until_expiry()
+            if remaining is None:
+                # Expiry unknown (e.g. gcloud token): auth errors trigger refresh
+                return
+            delay = remaining - REFRESH_MARGIN_SECONDS
+            if delay <= 0 and refreshed:
+                # Last refresh did not extend the token - back off
+                delay = REFRESH_MARGIN_SECONDS / 5
+            await asyncio.sleep(max(0.0, delay))
             try:
-                request = google.auth.transport.requests.Request()
-                self._credentials.refresh(request)
-                logger.debug("Credentials refreshed successfully")
+                await self.refresh_async(force=True)
+                logger.debug("Proactive credential refresh done")
             except Exception as e:
-                logger.warning(f"Failed to refresh credentials: {e}")
-                # Re-authenticate
-                self.get_credentials()
+                logger.warning(f"Proactive credential refresh failed: {e}")
+            refreshed = True
 
     @property
     def project_id(self) -> Optional[str]:
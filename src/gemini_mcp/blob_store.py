@@ -0,0 +1,388 @@
+"""
+Content-Addressed Blob Store for Design Drafts.
+
+Every artifact body is stored once, keyed by the SHA-256 of its content:
+
+    <root>/<aa>/<sha256>    (aa = first two hex chars)
+
+Blob file layout: one ASCII header line followed by the compressed payload.
+
+    GMB1 <codec> <size> <depth> <base|->\\n<payload>
+
+- codec: "zstd" when the optional `zstandard` package is installed,
+  otherwise "gzip" (stdlib).
+- size: plaintext bytes.
+- depth/base: 0 and "-" for a full blob. A delta blob stores line-level
+  copy/insert ops against `base` (the previous version of the same
+  component); depth is the length of the chain back to a full blob and
+  is capped so reads stay cheap.
+
+Identical content is never written twice: put() on an existing digest only
+refreshes the blob's mtime, which the draft GC uses as a grace marker so a
+sweep never deletes a blob a concurrent save just reused.
+"""
+
+import difflib
+import gzip
+import hashlib
+import io
+import json
+import logging
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Iterator, List, Optional, Tuple, Union
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+    zstandard = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+BLOB_MAGIC = "GMB1"
+MAX_DELTA_DEPTH = 8
+# Keep a delta only if it is at most this fraction of the full blob
+DELTA_MAX_RATIO = 0.5
+DELTA_DIFF_MAX_LINES = 2000
+RECENT_BLOB_CACHE_SIZE = 32
+# Drafts compress ~20x even at level 1; higher levels cost 2x the time for ~15%
+GZIP_LEVEL = 1
+ZSTD_LEVEL = 3
+
+
+def atomic_write(path: Path, data: Union[str, bytes], durable: bool = True) -> None:
+    """Write data to path via a temp file in the same directory and os.replace.
+
+    Args:
+        path: Destination file
+        data: Text (written as UTF-8) or bytes
+        durable: fsync the temp file before the rename
+    """
+    tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+    payload = data.encode("utf-8") if isinstance(data, str) else data
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def _compress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def _decompress(payload: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError("Blob is zstd-compressed but the zstandard package is not installed")
+        return zstandard.ZstdDecompressor().decompress(payload)
+    return gzip.decompress(payload)
+
+
+def encode_delta(base: bytes, data: bytes) -> bytes:
+    """Line-level delta of data against base.
+
+    Returns a JSON list whose items are either [i1, i2] (copy base lines
+    i1:i2) or a string (inserted text).
+
+    Refinements usually touch one region, so the common prefix and suffix
+    are matched directly; only the changed middle goes through difflib,
+    and a middle larger than DELTA_DIFF_MAX_LINES is inserted verbatim.
+    """
+    base_lines = base.decode("utf-8").splitlines(keepends=True)
+    new_lines = data.decode("utf-8").splitlines(keepends=True)
+
+    prefix = 0
+    limit = min(len(base_lines), len(new_lines))
+    while prefix < limit and base_lines[prefix] == new_lines[prefix]:
+        prefix += 1
+    suffix = 0
+    limit -= prefix
+    while suffix < limit and base_lines[-1 - suffix] == new_lines[-1 - suffix]:
+        suffix += 1
+    base_end, new_end = len(base_lines) - suffix, len(new_lines) - suffix
+
+    ops: List[Union[List[int], str]] = []
+    if prefix:
+        ops.append([0, prefix])
+    if max(base_end - prefix, new_end - prefix) <= DELTA_DIFF_MAX_LINES:
+        matcher = difflib.SequenceMatcher(
+            None, base_lines[prefix:base_end], new_lines[prefix:new_end], autojunk=False
+        )
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == "equal":
+                ops.append([prefix + i1, prefix + i2])
+            elif tag in ("replace", "insert"):
+                ops.append("".join(new_lines[prefix + j1:prefix + j2]))
+    elif new_end > prefix:
+        ops.append("".join(new_lines[prefix:new_end]))
+    if suffix:
+        ops.append([base_end, len(base_lines)])
+    return json.dumps(ops, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def apply_delta(base: bytes, delta: bytes) -> bytes:
+    """Rebuild content from base and an encode_delta() payload."""
+    base_lines = base.decode("utf-8").splitlines(keepends=True)
+    parts = []
+    for op in json.loads(delta):
+        if isinstance(op, str):
+            parts.append(op)
+        else:
+            parts.append("".join(base_lines[op[0]:op[1]]))
+    return "".join(parts).encode("utf-8")
+
+
+def _stream_compressor(fileobj: BinaryIO, codec: str):
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(fileobj, closefd=False)
+    return gzip.GzipFile(filename="", fileobj=fileobj, mode="wb", compresslevel=GZIP_LEVEL, mtime=0)
+
+
+class _OwnedStream:
+    """Readable stream that also closes the underlying blob file."""
+
+    def __init__(self, stream, owner: BinaryIO):
+        self._stream = stream
+        self._owner = owner
+
+    def read(self, size: int = -1) -> bytes:
+        return self._stream.read(size)
+
+    def seekable(self) -> bool:
+        return False
+
+    def close(self) -> None:
+        try:
+            self._stream.close()
+        finally:
+            self._owner.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+@dataclass
+class BlobInfo:
+    """Result of BlobStore.put()."""
+    digest: str
+    size: int  # plaintext bytes
+    stored_size: int  # bytes on disk
+    codec: str
+    depth: int = 0
+    base: Optional[str] = None
+    new: bool = True  # False when the content was already stored
+
+
+class BlobStore:
+    """Deduplicating, compressed blob storage addressed by content hash.
+
+    Thread- and process-safe: blobs are immutable and written atomically,
+    so concurrent writers of the same content produce the same file.
+    """
+
+    def __init__(self, root: Union[str, Path], codec: Optional[str] = None):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.codec = codec or ("zstd" if ZSTD_AVAILABLE else "gzip")
+        # Plaintext of recently written/read blobs (delta bases are almost
+        # always the last version written for a component)
+        self._recent: "OrderedDict[str, bytes]" = OrderedDict()
+        self._recent_lock = threading.Lock()
+
+    @staticmethod
+    def digest(data: bytes) -> str:
+        """Content address for data."""
+        return hashlib.sha256(data).hexdigest()
+
+    def path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest
+
+    def exists(self, digest: str) -> bool:
+        return self.path(digest).exists()
+
+    def _remember(self, digest: str, data: bytes) -> None:
+        with self._recent_lock:
+            self._recent[digest] = data
+            self._recent.move_to_end(digest)
+            while len(self._recent) > RECENT_BLOB_CACHE_SIZE:
+                self._recent.popitem(last=False)
+
+    def read_header(self, digest: str) -> Tuple[str, int, int, Optional[str]]:
+        """Return (codec, size, depth, base) without decompressing."""
+        with open(self.path(digest), "rb") as f:
+            return self._parse_header(f.readline())
+
+    @staticmethod
+    def _parse_header(line: bytes) -> Tuple[str, int, int, Optional[str]]:
+        magic, codec, size, depth, base = line.decode("ascii").split()
+        if magic != BLOB_MAGIC:
+            raise ValueError(f"Not a blob file (magic={magic!r})")
+        return codec, int(size), int(depth), None if base == "-" else base
+
+    def put(self, data: bytes, base: Optional[str] = None) -> BlobInfo:
+        """Store data (once) and return its BlobInfo.
+
+        Args:
+            data: Plaintext content
+            base: Digest of a previous version to delta-encode against.
+                The delta is kept only if it is much smaller than the full
+                blob and the chain stays within MAX_DELTA_DEPTH.
+        """
+        digest = self.digest(data)
+        path = self.path(digest)
+
+        if path.exists():
+            try:
+                os.utime(path)
+                codec, size, depth, stored_base = self.read_header(digest)
+                return BlobInfo(digest, size, path.stat().st_size, codec, depth, stored_base, new=False)
+            except (OSError, ValueError):
+                pass  # Removed by a concurrent GC or corrupt: rewrite below
+
+        full = _compress(data, self.codec)
+        payload, depth, used_base = full, 0, None
+        if base and base != digest:
+            try:
+                _, _, base_depth, _ = self.read_header(base)
+                if base_depth < MAX_DELTA_DEPTH:
+                    delta = _compress(encode_delta(self.get(base), data), self.codec)
+                    if len(delta) <= len(full) * DELTA_MAX_RATIO:
+                        payload, depth, used_base = delta, base_depth + 1, base
+            except (OSError, ValueError, UnicodeDecodeError) as e:
+                logger.debug(f"Delta against {base[:12]} skipped: {e}")
+
+        header = f"{BLOB_MAGIC} {self.codec} {len(data)} {depth} {used_base or '-'}\n".encode("ascii")
+        path.parent.mkdir(exist_ok=True)
+        atomic_write(path, header + payload)
+        self._remember(digest, data)
+        return BlobInfo(digest, len(data), len(header) + len(payload), self.codec, depth, used_base)
+
+    def get(self, digest: str) -> bytes:
+        """Return the plaintext for digest (resolving delta chains)."""
+        with self._recent_lock:
+            cached = self._recent.get(digest)
+            if cached is not None:
+                self._recent.move_to_end(digest)
+                return cached
+
+        with open(self.path(digest), "rb") as f:
+            codec, _, _, base = self._parse_header(f.readline())
+            payload = _decompress(f.read(), codec)
+        data = apply_delta(self.get(base), payload) if base else payload
+        self._remember(digest, data)
+        return data
+
+    def writer(self) -> "BlobWriter":
+        """Incremental writer for content too large to hold in memory."""
+        return BlobWriter(self)
+
+    def open(self, digest: str):
+        """Open a blob for streaming reads (delta blobs are rebuilt in memory)."""
+        f = open(self.path(digest), "rb")
+        try:
+            codec, _, _, base = self._parse_header(f.readline())
+        except BaseException:
+            f.close()
+            raise
+        if base:
+            f.close()
+            return io.BytesIO(self.get(digest))
+        if codec == "zstd":
+            if not ZSTD_AVAILABLE:
+                f.close()
+                raise RuntimeError("Blob is zstd-compressed but the zstandard package is not installed")
+            return _OwnedStream(zstandard.ZstdDecompressor().stream_reader(f), f)
+        return _OwnedStream(gzip.GzipFile(fileobj=f, mode="rb"), f)
+
+    def iter_blobs(self) -> Iterator[Tuple[str, os.stat_result]]:
+        """Yield (digest, stat) for every stored blob."""
+        for shard in self.root.iterdir():
+            if not shard.is_dir() or len(shard.name) != 2:
+                continue
+            for blob in shard.iterdir():
+                if blob.name.startswith("."):
+                    continue
+                try:
+                    yield blob.name, blob.stat()
+                except FileNotFoundError:
+                    continue
+
+    def delete(self, digest: str) -> None:
+        self.path(digest).unlink(missing_ok=True)
+        with self._recent_lock:
+            self._recent.pop(digest, None)
+
+    def total_size(self) -> int:
+        """Bytes on disk used by all blobs."""
+        return sum(stat.st_size for _, stat in self.iter_blobs())
+
+
+class BlobWriter:
+    """Streams a full (non-delta) blob to disk while hashing it.
+
+    The size field of the header is zero-padded so it can be patched in
+    place once the content length is known. Returned by BlobStore.writer().
+    """
+
+    SIZE_WIDTH = 12
+
+    def __init__(self, store: BlobStore):
+        self._store = store
+        self._hash = hashlib.sha256()
+        self._size = 0
+        self._tmp_path = store.root / f".{uuid.uuid4().hex}.tmp"
+        self._file = open(self._tmp_path, "wb")
+        self._file.write(self._header(0))
+        self._compressor = _stream_compressor(self._file, store.codec)
+
+    def _header(self, size: int) -> bytes:
+        return f"{BLOB_MAGIC} {self._store.codec} {size:0{self.SIZE_WIDTH}d} 0 -\n".encode("ascii")
+
+    def write(self, data: bytes) -> None:
+        self._hash.update(data)
+        self._size += len(data)
+        self._compressor.write(data)
+
+    def close(self) -> BlobInfo:
+        """Finish the blob and move it to its content address."""
+        try:
+            self._compressor.close()
+            stored_size = self._file.tell()
+            self._file.seek(0)
+            self._file.write(self._header(self._size))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        finally:
+            self._file.close()
+
+        digest = self._hash.hexdigest()
+        path = self._store.path(digest)
+        if path.exists():
+            self._tmp_path.unlink(missing_ok=True)
+            os.utime(path)
+            return BlobInfo(digest, self._size, path.stat().st_size, self._store.codec, new=False)
+        path.parent.mkdir(exist_ok=True)
+        os.replace(self._tmp_path, path)
+        return BlobInfo(digest, self._size, stored_size, self._store.codec)
+
+    def abort(self) -> None:
+        """Discard the partial blob."""
+        self._file.close()
+        self._tmp_path.unlink(missing_ok=True)
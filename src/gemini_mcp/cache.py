@@ -1,19 +1,119 @@
 """Caching mechanism for Gemini MCP design operations.
 
 Provides in-memory caching with TTL support to avoid redundant API calls
-for identical design requests.
+for identical design requests. An optional disk-backed second level (L2)
+keeps results across server restarts:
+
+    L1: OrderedDict LRU (process memory, O(1) lookups)
+    L2: SQLite file with zlib-compressed values, TTL and size-based eviction
+
+On startup the most recently used L2 entries are loaded back into L1
+(warm start), so identical requests after a redeploy skip the API call.
+Async callers use aget()/aset()/afind_similar(), which run the L2 SQLite
+and zlib work in a worker thread instead of on the event loop.
+
+Concurrent identical requests that both miss the cache are coalesced by
+SingleFlight: the first caller runs the API call, the others await the
+same result instead of paying for a duplicate generation.
+
+An optional near-duplicate stage (NearDuplicateIndex) catches requests
+that differ only in wording: the free-text fields (context,
+content_structure) are case/whitespace-normalized and compared by MinHash,
+while every other parameter must still match exactly. A cached result is
+only returned verbatim when the normalized content_structure is identical
+too; a match whose content differs can only seed a refinement.
 """
 
+import asyncio
 import hashlib
 import json
 import logging
+import random
+import re
+import sqlite3
+import threading
 import time
+import zlib
 from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import Any, Dict, Optional
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
 
 logger = logging.getLogger(__name__)
 
+# Default location of the L2 cache (same home directory as DNAStore)
+DEFAULT_DISK_CACHE_PATH = "~/.gemini-mcp/design_cache.db"
+
+# Request fields compared by similarity instead of exact equality
+NEAR_DUPLICATE_FIELDS = ("context", "content_structure")
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Coalesce concurrent identical async calls onto one shared task.
+
+    The first caller for a key starts the work; callers arriving while it
+    is in flight await the same task. The key is forgotten as soon as the
+    work finishes, so later calls run again (results are expected to be
+    cached by the caller). The work runs in its own task, so cancelling
+    one waiter never cancels the call for the others.
+
+    Example:
+        >>> flights = SingleFlight()
+        >>> result = await flights.do(key, lambda: client.design_component(...))
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self._stats = {"leaders": 0, "coalesced": 0}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run fn once per key among concurrent callers.
+
+        Args:
+            key: Request identity (e.g. DesignCache._hash_params output).
+            fn: Zero-argument coroutine factory doing the actual work.
+
+        Returns:
+            The shared result. Dict results are shallow-copied for
+            followers so per-caller annotations do not leak across.
+
+        Raises:
+            Whatever fn raises, for every waiter.
+        """
+        task = self._in_flight.get(key)
+        if task is not None:
+            self._stats["coalesced"] += 1
+            logger.debug(f"SingleFlight: joined in-flight call {key}")
+            result = await asyncio.shield(task)
+            return dict(result) if isinstance(result, dict) else result
+
+        self._stats["leaders"] += 1
+        task = asyncio.ensure_future(fn())
+        self._in_flight[key] = task
+        task.add_done_callback(lambda _t: self._forget(key, _t))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Retrieve the exception so abandoned tasks don't log "never retrieved"
+        if not task.cancelled():
+            task.exception()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._in_flight
+
+    @property
+    def in_flight(self) -> int:
+        """Number of keys currently being computed."""
+        return len(self._in_flight)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Leader/coalesced counters and current in-flight count."""
+        return {**self._stats, "in_flight": self.in_flight}
+
 
 @dataclass
 class CacheEntry:
@@ -42,12 +142,506 @@ class CacheEntry:
         self.hits += 1
 
 
+_WORD = re.compile(r"\w+")
+_STOPWORDS = frozenset(
+    "a an and for in of on or the to with "
+    "bir bu da de icin için ile ve".split()
+)
+
+# MinHash: 64 permutations hashed into 16 LSH bands of 4 rows
+_MINHASH_PRIME = (1 << 61) - 1
+_MINHASH_PERMS = 64
+_MINHASH_ROWS = 4
+_rng = random.Random(0x5EED)
+_MINHASH_COEFFS = [
+    (_rng.randrange(1, _MINHASH_PRIME), _rng.randrange(_MINHASH_PRIME))
+    for _ in range(_MINHASH_PERMS)
+]
+del _rng
+
+
+def normalize_request_text(value: Any) -> str:
+    """Case-, whitespace- and punctuation-insensitive form of a request field.
+
+    Dicts and lists (e.g. content_structure) are flattened to their keys and
+    values in sorted order; filler words ("the", "for", "ile", ...) are
+    dropped so "Primary CTA for newsletter" and "primary CTA for the
+    newsletter" normalize to the same string.
+
+    Args:
+        value: A string or JSON-like structure.
+
+    Returns:
+        Space-separated lower-case words.
+    """
+    if value is None:
+        return ""
+    if not isinstance(value, str):
+        value = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    return " ".join(
+        word for word in _WORD.findall(value.casefold()) if word not in _STOPWORDS
+    )
+
+
+def minhash_signature(text: str) -> Tuple[int, ...]:
+    """MinHash signature over the words and word bigrams of normalized text.
+
+    The share of equal positions in two signatures estimates the Jaccard
+    similarity of their shingle sets.
+    """
+    words = text.split()
+    shingles = set(words)
+    shingles.update(f"{a} {b}" for a, b in zip(words, words[1:]))
+    if not shingles:
+        return ()
+    hashes = [
+        int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "little")
+        for s in shingles
+    ]
+    return tuple(
+        min((a * h + b) % _MINHASH_PRIME for h in hashes)
+        for a, b in _MINHASH_COEFFS
+    )
+
+
+class NearDuplicateIndex:
+    """Find cached requests whose free-text fields nearly match a new one.
+
+    Entries are grouped by scope (hash of all non-text parameters, which
+    must match exactly). Within a scope, an identical normalized text is an
+    O(1) dict hit; otherwise LSH bands of the MinHash signature yield
+    candidates, ranked by estimated Jaccard similarity. Each entry can also
+    carry a content digest, which find() can require to be equal.
+
+    Example:
+        >>> index = NearDuplicateIndex()
+        >>> index.add("k1", "scope", normalize_request_text("Primary CTA for newsletter"))
+        >>> index.find("scope", normalize_request_text("primary CTA for the newsletter"), 0.9)
+        ('k1', 1.0)
+    """
+
+    def __init__(self):
+        self._exact: Dict[Tuple[str, str], str] = {}
+        self._bands: Dict[Tuple[str, int, Tuple[int, ...]], set] = {}
+        self._entries: Dict[str, Tuple[str, str, Tuple[int, ...], Optional[str]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    @staticmethod
+    def _band_keys(scope: str, signature: Tuple[int, ...]):
+        for start in range(0, len(signature), _MINHASH_ROWS):
+            yield scope, start, signature[start:start + _MINHASH_ROWS]
+
+    def add(self, key: str, scope: str, text: str, content: Optional[str] = None) -> None:
+        """Index a cache key under its scope, normalized text and content digest."""
+        if not text:
+            return
+        self.remove(key)
+        signature = minhash_signature(text)
+        self._entries[key] = (scope, text, signature, content)
+        self._exact[(scope, text)] = key
+        for band in self._band_keys(scope, signature):
+            self._bands.setdefault(band, set()).add(key)
+
+    def remove(self, key: str) -> bool:
+        """Drop a key; returns False if it was not indexed."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        scope, text, signature, _ = entry
+        if self._exact.get((scope, text)) == key:
+            del self._exact[(scope, text)]
+        for band in self._band_keys(scope, signature):
+            keys = self._bands.get(band)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._bands[band]
+        return True
+
+    def find(
+        self,
+        scope: str,
+        text: str,
+        min_similarity: float,
+        exclude: Optional[set] = None,
+        content: Optional[str] = None,
+    ) -> Optional[Tuple[str, float]]:
+        """Most similar key in the same scope.
+
+        Args:
+            scope: Scope hash of the request.
+            text: Normalized request text.
+            min_similarity: Minimum estimated Jaccard similarity (0-1).
+            exclude: Keys to skip (e.g. found to be gone from the cache).
+            content: If given, only keys indexed with this content digest match.
+
+        Returns:
+            (key, similarity) of the best match, or None.
+        """
+        if not text:
+            return None
+        exclude = exclude or set()
+        key = self._exact.get((scope, text))
+        if key is not None and key not in exclude and content in (None, self._entries[key][3]):
+            return key, 1.0
+
+        signature = minhash_signature(text)
+        candidates = set()
+        for band in self._band_keys(scope, signature):
+            candidates.update(self._bands.get(band, ()))
+        best: Optional[Tuple[str, float]] = None
+        for key in candidates - exclude:
+            _, _, other, other_content = self._entries[key]
+            if content is not None and other_content != content:
+                continue
+            similarity = sum(a == b for a, b in zip(signature, other)) / len(signature)
+            if similarity >= min_similarity and (best is None or similarity > best[1]):
+                best = (key, similarity)
+        return best
+
+    def clear(self) -> None:
+        self._exact.clear()
+        self._bands.clear()
+        self._entries.clear()
+
+
+class DiskCacheTier:
+    """SQLite-backed second-level cache for design results.
+
+    Values are stored as zlib-compressed JSON. Entries expire after their
+    TTL and the least recently accessed entries are evicted once the total
+    compressed size exceeds ``max_bytes``. An optional ``near_dup`` column
+    keeps the (scope, normalized text, content digest) of each request so the
+    near-duplicate index can be rebuilt after a restart.
+
+    Example:
+        >>> tier = DiskCacheTier("~/.gemini-mcp/design_cache.db")
+        >>> tier.set("abc123", {"html": "<div/>"}, ttl_seconds=3600)
+        >>> tier.get("abc123")
+        ({'html': '<div/>'}, 1735000000.0)
+    """
+
+    SCHEMA_VERSION = 2
+
+    def __init__(
+        self,
+        db_path: str = DEFAULT_DISK_CACHE_PATH,
+        max_bytes: int = 256 * 1024 * 1024,
+        compression_level: int = 6,
+    ):
+        """Initialize the disk tier.
+
+        Args:
+            db_path: Path to the SQLite database file.
+            max_bytes: Maximum total size of compressed values. Default: 256MB.
+            compression_level: zlib compression level (1-9). Default: 6.
+        """
+        self.db_path = Path(db_path).expanduser()
+        self.max_bytes = max_bytes
+        self.compression_level = compression_level
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "writes": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "errors": 0,
+        }
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(self.db_path),
+            check_same_thread=False,
+            isolation_level=None,  # autocommit; each statement is atomic
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS design_cache (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                last_accessed REAL NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0,
+                near_dup TEXT
+            )
+            """
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(design_cache)")}
+        if "near_dup" not in columns:  # v1 database
+            self._conn.execute("ALTER TABLE design_cache ADD COLUMN near_dup TEXT")
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_design_cache_accessed "
+            "ON design_cache(last_accessed)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_design_cache_expires "
+            "ON design_cache(expires_at)"
+        )
+        self._conn.execute(f"PRAGMA user_version={self.SCHEMA_VERSION}")
+        self.purge_expired()
+
+        logger.info(
+            f"DiskCacheTier initialized at {self.db_path} "
+            f"(max_bytes={max_bytes}, entries={self.count()})"
+        )
+
+    def _encode(self, value: Dict[str, Any]) -> bytes:
+        """Serialize and compress a value."""
+        payload = json.dumps(value, ensure_ascii=False, default=str).encode("utf-8")
+        return zlib.compress(payload, self.compression_level)
+
+    @staticmethod
+    def _decode(blob: bytes) -> Dict[str, Any]:
+        """Decompress and deserialize a value."""
+        return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+    def get(self, key: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        """Get a value and its creation time by key.
+
+        Args:
+            key: Cache key.
+
+        Returns:
+            Tuple of (value, created_at) if found and not expired, None otherwise.
+        """
+        now = time.time()
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    "SELECT value, created_at, expires_at FROM design_cache WHERE key = ?",
+                    (key,),
+                ).fetchone()
+                if row is None:
+                    self._stats["misses"] += 1
+                    return None
+
+                blob, created_at, expires_at = row
+                if now > expires_at:
+                    self._conn.execute("DELETE FROM design_cache WHERE key = ?", (key,))
+                    self._stats["expirations"] += 1
+                    self._stats["misses"] += 1
+                    return None
+
+                self._conn.execute(
+                    "UPDATE design_cache SET last_accessed = ?, hits = hits + 1 WHERE key = ?",
+                    (now, key),
+                )
+                self._stats["hits"] += 1
+                return self._decode(blob), created_at
+            except (sqlite3.Error, zlib.error, ValueError) as e:
+                self._stats["errors"] += 1
+                logger.warning(f"DiskCacheTier read failed for {key[:8]}...: {e}")
+                return None
+
+    def set(
+        self,
+        key: str,
+        value: Dict[str, Any],
+        ttl_seconds: float,
+        created_at: Optional[float] = None,
+        near_dup: Optional[Tuple[str, str, str]] = None,
+    ) -> bool:
+        """Store a value.
+
+        Args:
+            key: Cache key.
+            value: JSON-serializable result dict.
+            ttl_seconds: Time-to-live in seconds.
+            created_at: Creation timestamp. Default: now.
+            near_dup: Optional (scope, normalized text, content digest) of the request.
+
+        Returns:
+            True if the value was written, False on error.
+        """
+        now = time.time()
+        created_at = created_at if created_at is not None else now
+        with self._lock:
+            try:
+                blob = self._encode(value)
+                self._conn.execute(
+                    """
+                    INSERT OR REPLACE INTO design_cache
+                        (key, value, size, created_at, expires_at, last_accessed, hits, near_dup)
+                    VALUES (?, ?, ?, ?, ?, ?, 0, ?)
+                    """,
+                    (
+                        key, blob, len(blob), created_at, created_at + ttl_seconds, now,
+                        json.dumps(near_dup) if near_dup else None,
+                    ),
+                )
+                self._stats["writes"] += 1
+                self._enforce_size_locked()
+                return True
+            except (sqlite3.Error, TypeError, ValueError) as e:
+                self._stats["errors"] += 1
+                logger.warning(f"DiskCacheTier write failed for {key[:8]}...: {e}")
+                return False
+
+    def _enforce_size_locked(self) -> int:
+        """Evict least recently accessed entries until under max_bytes.
+
+        Must be called with the lock held.
+
+        Returns:
+            Number of entries evicted.
+        """
+        total = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM design_cache"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return 0
+
+        evicted = 0
+        rows = self._conn.execute(
+            "SELECT key, size FROM design_cache ORDER BY last_accessed ASC"
+        ).fetchall()
+        to_delete = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            to_delete.append((key,))
+            total -= size
+            evicted += 1
+
+        self._conn.executemany("DELETE FROM design_cache WHERE key = ?", to_delete)
+        self._stats["evictions"] += evicted
+        logger.debug(f"DiskCacheTier eviction: {evicted} entries removed")
+        return evicted
+
+    def delete(self, key: str) -> bool:
+        """Delete a key.
+
+        Returns:
+            True if an entry was removed.
+        """
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM design_cache WHERE key = ?", (key,))
+            return cursor.rowcount > 0
+
+    def purge_expired(self) -> int:
+        """Delete all expired entries.
+
+        Returns:
+            Number of entries removed.
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM design_cache WHERE expires_at < ?", (time.time(),)
+            )
+            self._stats["expirations"] += cursor.rowcount
+            return cursor.rowcount
+
+    def warm_entries(self, limit: int) -> List[Tuple[str, Dict[str, Any], float]]:
+        """Load the most recently accessed live entries for a warm start.
+
+        Args:
+            limit: Maximum number of entries to return.
+
+        Returns:
+            List of (key, value, created_at), least recently accessed first so
+            that inserting them in order preserves LRU ordering.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT key, value, created_at FROM design_cache
+                WHERE expires_at >= ?
+                ORDER BY last_accessed DESC
+                LIMIT ?
+                """,
+                (time.time(), limit),
+            ).fetchall()
+
+        entries = []
+        for key, blob, created_at in reversed(rows):
+            try:
+                entries.append((key, self._decode(blob), created_at))
+            except (zlib.error, ValueError) as e:
+                logger.warning(f"DiskCacheTier skipped corrupt entry {key[:8]}...: {e}")
+        return entries
+
+    def near_duplicate_entries(self) -> List[Tuple[str, str, str, Optional[str]]]:
+        """(key, scope, normalized text, content digest) of every live entry that has them.
+
+        Rows written before content digests were stored get None, so they
+        can seed a refinement but are never returned verbatim.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, near_dup FROM design_cache "
+                "WHERE near_dup IS NOT NULL AND expires_at >= ?",
+                (time.time(),),
+            ).fetchall()
+
+        entries = []
+        for key, near_dup in rows:
+            try:
+                scope, text, *rest = json.loads(near_dup)
+            except (ValueError, TypeError):
+                continue
+            entries.append((key, scope, text, rest[0] if rest else None))
+        return entries
+
+    def clear(self) -> int:
+        """Delete all entries.
+
+        Returns:
+            Number of entries removed.
+        """
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM design_cache")
+            return cursor.rowcount
+
+    def count(self) -> int:
+        """Number of stored entries (including not-yet-purged expired ones)."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM design_cache").fetchone()[0]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get disk tier statistics."""
+        with self._lock:
+            entries, total_bytes = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM design_cache"
+            ).fetchone()
+        return {
+            "path": str(self.db_path),
+            "entries": entries,
+            "bytes": total_bytes,
+            "max_bytes": self.max_bytes,
+            **self._stats,
+        }
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
 class DesignCache:
     """In-memory cache for design operation results.
 
     Uses content-based hashing to identify duplicate requests.
     Supports TTL-based expiration and LRU-like eviction.
 
+    When ``disk_path`` is given, a DiskCacheTier is used as L2: writes go
+    to both tiers, L1 misses fall through to disk and are promoted back
+    into memory, and L1 is warm-started from disk on construction.
+
+    With ``near_duplicate_threshold`` > 0, an exact miss is looked up again
+    in a NearDuplicateIndex: a cached result whose context is at least that
+    similar (and whose normalized content_structure and other parameters
+    are identical) is returned, annotated with ``_near_duplicate``.
+
     Example:
         >>> cache = DesignCache(ttl_hours=24, max_entries=100)
         >>>
@@ -71,6 +665,10 @@ class DesignCache:
         ttl_hours: float = 24.0,
         max_entries: int = 100,
         enabled: bool = True,
+        disk_path: Optional[str] = None,
+        disk_max_bytes: int = 256 * 1024 * 1024,
+        warm_start: bool = True,
+        near_duplicate_threshold: float = 0.0,
     ):
         """Initialize the cache.
 
@@ -79,6 +677,14 @@ class DesignCache:
             max_entries: Maximum number of entries to keep. Default: 100.
                         When exceeded, oldest entries are evicted.
             enabled: Whether caching is enabled. Default: True.
+            disk_path: Optional SQLite path for the persistent L2 tier.
+                      None keeps the cache memory-only. Default: None.
+            disk_max_bytes: Size quota for compressed L2 values. Default: 256MB.
+            warm_start: Load recent L2 entries into L1 on startup. Default: True.
+            near_duplicate_threshold: Minimum similarity (0-1] for a
+                      near-duplicate request to reuse a cached result.
+                      Only the context wording may differ. 0 disables
+                      the second-stage lookup. Default: 0.
         """
         # Use OrderedDict for O(1) LRU eviction (Issue 5 fix)
         self._cache: OrderedDict[str, CacheEntry] = OrderedDict()
@@ -90,11 +696,59 @@ class DesignCache:
             "misses": 0,
             "evictions": 0,
             "expirations": 0,
+            "l2_hits": 0,
+            "warm_loaded": 0,
+            "near_hits": 0,
+            "refine_seeds": 0,
         }
+
+        # Second-stage lookup over normalized request text
+        self._near_threshold = near_duplicate_threshold
+        self._near = NearDuplicateIndex()
+
+        # Optional persistent L2 tier - failures degrade to memory-only
+        self._disk: Optional[DiskCacheTier] = None
+        if disk_path:
+            try:
+                self._disk = DiskCacheTier(disk_path, max_bytes=disk_max_bytes)
+            except (sqlite3.Error, OSError) as e:
+                logger.warning(f"DesignCache L2 disabled, could not open {disk_path}: {e}")
+
+        # Single-flight for concurrent misses on the same key
+        self._flights = SingleFlight()
+
+        if self._disk is not None and warm_start and enabled:
+            self._warm_start()
+        if self._disk is not None and enabled:
+            for key, *near_key in self._disk.near_duplicate_entries():
+                self._near.add(key, *near_key)
+
         logger.info(
-            f"DesignCache initialized: ttl={ttl_hours}h, max_entries={max_entries}, enabled={enabled}"
+            f"DesignCache initialized: ttl={ttl_hours}h, max_entries={max_entries}, "
+            f"enabled={enabled}, l2={'on' if self._disk else 'off'}, "
+            f"near_duplicate={near_duplicate_threshold or 'off'}"
         )
 
+    def _warm_start(self) -> int:
+        """Populate L1 from the most recently used L2 entries.
+
+        Returns:
+            Number of entries loaded.
+        """
+        loaded = 0
+        for key, value, created_at in self._disk.warm_entries(self._max_entries):
+            self._cache[key] = CacheEntry(
+                key=key,
+                value=value,
+                created_at=created_at,
+                ttl_seconds=self._ttl_seconds,
+            )
+            loaded += 1
+        self._stats["warm_loaded"] = loaded
+        if loaded:
+            logger.info(f"DesignCache warm start: {loaded} entries loaded from disk")
+        return loaded
+
     def _hash_params(self, **params) -> str:
         """Create a deterministic hash from parameters.
 
@@ -113,6 +767,56 @@ class DesignCache:
         # Create hash
         return hashlib.sha256(param_str.encode()).hexdigest()[:16]
 
+    def _near_duplicate_key(self, params: Dict[str, Any]) -> Optional[Tuple[str, str, str]]:
+        """Split params into (scope hash, normalized text, content digest).
+
+        NEAR_DUPLICATE_FIELDS are taken from the top level or from a nested
+        dict (e.g. design_spec); everything else forms the scope. The
+        content digest hashes the normalized content_structure values, so
+        a verbatim near hit can require them to be identical.
+
+        Returns:
+            (scope, text, content), or None if the request has no free-text fields.
+        """
+        scope: Dict[str, Any] = {}
+        texts: List[str] = []
+        contents: List[str] = []
+        for name, value in sorted(params.items()):
+            if name in NEAR_DUPLICATE_FIELDS:
+                texts.append(normalize_request_text(value))
+                if name == "content_structure":
+                    contents.append(texts[-1])
+            elif isinstance(value, dict):
+                scope[name] = {k: v for k, v in value.items() if k not in NEAR_DUPLICATE_FIELDS}
+                texts.extend(
+                    normalize_request_text(value.get(k)) for k in NEAR_DUPLICATE_FIELDS
+                )
+                contents.append(normalize_request_text(value.get("content_structure")))
+            else:
+                scope[name] = value
+        text = " ".join(t for t in texts if t)
+        if not text:
+            return None
+        return self._hash_params(**scope), text, self._hash_params(content_structure=contents)
+
+    async def coalesce(self, compute: Callable[[], Awaitable[T]], **params) -> T:
+        """Run compute once for concurrent callers with identical params.
+
+        Call after a cache miss; compute is expected to set() its result.
+        Callers arriving while an identical request is in flight await the
+        same result instead of issuing a second API call.
+
+        Args:
+            compute: Zero-argument coroutine factory making the API call.
+            **params: Same parameters used for get()/set().
+
+        Returns:
+            The result of compute (shared among coalesced callers).
+        """
+        if not self._enabled:
+            return await compute()
+        return await self._flights.do(self._hash_params(**params), compute)
+
     def _evict_if_needed(self) -> int:
         """Evict old entries if cache is full.
 
@@ -136,7 +840,9 @@ class DesignCache:
         # If still over limit, evict oldest accessed entries (O(1) with OrderedDict)
         while len(self._cache) >= self._max_entries:
             # Pop the first (oldest) item - O(1) with OrderedDict (Issue 5 fix)
-            self._cache.popitem(last=False)
+            key, _ = self._cache.popitem(last=False)
+            if self._disk is None:
+                self._near.remove(key)
             evicted += 1
             self._stats["evictions"] += 1
 
@@ -148,6 +854,8 @@ class DesignCache:
     def get(self, **params) -> Optional[Dict[str, Any]]:
         """Get a cached result by parameters.
 
+        Reads L2 on the calling thread; async callers use aget().
+
         Args:
             **params: The same parameters used when caching the result.
 
@@ -158,31 +866,176 @@ class DesignCache:
             return None
 
         key = self._hash_params(**params)
-        entry = self._cache.get(key)
+        entry = self._lookup(key)
+        if entry is not None:
+            return self._exact_hit(key, entry)
 
-        if entry is None:
+        found = None
+        if self._near_threshold > 0:
+            found = self.find_similar(self._near_threshold, same_content=True, **params)
+        return self._near_hit_or_miss(key, found)
+
+    async def aget(self, **params) -> Optional[Dict[str, Any]]:
+        """get() for async callers: L2 reads run in a worker thread.
+
+        L1 is only touched on the event loop, so it needs no locking.
+        """
+        if not self._enabled:
+            return None
+
+        key = self._hash_params(**params)
+        entry = await self._alookup(key)
+        if entry is not None:
+            return self._exact_hit(key, entry)
+
+        found = None
+        if self._near_threshold > 0:
+            found = await self.afind_similar(self._near_threshold, same_content=True, **params)
+        return self._near_hit_or_miss(key, found)
+
+    def _exact_hit(self, key: str, entry: CacheEntry) -> Dict[str, Any]:
+        self._stats["hits"] += 1
+        logger.debug(f"Cache hit: {key[:8]}... (hits={entry.hits})")
+        # Return a copy to prevent mutation
+        return entry.value.copy()
+
+    def _near_hit_or_miss(
+        self, key: str, found: Optional[Tuple[Dict[str, Any], float]]
+    ) -> Optional[Dict[str, Any]]:
+        if found is None:
             self._stats["misses"] += 1
             return None
+        value, similarity = found
+        self._stats["hits"] += 1
+        self._stats["near_hits"] += 1
+        value["_near_duplicate"] = {"similarity": round(similarity, 3)}
+        logger.debug(f"Cache near-duplicate hit: {key[:8]}... (similarity={similarity:.2f})")
+        return value
+
+    def _lookup(self, key: str, use_disk: bool = True) -> Optional[CacheEntry]:
+        """Live entry for a key from L1 or L2 (promoted), touched for LRU."""
+        entry = self._cache.get(key)
+
+        if entry is None:
+            if not use_disk or self._disk is None:
+                return None
+            entry = self._promote(key, self._disk.get(key))
+            if entry is None:
+                return None
 
         if entry.is_expired:
             del self._cache[key]
+            self._near.remove(key)
             self._stats["expirations"] += 1
-            self._stats["misses"] += 1
             logger.debug(f"Cache miss (expired): {key[:8]}...")
             return None
 
         # Cache hit - move to end for LRU ordering (Issue 5 fix)
         entry.touch()
         self._cache.move_to_end(key)  # O(1) LRU update
-        self._stats["hits"] += 1
-        logger.debug(f"Cache hit: {key[:8]}... (hits={entry.hits})")
+        return entry
+
+    async def _alookup(self, key: str) -> Optional[CacheEntry]:
+        """_lookup() with the L2 read (SQLite + zlib) off the event loop."""
+        if key not in self._cache and self._disk is not None:
+            found = await asyncio.to_thread(self._disk.get, key)
+            # Another task may have set the key while the read was running
+            if key not in self._cache:
+                self._promote(key, found)
+        return self._lookup(key, use_disk=False)
+
+    def find_similar(
+        self, min_similarity: float, same_content: bool = False, **params
+    ) -> Optional[Tuple[Dict[str, Any], float]]:
+        """Cached result of the most similar request with the same scope.
+
+        Only context/content_structure may differ; all other parameters
+        must match exactly. Does not count as a hit or miss, so callers can
+        use a lower threshold to seed a refinement instead of a fresh call.
 
-        # Return a copy to prevent mutation
-        return entry.value.copy()
+        Args:
+            min_similarity: Minimum similarity (0-1].
+            same_content: Also require an identical normalized
+                content_structure (for results returned verbatim).
+            **params: The request parameters (as for get()).
+
+        Returns:
+            (copy of the cached result, similarity), or None.
+        """
+        near_key = self._near_duplicate_key(params) if self._enabled else None
+        if near_key is None:
+            return None
+        scope, text, content = near_key
+
+        stale: set = set()
+        while True:
+            match = self._near.find(
+                scope, text, min_similarity, exclude=stale,
+                content=content if same_content else None,
+            )
+            if match is None:
+                return None
+            key, similarity = match
+            entry = self._lookup(key)
+            if entry is not None:
+                return entry.value.copy(), similarity
+            # Evicted or expired in L2 since it was indexed
+            self._near.remove(key)
+            stale.add(key)
+
+    async def afind_similar(
+        self, min_similarity: float, same_content: bool = False, **params
+    ) -> Optional[Tuple[Dict[str, Any], float]]:
+        """find_similar() for async callers: L2 reads run in a worker thread."""
+        near_key = self._near_duplicate_key(params) if self._enabled else None
+        if near_key is None:
+            return None
+        scope, text, content = near_key
+
+        stale: set = set()
+        while True:
+            match = self._near.find(
+                scope, text, min_similarity, exclude=stale,
+                content=content if same_content else None,
+            )
+            if match is None:
+                return None
+            key, similarity = match
+            entry = await self._alookup(key)
+            if entry is not None:
+                return entry.value.copy(), similarity
+            self._near.remove(key)
+            stale.add(key)
+
+    def record_refine_seed(self) -> None:
+        """Count a design produced by refining a similar cached result."""
+        self._stats["refine_seeds"] += 1
+
+    def _promote(
+        self, key: str, found: Optional[Tuple[Dict[str, Any], float]]
+    ) -> Optional[CacheEntry]:
+        """Insert an L2 hit (DiskCacheTier.get() result) into L1."""
+        if found is None:
+            return None
+
+        value, created_at = found
+        self._evict_if_needed()
+        entry = CacheEntry(
+            key=key,
+            value=value,
+            created_at=created_at,
+            ttl_seconds=self._ttl_seconds,
+        )
+        self._cache[key] = entry
+        self._stats["l2_hits"] += 1
+        logger.debug(f"Cache L2 hit: {key[:8]}... promoted to memory")
+        return entry
 
     def set(self, result: Dict[str, Any], **params) -> str:
         """Cache a result with the given parameters.
 
+        Writes L2 on the calling thread; async callers use aset().
+
         Args:
             result: The result to cache.
             **params: The parameters that produced this result.
@@ -192,21 +1045,49 @@ class DesignCache:
         """
         if not self._enabled:
             return ""
+        key, created_at, near_key = self._set_memory(result, params)
+        if self._disk is not None:
+            self._disk.set(key, result, self._ttl_seconds, created_at=created_at, near_dup=near_key)
+        return key
+
+    async def aset(self, result: Dict[str, Any], **params) -> str:
+        """set() for async callers: the L2 write (zlib + SQLite) runs in a worker thread."""
+        if not self._enabled:
+            return ""
+        key, created_at, near_key = self._set_memory(result, params)
+        if self._disk is not None:
+            await asyncio.to_thread(
+                self._disk.set, key, result, self._ttl_seconds,
+                created_at=created_at, near_dup=near_key,
+            )
+        return key
+
+    def _set_memory(
+        self, result: Dict[str, Any], params: Dict[str, Any]
+    ) -> Tuple[str, float, Optional[Tuple[str, str, str]]]:
+        """Store a result in L1 and the near-duplicate index.
 
+        Returns:
+            (key, created_at, near-duplicate key) for the L2 write.
+        """
         # Evict if needed
         self._evict_if_needed()
 
         key = self._hash_params(**params)
+        created_at = time.time()
+        near_key = self._near_duplicate_key(params)
+        if near_key is not None:
+            self._near.add(key, *near_key)
 
         self._cache[key] = CacheEntry(
             key=key,
             value=result.copy(),  # Store a copy
-            created_at=time.time(),
+            created_at=created_at,
             ttl_seconds=self._ttl_seconds,
         )
 
         logger.debug(f"Cache set: {key[:8]}... (total={len(self._cache)})")
-        return key
+        return key, created_at, near_key
 
     def invalidate(self, **params) -> bool:
         """Invalidate a specific cache entry.
@@ -218,11 +1099,16 @@ class DesignCache:
             True if an entry was removed, False otherwise.
         """
         key = self._hash_params(**params)
+        removed = False
+        self._near.remove(key)
         if key in self._cache:
             del self._cache[key]
+            removed = True
+        if self._disk is not None and self._disk.delete(key):
+            removed = True
+        if removed:
             logger.debug(f"Cache invalidated: {key[:8]}...")
-            return True
-        return False
+        return removed
 
     def invalidate_pattern(self, **partial_params) -> int:
         """Invalidate entries matching partial parameters.
@@ -254,13 +1140,17 @@ class DesignCache:
         return invalidated
 
     def clear(self) -> int:
-        """Clear all cache entries.
+        """Clear all cache entries (both tiers).
 
         Returns:
-            Number of entries cleared.
+            Number of entries cleared: L1 entries plus L2 rows (a result
+            held in both tiers counts once per tier).
         """
         count = len(self._cache)
         self._cache.clear()
+        self._near.clear()
+        if self._disk is not None:
+            count += self._disk.clear()
         logger.info(f"Cache cleared: {count} entries removed")
         return count
 
@@ -277,7 +1167,8 @@ class DesignCache:
             else 0.0
         )
 
-        return {
+        near_hits = self._stats["near_hits"]
+        stats = {
             "enabled": self._enabled,
             "entries": len(self._cache),
             "max_entries": self._max_entries,
@@ -285,9 +1176,27 @@ class DesignCache:
             "hits": self._stats["hits"],
             "misses": self._stats["misses"],
             "hit_rate": round(hit_rate, 3),
+            "exact_hit_rate": round(
+                (self._stats["hits"] - near_hits) / total_requests if total_requests else 0.0, 3
+            ),
             "evictions": self._stats["evictions"],
             "expirations": self._stats["expirations"],
+            "l2_hits": self._stats["l2_hits"],
+            "warm_loaded": self._stats["warm_loaded"],
+            "coalesced": self._flights.get_stats()["coalesced"],
+            "in_flight": self._flights.in_flight,
+            "near_duplicate": {
+                "threshold": self._near_threshold,
+                "indexed": len(self._near),
+                "hits": near_hits,
+                "refine_seeds": self._stats["refine_seeds"],
+                # Share of all lookups served only thanks to the near-duplicate stage
+                "hit_rate_uplift": round(near_hits / total_requests if total_requests else 0.0, 3),
+            },
         }
+        if self._disk is not None:
+            stats["disk"] = self._disk.get_stats()
+        return stats
 
     def list_entries(self, limit: int = 10) -> list[dict[str, Any]]:
         """List cache entries for debugging.
@@ -328,6 +1237,8 @@ def get_design_cache(
     ttl_hours: float = 24.0,
     max_entries: int = 100,
     enabled: bool = True,
+    disk_path: Optional[str] = None,
+    near_duplicate_threshold: float = 0.0,
 ) -> DesignCache:
     """Get or create the global design cache.
 
@@ -335,6 +1246,8 @@ def get_design_cache(
         ttl_hours: Time-to-live for cache entries.
         max_entries: Maximum cache entries.
         enabled: Whether caching is enabled.
+        disk_path: Optional SQLite path for the persistent L2 tier.
+        near_duplicate_threshold: Similarity for near-duplicate hits (0 = off).
 
     Returns:
         The global DesignCache instance.
@@ -345,6 +1258,8 @@ def get_design_cache(
             ttl_hours=ttl_hours,
             max_entries=max_entries,
             enabled=enabled,
+            disk_path=disk_path,
+            near_duplicate_threshold=near_duplicate_threshold,
         )
     return _design_cache
 
@@ -353,7 +1268,7 @@ def clear_design_cache() -> int:
     """Clear the global design cache.
 
     Returns:
-        Number of entries cleared.
+        Number of entries cleared (L1 plus L2, see DesignCache.clear).
     """
     global _design_cache
     if _design_cache is not None:
@@ -7,11 +7,13 @@ image generation. Includes automatic token refresh on authentication errors.
 import base64
 import logging
 import os
+import time
 import uuid
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 import json
-from typing import Any, Dict, List, Optional, TypeVar
+from typing import Any, Dict, List, Optional, Tuple, TypeVar
 
 from google import genai
 from google.genai import types
@@ -35,6 +37,7 @@ from .schemas import (
     get_response_schema,
 )
 from .cache import DesignCache, get_design_cache
+from .context_cache import GeminiContextCache
 from .error_recovery import (
     RecoveryStrategy,
     repair_json_response,
@@ -45,12 +48,24 @@ from .error_recovery import (
     is_auth_error,
 )
 from .few_shot_examples import get_few_shot_examples_for_prompt
+from .rate_limiter import get_rate_controller
+from .section_utils import SectionCallback, SectionStreamParser
 
 logger = logging.getLogger(__name__)
 
 T = TypeVar("T")
 
 
+@dataclass
+class StreamedResponse:
+    """generate_content-like result assembled from a streamed response."""
+
+    text: str
+    candidates: List[Any] = field(default_factory=list)
+    usage_metadata: Any = None
+    sections_emitted: List[str] = field(default_factory=list)
+
+
 class GeminiClient:
     """High-level client for Gemini API on Vertex AI.
 
@@ -68,50 +83,268 @@ class GeminiClient:
         self._auth_manager = get_auth_manager()
         # Design system state for consistency across components
         self._design_systems: Dict[str, DesignSystemState] = {}
-        # Cache for design results
-        self._cache: DesignCache = get_design_cache(ttl_hours=24, max_entries=100)
+        # Cache for design results (memory L1 + optional SQLite L2 that survives restarts)
+        self._cache: DesignCache = get_design_cache(
+            ttl_hours=24,
+            max_entries=100,
+            disk_path=self.config.design_cache_path or None,
+            near_duplicate_threshold=self.config.near_duplicate_threshold,
+        )
         # Error recovery strategy
         self._recovery_strategy = RecoveryStrategy(
             max_retries=2,
             base_delay_seconds=1.0,
             exponential_backoff=True,
         )
-
-    def _refresh_credentials_and_client(self) -> None:
+        # Process-wide AIMD concurrency limit per model (shared by all clients)
+        self._rate_controller = get_rate_controller(self.config.max_concurrency)
+        # Real token usage per model, accumulated from usage_metadata
+        self._usage_totals: Dict[str, Dict[str, int]] = {}
+        # Server-side context cache for agent system prompts (opt-in)
+        self._context_cache: Optional[GeminiContextCache] = None
+        if self.config.context_cache_enabled:
+            self.enable_context_cache(self.config.context_cache_ttl_seconds)
+
+    async def _refresh_credentials_and_client(self) -> None:
         """Refresh credentials and recreate the client.
 
-        This is called when an authentication error is detected.
+        This is called when an authentication error is detected. The
+        refresh runs in a worker thread so other requests keep running.
         """
         logger.info("Refreshing credentials due to authentication error...")
 
-        # Refresh credentials via AuthManager
-        self._auth_manager.refresh_if_needed()
+        # Refresh credentials via AuthManager (single-flight, off the loop)
+        await self._auth_manager.refresh_async(force=True)
 
         # Force client recreation
         self._client = None
         logger.info("Client will be recreated on next request")
 
+    async def _get_client(self) -> genai.Client:
+        """Async counterpart of the client property.
+
+        Credentials are checked/refreshed in a worker thread before the
+        client is created, so a slow token fetch never blocks the loop.
+        All code running on the event loop gets the client from here.
+        """
+        if self._client is None:
+            await self._auth_manager.ensure_fresh()
+            self._client = self._create_client()
+        return self._client
+
     @property
     def client(self) -> genai.Client:
         """Get or create the Gemini client.
 
+        Blocking (the credential check takes the AuthManager lock): code
+        running on the event loop awaits _get_client() instead.
+
         Returns:
             Initialized genai.Client for Vertex AI.
         """
         if self._client is None:
             # Ensure credentials are fresh before creating client
             self._auth_manager.refresh_if_needed()
+            self._client = self._create_client()
+        return self._client
+
+    def _create_client(self) -> genai.Client:
+        """genai.Client authenticated with the AuthManager's credentials.
+
+        The credentials object is shared, so refreshes done by the
+        AuthManager apply to the client's requests.
+        """
+        client = genai.Client(
+            vertexai=True,
+            project=self.config.project_id,
+            location=self.config.location,
+            credentials=self._auth_manager.credentials,
+        )
+        logger.info(
+            f"Gemini client initialized for project '{self.config.project_id}' "
+            f"in '{self.config.location}'"
+        )
+        return client
+
+    # =========================================================================
+    # Token Usage Accounting
+    # =========================================================================
+
+    def _record_usage(self, model: str, response: Any) -> Dict[str, int]:
+        """Accumulate a response's token counts into the per-model totals.
+
+        Args:
+            model: Model that produced the response.
+            response: generate_content response.
+
+        Returns:
+            The response's token usage (see extract_token_usage).
+        """
+        usage = extract_token_usage(response)
+        if usage:
+            totals = self._usage_totals.setdefault(model, {"calls": 0})
+            totals["calls"] += 1
+            for key, value in usage.items():
+                totals[key] = totals.get(key, 0) + value
+        return usage
+
+    def _record_route(self, route: Any, latency_ms: float, usage: Dict[str, int]) -> None:
+        """Report a routed call's latency and cost to pipeline telemetry.
+
+        Args:
+            route: ModelRoute the call was made on.
+            latency_ms: Call latency.
+            usage: The response's token usage (see extract_token_usage).
+        """
+        from .orchestration.routing import estimate_cost
+        from .orchestration.telemetry import get_telemetry
+
+        get_telemetry().record_route(
+            "",
+            route.to_dict(),
+            latency_ms,
+            estimate_cost(route.model, usage),
+            usage.get("total_tokens", 0),
+        )
+
+    def get_usage_stats(self) -> Dict[str, Dict[str, int]]:
+        """Get real token usage per model since the client was created.
+
+        Returns:
+            Dict mapping model name to call count and summed
+            input/output/thinking/cached/total token counts.
+        """
+        return {model: dict(totals) for model, totals in self._usage_totals.items()}
+
+    def get_rate_limit_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get concurrency limit, queue depth and wait times per model.
+
+        Returns:
+            Dict mapping model name to AdaptiveLimiter.get_stats().
+        """
+        return self._rate_controller.get_stats()
+
+    # =========================================================================
+    # Streaming (Incremental Section Delivery)
+    # =========================================================================
+
+    async def _generate(
+        self,
+        model: str,
+        contents: Any,
+        config: types.GenerateContentConfig,
+        on_section: Optional[SectionCallback] = None,
+        json_escaped: bool = False,
+    ) -> Any:
+        """Call generate_content, streaming when a section callback is given.
+
+        Without on_section this is a plain generate_content call. With it the
+        response is streamed via generate_content_stream and on_section is
+        awaited for every <!-- SECTION: x --> block as soon as its closing
+        marker arrives, so callers see the first section long before the
+        whole page is done.
+
+        Every call holds one of the model's rate controller slots for its
+        whole duration, bounding concurrent calls per model process-wide.
+
+        Args:
+            model: Model name.
+            contents: Request contents.
+            config: Generation config.
+            on_section: Async callback receiving (section_type, section_html).
+            json_escaped: The response is JSON (HTML inside a JSON string).
 
-            self._client = genai.Client(
-                vertexai=True,
-                project=self.config.project_id,
+        Returns:
+            The API response, or a StreamedResponse with the same text,
+            candidates and usage_metadata attributes.
+        """
+        client = await self._get_client()
+        async with self._rate_controller.slot(model):
+            if on_section is None:
+                return await client.aio.models.generate_content(
+                    model=model,
+                    contents=contents,
+                    config=config,
+                )
+            return await self._generate_streamed(model, contents, config, on_section, json_escaped)
+
+    async def _generate_streamed(
+        self,
+        model: str,
+        contents: Any,
+        config: types.GenerateContentConfig,
+        on_section: SectionCallback,
+        json_escaped: bool,
+    ) -> StreamedResponse:
+        """Stream a response, awaiting on_section for every completed section."""
+        parser = SectionStreamParser(json_escaped=json_escaped)
+        parts: List[str] = []
+        candidates: List[Any] = []
+        usage_metadata = None
+
+        client = await self._get_client()
+        stream = await client.aio.models.generate_content_stream(
+            model=model,
+            contents=contents,
+            config=config,
+        )
+        async for chunk in stream:
+            if getattr(chunk, "usage_metadata", None) is not None:
+                usage_metadata = chunk.usage_metadata
+            if getattr(chunk, "candidates", None):
+                candidates = chunk.candidates
+            text = getattr(chunk, "text", None)
+            if not isinstance(text, str) or not text:
+                continue
+            parts.append(text)
+            for section_type, section_html in parser.feed(text):
+                logger.debug(f"Streamed section ready: {section_type} ({len(section_html)} chars)")
+                await on_section(section_type, section_html)
+
+        return StreamedResponse(
+            text="".join(parts),
+            candidates=candidates,
+            usage_metadata=usage_metadata,
+            sections_emitted=list(parser.completed),
+        )
+
+    # =========================================================================
+    # Context Caching (Used by Agents)
+    # =========================================================================
+
+    @property
+    def context_cache_enabled(self) -> bool:
+        """Whether agent calls reuse server-side cached system prompts."""
+        return self._context_cache is not None and self._context_cache.enabled
+
+    @property
+    def context_cache(self) -> Optional[GeminiContextCache]:
+        """The context cache manager, if the mode is enabled."""
+        return self._context_cache
+
+    def enable_context_cache(self, ttl_seconds: Optional[int] = None) -> GeminiContextCache:
+        """Turn on context-cache mode for generate_text() calls.
+
+        Args:
+            ttl_seconds: Cache TTL in seconds. Defaults to the configured TTL.
+
+        Returns:
+            The active GeminiContextCache.
+        """
+        if self._context_cache is None:
+            self._context_cache = GeminiContextCache(
+                project_id=self.config.project_id,
                 location=self.config.location,
+                ttl_seconds=ttl_seconds or self.config.context_cache_ttl_seconds,
+                client_provider=self._get_client,
             )
-            logger.info(
-                f"Gemini client initialized for project '{self.config.project_id}' "
-                f"in '{self.config.location}'"
-            )
-        return self._client
+        self._context_cache.enabled = True
+        return self._context_cache
+
+    def disable_context_cache(self) -> None:
+        """Turn off context-cache mode (tracked handles expire server-side)."""
+        if self._context_cache is not None:
+            self._context_cache.enabled = False
 
     # =========================================================================
     # Generic Text Generation (Used by Agents)
@@ -125,6 +358,9 @@ class GeminiClient:
         max_output_tokens: int = 8192,
         thinking_level: str = "high",
         model: Optional[str] = None,
+        cache_agent: Optional[str] = None,
+        cacheable_prefix: str = "",
+        on_section: Optional[SectionCallback] = None,
     ) -> Dict[str, Any]:
         """Generate text using Gemini API with Gemini 3 optimizations.
 
@@ -144,6 +380,15 @@ class GeminiClient:
                 - "low": 8192 budget for simple tasks
                 - "minimal": 1024 budget for trivial tasks
             model: Model to use (defaults to gemini-3-pro-preview).
+            cache_agent: Agent name requesting context caching. Only used when
+                context-cache mode is enabled; the system instruction (plus
+                cacheable_prefix) is then served from a cached_content handle.
+            cacheable_prefix: Static prompt prefix (e.g. few-shot examples)
+                cached together with the system instruction. Sent in front of
+                the prompt when no handle is available.
+            on_section: Optional async callback; when set the response is
+                streamed and called with (section_type, html) per completed
+                <!-- SECTION: x --> block.
 
         Returns:
             Dict containing:
@@ -151,9 +396,22 @@ class GeminiClient:
                 - thought_signature: Gemini 3 thought signature (if available)
                 - model_used: Model that generated the response
                 - thinking_level: Thinking level used
+                - token_usage: input/output/thinking/cached/total token counts
+                  from the response's usage_metadata (empty if not reported)
+                - context_cache: Cache handle info (only in context-cache mode)
         """
         model = model or "gemini-3-pro-preview"
 
+        # Resolve a cached_content handle for the static prefix (opt-in)
+        cached = None
+        if cache_agent and self.context_cache_enabled:
+            cached = await self._context_cache.get_or_create(
+                agent_name=cache_agent,
+                system_prompt=system_instruction,
+                model=model,
+                few_shot_examples=cacheable_prefix or None,
+            )
+
         # Build config with Gemini 3 optimizations
         # IMPORTANT: Gemini 3 uses thinking_level (not thinking_budget)
         # Valid values: "high", "low", "minimal" (minimal only for Flash)
@@ -169,13 +427,29 @@ class GeminiClient:
         if system_instruction:
             gen_config.system_instruction = system_instruction
 
+        uncached_prompt = f"{cacheable_prefix}\n\n{prompt}" if cacheable_prefix else prompt
+
         async def _call_api():
             """Inner async function for retry wrapper."""
-            response = await self.client.aio.models.generate_content(
-                model=model,
-                contents=prompt,
-                config=gen_config,
-            )
+            nonlocal cached
+            response = None
+            if cached is not None:
+                # System instruction and prefix live in the cached content
+                cached_config = gen_config.model_copy(
+                    update={"cached_content": cached.cache_name, "system_instruction": None}
+                )
+                try:
+                    response = await self._generate(model, prompt, cached_config, on_section)
+                except Exception as e:
+                    if not _is_cached_content_error(e):
+                        raise
+                    # Handle expired or was deleted server-side - send uncached
+                    logger.warning(f"Cached content unavailable, sending full prompt: {e}")
+                    self._context_cache.invalidate(cached.cache_name)
+                    cached = None
+            if response is None:
+                response = await self._generate(model, uncached_prompt, gen_config, on_section)
+            token_usage = self._record_usage(model, response)
 
             # Extract text from response
             response_text = response.text.strip() if response.text else ""
@@ -185,8 +459,20 @@ class GeminiClient:
                 "text": response_text,
                 "model_used": model,
                 "thinking_level": thinking_level,
+                "token_usage": token_usage,
             }
 
+            if cache_agent and self.context_cache_enabled:
+                cached_tokens = token_usage.get("cached_tokens", 0)
+                if cached is not None:
+                    self._context_cache.record_usage(cached_tokens)
+                result["context_cache"] = {
+                    "agent": cache_agent,
+                    "cache_name": cached.cache_name if cached else None,
+                    "hit": cached is not None,
+                    "cached_tokens": cached_tokens,
+                }
+
             # === GEMINI 3 THOUGHT SIGNATURE EXTRACTION ===
             # Thought signatures maintain reasoning continuity across API calls.
             # They are REQUIRED for multi-turn conversations with Gemini 3.
@@ -212,7 +498,8 @@ class GeminiClient:
 
             logger.info(
                 f"generate_text completed: {len(response_text)} chars, "
-                f"thinking_level={thinking_level}"
+                f"thinking_level={thinking_level}, "
+                f"tokens={token_usage.get('total_tokens', 0)}"
             )
             return result
 
@@ -220,6 +507,7 @@ class GeminiClient:
         return await with_retry(
             _call_api,
             strategy=self._recovery_strategy,
+            layer="client",
             on_auth_error=self._refresh_credentials_and_client,
         )
 
@@ -271,6 +559,7 @@ class GeminiClient:
         return await with_retry(
             _call_api,
             strategy=self._recovery_strategy,
+            layer="client",
             on_auth_error=self._refresh_credentials_and_client,
         )
 
@@ -290,11 +579,8 @@ class GeminiClient:
             response_modalities=[types.Modality.TEXT, types.Modality.IMAGE],
         )
 
-        response = await self.client.aio.models.generate_content(
-            model=model,
-            contents=prompt,
-            config=gen_config,
-        )
+        response = await self._generate(model, prompt, gen_config)
+        self._record_usage(model, response)
 
         result: Dict[str, Any] = {
             "model_used": model,
@@ -364,11 +650,13 @@ class GeminiClient:
             pass  # output_resolution is set via API, SDK support may vary
 
         # Use async API for proper async handling
-        response = await self.client.aio.models.generate_images(
-            model=model,
-            prompt=prompt,
-            config=config,
-        )
+        client = await self._get_client()
+        async with self._rate_controller.slot(model):
+            response = await client.aio.models.generate_images(
+                model=model,
+                prompt=prompt,
+                config=config,
+            )
 
         result: Dict[str, Any] = {
             "model_used": model,
@@ -514,12 +802,18 @@ class GeminiClient:
         project_context: str = "",
         design_system_id: str = "",
         content_language: str = "tr",
+        on_section: Optional[SectionCallback] = None,
+        quality_target: str = "production",
+        tier: Optional[int] = None,
     ) -> Dict[str, Any]:
-        """Generate frontend component HTML using Gemini 3 Pro.
+        """Generate frontend component HTML using Gemini 3.
 
-        This method uses gemini-3-pro-preview exclusively for highest quality
-        design output. It leverages high thinking budget for complex design
-        reasoning and returns structured JSON with HTML and metadata.
+        The model, thinking level and output cap come from the routing
+        policy (component tier and quality target): simple components run on
+        Flash, complex ones and high quality targets on Pro. A Flash response
+        that fails to parse as a design is regenerated once on Pro. With
+        model routing disabled every call uses Pro with high thinking.
+        Returns structured JSON with HTML and metadata.
 
         Args:
             component_type: Type of component (button, card, navbar, etc.)
@@ -535,6 +829,13 @@ class GeminiClient:
                 across multiple components in the same project.
             content_language: Language code for generated content (tr, en, de).
                 Default is "tr" (Turkish).
+            on_section: Optional async callback; when set the response is
+                streamed and called per completed <!-- SECTION: x --> block
+                (full pages). Not called for cached results.
+            quality_target: QualityTarget value (draft, production, high,
+                premium, enterprise...) used for model routing.
+            tier: Component tier override (1-4) for model routing; None
+                resolves it from the component type.
 
         Returns:
             Dict containing:
@@ -548,9 +849,24 @@ class GeminiClient:
                 - micro_interactions: Animation/transition classes
                 - design_notes: Gemini's design decisions explanation
                 - model_used: Model that generated the design
+                - model_route: Routing decision (model, thinking level,
+                  output cap, tier, escalation)
         """
-        # Force Pro model for design quality
-        model = "gemini-3-pro-preview"
+        from .orchestration.routing import ModelRoute, SINGLE_SHOT_AGENT, get_routing_policy
+
+        # Model, thinking level and output cap for this component
+        policy = get_routing_policy() if self.config.model_routing_enabled else None
+        if policy is not None:
+            route = policy.route(SINGLE_SHOT_AGENT, component_type, quality_target, tier)
+        else:
+            route = ModelRoute(
+                agent_name=SINGLE_SHOT_AGENT,
+                model="gemini-3-pro-preview",
+                thinking_level="high",
+                max_output_tokens=65536,  # Gemini 3 max
+                tier=tier or 0,
+                quality_target=quality_target,
+            )
 
         # Create cache key parameters
         cache_params = {
@@ -560,13 +876,34 @@ class GeminiClient:
             "constraints": constraints,
             "content_language": content_language,
         }
-
-        # Check cache first
-        cached = self._cache.get(**cache_params)
+        # Other quality targets may route to another model: keep them apart
+        # (production keeps the existing keys)
+        if quality_target != "production":
+            cache_params["quality_target"] = quality_target
+        # With routing, tier picks the model too
+        if policy is not None:
+            cache_params["model"] = route.model
+
+        # Check cache first (exact, then near-duplicate wording)
+        cached = await self._cache.aget(**cache_params)
         if cached:
             logger.info(f"Cache hit for {component_type}")
             return cached
 
+        # A similar cached design can be refined instead of generated from scratch
+        # (including a near hit refused above because its content differs)
+        refine_threshold = (
+            self.config.near_duplicate_refine_threshold or self.config.near_duplicate_threshold
+        )
+        if refine_threshold > 0 and on_section is None:
+            seed = await self._cache.afind_similar(refine_threshold, **cache_params)
+            if seed is not None and seed[0].get("html"):
+                refined = await self._refine_cached_design(
+                    component_type, design_spec, seed, project_context, cache_params
+                )
+                if refined is not None:
+                    return refined
+
         # Get component preset for context
         component_preset = get_component_preset(component_type)
 
@@ -619,26 +956,26 @@ Respond ONLY with valid JSON."""
         # Build system prompt with project context
         system_prompt = build_system_prompt(project_context)
 
-        # Gemini 3 optimized config
-        # max_output_tokens increased to 65536 (Gemini 3 max)
-        gen_config = types.GenerateContentConfig(
-            temperature=1.0,  # Gemini 3 requires 1.0 for optimal reasoning
-            max_output_tokens=65536,
-            thinking_config=types.ThinkingConfig(
-                thinking_level="high",  # Max thinking for best design quality
-            ),
-            system_instruction=system_prompt,
-            response_mime_type="application/json",
-            response_schema=get_response_schema("design_component"),
-        )
-
         async def _call_api():
             """Inner async function for retry wrapper."""
-            response = await self.client.aio.models.generate_content(
-                model=model,
-                contents=prompt,
-                config=gen_config,
+            model = route.model
+            # Gemini 3 optimized config
+            gen_config = types.GenerateContentConfig(
+                temperature=1.0,  # Gemini 3 requires 1.0 for optimal reasoning
+                max_output_tokens=route.max_output_tokens,
+                thinking_config=types.ThinkingConfig(
+                    thinking_level=route.thinking_level,
+                ),
+                system_instruction=system_prompt,
+                response_mime_type="application/json",
+                response_schema=get_response_schema("design_component"),
+            )
+            start = time.perf_counter()
+            response = await self._generate(
+                model, prompt, gen_config, on_section, json_escaped=True
             )
+            usage = self._record_usage(model, response)
+            self._record_route(route, (time.perf_counter() - start) * 1000, usage)
 
             # Parse JSON response
             response_text = response.text.strip()
@@ -663,14 +1000,14 @@ Respond ONLY with valid JSON."""
                 if repaired:
                     logger.info("JSON repair successful")
                     repaired["model_used"] = model
+                    repaired["model_route"] = route.to_dict()
                     repaired["content_language"] = content_language
                     repaired["_repaired"] = True
 
                     # Validate and repair missing fields
                     repaired = ResponseValidator.repair(repaired, "design", component_type)
 
-                    # Cache even repaired results
-                    self._cache.set(repaired, **cache_params)
+                    # Cached by _routed_call once no escalation follows
                     return repaired
 
                 # Try to extract HTML as fallback
@@ -681,6 +1018,7 @@ Respond ONLY with valid JSON."""
                         "html": html_fallback,
                         "component_id": f"recovered_{component_type}",
                         "model_used": model,
+                        "model_route": route.to_dict(),
                         "content_language": content_language,
                         "_recovered_html": True,
                     }
@@ -703,6 +1041,7 @@ Respond ONLY with valid JSON."""
 
             # Add model info and language to result
             result["model_used"] = model
+            result["model_route"] = route.to_dict()
             result["content_language"] = content_language
 
             # Validate response (logs warnings, doesn't block)
@@ -725,19 +1064,85 @@ Respond ONLY with valid JSON."""
                 )
 
             # Cache successful result
-            self._cache.set(result, **cache_params)
+            await self._cache.aset(result, **cache_params)
 
             logger.info(
                 f"design_component completed: {component_type} -> {result.get('component_id', 'unknown')}"
             )
             return result
 
-        # Use centralized retry with auth error handling
-        return await with_retry(
-            _call_api,
-            strategy=self._recovery_strategy,
-            on_auth_error=self._refresh_credentials_and_client,
+        async def _routed_call():
+            """Generate, then once more on Pro if a Flash response did not parse."""
+            nonlocal route
+            # Use centralized retry with auth error handling
+            result = await with_retry(
+                _call_api,
+                strategy=self._recovery_strategy,
+                layer="client",
+                on_auth_error=self._refresh_credentials_and_client,
+            )
+            degraded = any(result.get(flag) for flag in ("_repaired", "_recovered_html", "recovery_failed"))
+            reason = policy.escalation_reason(route, validation_failed=degraded) if policy else ""
+            if reason:
+                route = policy.escalate(route, reason)
+                result = await with_retry(
+                    _call_api,
+                    strategy=self._recovery_strategy,
+                    layer="client",
+                    on_auth_error=self._refresh_credentials_and_client,
+                )
+            # Cache even repaired results, but only the final one: a repaired
+            # Flash response must not outlive a failed Pro retry
+            if result.get("_repaired"):
+                await self._cache.aset(result, **cache_params)
+            return result
+
+        # Identical concurrent requests share one call (single-flight)
+        return await self._cache.coalesce(_routed_call, **cache_params)
+
+    async def _refine_cached_design(
+        self,
+        component_type: str,
+        design_spec: Dict[str, Any],
+        seed: Tuple[Dict[str, Any], float],
+        project_context: str,
+        cache_params: Dict[str, Any],
+    ) -> Optional[Dict[str, Any]]:
+        """Adapt a similar cached design to a new request via refine_component.
+
+        Returns:
+            The refined design (cached under cache_params), or None if the
+            refinement failed and a fresh generation should run instead.
+        """
+        cached, similarity = seed
+        modifications = (
+            f"Adapt this {component_type} to a new request. "
+            f"Context: {design_spec.get('context', '')}\n"
+            f"Content: {json.dumps(design_spec.get('content_structure', {}), ensure_ascii=False)}\n"
+            "Keep the layout and visual style; change only what the new request needs."
+        )
+        try:
+            refined = await self.refine_component(
+                previous_html=cached["html"],
+                modifications=modifications,
+                project_context=project_context,
+            )
+        except Exception as e:
+            logger.warning(f"Seeded refine failed for {component_type}, generating fresh: {e}")
+            return None
+        if refined.get("error") or not refined.get("html"):
+            return None
+
+        result = {**cached, **refined}
+        result.pop("_near_duplicate", None)
+        result["content_language"] = cache_params["content_language"]
+        result["seeded_from_cache"] = {"similarity": round(similarity, 3)}
+        await self._cache.aset(result, **cache_params)
+        self._cache.record_refine_seed()
+        logger.info(
+            f"design_component seeded from cache: {component_type} (similarity={similarity:.2f})"
         )
+        return result
 
     async def refine_component(
         self,
@@ -811,11 +1216,8 @@ Respond with valid JSON containing:
 
         async def _call_api():
             """Inner async function for retry wrapper."""
-            response = await self.client.aio.models.generate_content(
-                model=model,
-                contents=prompt,
-                config=gen_config,
-            )
+            response = await self._generate(model, prompt, gen_config)
+            self._record_usage(model, response)
 
             # Parse JSON response
             response_text = response.text.strip()
@@ -852,6 +1254,7 @@ Respond with valid JSON containing:
         return await with_retry(
             _call_api,
             strategy=self._recovery_strategy,
+            layer="client",
             on_auth_error=self._refresh_credentials_and_client,
         )
 
@@ -1001,11 +1404,8 @@ Also include a "design_description" field with a 2-3 sentence description of the
 
         async def _call_api():
             """Inner async function for retry wrapper."""
-            response = await self.client.aio.models.generate_content(
-                model=model,
-                contents=contents,
-                config=gen_config,
-            )
+            response = await self._generate(model, contents, gen_config)
+            self._record_usage(model, response)
 
             # Parse JSON response
             response_text = response.text.strip()
@@ -1039,6 +1439,7 @@ Also include a "design_description" field with a 2-3 sentence description of the
         return await with_retry(
             _call_api,
             strategy=self._recovery_strategy,
+            layer="client",
             on_auth_error=self._refresh_credentials_and_client,
         )
 
@@ -1163,11 +1564,8 @@ Respond ONLY with valid JSON containing:
 
         async def _call_api() -> Dict[str, Any]:
             """Inner async function for retry wrapper."""
-            response = await self.client.aio.models.generate_content(
-                model=model,
-                contents=prompt,
-                config=gen_config,
-            )
+            response = await self._generate(model, prompt, gen_config)
+            self._record_usage(model, response)
 
             # Parse JSON response
             response_text = response.text.strip()
@@ -1210,6 +1608,7 @@ Respond ONLY with valid JSON containing:
         return await with_retry(
             _call_api,
             strategy=self._recovery_strategy,
+            layer="client",
             on_auth_error=self._refresh_credentials_and_client,
         )
 
@@ -1223,6 +1622,8 @@ Respond ONLY with valid JSON containing:
         theme: str = "modern-minimal",
         project_context: str = "",
         content_language: str = "tr",
+        on_section: Optional[SectionCallback] = None,
+        token_summary: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         """Design a single page section that matches previous sections.
 
@@ -1262,6 +1663,12 @@ Respond ONLY with valid JSON containing:
             project_context: Project context for design consistency.
             content_language: Language code for generated content (tr, en, de).
                 Default is "tr" (Turkish).
+            on_section: Optional async callback; when set the response is
+                streamed and called as soon as the section's HTML closes,
+                before the JSON metadata (design notes, tokens) finishes.
+            token_summary: ProjectTokenIndex.summary() of the project's
+                saved sections. Sent in place of previous_html, which is
+                then neither re-scanned nor included in the prompt.
 
         Returns:
             Dict containing:
@@ -1307,6 +1714,10 @@ Respond ONLY with valid JSON containing:
                 "typical_elements": [],
             }
 
+        # The token index already covers the page; don't send or re-scan its HTML
+        if token_summary:
+            previous_html = ""
+
         # Auto-extract design tokens from previous HTML if not provided
         if previous_html and not design_tokens:
             design_tokens = extract_design_tokens(previous_html)
@@ -1321,7 +1732,9 @@ Respond ONLY with valid JSON containing:
             previous_html=previous_html,
             design_tokens=design_tokens,
             project_context=project_context,
+            token_summary=token_summary,
         )
+        chain_mode = bool(previous_html or token_summary)
 
         # Build content structure for prompt
         structured_content = {
@@ -1331,7 +1744,7 @@ Respond ONLY with valid JSON containing:
             "context": context,
             "content_structure": content_structure or {},
             "theme": theme,
-            "has_previous_section": bool(previous_html),
+            "has_previous_section": chain_mode,
             "content_language": {
                 "code": lang_config.code,
                 "name": lang_config.name,
@@ -1352,7 +1765,7 @@ Respond ONLY with valid JSON containing:
 {lang_instruction}
 
 Generate a high-quality, production-ready HTML section following all rules in your system instructions.
-{"IMPORTANT: Match the design patterns from the previous section exactly." if previous_html else ""}
+{"IMPORTANT: Match the design patterns from the previous section exactly." if chain_mode else ""}
 
 Respond ONLY with valid JSON containing:
 - html: Self-contained HTML with TailwindCSS classes
@@ -1377,11 +1790,10 @@ Respond ONLY with valid JSON containing:
 
         async def _call_api() -> Dict[str, Any]:
             """Inner async function for retry wrapper."""
-            response = await self.client.aio.models.generate_content(
-                model=model,
-                contents=prompt,
-                config=gen_config,
+            response = await self._generate(
+                model, prompt, gen_config, on_section, json_escaped=True
             )
+            self._record_usage(model, response)
 
             # Parse JSON response
             response_text = response.text.strip()
@@ -1417,23 +1829,83 @@ Respond ONLY with valid JSON containing:
             result["model_used"] = model
             result["content_language"] = content_language
 
+            # Deliver the section now if the model omitted its markers
+            emitted = getattr(response, "sections_emitted", None)
+            if on_section is not None and result.get("html") and emitted == []:
+                await on_section(section_type, result["html"])
+
             # Validate response (logs warnings, doesn't block)
             self._validate_and_log_response(result, "design")
 
             logger.info(
                 f"design_section completed: {section_type} "
-                f"(chain_mode={'yes' if previous_html else 'no'})"
+                f"(chain_mode={'yes' if chain_mode else 'no'})"
             )
             return result
 
-        # Use centralized retry with auth error handling
-        return await with_retry(
-            _call_api,
-            strategy=self._recovery_strategy,
-            on_auth_error=self._refresh_credentials_and_client,
+        # Use centralized retry with auth error handling; identical
+        # concurrent requests share one call (single-flight)
+        return await self._cache.coalesce(
+            lambda: with_retry(
+                _call_api,
+                strategy=self._recovery_strategy,
+                layer="client",
+                on_auth_error=self._refresh_credentials_and_client,
+            ),
+            operation="design_section",
+            section_type=section_type,
+            context=context,
+            previous_html=previous_html,
+            design_tokens=design_tokens,
+            token_summary=token_summary,
+            content_structure=content_structure,
+            theme=theme,
+            project_context=project_context,
+            content_language=content_language,
         )
 
 
+def extract_token_usage(response: Any) -> Dict[str, int]:
+    """Read token counts from a generate_content response's usage_metadata.
+
+    input_tokens includes cached and tool-use prompt tokens; cached_tokens is
+    the part of the input served from cached content (billed at a discount).
+
+    Args:
+        response: generate_content response (or a streamed final chunk).
+
+    Returns:
+        Dict with input_tokens, output_tokens, thinking_tokens, cached_tokens
+        and total_tokens. Empty if the response carries no usage metadata.
+    """
+    usage = getattr(response, "usage_metadata", None)
+    if usage is None:
+        return {}
+
+    def _count(name: str) -> int:
+        value = getattr(usage, name, None)
+        return value if isinstance(value, int) else 0
+
+    input_tokens = _count("prompt_token_count") + _count("tool_use_prompt_token_count")
+    output_tokens = _count("candidates_token_count")
+    thinking_tokens = _count("thoughts_token_count")
+    return {
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "thinking_tokens": thinking_tokens,
+        "cached_tokens": _count("cached_content_token_count"),
+        "total_tokens": _count("total_token_count") or (input_tokens + output_tokens + thinking_tokens),
+    }
+
+
+def _is_cached_content_error(error: Exception) -> bool:
+    """Check if an API error means the cached_content handle is unusable."""
+    message = str(error).lower()
+    return ("cachedcontent" in message or "cached content" in message or "cached_content" in message) and (
+        "not found" in message or "expired" in message or "404" in message
+    )
+
+
 def fix_js_fallbacks(html: str) -> tuple[str, list[str]]:
     """Post-process HTML to ensure JS graceful degradation.
 
@@ -25,6 +25,48 @@ class GeminiConfig:
     # Image output settings
     default_image_output_dir: str = field(default_factory=lambda: os.getenv("GEMINI_IMAGE_OUTPUT_DIR", "./images"))
 
+    # Persistent design cache (L2) - set to empty string to keep the cache memory-only
+    design_cache_path: str = field(
+        default_factory=lambda: os.getenv("GEMINI_DESIGN_CACHE_PATH", "~/.gemini-mcp/design_cache.db")
+    )
+
+    # Near-duplicate design requests (same parameters and content, reworded context):
+    # reuse the cached design at or above this similarity (0 = exact matches only)
+    near_duplicate_threshold: float = field(
+        default_factory=lambda: float(os.getenv("GEMINI_NEAR_DUP_THRESHOLD", "0"))
+    )
+    # Refine the most similar cached design instead of a fresh generation at or
+    # above this similarity (0 = use near_duplicate_threshold, so a match whose
+    # content differs is refined rather than returned; both 0 = off)
+    near_duplicate_refine_threshold: float = field(
+        default_factory=lambda: float(os.getenv("GEMINI_NEAR_DUP_REFINE_THRESHOLD", "0"))
+    )
+
+    # Gemini context caching for agent system prompts (opt-in)
+    context_cache_enabled: bool = field(
+        default_factory=lambda: os.getenv("GEMINI_CONTEXT_CACHE", "").lower() in ("1", "true", "yes")
+    )
+    context_cache_ttl_seconds: int = field(
+        default_factory=lambda: int(os.getenv("GEMINI_CONTEXT_CACHE_TTL", "3600"))
+    )
+
+    # Route calls to Flash or Pro (thinking level, output cap) by agent,
+    # component tier and quality target; off = Pro with high thinking for all
+    model_routing_enabled: bool = field(
+        default_factory=lambda: os.getenv("GEMINI_MODEL_ROUTING", "1").lower() in ("1", "true", "yes")
+    )
+
+    # Alchemist → Critic candidates per refiner iteration (1 = serial loop);
+    # more candidates trade extra API calls for fewer serial round trips
+    speculative_candidates: int = field(
+        default_factory=lambda: int(os.getenv("GEMINI_SPECULATIVE_CANDIDATES", "1"))
+    )
+
+    # Ceiling of concurrent API calls per model (adapted down on 429s)
+    max_concurrency: int = field(
+        default_factory=lambda: int(os.getenv("GEMINI_MAX_CONCURRENCY", "8"))
+    )
+
     def __post_init__(self):
         """Validate configuration after initialization."""
         if not self.project_id:
@@ -10,6 +10,10 @@ Requirements:
 - Only system instructions and few-shot examples are cached
 - User content is NOT cached (privacy-safe)
 
+Handles are keyed per (agent, model, content hash) and are refreshed
+in place shortly before their TTL runs out, so a long-running server
+sends each agent's system prompt once per TTL window.
+
 Usage:
     >>> from gemini_mcp.context_cache import GeminiContextCache
     >>> cache = GeminiContextCache(project_id="my-project")
@@ -22,22 +26,26 @@ Usage:
     ... )
     >>>
     >>> # Use cached content in API call
-    >>> response = await client.generate_content(
-    ...     cached_content=cached.name,
-    ...     contents=[user_message]
+    >>> response = await client.aio.models.generate_content(
+    ...     model="gemini-2.5-pro",
+    ...     contents=user_message,
+    ...     config=types.GenerateContentConfig(cached_content=cached.cache_name),
     ... )
 """
 
 import hashlib
+import inspect
 import logging
 import time
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Any, Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, Optional, Union
 
 from google import genai
 from google.genai import types
 
+from .cache import SingleFlight
+
 logger = logging.getLogger(__name__)
 
 # Minimum tokens required for Gemini to cache content
@@ -49,6 +57,10 @@ DEFAULT_TTL_SECONDS = 3600
 # Maximum cache TTL in seconds (24 hours)
 MAX_TTL_SECONDS = 86400
 
+# Handles closer than this to expiry are refreshed before use, so a request
+# never races the server-side expiration of its cached content.
+REFRESH_MARGIN_SECONDS = 120
+
 
 @dataclass
 class CacheMetrics:
@@ -58,7 +70,11 @@ class CacheMetrics:
     misses: int = 0
     creates: int = 0
     errors: int = 0
+    refreshes: int = 0
+    invalidations: int = 0
+    coalesced: int = 0
     total_tokens_cached: int = 0
+    tokens_served_from_cache: int = 0
     estimated_savings_usd: float = 0.0
 
     @property
@@ -74,8 +90,12 @@ class CacheMetrics:
             "misses": self.misses,
             "creates": self.creates,
             "errors": self.errors,
+            "refreshes": self.refreshes,
+            "invalidations": self.invalidations,
+            "coalesced": self.coalesced,
             "hit_rate": round(self.hit_rate, 3),
             "total_tokens_cached": self.total_tokens_cached,
+            "tokens_served_from_cache": self.tokens_served_from_cache,
             "estimated_savings_usd": round(self.estimated_savings_usd, 4),
         }
 
@@ -88,6 +108,7 @@ class CachedPrompt:
     agent_name: str
     content_hash: str
     token_count: int
+    model: str = ""
     created_at: float = field(default_factory=time.time)
     expires_at: float = field(default_factory=lambda: time.time() + DEFAULT_TTL_SECONDS)
     hits: int = 0
@@ -102,6 +123,11 @@ class CachedPrompt:
         """Get remaining TTL in seconds."""
         return max(0, self.expires_at - time.time())
 
+    @property
+    def needs_refresh(self) -> bool:
+        """Check if the handle is close enough to expiry to refresh it."""
+        return self.ttl_remaining < REFRESH_MARGIN_SECONDS
+
     def touch(self) -> None:
         """Record a cache hit."""
         self.hits += 1
@@ -116,8 +142,9 @@ class GeminiContextCache:
 
     Key Features:
     - Automatic content hashing for deduplication
+    - Handles keyed per (agent, model, content hash)
     - Local tracking of remote cache entries
-    - Automatic TTL management
+    - Automatic TTL management (handles are extended before they expire)
     - Metrics collection for cost analysis
 
     Example:
@@ -142,6 +169,7 @@ class GeminiContextCache:
         location: str = "us-central1",
         ttl_seconds: int = DEFAULT_TTL_SECONDS,
         enabled: bool = True,
+        client_provider: Optional[Callable[[], Union[genai.Client, Awaitable[genai.Client]]]] = None,
     ):
         """Initialize the context cache manager.
 
@@ -150,15 +178,23 @@ class GeminiContextCache:
             location: Vertex AI location (e.g., "us-central1").
             ttl_seconds: Cache TTL in seconds (1-86400). Default: 3600 (1 hour).
             enabled: Whether caching is enabled. Default: True.
+            client_provider: Optional callable returning the genai.Client to
+                use (or an awaitable of it). Lets GeminiClient share its
+                authenticated client (which is recreated after credential
+                refreshes) without blocking the event loop.
         """
         self.project_id = project_id
         self.location = location
         self.ttl_seconds = min(max(ttl_seconds, 60), MAX_TTL_SECONDS)
         self.enabled = enabled
+        self._client_provider = client_provider
 
-        # Local cache tracking (content_hash -> CachedPrompt)
+        # Local cache tracking ("agent:model:content_hash" -> CachedPrompt)
         self._local_cache: Dict[str, CachedPrompt] = {}
 
+        # Concurrent misses for the same key share one caches.create call
+        self._flights = SingleFlight()
+
         # Metrics
         self._metrics = CacheMetrics()
 
@@ -171,8 +207,13 @@ class GeminiContextCache:
             f"ttl={ttl_seconds}s, enabled={enabled}"
         )
 
-    def _get_client(self) -> genai.Client:
+    async def _get_client(self) -> genai.Client:
         """Get or create the Genai client."""
+        if self._client_provider is not None:
+            client = self._client_provider()
+            if inspect.isawaitable(client):
+                client = await client
+            return client
         if self._client is None:
             self._client = genai.Client(
                 vertexai=True,
@@ -207,6 +248,11 @@ class GeminiContextCache:
         # Simple heuristic: ~4 chars per token (conservative)
         return len(content) // 4
 
+    @staticmethod
+    def _cache_key(agent_name: str, model: str, content_hash: str) -> str:
+        """Build the local tracking key for a cached prompt."""
+        return f"{agent_name}:{model}:{content_hash}"
+
     def _cleanup_expired(self) -> int:
         """Remove expired entries from local cache.
 
@@ -263,14 +309,18 @@ class GeminiContextCache:
 
         # Generate content hash
         content_hash = self._hash_content(full_content)
+        key = self._cache_key(agent_name, model, content_hash)
 
         # Clean up expired entries
         self._cleanup_expired()
 
         # Check local cache first
-        if content_hash in self._local_cache:
-            cached = self._local_cache[content_hash]
-            if not cached.is_expired:
+        cached = self._local_cache.get(key)
+        if cached is not None:
+            if cached.needs_refresh and not await self._refresh(cached):
+                # Could not extend the TTL - drop it and create a fresh handle
+                self._local_cache.pop(key, None)
+            else:
                 cached.touch()
                 self._metrics.hits += 1
                 logger.debug(
@@ -279,22 +329,51 @@ class GeminiContextCache:
                 )
                 return cached
 
-        # Cache miss - create new cached content
+        # Cache miss - create new cached content (once per key under a burst)
+        if key in self._flights:
+            self._metrics.coalesced += 1
+        return await self._flights.do(
+            key,
+            lambda: self._create(
+                key, agent_name, system_prompt, model, few_shot_examples,
+                content_hash, estimated_tokens,
+            ),
+        )
+
+    async def _create(
+        self,
+        key: str,
+        agent_name: str,
+        system_prompt: str,
+        model: str,
+        few_shot_examples: Optional[str],
+        content_hash: str,
+        estimated_tokens: int,
+    ) -> Optional[CachedPrompt]:
+        """Create the remote cached content for a local-cache miss."""
         self._metrics.misses += 1
 
         try:
-            client = self._get_client()
+            client = await self._get_client()
 
-            # Build cached content
-            cached_content = types.CachedContent(
-                model=model,
-                display_name=f"gemini-mcp-{agent_name}-{content_hash[:8]}",
-                system_instruction=system_prompt,
-                ttl=f"{self.ttl_seconds}s",
-            )
+            # Few-shot examples travel as cached user content next to the
+            # system instruction so the whole static prefix is cached.
+            contents = None
+            if few_shot_examples:
+                contents = [
+                    types.Content(role="user", parts=[types.Part(text=few_shot_examples)])
+                ]
 
             # Create on Google's side
-            result = await client.aio.caches.create(config=cached_content)
+            result = await client.aio.caches.create(
+                model=model,
+                config=types.CreateCachedContentConfig(
+                    display_name=f"gemini-mcp-{agent_name}-{content_hash[:8]}",
+                    system_instruction=system_prompt,
+                    contents=contents,
+                    ttl=f"{self.ttl_seconds}s",
+                ),
+            )
 
             # Track locally
             cached_prompt = CachedPrompt(
@@ -302,19 +381,15 @@ class GeminiContextCache:
                 agent_name=agent_name,
                 content_hash=content_hash,
                 token_count=estimated_tokens,
+                model=model,
                 expires_at=time.time() + self.ttl_seconds,
             )
-            self._local_cache[content_hash] = cached_prompt
+            self._local_cache[key] = cached_prompt
 
             # Update metrics
             self._metrics.creates += 1
             self._metrics.total_tokens_cached += estimated_tokens
 
-            # Estimate savings (assuming $0.00025 per 1K input tokens)
-            self._metrics.estimated_savings_usd += (
-                estimated_tokens / 1000 * 0.00025 * 0.75  # 75% savings
-            )
-
             logger.info(
                 f"Created cache for {agent_name}: {result.name} "
                 f"({estimated_tokens} tokens, ttl={self.ttl_seconds}s)"
@@ -327,6 +402,64 @@ class GeminiContextCache:
             logger.error(f"Failed to create cache for {agent_name}: {e}")
             return None
 
+    async def _refresh(self, cached: CachedPrompt) -> bool:
+        """Extend the server-side TTL of a handle that is about to expire.
+
+        Args:
+            cached: The handle to refresh.
+
+        Returns:
+            True if the TTL was extended, False otherwise.
+        """
+        try:
+            client = await self._get_client()
+            await client.aio.caches.update(
+                name=cached.cache_name,
+                config=types.UpdateCachedContentConfig(ttl=f"{self.ttl_seconds}s"),
+            )
+            cached.expires_at = time.time() + self.ttl_seconds
+            self._metrics.refreshes += 1
+            logger.debug(f"Refreshed cache {cached.cache_name} (ttl={self.ttl_seconds}s)")
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to refresh cache {cached.cache_name}: {e}")
+            return False
+
+    def invalidate(self, cache_name: str) -> bool:
+        """Forget a handle the server no longer knows about.
+
+        Called when a request using the handle fails because the cached
+        content was deleted or expired server-side. The next get_or_create()
+        for the same prompt creates a fresh handle.
+
+        Args:
+            cache_name: Google's cache resource name.
+
+        Returns:
+            True if a local entry was removed.
+        """
+        for key, cached in list(self._local_cache.items()):
+            if cached.cache_name == cache_name:
+                del self._local_cache[key]
+                self._metrics.invalidations += 1
+                logger.info(f"Invalidated cache handle: {cache_name}")
+                return True
+        return False
+
+    def record_usage(self, cached_tokens: int) -> None:
+        """Record prompt tokens that were served from cached content.
+
+        Args:
+            cached_tokens: cached_content_token_count reported by the API.
+        """
+        if cached_tokens <= 0:
+            return
+        self._metrics.tokens_served_from_cache += cached_tokens
+        # Estimate savings (assuming $0.00025 per 1K input tokens)
+        self._metrics.estimated_savings_usd += (
+            cached_tokens / 1000 * 0.00025 * 0.75  # 75% savings
+        )
+
     async def delete(self, content_hash: str) -> bool:
         """Delete a cached content entry.
 
@@ -336,15 +469,19 @@ class GeminiContextCache:
         Returns:
             True if deleted, False otherwise.
         """
-        if content_hash not in self._local_cache:
+        key = next(
+            (k for k, c in self._local_cache.items() if c.content_hash == content_hash),
+            None,
+        )
+        if key is None:
             return False
 
-        cached = self._local_cache[content_hash]
+        cached = self._local_cache[key]
 
         try:
-            client = self._get_client()
+            client = await self._get_client()
             await client.aio.caches.delete(name=cached.cache_name)
-            del self._local_cache[content_hash]
+            del self._local_cache[key]
             logger.info(f"Deleted cache: {cached.cache_name}")
             return True
         except Exception as e:
@@ -358,11 +495,12 @@ class GeminiContextCache:
             List of cache entry summaries.
         """
         entries = []
-        for hash_key, cached in self._local_cache.items():
+        for cached in self._local_cache.values():
             entries.append({
                 "cache_name": cached.cache_name,
                 "agent_name": cached.agent_name,
-                "content_hash": hash_key,
+                "model": cached.model,
+                "content_hash": cached.content_hash,
                 "token_count": cached.token_count,
                 "hits": cached.hits,
                 "ttl_remaining": round(cached.ttl_remaining),
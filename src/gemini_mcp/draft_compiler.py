@@ -0,0 +1,364 @@
+"""
+Streaming Project Compiler for Gemini MCP.
+
+Combines the latest HTML draft of each component in a draft project into
+one page with bounded memory:
+
+- The latest version per component comes from the DraftManager index
+  (no manifest load or sort).
+- Each draft is scanned in fixed-size chunks for its <body> content (same
+  rule as the previous `<body[^>]*>(.*?)</body>` regex: whole file if there
+  is no complete body) and streamed through without being read whole.
+- The page is written incrementally via DraftManager.save_artifact_stream.
+- Optionally, the latest CSS/JS drafts of all components are emitted as one
+  deduplicated bundle each: CSS by top-level rule, JS by file content.
+"""
+
+import codecs
+import hashlib
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from .state import DraftManager
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+COMPILED_COMPONENT = "compiled_full_page"
+
+PAGE_HEAD = """<!DOCTYPE html><html lang="tr"><head>
+    <meta charset="UTF-8"><meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <script src="https://cdn.tailwindcss.com"></script>
+    <script defer src="https://cdn.jsdelivr.net/npm/alpinejs@3.x.x/dist/cdn.min.js"></script>
+    <link href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap" rel="stylesheet">
+    """
+
+_BODY_OPEN = b"<body"
+_BODY_CLOSE = b"</body>"
+
+
+@dataclass
+class CompileResult:
+    """Outcome of compile_project()."""
+    path: str = ""
+    components: int = 0
+    bytes_written: int = 0
+    css_path: str = ""
+    css_rules: int = 0
+    css_duplicates: int = 0
+    js_path: str = ""
+    js_files: int = 0
+    js_duplicates: int = 0
+
+
+def find_body_span(stream, chunk_size: int = CHUNK_SIZE) -> Optional[Tuple[int, int]]:
+    """Byte offsets (start, end) of the first complete <body ...>...</body> content.
+
+    Reads the stream once in chunks; returns None when there is no body
+    element closed by </body>.
+    """
+    buf = b""
+    base = 0  # absolute offset of buf[0]
+    phase = 0  # 0: looking for "<body", 1: for its ">", 2: for "</body>"
+    start = 0
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            return None
+        buf += chunk
+        while True:
+            if phase == 0:
+                i = buf.find(_BODY_OPEN)
+                if i < 0:
+                    keep = len(_BODY_OPEN) - 1
+                    break
+                base += i + len(_BODY_OPEN)
+                buf = buf[i + len(_BODY_OPEN):]
+                phase = 1
+            elif phase == 1:
+                i = buf.find(b">")
+                if i < 0:
+                    keep = 0
+                    break
+                start = base + i + 1
+                buf = buf[i + 1:]
+                base = start
+                phase = 2
+            else:
+                i = buf.find(_BODY_CLOSE)
+                if i < 0:
+                    keep = len(_BODY_CLOSE) - 1
+                    break
+                return start, base + i
+        if len(buf) > keep:
+            base += len(buf) - keep
+            buf = buf[len(buf) - keep:] if keep else b""
+
+
+def _skip(stream, count: int, chunk_size: int = CHUNK_SIZE) -> None:
+    seekable = getattr(stream, "seekable", None)
+    if seekable is not None and seekable():
+        stream.seek(count)
+        return
+    while count > 0:
+        data = stream.read(min(chunk_size, count))
+        if not data:
+            return
+        count -= len(data)
+
+
+def iter_body_content(open_stream: Callable, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """Yield the decoded body content of a draft (whole draft if no body).
+
+    Args:
+        open_stream: Returns a fresh binary stream of the draft each call
+            (the draft is read twice: once to locate the body, once to
+            stream it)
+    """
+    with open_stream() as stream:
+        span = find_body_span(stream, chunk_size)
+
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    with open_stream() as stream:
+        remaining = None
+        if span:
+            _skip(stream, span[0], chunk_size)
+            remaining = span[1] - span[0]
+        while remaining is None or remaining > 0:
+            data = stream.read(chunk_size if remaining is None else min(chunk_size, remaining))
+            if not data:
+                break
+            if remaining is not None:
+                remaining -= len(data)
+            text = decoder.decode(data)
+            if text:
+                yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+class CSSRuleDeduper:
+    """Splits a CSS stream into top-level blocks and drops repeated ones.
+
+    A block is a rule or at-rule up to its closing brace, or a statement
+    such as @import up to its semicolon. Blocks are compared with
+    whitespace collapsed; comments and strings are respected when
+    tracking braces.
+    """
+
+    def __init__(self):
+        self._seen = set()
+        self._buf: List[str] = []
+        self._depth = 0
+        self._quote = ""
+        self._comment = False
+        self._prev = ""
+        self.rules = 0
+        self.duplicates = 0
+
+    def feed(self, text: str) -> List[str]:
+        """Consume CSS text; return the new unique blocks it completed."""
+        out: List[str] = []
+        buf = self._buf
+        for ch in text:
+            buf.append(ch)
+            prev, self._prev = self._prev, ch
+            if self._comment:
+                if prev == "*" and ch == "/":
+                    self._comment = False
+                    self._prev = ""
+            elif self._quote:
+                if ch == self._quote and prev != "\\":
+                    self._quote = ""
+            elif prev == "/" and ch == "*":
+                self._comment = True
+                self._prev = ""
+            elif ch in "\"'":
+                self._quote = ch
+            elif ch == "{":
+                self._depth += 1
+            elif ch == "}":
+                self._depth = max(0, self._depth - 1)
+                if self._depth == 0:
+                    self._emit(out)
+            elif ch == ";" and self._depth == 0:
+                self._emit(out)
+        return out
+
+    def flush(self) -> List[str]:
+        """Return the trailing (unterminated) block, if new."""
+        out: List[str] = []
+        self._emit(out)
+        self._depth, self._quote, self._comment, self._prev = 0, "", False, ""
+        return out
+
+    def _emit(self, out: List[str]) -> None:
+        block = "".join(self._buf).strip()
+        self._buf.clear()
+        if not block:
+            return
+        key = hashlib.sha256(" ".join(block.split()).encode()).hexdigest()[:16]
+        if key in self._seen:
+            self.duplicates += 1
+            return
+        self._seen.add(key)
+        self.rules += 1
+        out.append(block)
+
+
+def _iter_text(manager: DraftManager, entry: Dict, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    stream = manager.open_artifact(entry)
+    if stream is None:
+        raise FileNotFoundError(entry.get("path", ""))
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    with stream:
+        while True:
+            data = stream.read(chunk_size)
+            if not data:
+                break
+            text = decoder.decode(data)
+            if text:
+                yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def _css_bundle(manager: DraftManager, entries: Dict[str, Dict], result: CompileResult) -> Iterator[str]:
+    deduper = CSSRuleDeduper()
+    for component, entry in entries.items():
+        header = f"/* {component} */\n"
+        try:
+            for piece in _iter_text(manager, entry):
+                blocks = deduper.feed(piece)
+                if blocks:
+                    yield header + "\n".join(blocks) + "\n"
+                    header = ""
+            blocks = deduper.flush()
+            if blocks:
+                yield header + "\n".join(blocks) + "\n"
+        except Exception as e:
+            deduper.flush()
+            yield f"/* FAILED TO LOAD {component}: {e} */\n"
+    result.css_rules = deduper.rules
+    result.css_duplicates = deduper.duplicates
+
+
+def _content_digest(manager: DraftManager, entry: Dict) -> str:
+    if entry.get("blob"):
+        return entry["blob"]
+    digest = hashlib.sha256()
+    for piece in _iter_text(manager, entry):
+        digest.update(piece.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _js_bundle(manager: DraftManager, entries: Dict[str, Dict], result: CompileResult) -> Iterator[str]:
+    seen = set()
+    for component, entry in entries.items():
+        try:
+            digest = _content_digest(manager, entry)
+            if digest in seen:
+                result.js_duplicates += 1
+                continue
+            seen.add(digest)
+            yield f"/* {component} */\n"
+            yield from _iter_text(manager, entry)
+            yield "\n;\n"
+            result.js_files += 1
+        except Exception as e:
+            yield f"/* FAILED TO LOAD {component}: {e} */\n"
+
+
+def _page(
+    manager: DraftManager,
+    entries: Dict[str, Dict],
+    css_name: str,
+    js_name: str,
+    result: CompileResult,
+) -> Iterator[str]:
+    head = PAGE_HEAD
+    if css_name:
+        head += f'<link rel="stylesheet" href="{css_name}">\n    '
+    yield head + '</head><body class="bg-gray-50">'
+
+    for component, entry in entries.items():
+        probe = manager.open_artifact(entry)
+        if probe is None:
+            yield f"\n<!-- FAILED TO LOAD {component}: {entry.get('path', '')} -->\n"
+            continue
+        probe.close()
+        yield f"\n<!-- SECTION: {component} -->\n"
+        try:
+            yield from iter_body_content(lambda: manager.open_artifact(entry))
+        except Exception as e:
+            yield f"\n<!-- FAILED TO LOAD {component}: {e} -->\n"
+        yield "\n"
+        result.components += 1
+
+    if js_name:
+        yield f'\n<script src="{js_name}"></script>\n'
+    yield "</body></html>"
+
+
+def _latest(manager: DraftManager, project_name: str, extension: str) -> Dict[str, Dict]:
+    return {
+        component: entry
+        for component, entry in manager.latest_by_component(project_name, extension).items()
+        if not component.startswith(COMPILED_COMPONENT)
+    }
+
+
+def compile_project(
+    manager: DraftManager,
+    project_name: str,
+    bundle_assets: bool = False,
+) -> CompileResult:
+    """Compile a project's latest HTML drafts into one page (streaming).
+
+    Args:
+        manager: Draft store to read from and save the page into
+        project_name: Draft project
+        bundle_assets: Also write deduplicated CSS and JS bundles of the
+            components' latest CSS/JS drafts and link them from the page
+
+    Returns:
+        CompileResult; components == 0 means there was nothing to compile
+    """
+    result = CompileResult()
+    html_entries = _latest(manager, project_name, "html")
+    if not html_entries:
+        return result
+
+    css_name = js_name = ""
+    if bundle_assets:
+        css_entries = _latest(manager, project_name, "css")
+        if css_entries:
+            result.css_path = manager.save_artifact_stream(
+                _css_bundle(manager, css_entries, result), "css", project_name,
+                component_type=f"{COMPILED_COMPONENT}_styles",
+            )
+            css_name = Path(result.css_path).name if result.css_path else ""
+        js_entries = _latest(manager, project_name, "js")
+        if js_entries:
+            result.js_path = manager.save_artifact_stream(
+                _js_bundle(manager, js_entries, result), "js", project_name,
+                component_type=f"{COMPILED_COMPONENT}_scripts",
+            )
+            js_name = Path(result.js_path).name if result.js_path else ""
+
+    result.path = manager.save_artifact_stream(
+        _page(manager, html_entries, css_name, js_name, result), "html", project_name,
+        component_type=COMPILED_COMPONENT,
+    )
+    if result.path:
+        result.bytes_written = Path(result.path).stat().st_size
+    logger.info(
+        f"Compiled {result.components} components of '{project_name}' into {result.path} "
+        f"(css_rules={result.css_rules}, css_duplicates={result.css_duplicates}, "
+        f"js_files={result.js_files}, js_duplicates={result.js_duplicates})"
+    )
+    return result
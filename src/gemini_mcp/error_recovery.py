@@ -7,14 +7,17 @@ Includes both async and sync retry wrappers for use across the codebase.
 """
 
 import asyncio
+import contextvars
 import functools
+import inspect
 import logging
 import json
 import re
 import time
-from dataclasses import dataclass
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional, TypeVar, Awaitable
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar, Awaitable
 
 logger = logging.getLogger(__name__)
 
@@ -343,20 +346,197 @@ def generate_fallback_html(component_type: str, error_message: str) -> str:
     return html.strip()
 
 
+# =============================================================================
+# RETRY BUDGET (Shared by every retry layer of one request)
+# =============================================================================
+
+# Retries allowed across all layers of one request (server, client, agents)
+DEFAULT_RETRY_BUDGET = 4
+# Wall-clock deadline for one request, retries included
+DEFAULT_RETRY_DEADLINE_SECONDS = 300.0
+
+
+class RetryBudgetExhausted(Exception):
+    """Raised when a request's retry deadline has passed before an attempt."""
+
+
+@dataclass
+class RetryMetrics:
+    """Process-wide retry counters, per retry layer."""
+
+    retries: Dict[str, int] = field(default_factory=dict)
+    aborts: Dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for reporting."""
+        return {
+            "retries": dict(self.retries),
+            "aborts": dict(self.aborts),
+            "total_retries": sum(self.retries.values()),
+            "total_aborts": sum(self.aborts.values()),
+        }
+
+
+_retry_metrics = RetryMetrics()
+
+
+@dataclass
+class RetryBudget:
+    """Retry allowance shared by every layer handling one request.
+
+    Nested retry loops (safe_design_call → with_retry in the client,
+    orchestrator self-correction → agent retries) each ask the same budget
+    before retrying, so one failing request cannot multiply into a dozen
+    calls, and nothing is retried once the deadline has passed.
+
+    Attributes:
+        max_retries: Retries allowed in total across all layers
+        deadline_seconds: Wall-clock limit measured from creation
+    """
+
+    max_retries: int = DEFAULT_RETRY_BUDGET
+    deadline_seconds: float = DEFAULT_RETRY_DEADLINE_SECONDS
+    started_at: float = field(default_factory=time.monotonic)
+    retries_used: int = 0
+    retries_by_layer: Dict[str, int] = field(default_factory=dict)
+    abort_reason: str = ""
+
+    @property
+    def remaining_seconds(self) -> float:
+        """Seconds left before the deadline (never negative)."""
+        return max(0.0, self.started_at + self.deadline_seconds - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        """Whether the deadline has passed."""
+        return self.remaining_seconds <= 0
+
+    def consume(self, layer: str, delay: float = 0.0) -> bool:
+        """Take one retry for a layer, if the budget and deadline allow it.
+
+        Args:
+            layer: Name of the retrying layer (for metrics).
+            delay: Backoff the layer will sleep before retrying.
+
+        Returns:
+            True if the retry may proceed, False if the layer must give up.
+        """
+        if self.retries_used >= self.max_retries:
+            reason = "budget"
+        elif delay >= self.remaining_seconds:
+            reason = "deadline"
+        else:
+            self.retries_used += 1
+            self.retries_by_layer[layer] = self.retries_by_layer.get(layer, 0) + 1
+            _retry_metrics.retries[layer] = _retry_metrics.retries.get(layer, 0) + 1
+            return True
+
+        self.abort_reason = reason
+        key = f"{layer}:{reason}"
+        _retry_metrics.aborts[key] = _retry_metrics.aborts.get(key, 0) + 1
+        logger.warning(
+            f"Retry budget exhausted in {layer} ({reason}): "
+            f"{self.retries_used}/{self.max_retries} retries used, "
+            f"{self.remaining_seconds:.1f}s left"
+        )
+        return False
+
+    def check_deadline(self, layer: str) -> None:
+        """Fail fast if the deadline passed before a new attempt.
+
+        Raises:
+            RetryBudgetExhausted: The deadline has passed.
+        """
+        if self.expired:
+            self.abort_reason = "deadline"
+            key = f"{layer}:deadline"
+            _retry_metrics.aborts[key] = _retry_metrics.aborts.get(key, 0) + 1
+            raise RetryBudgetExhausted(
+                f"Request deadline of {self.deadline_seconds:.0f}s exceeded in {layer}"
+            )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for reporting."""
+        return {
+            "max_retries": self.max_retries,
+            "retries_used": self.retries_used,
+            "retries_by_layer": dict(self.retries_by_layer),
+            "deadline_seconds": self.deadline_seconds,
+            "remaining_seconds": round(self.remaining_seconds, 1),
+            "abort_reason": self.abort_reason,
+        }
+
+
+_current_budget: contextvars.ContextVar[Optional[RetryBudget]] = contextvars.ContextVar(
+    "retry_budget", default=None
+)
+
+
+def current_retry_budget() -> Optional[RetryBudget]:
+    """Retry budget of the request running in the current task, if any."""
+    return _current_budget.get()
+
+
+@contextmanager
+def retry_budget(
+    max_retries: int = DEFAULT_RETRY_BUDGET,
+    deadline_seconds: float = DEFAULT_RETRY_DEADLINE_SECONDS,
+) -> Iterator[RetryBudget]:
+    """Run the block (and tasks it spawns) under one retry budget.
+
+    Nested scopes reuse the outermost budget, so the first layer that
+    starts handling a request decides its allowance.
+
+    Example:
+        >>> with retry_budget(max_retries=3, deadline_seconds=120) as budget:
+        ...     result = await client.design_component(...)
+        >>> budget.retries_used
+        1
+    """
+    active = _current_budget.get()
+    if active is not None:
+        yield active
+        return
+
+    budget = RetryBudget(max_retries=max_retries, deadline_seconds=deadline_seconds)
+    token = _current_budget.set(budget)
+    try:
+        yield budget
+    finally:
+        _current_budget.reset(token)
+
+
+def get_retry_stats() -> Dict[str, Any]:
+    """Retry and abort counts per layer since start (or the last reset)."""
+    return _retry_metrics.to_dict()
+
+
+def reset_retry_stats() -> None:
+    """Reset the process-wide retry counters (for testing)."""
+    global _retry_metrics
+    _retry_metrics = RetryMetrics()
+
+
 async def with_retry(
     func: Callable[..., Awaitable[T]],
     strategy: Optional[RecoveryStrategy] = None,
-    on_auth_error: Optional[Callable[[], None]] = None,
+    on_auth_error: Optional[Callable[[], Any]] = None,
     on_retry: Optional[Callable[[int, Exception], None]] = None,
+    layer: str = "with_retry",
 ) -> T:
     """Execute an async function with retry logic.
 
+    Retries also draw on the current RetryBudget (see retry_budget), if
+    one is active: once it is spent or its deadline has passed, the last
+    error is raised without further attempts.
+
     Args:
         func: Async function to execute.
         strategy: Recovery strategy configuration.
         on_auth_error: Optional callback invoked when auth error detected.
-                      Typically used to refresh credentials.
+                      Typically used to refresh credentials. May be async.
         on_retry: Optional callback called on each retry.
+        layer: Name reported in retry metrics.
 
     Returns:
         The result of the function.
@@ -367,9 +547,12 @@ async def with_retry(
     if strategy is None:
         strategy = RecoveryStrategy()
 
+    budget = current_retry_budget()
     last_error: Optional[Exception] = None
 
     for attempt in range(strategy.max_retries + 1):
+        if budget is not None:
+            budget.check_deadline(layer)
         try:
             return await func()
         except Exception as e:
@@ -381,7 +564,9 @@ async def with_retry(
             auth_error_handled = False
             if is_auth_error(e) and on_auth_error is not None:
                 logger.info("Auth error detected, invoking refresh callback")
-                on_auth_error()
+                refreshed = on_auth_error()
+                if inspect.isawaitable(refreshed):
+                    await refreshed
                 auth_error_handled = True
 
             # Check if we should retry this error type
@@ -402,6 +587,9 @@ async def with_retry(
                 f"Retrying in {delay:.1f}s..."
             )
 
+            if budget is not None and not budget.consume(layer, delay):
+                raise
+
             if on_retry:
                 on_retry(attempt, e)
 
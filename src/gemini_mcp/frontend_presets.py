@@ -1593,6 +1593,27 @@ Return JSON with:
 - design_notes: Explain how you matched the previous section's style
 """
 
+SECTION_TOKEN_CHAIN_PROMPT = """
+## SECTION CHAIN MODE
+
+You are designing a SINGLE SECTION that must visually match the sections
+already on this page. Instead of their HTML you get the page's design
+tokens: the Tailwind classes used per category, most frequent first.
+
+### Design Continuity Rules
+1. USE THE SAME color classes, preferring the most frequent ones
+2. MATCH the typography classes for headings and body text
+3. MAINTAIN the spacing scale (section padding, gaps, container width)
+4. REUSE the effect classes (radius, shadows, transitions)
+5. ENSURE responsive breakpoints align
+
+### Output Requirements
+Return JSON with:
+- html: The new section HTML
+- design_tokens: Extracted design tokens from YOUR output (for next section)
+- design_notes: Explain how you matched the page's tokens
+"""
+
 # Available section types for design_section
 SECTION_TYPES: Dict[str, Dict[str, Any]] = {
     "hero": {
@@ -1748,6 +1769,7 @@ def build_section_prompt(
     previous_html: str = "",
     design_tokens: Dict[str, Any] = None,
     project_context: str = "",
+    token_summary: Optional[Dict[str, Any]] = None,
 ) -> str:
     """Build a prompt for designing a section in chain mode.
 
@@ -1757,6 +1779,9 @@ def build_section_prompt(
         previous_html: HTML from the previous section (for style matching).
         design_tokens: Extracted design tokens from previous section.
         project_context: Project-specific context.
+        token_summary: ProjectTokenIndex.summary() of the sections saved so
+            far. When given it replaces previous_html, so the prompt stays
+            the same size however long the page grows.
 
     Returns:
         Complete prompt for section design.
@@ -1783,8 +1808,18 @@ Design a **{section_type}** section: {section_desc}
 
 """
 
+    # Chain mode from the project token index: tokens only, no prior HTML
+    if token_summary:
+        section_prompt += SECTION_TOKEN_CHAIN_PROMPT
+        section_prompt += f"""
+### Page Design Tokens (sections: {", ".join(token_summary.get("sections", []))})
+```json
+{json.dumps({k: v for k, v in token_summary.items() if k != "sections"}, separators=(",", ":"))}
+```
+
+"""
     # Add chain mode if previous HTML exists
-    if previous_html:
+    elif previous_html:
         section_prompt += SECTION_CHAIN_PROMPT
         section_prompt += f"""
 ### Previous Section HTML
@@ -5,6 +5,7 @@ Based on Vertex AI Gemini pricing:
 - Input tokens: $0.00025/1K
 - Output tokens: $0.00125/1K
 - Thinking tokens: $0.0025/1K (10x output)
+- Cached input tokens: $0.0000625/1K (75% discount on input)
 """
 from __future__ import annotations
 
@@ -19,6 +20,7 @@ PRICING: dict[str, float] = {
     "input": 0.00025,
     "output": 0.00125,
     "thinking": 0.0025,
+    "cached_input": 0.0000625,
 }
 
 
@@ -29,6 +31,7 @@ class CostBreakdown:
     input_tokens: int = 0
     output_tokens: int = 0
     thinking_tokens: int = 0
+    cached_tokens: int = 0  # Portion of input_tokens served from context cache
 
     @property
     def total_tokens(self) -> int:
@@ -37,8 +40,11 @@ class CostBreakdown:
 
     @property
     def input_cost(self) -> float:
-        """Cost for input tokens in USD."""
-        return (self.input_tokens / 1000) * PRICING["input"]
+        """Cost for input tokens in USD (cached tokens at the discounted rate)."""
+        uncached = max(self.input_tokens - self.cached_tokens, 0)
+        return (uncached / 1000) * PRICING["input"] + (
+            self.cached_tokens / 1000
+        ) * PRICING["cached_input"]
 
     @property
     def output_cost(self) -> float:
@@ -61,6 +67,7 @@ class CostBreakdown:
             input_tokens=self.input_tokens + other.input_tokens,
             output_tokens=self.output_tokens + other.output_tokens,
             thinking_tokens=self.thinking_tokens + other.thinking_tokens,
+            cached_tokens=self.cached_tokens + other.cached_tokens,
         )
 
     def to_dict(self) -> dict[str, Any]:
@@ -70,6 +77,7 @@ class CostBreakdown:
                 "input": self.input_tokens,
                 "output": self.output_tokens,
                 "thinking": self.thinking_tokens,
+                "cached": self.cached_tokens,
                 "total": self.total_tokens,
             },
             "cost_usd": {
@@ -139,6 +147,7 @@ class CostAnalyzer:
         input_tokens: int = 0,
         output_tokens: int = 0,
         thinking_tokens: int = 0,
+        cached_tokens: int = 0,
     ) -> None:
         """
         Record token usage from an API call.
@@ -148,6 +157,7 @@ class CostAnalyzer:
             input_tokens: Number of input tokens used
             output_tokens: Number of output tokens generated
             thinking_tokens: Number of thinking tokens used
+            cached_tokens: Number of input tokens served from context cache
         """
         if session_id not in self._session_costs:
             self.start_session(session_id)
@@ -156,12 +166,30 @@ class CostAnalyzer:
         costs.input_tokens += input_tokens
         costs.output_tokens += output_tokens
         costs.thinking_tokens += thinking_tokens
+        costs.cached_tokens += cached_tokens
 
         logger.debug(
             f"[CostAnalyzer] Recorded: {session_id} "
             f"+{input_tokens}in/{output_tokens}out/{thinking_tokens}think"
         )
 
+    def record_usage(self, session_id: str, token_usage: dict[str, int]) -> None:
+        """
+        Record real token usage reported by the API (usage_metadata).
+
+        Args:
+            session_id: Active session identifier
+            token_usage: Dict with input_tokens, output_tokens, thinking_tokens
+                and cached_tokens (as produced by GeminiClient / PipelineResult)
+        """
+        self.record_api_call(
+            session_id,
+            input_tokens=token_usage.get("input_tokens", 0),
+            output_tokens=token_usage.get("output_tokens", 0),
+            thinking_tokens=token_usage.get("thinking_tokens", 0),
+            cached_tokens=token_usage.get("cached_tokens", 0),
+        )
+
     def record_agent_call(
         self,
         session_id: str,
@@ -171,6 +199,8 @@ class CostAnalyzer:
         """
         Record estimated token usage for an agent call.
 
+        Prefer record_usage() when real usage_metadata counts are available.
+
         Args:
             session_id: Active session identifier
             agent_name: Name of the agent (e.g., "architect", "alchemist")
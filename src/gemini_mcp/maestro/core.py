@@ -17,7 +17,7 @@ from __future__ import annotations
 
 import logging
 import uuid
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Optional
 
 from gemini_mcp.maestro.decision.context_analyzer import ContextAnalyzer
 from gemini_mcp.maestro.decision.tree import DecisionTree
@@ -58,7 +58,7 @@ from gemini_mcp.maestro.intelligence import (
 )
 
 # Phase 7: DNA Integration
-from gemini_mcp.orchestration.dna_store import get_dna_store, DNAStore
+from gemini_mcp.orchestration.dna_store import DNAEntry, DNAStore, get_dna_store, project_id_from_context
 from gemini_mcp.orchestration.context import DesignDNA
 
 if TYPE_CHECKING:
@@ -153,16 +153,12 @@ class Maestro:
         # Phase 7: Load previous DNA for project continuity
         if project_context:
             try:
-                # Search for most recent DNA in this project (any component type)
-                previous_entries = self._dna_store.search(
-                    project_id=project_context,
-                    limit=1,
-                )
-                if previous_entries:
-                    context_data.design_tokens = previous_entries[0].dna.to_dict()
+                previous = self._find_project_dna(project_context)
+                if previous:
+                    context_data.design_tokens = previous.dna.to_dict()
                     logger.info(
-                        f"[Maestro] Loaded previous DNA for project: {project_context} "
-                        f"(from {previous_entries[0].component_type})"
+                        f"[Maestro] Loaded previous DNA for project: {previous.project_id} "
+                        f"(from {previous.component_type})"
                     )
             except Exception as e:
                 # DNA load failure should not break session start
@@ -379,6 +375,9 @@ class Maestro:
         # Phase 6: Generate execution summary
         # Add mode to result for summary generation
         result["mode"] = decision.mode
+        if result.get("token_usage"):
+            # Real usage_metadata counts from the Trifecta pipeline
+            self._cost_analyzer.record_usage(session_id, result["token_usage"])
         cost_breakdown = self._cost_analyzer.get_session_cost(session_id)
         execution_summary = generate_execution_summary(
             result=result,
@@ -575,6 +574,31 @@ class Maestro:
     # PHASE 7: DNA PERSISTENCE
     # =========================================================================
 
+    def _find_project_dna(self, project_context: str) -> Optional[DNAEntry]:
+        """
+        Find the stored DNA to seed a session of a project.
+
+        The project is project_context itself or, for free text such as
+        "Project: Acme SaaS, dark dashboard", the id the Strategist saves
+        under ("acme-saas"). Within the project, the entry whose component,
+        theme and mood words best match the context wins; on a tie the most
+        recent entry is used. Other projects are never consulted.
+        """
+        for project_id in dict.fromkeys([project_context, project_id_from_context(project_context)]):
+            if not project_id:
+                continue
+            latest = self._dna_store.search(project_id=project_id, limit=1)
+            if not latest:
+                continue
+            try:
+                similar = self._dna_store.find_similar(project_context, k=2, project_id=project_id)
+                if similar and (len(similar) == 1 or similar[0][1] > similar[1][1] + 1e-6):
+                    return similar[0][0]
+            except Exception as e:
+                logger.debug(f"[Maestro] DNA similarity lookup failed, using latest: {e}")
+            return latest[0]
+        return None
+
     def get_dna_history(
         self,
         project_id: str | None = None,
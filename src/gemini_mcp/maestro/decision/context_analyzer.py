@@ -20,6 +20,7 @@ import re
 from typing import Any
 
 from gemini_mcp.maestro.decision.models import ContextAnalysis
+from gemini_mcp.validation.document import ParsedDocument, parse_document
 
 logger = logging.getLogger(__name__)
 
@@ -123,20 +124,23 @@ class ContextAnalyzer:
 
     def __init__(self) -> None:
         """Initialize the ContextAnalyzer."""
-        # Compile regex patterns for performance
-        self._compiled_class_pattern = re.compile(r'class=["\']([^"\']*)["\']')
-        self._compiled_section_pattern = re.compile(self.SECTION_MARKER_PATTERN)
+        # Class tokens and section markers come from the shared ParsedDocument
 
     # =========================================================================
     # PUBLIC API
     # =========================================================================
 
-    def analyze(self, html: str | None) -> ContextAnalysis:
+    def analyze(
+        self,
+        html: str | None,
+        document: ParsedDocument | None = None,
+    ) -> ContextAnalysis:
         """
         Analyze HTML and extract design tokens.
 
         Args:
             html: HTML string to analyze (can be None)
+            document: Shared parse of ``html`` (parsed here if omitted)
 
         Returns:
             ContextAnalysis with extracted tokens
@@ -150,8 +154,10 @@ class ContextAnalyzer:
         result = ContextAnalysis(has_html=True)
 
         try:
+            doc = document if document is not None else parse_document(html)
+
             # Extract all Tailwind classes
-            result.tailwind_classes = self._extract_tailwind_classes(html)
+            result.tailwind_classes = self._extract_tailwind_classes(doc)
             logger.debug(f"[ContextAnalyzer] Found {len(result.tailwind_classes)} classes")
 
             # Detect colors by role
@@ -167,7 +173,7 @@ class ContextAnalyzer:
             result.detected_components = self._detect_components(html)
 
             # Detect section markers
-            result.section_markers = self._detect_section_markers(html)
+            result.section_markers = self._detect_section_markers(doc)
 
             # Infer theme from patterns
             result.detected_theme = self._infer_theme(result)
@@ -207,26 +213,21 @@ class ContextAnalyzer:
     # EXTRACTION METHODS
     # =========================================================================
 
-    def _extract_tailwind_classes(self, html: str) -> list[str]:
+    def _extract_tailwind_classes(self, doc: ParsedDocument) -> list[str]:
         """
         Extract all unique Tailwind CSS classes from HTML.
 
         Args:
-            html: HTML string
+            doc: Parsed HTML document
 
         Returns:
             Sorted list of unique class names
         """
-        matches = self._compiled_class_pattern.findall(html)
-
-        classes = set()
-        for match in matches:
-            for cls in match.split():
-                # Filter out non-Tailwind classes (rough heuristic)
-                if cls and not cls.startswith("js-") and not cls.startswith("_"):
-                    classes.add(cls)
-
-        return sorted(classes)
+        # Filter out non-Tailwind classes (rough heuristic)
+        return sorted(
+            cls for cls in doc.class_index
+            if not cls.startswith("js-") and not cls.startswith("_")
+        )
 
     def _detect_colors(self, classes: list[str]) -> dict[str, str]:
         """
@@ -307,19 +308,19 @@ class ContextAnalyzer:
 
         return components
 
-    def _detect_section_markers(self, html: str) -> list[str]:
+    def _detect_section_markers(self, doc: ParsedDocument) -> list[str]:
         """
         Detect section markers in HTML.
 
         Section markers follow the pattern: <!-- SECTION: {type} -->
 
         Args:
-            html: HTML string
+            doc: Parsed HTML document
 
         Returns:
             List of section types found
         """
-        return self._compiled_section_pattern.findall(html)
+        return doc.section_names
 
     # =========================================================================
     # THEME INFERENCE
@@ -13,8 +13,7 @@ Phase 5 Additions:
 from __future__ import annotations
 
 import logging
-import re
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Union
 
 from gemini_mcp.maestro.execution.adapters import (
     adapt_for_design_frontend,
@@ -30,6 +29,7 @@ from gemini_mcp.orchestration import (
     PipelineType,
     get_orchestrator,
 )
+from gemini_mcp.section_utils import SectionedPage
 
 if TYPE_CHECKING:
     from gemini_mcp.client import GeminiClient
@@ -176,9 +176,13 @@ class ToolExecutor:
         handler = getattr(self, handler_name)
 
         try:
+            usage_before = self._usage_snapshot()
             result = await handler(decision, context)
             logger.info(f"[ToolExecutor] Direct execution complete for: {decision.mode}")
             result["trifecta_enabled"] = False
+            token_usage = self._usage_delta(usage_before, self._usage_snapshot())
+            if token_usage:
+                result["token_usage"] = token_usage
             return result
         except ValueError as e:
             # Validation errors from adapters
@@ -197,6 +201,25 @@ class ToolExecutor:
                 "status": "failed",
             }
 
+    def _usage_snapshot(self) -> dict[str, int]:
+        """Sum the client's per-model token totals (empty if unavailable)."""
+        stats = getattr(self.client, "get_usage_stats", None)
+        per_model = stats() if callable(stats) else None
+        if not isinstance(per_model, dict):
+            return {}
+        totals: dict[str, int] = {}
+        for model_totals in per_model.values():
+            for key, value in model_totals.items():
+                if key != "calls":
+                    totals[key] = totals.get(key, 0) + value
+        return totals
+
+    @staticmethod
+    def _usage_delta(before: dict[str, int], after: dict[str, int]) -> dict[str, int]:
+        """Token usage spent between two snapshots (empty if nothing was spent)."""
+        delta = {key: value - before.get(key, 0) for key, value in after.items()}
+        return delta if any(delta.values()) else {}
+
     async def _execute_with_pipeline(
         self,
         decision: MaestroDecision,
@@ -432,11 +455,12 @@ class ToolExecutor:
         """
         params = adapt_for_replace_section(decision.parameters, context)
 
+        # One marker scan serves the extract, the splice and the section list
+        page = SectionedPage(params["page_html"])
+        preserved_sections = list(dict.fromkeys(page.names))
+
         # Extract existing section content for context
-        existing_section = self._extract_section(
-            params["page_html"],
-            params["section_type"],
-        )
+        existing_section = self._extract_section(page, params["section_type"])
 
         # Design new section
         new_section = await self.client.design_section(
@@ -453,7 +477,7 @@ class ToolExecutor:
         # Replace section in page HTML
         new_section_html = new_section.get("html", "")
         updated_html = self._replace_section_html(
-            params["page_html"],
+            page,
             params["section_type"],
             new_section_html,
         )
@@ -464,7 +488,7 @@ class ToolExecutor:
             "modified_section": params["section_type"],
             "new_section_html": new_section_html,
             "design_notes": new_section.get("design_notes", ""),
-            "preserved_sections": self._list_sections(params["page_html"]),
+            "preserved_sections": preserved_sections,
         }
 
     async def _execute_design_from_reference(
@@ -504,7 +528,7 @@ class ToolExecutor:
             logger.warning(f"Could not import build_style_guide, using empty guide")
             return {}
 
-    def _extract_section(self, html: str, section_type: str) -> str:
+    def _extract_section(self, html: Union[str, SectionedPage], section_type: str) -> str:
         """
         Extract a section from page HTML using section markers.
 
@@ -512,38 +536,39 @@ class ToolExecutor:
             <!-- SECTION: {type} --> ... content ... <!-- /SECTION: {type} -->
 
         Args:
-            html: Full page HTML
+            html: Full page HTML (or an already scanned SectionedPage)
             section_type: Type of section to extract
 
         Returns:
             Section content (without markers), or empty string if not found
         """
-        pattern = rf'<!-- SECTION: {section_type} -->(.*?)<!-- /SECTION: {section_type} -->'
-        match = re.search(pattern, html, re.DOTALL | re.IGNORECASE)
-        return match.group(1).strip() if match else ""
+        page = html if isinstance(html, SectionedPage) else SectionedPage(html)
+        return page.extract(section_type) or ""
 
     def _replace_section_html(
         self,
-        page_html: str,
+        page_html: Union[str, SectionedPage],
         section_type: str,
         new_section_html: str,
     ) -> str:
         """
         Replace a section in page HTML with new content.
 
-        Preserves section markers.
+        Preserves section markers. The page is returned unchanged if the
+        section is not present.
 
         Args:
-            page_html: Full page HTML with section markers
+            page_html: Full page HTML with section markers (or a SectionedPage)
             section_type: Type of section to replace
             new_section_html: New section content
 
         Returns:
             Updated page HTML with replaced section
         """
-        pattern = rf'(<!-- SECTION: {section_type} -->).*?(<!-- /SECTION: {section_type} -->)'
-        replacement = rf'\1\n{new_section_html}\n\2'
-        return re.sub(pattern, replacement, page_html, flags=re.DOTALL | re.IGNORECASE)
+        page = page_html if isinstance(page_html, SectionedPage) else SectionedPage(page_html)
+        if section_type in page:
+            page.replace(section_type, new_section_html)
+        return page.text
 
     def _list_sections(self, html: str) -> list[str]:
         """
@@ -553,8 +578,6 @@ class ToolExecutor:
             html: Page HTML with section markers
 
         Returns:
-            List of section type names
+            List of section type names (unique, in page order)
         """
-        pattern = r'<!-- SECTION: (\w+) -->'
-        matches = re.findall(pattern, html, re.IGNORECASE)
-        return list(set(matches))
+        return list(dict.fromkeys(SectionedPage(html).names))
@@ -4,9 +4,11 @@ Orchestration Module - Multi-Agent Pipeline Coordination
 This module handles the coordination of multiple agents in design pipelines:
 - AgentContext: Shared context passed between agents
 - PipelineType: Different pipeline configurations per tool
+- DAGScheduler: Runs pipeline nodes as soon as their input artifacts are ready
 - AgentOrchestrator: Main coordinator for running pipelines
 - CheckpointManager: Error recovery and state management
 - PipelineTelemetry: Metrics collection and observability
+- RoutingPolicy: Flash vs Pro, thinking level and output cap per agent call
 
 Phase 7 Additions:
 - InteractionSpec: Structural map for Architect→Physicist communication
@@ -22,7 +24,8 @@ from gemini_mcp.orchestration.context import (
     QualityTarget,
     TriggerType,
 )
-from gemini_mcp.orchestration.pipelines import PipelineType, PipelineStep, Pipeline
+from gemini_mcp.orchestration.pipelines import PipelineType, PipelineStep, PipelineNode, Pipeline
+from gemini_mcp.orchestration.scheduler import DAGScheduler
 from gemini_mcp.orchestration.orchestrator import (
     AgentOrchestrator,
     PipelineResult,
@@ -36,9 +39,13 @@ from gemini_mcp.orchestration.telemetry import (
 from gemini_mcp.orchestration.dna_store import (
     DNAStore,
     DNAEntry,
+    DNABackend,
+    JSONBackend,
+    SQLiteBackend,
     get_dna_store,
     reset_dna_store,
 )
+from gemini_mcp.orchestration.dna_index import DNASimilarityIndex
 from gemini_mcp.orchestration.fallback import (
     FallbackChain,
     FallbackLevel,
@@ -56,6 +63,13 @@ from gemini_mcp.orchestration.complexity import (
     should_enable_parallel_styling,
     should_enable_critic_loop,
 )
+from gemini_mcp.orchestration.routing import (
+    ModelRoute,
+    RoutingPolicy,
+    estimate_cost,
+    get_routing_policy,
+    reset_routing_policy,
+)
 
 __all__ = [
     # Context classes
@@ -70,7 +84,9 @@ __all__ = [
     # Pipeline classes
     "PipelineType",
     "PipelineStep",
+    "PipelineNode",
     "Pipeline",
+    "DAGScheduler",
     # Orchestrator
     "AgentOrchestrator",
     "PipelineResult",
@@ -82,8 +98,12 @@ __all__ = [
     # DNA Persistence (Phase 7)
     "DNAStore",
     "DNAEntry",
+    "DNABackend",
+    "JSONBackend",
+    "SQLiteBackend",
     "get_dna_store",
     "reset_dna_store",
+    "DNASimilarityIndex",
     # Fallback Chain (Phase 4)
     "FallbackChain",
     "FallbackLevel",
@@ -99,4 +119,10 @@ __all__ = [
     "get_thinking_level_for_component",
     "should_enable_parallel_styling",
     "should_enable_critic_loop",
+    # Model Routing
+    "ModelRoute",
+    "RoutingPolicy",
+    "estimate_cost",
+    "get_routing_policy",
+    "reset_routing_policy",
 ]
@@ -26,6 +26,9 @@ from datetime import datetime
 from enum import Enum
 from typing import Any, Literal, Optional
 
+from gemini_mcp.validation.document import ParsedDocument, content_hash, parse_document
+from gemini_mcp.validation.skeleton import SKELETON_LEGEND, skeletonize_html
+
 # =============================================================================
 # PRECOMPILED PATTERNS - Performance optimization (Issue 4)
 # =============================================================================
@@ -36,6 +39,9 @@ _ID_PATTERN = re.compile(r'id=["\']([^"\']+)["\']')
 # Pattern to extract data-* attributes
 _DATA_ATTR_PATTERN = re.compile(r'data-(\w+)=["\']([^"\']+)["\']')
 
+# Parsed HTML documents kept per context (architect output, corrected output...)
+PARSED_DOCUMENT_CACHE_SIZE = 4
+
 
 class QualityTarget(Enum):
     """
@@ -62,6 +68,8 @@ QUALITY_TARGET_CONFIG: dict[QualityTarget, dict] = {
         "enable_critic": False,
         "enable_professional_validator": False,
         "require_corporate_evaluation": False,
+        "speculative_candidates": 1,
+        "speculative_token_budget": 0,
         "description": "Fast output for drafts and prototypes",
     },
     QualityTarget.PRODUCTION: {
@@ -70,6 +78,8 @@ QUALITY_TARGET_CONFIG: dict[QualityTarget, dict] = {
         "enable_critic": True,
         "enable_professional_validator": False,
         "require_corporate_evaluation": False,
+        "speculative_candidates": 1,
+        "speculative_token_budget": 0,
         "description": "Standard production quality",
     },
     QualityTarget.STANDARD: {
@@ -78,6 +88,8 @@ QUALITY_TARGET_CONFIG: dict[QualityTarget, dict] = {
         "enable_critic": False,
         "enable_professional_validator": False,
         "require_corporate_evaluation": False,
+        "speculative_candidates": 1,
+        "speculative_token_budget": 0,
         "description": "Basic quality for quick iterations",
     },
     QualityTarget.HIGH: {
@@ -86,6 +98,8 @@ QUALITY_TARGET_CONFIG: dict[QualityTarget, dict] = {
         "enable_critic": True,
         "enable_professional_validator": False,
         "require_corporate_evaluation": False,
+        "speculative_candidates": 1,
+        "speculative_token_budget": 60000,
         "description": "High quality with Critic evaluation",
     },
     QualityTarget.PREMIUM: {
@@ -94,6 +108,8 @@ QUALITY_TARGET_CONFIG: dict[QualityTarget, dict] = {
         "enable_critic": True,
         "enable_professional_validator": True,
         "require_corporate_evaluation": False,
+        "speculative_candidates": 1,
+        "speculative_token_budget": 120000,
         "description": "Premium quality with professional validation",
     },
     QualityTarget.ENTERPRISE: {
@@ -102,6 +118,8 @@ QUALITY_TARGET_CONFIG: dict[QualityTarget, dict] = {
         "enable_critic": True,
         "enable_professional_validator": True,
         "require_corporate_evaluation": True,
+        "speculative_candidates": 1,
+        "speculative_token_budget": 200000,
         "description": "Enterprise-grade with full corporate evaluation",
     },
 }
@@ -122,6 +140,35 @@ def get_max_iterations_for_target(target: QualityTarget) -> int:
     return get_quality_config(target).get("max_iterations", 2)
 
 
+def get_speculative_config(
+    target: QualityTarget, candidates: Optional[int] = None
+) -> tuple[int, int]:
+    """
+    Get speculative refiner settings for a target level.
+
+    Speculative mode is opt-in: every target defaults to one candidate,
+    and callers enable it with an explicit candidate count
+    (AgentOrchestrator(speculative_candidates=...) or
+    GEMINI_SPECULATIVE_CANDIDATES).
+
+    Args:
+        target: Quality target of the pipeline
+        candidates: Explicit candidates per iteration (None = target default)
+
+    Returns:
+        Tuple of (candidates per iteration, token budget for the loop).
+        One candidate means the serial Alchemist → Critic loop; a budget
+        of 0 means unlimited.
+    """
+    config = get_quality_config(target)
+    if candidates is None:
+        candidates = config.get("speculative_candidates", 1)
+    return (
+        max(1, candidates),
+        config.get("speculative_token_budget", 0),
+    )
+
+
 class InteractionType(Enum):
     """Types of interactions that Physicist can implement."""
 
@@ -316,7 +363,8 @@ class CompressedOutput:
     # Tailwind classes used (for style reference)
     tailwind_classes: list[str] = field(default_factory=list)
 
-    # DOM structure outline (simplified)
+    # DOM skeleton (validation.skeleton format: tag tree, ids, class
+    # dictionary, data-* attributes, section markers; text elided)
     structure_summary: str = ""
 
     # Section markers if applicable
@@ -327,6 +375,47 @@ class CompressedOutput:
     # Maps element_id → InteractionSpec
     interaction_map: dict[str, "InteractionSpec"] = field(default_factory=dict)
 
+    @classmethod
+    def from_html(
+        cls, html: str, doc: Optional[ParsedDocument] = None
+    ) -> "CompressedOutput":
+        """Compress HTML into IDs, classes, section markers and its skeleton."""
+        if doc is None:
+            doc = parse_document(html)
+        return cls(
+            element_ids=doc.ids(),
+            tailwind_classes=list(doc.class_tokens()),
+            section_markers=doc.section_names,
+            structure_summary=skeletonize_html(html, doc).text,
+        )
+
+    def to_prompt(self, max_classes: int = 40, outline: bool = False) -> str:
+        """
+        Render as a compact prompt block, used in place of the full HTML.
+
+        The skeleton is the default since it keeps the whole structure;
+        ``outline=True`` (or no skeleton) gives the smaller flat listing of
+        sections, IDs, classes and interactions.
+        """
+        if self.structure_summary and not outline:
+            return f"{SKELETON_LEGEND}\n{self.structure_summary}"
+        lines = []
+        if self.section_markers:
+            lines.append(f"Sections: {', '.join(self.section_markers)}")
+        if self.element_ids:
+            lines.append(f"IDs: {', '.join(self.element_ids)}")
+        if self.tailwind_classes:
+            lines.append(f"Classes: {' '.join(self.tailwind_classes[:max_classes])}")
+        if self.interaction_map:
+            lines.append(
+                "Interactions: "
+                + ", ".join(
+                    f"#{spec.element_id}={spec.interaction_type}"
+                    for spec in self.interaction_map.values()
+                )
+            )
+        return "\n".join(lines)
+
     def get_interactions_by_type(
         self, interaction_type: str
     ) -> list["InteractionSpec"]:
@@ -438,6 +527,9 @@ class AgentContext:
     quality_target: QualityTarget = QualityTarget.PRODUCTION
     token_budget: int = 32768
     skip_agents: list[str] = field(default_factory=list)
+    # Agent role → routing.ModelRoute chosen by the orchestrator's RoutingPolicy
+    # (agents fall back to their AgentConfig when absent)
+    model_routes: dict[str, Any] = field(default_factory=dict)
 
     # === General Metadata ===
     # Flexible key-value store for additional context (industry, formality, etc.)
@@ -463,6 +555,18 @@ class AgentContext:
     current_section_index: int = -1  # For parallel section generation
     current_section_type: str = ""  # Current section type being generated
 
+    # === Streaming (incremental section delivery) ===
+    # Async callback(section_type, html) invoked as each section completes.
+    # Runtime-only: not serialized.
+    section_callback: Optional[Any] = field(default=None, repr=False, compare=False)
+
+    # === Shared HTML parse (validation stack) ===
+    # Content hash → ParsedDocument, so validators, compression and analysis
+    # reuse one scan of the same HTML. Runtime-only: not serialized.
+    parsed_documents: dict[str, ParsedDocument] = field(
+        default_factory=dict, repr=False, compare=False
+    )
+
     # === Reference-specific (for design_from_reference) ===
     reference_image_path: str = ""
     reference_analysis: str = ""
@@ -516,6 +620,7 @@ class AgentContext:
         forked.warnings = list(self.warnings)
         forked.critic_feedback = list(self.critic_feedback)
         forked.skip_agents = list(self.skip_agents)
+        forked.model_routes = dict(self.model_routes)
         forked.thought_signatures = list(self.thought_signatures)
         forked.sections = [dict(s) for s in self.sections]
         # Phase 1 & 4: Few-shot examples and interaction presets
@@ -702,41 +807,33 @@ class AgentContext:
             self.compressed = CompressedOutput()
 
         if output_type == "html":
-            # Extract IDs
-            id_pattern = r'id=["\']([^"\']+)["\']'
-            self.compressed.element_ids = re.findall(id_pattern, output)
-
-            # Extract Tailwind classes
-            class_pattern = r'class=["\']([^"\']+)["\']'
-            matches = re.findall(class_pattern, output)
-            classes = []
-            for match in matches:
-                classes.extend(match.split())
-            self.compressed.tailwind_classes = list(set(classes))
-
-            # Extract section markers
-            marker_pattern = r"<!-- SECTION: (\w+) -->"
-            self.compressed.section_markers = re.findall(marker_pattern, output)
-
-            # Create structure summary (first 500 chars of cleaned HTML)
-            summary = re.sub(r"<[^>]+>", " ", output)
-            summary = " ".join(summary.split())[:500]
-            self.compressed.structure_summary = summary
+            doc = self.get_parsed_document(output)
+
+            # IDs, Tailwind classes, section markers and skeleton
+            fresh = CompressedOutput.from_html(output, doc)
+            self.compressed.element_ids = fresh.element_ids
+            self.compressed.tailwind_classes = fresh.tailwind_classes
+            self.compressed.section_markers = fresh.section_markers
+            self.compressed.structure_summary = fresh.structure_summary
 
             # === PHASE 7: Extract Structural Map (data-* attributes) ===
-            self._extract_interaction_map(output)
+            self._extract_interaction_map(output, doc)
 
         elif output_type == "css":
             # Extract CSS variables
             var_pattern = r"--([a-zA-Z0-9-]+)"
             self.compressed.css_variables = list(set(re.findall(var_pattern, output)))
 
-    def _extract_interaction_map(self, html: str) -> None:
+    def _extract_interaction_map(
+        self,
+        html: str,
+        doc: Optional[ParsedDocument] = None,
+    ) -> None:
         """
         Extract interaction specifications from HTML data-* attributes.
 
-        Scans HTML for elements with data-interaction attribute and builds
-        an interaction_map for Physicist to consume.
+        Looks up elements with a data-interaction attribute in the parsed
+        document and builds an interaction_map for Physicist to consume.
 
         Supported attributes:
             - data-interaction: parallax, magnetic, reveal, tilt, glow, morph
@@ -749,15 +846,12 @@ class AgentContext:
         """
         if self.compressed is None:
             self.compressed = CompressedOutput()
+        if doc is None:
+            doc = self.get_parsed_document(html)
 
-        # Use precompiled patterns for performance (Issue 4 fix)
-        for match in _ELEMENT_PATTERN.finditer(html):
-            tag_name = match.group(1)
-            attributes_str = match.group(2)
-
-            # Skip if no data-interaction attribute
-            if "data-interaction" not in attributes_str:
-                continue
+        # Only elements carrying data-interaction (attribute index lookup)
+        for element in doc.with_attribute("data-interaction"):
+            attributes_str = doc.raw(element)
 
             # Extract element ID using precompiled pattern
             id_match = _ID_PATTERN.search(attributes_str)
@@ -778,6 +872,31 @@ class AgentContext:
                 spec = InteractionSpec.from_data_attributes(element_id, data_attrs)
                 self.compressed.interaction_map[element_id] = spec
 
+    def get_parsed_document(self, html: Optional[str] = None) -> ParsedDocument:
+        """
+        Get the shared parse of an HTML string, cached by content hash.
+
+        Validators, compression and context analysis all read from the same
+        ParsedDocument, so each distinct HTML output is scanned once.
+
+        Args:
+            html: HTML to parse (default: html_output)
+
+        Returns:
+            ParsedDocument for the content
+        """
+        if html is None:
+            html = self.html_output
+        digest = content_hash(html)
+        doc = self.parsed_documents.get(digest)
+        if doc is None:
+            doc = parse_document(html, digest)
+            if len(self.parsed_documents) >= PARSED_DOCUMENT_CACHE_SIZE:
+                # Evict the oldest entry (dicts keep insertion order)
+                self.parsed_documents.pop(next(iter(self.parsed_documents)))
+            self.parsed_documents[digest] = doc
+        return doc
+
     def get_interaction_summary(self) -> dict[str, list[str]]:
         """
         Get a summary of interactions grouped by type.
@@ -0,0 +1,369 @@
+"""
+DNA Vector Index - Similarity Search over Stored Design DNA
+
+Every stored DNA entry is turned into two sparse feature vectors, hashed
+into DIM dimensions and L2-normalized, so a dot product is the cosine:
+
+- style: palette (hue/lightness/saturation per color role and overall),
+  typography, spacing, borders, animation and mood tokens. Used to find
+  the prior DNA closest to a given DesignDNA.
+- text: words of the project id, component type, theme and mood. Used to
+  match free text such as a MAESTRO project_context against stored DNA.
+
+Top-k search uses NumPy when it is installed (one float32 matrix-vector
+product per query) and otherwise a pure-Python inverted index over the
+hashed dimensions. Both give the same scores (up to float32 rounding).
+Entries are added and removed incrementally; nothing is rebuilt on save.
+
+Usage:
+    index = DNASimilarityIndex()
+    index.add(entry)
+    index.search(dna, k=3, project_id="my-saas")  # [(dna_id, score), ...]
+    index.search("dark saas dashboard", k=1)
+"""
+
+from __future__ import annotations
+
+import colorsys
+import hashlib
+import heapq
+import re
+import threading
+from array import array
+from functools import lru_cache
+from typing import TYPE_CHECKING, Iterable, Optional, Union
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    np = None  # type: ignore
+
+from gemini_mcp.orchestration.context import DesignDNA
+
+if TYPE_CHECKING:
+    from gemini_mcp.orchestration.dna_store import DNAEntry
+
+# Hashed feature dimensions (128 x float32 = 512 bytes per entry with NumPy)
+DIM = 128
+
+# Relative weight of each DNA field in the style vector
+FIELD_WEIGHTS = {
+    "mood": 2.0,
+    "colors": 1.0,
+    "typography": 1.0,
+    "spacing": 0.7,
+    "borders": 0.7,
+    "animation": 0.5,
+}
+
+_WORD = re.compile(r"[a-z0-9]+")
+_HEX = re.compile(r"#([0-9a-f]{3}|[0-9a-f]{6})\b")
+_STOPWORDS = frozenset(
+    "a an and as at be by for from in is it of on or the to with "
+    "bir bu da de icin ile ve".split()
+)
+
+
+@lru_cache(maxsize=65536)
+def _dimension(feature: str) -> tuple[int, float]:
+    """Stable (dimension, sign) of a feature; the sign halves collision bias."""
+    digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=4).digest()
+    value = int.from_bytes(digest, "little")
+    return value % DIM, 1.0 if value & 0x80000000 else -1.0
+
+
+def words(text: str) -> list[str]:
+    """Lower-case word tokens of a text, without stopwords and single letters."""
+    return [w for w in _WORD.findall(text.lower()) if len(w) > 1 and w not in _STOPWORDS]
+
+
+@lru_cache(maxsize=65536)
+def _color_features(role: str, value: str) -> tuple[tuple[str, float], ...]:
+    """Palette features of one color: hue/tone buckets for hex, tokens otherwise."""
+    match = _HEX.search(value.lower())
+    if not match:
+        return tuple(
+            (name, 1.0)
+            for token in words(value)
+            if not token.isdigit()
+            for name in (f"palette:{token}", f"color:{role}:{token}")
+        )
+    digits = match.group(1)
+    if len(digits) == 3:
+        digits = "".join(c * 2 for c in digits)
+    r, g, b = (int(digits[i:i + 2], 16) / 255 for i in (0, 2, 4))
+    hue, lightness, saturation = colorsys.rgb_to_hls(r, g, b)
+    tone = f"{min(int(lightness * 4), 3)}:{min(int(saturation * 3), 2)}"
+    hue_bucket = "gray" if saturation < 0.12 else str(int(hue * 12) % 12)
+    return (
+        (f"hue:{hue_bucket}", 1.0),
+        (f"tone:{tone}", 0.5),
+        (f"color:{role}:{hue_bucket}:{tone}", 1.0),
+    )
+
+
+@lru_cache(maxsize=65536)
+def _token_features(field_name: str, key: str, value: str) -> tuple[tuple[str, float], ...]:
+    """Features of one typography/spacing/border/animation token."""
+    return tuple(
+        item
+        for token in words(value)
+        for item in ((f"{field_name}:{key}:{token}", 1.0), (f"{field_name}:{token}", 0.5))
+    )
+
+
+def dna_features(dna: DesignDNA) -> dict[str, float]:
+    """Weighted style features of a DesignDNA."""
+    features: dict[str, float] = {}
+
+    for token in words(dna.mood or ""):
+        features[f"mood:{token}"] = features.get(f"mood:{token}", 0.0) + FIELD_WEIGHTS["mood"]
+
+    colors = [(role, value) for role, value in (dna.colors or {}).items() if isinstance(value, str)]
+    scale = FIELD_WEIGHTS["colors"] / max(len(colors), 1) ** 0.5
+    for role, value in colors:
+        for name, weight in _color_features(str(role).lower(), value):
+            features[name] = features.get(name, 0.0) + weight * scale
+
+    for field_name in ("typography", "spacing", "borders", "animation"):
+        tokens = getattr(dna, field_name) or {}
+        scale = FIELD_WEIGHTS[field_name] / max(len(tokens), 1) ** 0.5
+        for key, value in tokens.items():
+            for name, weight in _token_features(field_name, str(key).lower(), str(value)):
+                features[name] = features.get(name, 0.0) + weight * scale
+    return features
+
+
+def text_features(*texts: str) -> dict[str, float]:
+    """Word features of free text (one feature per distinct word)."""
+    return {f"word:{token}": 1.0 for text in texts if text for token in words(text)}
+
+
+def entry_text_features(entry: "DNAEntry") -> dict[str, float]:
+    """Word features describing a stored entry."""
+    return text_features(entry.project_id, entry.component_type, entry.theme, entry.dna.mood)
+
+
+def hash_vector(features: dict[str, float]) -> dict[int, float]:
+    """Hash features into DIM dimensions and L2-normalize (empty if no features)."""
+    vector: dict[int, float] = {}
+    for name, weight in features.items():
+        dim, sign = _dimension(name)
+        vector[dim] = vector.get(dim, 0.0) + sign * weight
+    norm = sum(w * w for w in vector.values()) ** 0.5
+    if norm == 0.0:
+        return {}
+    return {dim: w / norm for dim, w in vector.items() if w}
+
+
+class VectorIndex:
+    """Cosine top-k index over normalized sparse vectors with tag filters.
+
+    Keys live in append-only slots; removal frees the slot (tombstone) and
+    the storage is compacted once more than half of it is dead.
+    """
+
+    def __init__(self, use_numpy: Optional[bool] = None):
+        self.use_numpy = NUMPY_AVAILABLE if use_numpy is None else use_numpy and NUMPY_AVAILABLE
+        self._slots: list[Optional[str]] = []
+        # (dims, weights) per slot; compact so 100k entries stay small
+        self._vectors: list[Optional[tuple[bytes, array]]] = []
+        self._slot_of: dict[str, int] = {}
+        self._tags: dict[str, set[str]] = {}
+        self._key_tags: dict[str, tuple[str, ...]] = {}
+        self._dead = 0
+        self._reset_storage()
+
+    def _reset_storage(self) -> None:
+        if self.use_numpy:
+            self._matrix = np.zeros((max(len(self._slots), 64), DIM), dtype=np.float32)
+        else:
+            self._post_slots = [array("I") for _ in range(DIM)]
+            self._post_weights = [array("f") for _ in range(DIM)]
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._slot_of
+
+    def add(self, key: str, vector: dict[int, float], tags: Iterable[str] = ()) -> None:
+        """Insert or replace a key's vector (already normalized)."""
+        if key in self._slot_of:
+            self.remove(key)
+        slot = len(self._slots)
+        self._slots.append(key)
+        self._vectors.append((bytes(vector), array("f", vector.values())))
+        self._slot_of[key] = slot
+        self._key_tags[key] = tuple(tags)
+        for tag in self._key_tags[key]:
+            self._tags.setdefault(tag, set()).add(key)
+
+        if self.use_numpy:
+            if slot >= self._matrix.shape[0]:
+                grown = np.zeros((self._matrix.shape[0] * 2, DIM), dtype=np.float32)
+                grown[: self._matrix.shape[0]] = self._matrix
+                self._matrix = grown
+            for dim, weight in vector.items():
+                self._matrix[slot, dim] = weight
+        else:
+            for dim, weight in vector.items():
+                self._post_slots[dim].append(slot)
+                self._post_weights[dim].append(weight)
+
+    def remove(self, key: str) -> bool:
+        """Remove a key; returns False if it was not indexed."""
+        slot = self._slot_of.pop(key, None)
+        if slot is None:
+            return False
+        self._slots[slot] = None
+        self._vectors[slot] = None
+        for tag in self._key_tags.pop(key, ()):
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+        if self.use_numpy:
+            self._matrix[slot] = 0.0
+        self._dead += 1
+        if self._dead > 64 and self._dead > len(self._slot_of):
+            self._compact()
+        return True
+
+    def _compact(self) -> None:
+        live = [(key, vector) for key, vector in zip(self._slots, self._vectors) if key is not None]
+        self._slots, self._vectors, self._slot_of, self._dead = [], [], {}, 0
+        self._reset_storage()
+        key_tags = self._key_tags
+        self._key_tags, self._tags = {}, {}
+        for key, (dims, weights) in live:
+            self.add(key, dict(zip(dims, weights)), key_tags.get(key, ()))
+
+    def keys_with(self, tag: str) -> list[str]:
+        """Keys carrying a tag."""
+        return list(self._tags.get(tag, ()))
+
+    def _candidate_slots(self, tags: Iterable[str]) -> Optional[list[int]]:
+        tag_sets = [self._tags.get(tag, set()) for tag in tags]
+        if not tag_sets:
+            return None
+        tag_sets.sort(key=len)
+        return sorted(self._slot_of[key] for key in set.intersection(*tag_sets))
+
+    def search(
+        self, query: dict[int, float], k: int = 5, tags: Iterable[str] = ()
+    ) -> list[tuple[str, float]]:
+        """Top-k keys by cosine with the query, best first.
+
+        Args:
+            query: Normalized query vector (see hash_vector)
+            k: Number of results
+            tags: Only keys carrying all of these tags
+        """
+        if not query or k <= 0:
+            return []
+        candidates = self._candidate_slots(tags)
+        if candidates is not None and not candidates:
+            return []
+        if self.use_numpy:
+            ranked = self._search_numpy(query, k, candidates)
+        else:
+            ranked = self._search_python(query, k, candidates)
+        return [(self._slots[slot], score) for slot, score in ranked if score > 0.0]
+
+    def _search_numpy(
+        self, query: dict[int, float], k: int, candidates: Optional[list[int]]
+    ) -> list[tuple[int, float]]:
+        dense = np.zeros(DIM, dtype=np.float32)
+        for dim, weight in query.items():
+            dense[dim] = weight
+        if candidates is None:
+            slots = None
+            scores = self._matrix[: len(self._slots)] @ dense
+        else:
+            slots = np.asarray(candidates, dtype=np.int64)
+            scores = self._matrix[slots] @ dense
+        if len(scores) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [
+            (int(slots[i]) if slots is not None else int(i), float(scores[i]))
+            for i in top
+        ]
+
+    def _search_python(
+        self, query: dict[int, float], k: int, candidates: Optional[list[int]]
+    ) -> list[tuple[int, float]]:
+        if candidates is not None and len(candidates) * 8 < len(self._slot_of):
+            # Few candidates: score their vectors directly
+            scored = []
+            for slot in candidates:
+                dims, weights = self._vectors[slot]
+                scored.append((slot, sum(w * query.get(dim, 0.0) for dim, w in zip(dims, weights))))
+            return heapq.nlargest(k, scored, key=lambda item: item[1])
+
+        scores = [0.0] * len(self._slots)
+        for dim, query_weight in query.items():
+            for slot, weight in zip(self._post_slots[dim], self._post_weights[dim]):
+                scores[slot] += query_weight * weight
+        if candidates is None:
+            live = self._slots
+            candidates = [slot for slot in range(len(scores)) if live[slot] is not None]
+        best = heapq.nlargest(k, candidates, key=scores.__getitem__)
+        return [(slot, scores[slot]) for slot in best]
+
+
+class DNASimilarityIndex:
+    """Style and text vector indexes over DNA entries, filterable by project/component."""
+
+    def __init__(self, use_numpy: Optional[bool] = None):
+        self.style = VectorIndex(use_numpy)
+        self.text = VectorIndex(use_numpy)
+        self.cursor = 0  # Backend position up to which entries are indexed
+        self.lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.style)
+
+    @staticmethod
+    def _tags(entry: "DNAEntry") -> tuple[str, str]:
+        return f"project:{entry.project_id}", f"component:{entry.component_type}"
+
+    def add(self, entry: "DNAEntry") -> None:
+        with self.lock:
+            tags = self._tags(entry)
+            self.style.add(entry.dna_id, hash_vector(dna_features(entry.dna)), tags)
+            self.text.add(entry.dna_id, hash_vector(entry_text_features(entry)), tags)
+
+    def remove(self, dna_id: str) -> None:
+        with self.lock:
+            self.style.remove(dna_id)
+            self.text.remove(dna_id)
+
+    def remove_project(self, project_id: str) -> None:
+        with self.lock:
+            for dna_id in self.style.keys_with(f"project:{project_id}"):
+                self.remove(dna_id)
+
+    def search(
+        self,
+        query: Union[DesignDNA, str],
+        k: int = 5,
+        project_id: Optional[str] = None,
+        component_type: Optional[str] = None,
+    ) -> list[tuple[str, float]]:
+        """Nearest entries to a DesignDNA (style) or free text (text), best first."""
+        tags = []
+        if project_id:
+            tags.append(f"project:{project_id}")
+        if component_type:
+            tags.append(f"component:{component_type}")
+        with self.lock:
+            if isinstance(query, DesignDNA):
+                return self.style.search(hash_vector(dna_features(query)), k, tags)
+            return self.text.search(hash_vector(text_features(query)), k, tags)
@@ -6,31 +6,71 @@ This module provides persistent storage for Design DNA, enabling:
 - Project-based DNA organization
 - DNA search by component type, theme, or project
 
-Storage Format: JSON file at ~/.gemini-mcp/dna_db.json
+Storage is pluggable (DNABackend):
+- SQLiteBackend (default): ~/.gemini-mcp/dna_db.db in WAL mode with
+  composite indexes, so get_latest/search are index range scans and
+  several server processes can share one store safely.
+- JSONBackend: the original single-file format (~/.gemini-mcp/dna_db.json).
+  Also used as the import/export format; an existing dna_db.json next to a
+  new SQLite database is imported once on first open.
 
 Usage:
     store = DNAStore()
     dna_id = store.save("navbar", "cyberpunk", dna, project_id="my-saas")
     dna = store.get(dna_id)
     dna = store.get_latest("navbar", project_id="my-saas")
+
+    with store.batch():  # one transaction, one eviction pass
+        for component, dna in results.items():
+            store.save(component, "cyberpunk", dna, project_id="my-saas")
 """
 
 from __future__ import annotations
 
+import heapq
 import json
 import logging
 import os
-import time
+import re
+import sqlite3
+import threading
 import uuid
-from dataclasses import dataclass, field
-from datetime import datetime
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Iterable, Iterator, Optional, Union
 
+from gemini_mcp.blob_store import atomic_write
 from gemini_mcp.orchestration.context import DesignDNA
+from gemini_mcp.orchestration.dna_index import DNASimilarityIndex
 
 logger = logging.getLogger(__name__)
 
+# Backend used when DNAStore is not given one: "sqlite" (default) or "json"
+DNA_BACKEND_ENV = "GEMINI_DNA_BACKEND"
+
+# How long a writer waits for another process's write transaction
+BUSY_TIMEOUT_SECONDS = 10.0
+
+JSON_FORMAT_VERSION = "1.0"
+
+# dna_meta key tracking the one-time import of a legacy JSON database
+LEGACY_IMPORT_KEY = "legacy_json_import"
+
+_PROJECT_PATTERN = re.compile(r"[Pp]roject:\s*([^\n,]+)")
+
+
+def project_id_from_context(project_context: str) -> str:
+    """Project id named in a free-text project context, or "" if none.
+
+    "Project: Acme SaaS, dark theme" -> "acme-saas"
+    """
+    match = _PROJECT_PATTERN.search(project_context or "")
+    if not match:
+        return ""
+    return match.group(1).strip().lower().replace(" ", "-")
+
 
 @dataclass
 class DNAEntry:
@@ -67,137 +107,612 @@ class DNAEntry:
         )
 
 
+def to_json_document(entries: Iterable[DNAEntry]) -> dict[str, Any]:
+    """Build the JSON database document (format 1.0) for the given entries."""
+    document: dict[str, Any] = {
+        "version": JSON_FORMAT_VERSION,
+        "entries": {},
+        "index": {"by_component": {}, "by_theme": {}, "by_project": {}},
+    }
+    index = document["index"]
+    for entry in entries:
+        document["entries"][entry.dna_id] = entry.to_dict()
+        index["by_component"].setdefault(entry.component_type, []).append(entry.dna_id)
+        index["by_theme"].setdefault(entry.theme, []).append(entry.dna_id)
+        index["by_project"].setdefault(entry.project_id, []).append(entry.dna_id)
+    return document
+
+
+def read_json_document(path: Path) -> list[DNAEntry]:
+    """Read the entries of a JSON database file, skipping malformed ones.
+
+    Raises:
+        OSError, json.JSONDecodeError: If the file cannot be read or parsed
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    entries = []
+    for dna_id, raw in (data.get("entries") or {}).items():
+        try:
+            entries.append(DNAEntry.from_dict(raw))
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning(f"[DNAStore] Skipped malformed entry {dna_id}: {e}")
+    return entries
+
+
+class DNABackend:
+    """Storage interface behind DNAStore.
+
+    Writes happen inside transaction(); nested transactions join the
+    outermost one, which commits (or flushes) once on exit.
+    """
+
+    name = "base"
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        yield
+
+    def put(self, entries: list[DNAEntry]) -> None:
+        """Insert or replace entries."""
+        raise NotImplementedError
+
+    def get(self, dna_id: str) -> Optional[DNAEntry]:
+        raise NotImplementedError
+
+    def latest(
+        self, component_type: str, project_id: str, theme: Optional[str] = None
+    ) -> Optional[DNAEntry]:
+        """Newest entry for a component in a project (optionally a theme)."""
+        raise NotImplementedError
+
+    def search(
+        self,
+        component_type: Optional[str],
+        theme: Optional[str],
+        project_id: Optional[str],
+        limit: int,
+    ) -> list[DNAEntry]:
+        """Matching entries, newest first. Empty filters match everything."""
+        raise NotImplementedError
+
+    def delete(self, dna_ids: list[str]) -> int:
+        """Delete entries by ID; returns how many existed."""
+        raise NotImplementedError
+
+    def delete_project(self, project_id: str) -> int:
+        raise NotImplementedError
+
+    def evict(self, max_entries: int) -> int:
+        """Delete the oldest entries beyond max_entries; returns the count."""
+        raise NotImplementedError
+
+    def count(self) -> int:
+        raise NotImplementedError
+
+    def distinct(self, field_name: str, project_id: Optional[str] = None) -> list[str]:
+        """Distinct component_type/theme/project_id values."""
+        raise NotImplementedError
+
+    def iter_entries(self) -> Iterator[DNAEntry]:
+        """All entries, oldest first."""
+        raise NotImplementedError
+
+    def entries_since(self, cursor: int) -> tuple[int, list[DNAEntry]]:
+        """Entries written after an opaque cursor (0 = from the start).
+
+        Returns the new cursor and the entries. Backends without a change
+        feed (JSON) return everything once.
+        """
+        if cursor:
+            return cursor, []
+        return 1, list(self.iter_entries())
+
+    def close(self) -> None:
+        pass
+
+
+class JSONBackend(DNABackend):
+    """The original single JSON file, with in-memory set indexes.
+
+    The whole file is rewritten (atomically) once per outermost
+    transaction, so batch writes through DNAStore.batch() to amortize it.
+    Not safe for concurrent writers in several processes.
+    """
+
+    name = "json"
+    _FIELDS = {"component_type": "by_component", "theme": "by_theme", "project_id": "by_project"}
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.RLock()
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._index: dict[str, dict[str, set[str]]] = {name: {} for name in self._FIELDS.values()}
+        self._depth = 0
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if not self.path.exists():
+            return
+        try:
+            entries = read_json_document(self.path)
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning(f"[DNAStore] Failed to load database: {e}")
+            return
+        for entry in entries:
+            self._add(entry.to_dict())
+        logger.debug(f"[DNAStore] Loaded {len(self._entries)} entries")
+
+    def _add(self, raw: dict[str, Any]) -> None:
+        if raw["dna_id"] in self._entries:
+            self._remove(raw["dna_id"])
+        self._entries[raw["dna_id"]] = raw
+        for field_name, index_name in self._FIELDS.items():
+            self._index[index_name].setdefault(raw[field_name], set()).add(raw["dna_id"])
+
+    def _remove(self, dna_id: str) -> bool:
+        raw = self._entries.pop(dna_id, None)
+        if raw is None:
+            return False
+        for field_name, index_name in self._FIELDS.items():
+            ids = self._index[index_name].get(raw[field_name])
+            if ids is not None:
+                ids.discard(dna_id)
+                if not ids:
+                    del self._index[index_name][raw[field_name]]
+        return True
+
+    def _flush(self) -> None:
+        entries = sorted(self._entries.values(), key=lambda raw: raw.get("created_at", ""))
+        document = to_json_document(DNAEntry.from_dict(raw) for raw in entries)
+        try:
+            atomic_write(self.path, json.dumps(document, indent=2, ensure_ascii=False))
+            logger.debug(f"[DNAStore] Saved {len(self._entries)} entries")
+        except OSError as e:
+            logger.error(f"[DNAStore] Failed to save database: {e}")
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        with self._lock:
+            self._depth += 1
+            try:
+                yield
+            finally:
+                self._depth -= 1
+                if self._depth == 0 and self._dirty:
+                    self._dirty = False
+                    self._flush()
+
+    def _candidates(
+        self, component_type: Optional[str], theme: Optional[str], project_id: Optional[str]
+    ) -> Iterable[str]:
+        sets = [
+            self._index[self._FIELDS[field_name]].get(value, set())
+            for field_name, value in (
+                ("component_type", component_type),
+                ("theme", theme),
+                ("project_id", project_id),
+            )
+            if value
+        ]
+        if not sets:
+            return self._entries.keys()
+        sets.sort(key=len)
+        return set.intersection(*sets)
+
+    def put(self, entries: list[DNAEntry]) -> None:
+        with self.transaction():
+            for entry in entries:
+                self._add(entry.to_dict())
+            self._dirty = True
+
+    def get(self, dna_id: str) -> Optional[DNAEntry]:
+        with self._lock:
+            raw = self._entries.get(dna_id)
+            return DNAEntry.from_dict(raw) if raw else None
+
+    def latest(
+        self, component_type: str, project_id: str, theme: Optional[str] = None
+    ) -> Optional[DNAEntry]:
+        with self._lock:
+            candidates = self._candidates(component_type, theme, project_id)
+            latest_id = max(candidates, key=lambda i: self._entries[i].get("created_at", ""), default=None)
+            return self.get(latest_id) if latest_id else None
+
+    def search(
+        self,
+        component_type: Optional[str],
+        theme: Optional[str],
+        project_id: Optional[str],
+        limit: int,
+    ) -> list[DNAEntry]:
+        with self._lock:
+            candidates = self._candidates(component_type, theme, project_id)
+            newest = heapq.nlargest(
+                max(limit, 0), candidates, key=lambda i: self._entries[i].get("created_at", "")
+            )
+            return [DNAEntry.from_dict(self._entries[i]) for i in newest]
+
+    def delete(self, dna_ids: list[str]) -> int:
+        with self.transaction():
+            removed = sum(1 for dna_id in dna_ids if self._remove(dna_id))
+            self._dirty = self._dirty or removed > 0
+            return removed
+
+    def delete_project(self, project_id: str) -> int:
+        with self._lock:
+            return self.delete(list(self._index["by_project"].get(project_id, ())))
+
+    def evict(self, max_entries: int) -> int:
+        with self._lock:
+            excess = len(self._entries) - max_entries
+            if excess <= 0:
+                return 0
+            oldest = heapq.nsmallest(
+                excess, self._entries, key=lambda i: self._entries[i].get("created_at", "")
+            )
+            return self.delete(oldest)
+
+    def count(self) -> int:
+        return len(self._entries)
+
+    def distinct(self, field_name: str, project_id: Optional[str] = None) -> list[str]:
+        with self._lock:
+            if project_id is None:
+                return list(self._index[self._FIELDS[field_name]])
+            ids = self._index["by_project"].get(project_id, ())
+            return list({self._entries[i][field_name] for i in ids})
+
+    def iter_entries(self) -> Iterator[DNAEntry]:
+        with self._lock:
+            raws = sorted(self._entries.values(), key=lambda raw: raw.get("created_at", ""))
+        for raw in raws:
+            yield DNAEntry.from_dict(raw)
+
+
+class SQLiteBackend(DNABackend):
+    """SQLite database in WAL mode.
+
+    Readers never block the writer and vice versa; writers in other
+    processes are serialized by BEGIN IMMEDIATE and wait up to
+    BUSY_TIMEOUT_SECONDS for the lock. Every query used by DNAStore is
+    served by one of the composite indexes (see EXPLAIN QUERY PLAN).
+    """
+
+    name = "sqlite"
+    SCHEMA_VERSION = 2
+    _COLUMNS = "dna_id, component_type, theme, project_id, created_at, dna"
+    _ORDER_NEWEST = "ORDER BY created_at DESC, seq DESC"
+
+    def __init__(self, path: Path, timeout: float = BUSY_TIMEOUT_SECONDS):
+        """Open (and create if needed) the database.
+
+        Attributes:
+            created: True if this call created the schema (fresh database)
+        """
+        self.path = path
+        self._lock = threading.RLock()
+        self._depth = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(self.path),
+            timeout=timeout,
+            check_same_thread=False,
+            isolation_level=None,  # explicit transactions via transaction()
+        )
+        self._conn.execute(f"PRAGMA busy_timeout={int(timeout * 1000)}")
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self.transaction():
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            self.created = version == 0
+            if version == 1:
+                # v1 keyed rows by dna_id only; seq gives a never-reused insert order
+                self._conn.execute("ALTER TABLE dna_entries RENAME TO dna_entries_v1")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS dna_entries (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    dna_id TEXT NOT NULL UNIQUE,
+                    component_type TEXT NOT NULL,
+                    theme TEXT NOT NULL,
+                    project_id TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    dna TEXT NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS dna_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+            if version == 1:
+                self._conn.execute(
+                    f"INSERT INTO dna_entries ({self._COLUMNS}) "
+                    f"SELECT {self._COLUMNS} FROM dna_entries_v1 ORDER BY rowid"
+                )
+                self._conn.execute("DROP TABLE dna_entries_v1")
+            for name, columns in (
+                ("idx_dna_scope", "project_id, component_type, theme, created_at"),
+                ("idx_dna_project_component", "project_id, component_type, created_at"),
+                ("idx_dna_project", "project_id, created_at"),
+                ("idx_dna_component", "component_type, created_at"),
+                ("idx_dna_theme", "theme, created_at"),
+                ("idx_dna_created", "created_at"),
+            ):
+                self._conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON dna_entries({columns})")
+            self._conn.execute(f"PRAGMA user_version={self.SCHEMA_VERSION}")
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        with self._lock:
+            outermost = self._depth == 0
+            if outermost:
+                self._conn.execute("BEGIN IMMEDIATE")
+            self._depth += 1
+            try:
+                yield
+            except BaseException:
+                self._depth -= 1
+                if outermost:
+                    self._conn.execute("ROLLBACK")
+                raise
+            self._depth -= 1
+            if outermost:
+                self._conn.execute("COMMIT")
+
+    def get_meta(self, key: str) -> Optional[str]:
+        """Value of a dna_meta key (None if unset)."""
+        rows = self._query("SELECT value FROM dna_meta WHERE key = ?", (key,))
+        return rows[0][0] if rows else None
+
+    def set_meta(self, key: str, value: str) -> None:
+        with self.transaction():
+            self._conn.execute(
+                "INSERT OR REPLACE INTO dna_meta (key, value) VALUES (?, ?)", (key, value)
+            )
+
+    @staticmethod
+    def _row_to_entry(row: tuple) -> DNAEntry:
+        dna_id, component_type, theme, project_id, created_at, dna = row
+        return DNAEntry(
+            dna_id=dna_id,
+            component_type=component_type,
+            theme=theme,
+            project_id=project_id,
+            created_at=created_at,
+            dna=DesignDNA.from_dict(json.loads(dna)),
+        )
+
+    def _query(self, sql: str, params: tuple = ()) -> list[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def put(self, entries: list[DNAEntry]) -> None:
+        rows = [
+            (
+                e.dna_id,
+                e.component_type,
+                e.theme,
+                e.project_id,
+                e.created_at,
+                json.dumps(e.dna.to_dict(), ensure_ascii=False),
+            )
+            for e in entries
+        ]
+        with self.transaction():
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO dna_entries ({self._COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def get(self, dna_id: str) -> Optional[DNAEntry]:
+        rows = self._query(f"SELECT {self._COLUMNS} FROM dna_entries WHERE dna_id = ?", (dna_id,))
+        return self._row_to_entry(rows[0]) if rows else None
+
+    def latest(
+        self, component_type: str, project_id: str, theme: Optional[str] = None
+    ) -> Optional[DNAEntry]:
+        entries = self.search(component_type, theme, project_id, 1)
+        return entries[0] if entries else None
+
+    @staticmethod
+    def _where(
+        component_type: Optional[str], theme: Optional[str], project_id: Optional[str]
+    ) -> tuple[str, tuple]:
+        clauses, params = [], []
+        for column, value in (
+            ("project_id", project_id),
+            ("component_type", component_type),
+            ("theme", theme),
+        ):
+            if value:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), tuple(params)
+
+    def search(
+        self,
+        component_type: Optional[str],
+        theme: Optional[str],
+        project_id: Optional[str],
+        limit: int,
+    ) -> list[DNAEntry]:
+        where, params = self._where(component_type, theme, project_id)
+        rows = self._query(
+            f"SELECT {self._COLUMNS} FROM dna_entries{where} {self._ORDER_NEWEST} LIMIT ?",
+            params + (max(limit, 0),),
+        )
+        return [self._row_to_entry(row) for row in rows]
+
+    def delete(self, dna_ids: list[str]) -> int:
+        with self.transaction():
+            before = self._conn.total_changes
+            self._conn.executemany("DELETE FROM dna_entries WHERE dna_id = ?", [(i,) for i in dna_ids])
+            return self._conn.total_changes - before
+
+    def delete_project(self, project_id: str) -> int:
+        with self.transaction():
+            return self._conn.execute(
+                "DELETE FROM dna_entries WHERE project_id = ?", (project_id,)
+            ).rowcount
+
+    def evict(self, max_entries: int) -> int:
+        with self.transaction():
+            excess = self._conn.execute("SELECT COUNT(*) FROM dna_entries").fetchone()[0] - max_entries
+            if excess <= 0:
+                return 0
+            return self._conn.execute(
+                """
+                DELETE FROM dna_entries WHERE seq IN (
+                    SELECT seq FROM dna_entries ORDER BY created_at ASC, seq ASC LIMIT ?
+                )
+                """,
+                (excess,),
+            ).rowcount
+
+    def count(self) -> int:
+        return self._query("SELECT COUNT(*) FROM dna_entries")[0][0]
+
+    def distinct(self, field_name: str, project_id: Optional[str] = None) -> list[str]:
+        if field_name not in ("component_type", "theme", "project_id"):
+            raise ValueError(f"Unknown field: {field_name}")
+        where, params = self._where(None, None, project_id)
+        return [row[0] for row in self._query(f"SELECT DISTINCT {field_name} FROM dna_entries{where}", params)]
+
+    def iter_entries(self) -> Iterator[DNAEntry]:
+        rows = self._query(f"SELECT {self._COLUMNS} FROM dna_entries ORDER BY created_at ASC, seq ASC")
+        for row in rows:
+            yield self._row_to_entry(row)
+
+    def entries_since(self, cursor: int) -> tuple[int, list[DNAEntry]]:
+        rows = self._query(
+            f"SELECT seq, {self._COLUMNS} FROM dna_entries WHERE seq > ? ORDER BY seq", (cursor,)
+        )
+        if not rows:
+            return cursor, []
+        return rows[-1][0], [self._row_to_entry(row[1:]) for row in rows]
+
+    def explain(self, sql: str, params: tuple = ()) -> str:
+        """EXPLAIN QUERY PLAN details for a query, one step per line."""
+        return "\n".join(row[-1] for row in self._query(f"EXPLAIN QUERY PLAN {sql}", params))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
 class DNAStore:
     """
     Persistent storage for Design DNA.
 
-    Stores DNA entries in a JSON file with indices for fast lookup.
+    Delegates to a DNABackend (SQLite by default, see module docstring).
     Supports project-based organization and various search criteria.
     """
 
-    VERSION = "1.0"
-    DEFAULT_PATH = "~/.gemini-mcp/dna_db.json"
+    VERSION = JSON_FORMAT_VERSION
+    DEFAULT_PATH = "~/.gemini-mcp/dna_db.db"
 
-    def __init__(self, db_path: str = DEFAULT_PATH, max_entries: int = 500):
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        max_entries: int = 500,
+        backend: Union[str, DNABackend, None] = None,
+    ):
         """
         Initialize DNAStore.
 
         Args:
-            db_path: Path to the JSON database file
-            max_entries: Maximum number of entries to keep (LRU eviction)
+            db_path: Path to the database file (default: DEFAULT_PATH).
+                A SQLite store given a ``.json`` path lives next to it
+                with a ``.db`` suffix.
+            max_entries: Maximum number of entries to keep (oldest evicted)
+            backend: "sqlite", "json" or a DNABackend instance.
+                Default: GEMINI_DNA_BACKEND env, else "sqlite".
         """
-        self.db_path = Path(db_path).expanduser()
         self.max_entries = max_entries
-        self._data: dict[str, Any] = {}
-        self._load()
-
-    def _ensure_dir(self) -> None:
-        """Ensure the database directory exists."""
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
-
-    def _load(self) -> None:
-        """Load database from disk."""
-        self._ensure_dir()
+        self._batch_depth = 0
+        self._last_created: Optional[datetime] = None
+        self._similarity: Optional[DNASimilarityIndex] = None
+
+        db_path = db_path or self.DEFAULT_PATH
+        if isinstance(backend, DNABackend):
+            self.db_path = Path(db_path).expanduser()
+            self._backend = backend
+            return
 
-        if self.db_path.exists():
-            try:
-                with open(self.db_path, "r", encoding="utf-8") as f:
-                    self._data = json.load(f)
-                logger.debug(f"[DNAStore] Loaded {len(self._data.get('entries', {}))} entries")
-            except (json.JSONDecodeError, IOError) as e:
-                logger.warning(f"[DNAStore] Failed to load database: {e}")
-                self._init_empty()
+        kind = (backend or os.getenv(DNA_BACKEND_ENV) or "sqlite").strip().lower()
+        path = Path(db_path).expanduser()
+        if kind == "json":
+            self.db_path = path if path.suffix == ".json" else path.with_suffix(".json")
+            self._backend = JSONBackend(self.db_path)
+        elif kind == "sqlite":
+            self.db_path = path.with_suffix(".db") if path.suffix == ".json" else path
+            self._backend = SQLiteBackend(self.db_path)
+            self._import_legacy_json(self.db_path.with_suffix(".json"))
         else:
-            self._init_empty()
-
-    def _init_empty(self) -> None:
-        """Initialize an empty database."""
-        self._data = {
-            "version": self.VERSION,
-            "entries": {},
-            "index": {
-                "by_component": {},
-                "by_theme": {},
-                "by_project": {},
-            },
-        }
+            raise ValueError(f"Unknown DNAStore backend: {kind!r} (expected 'sqlite' or 'json')")
 
-    def _save(self) -> None:
-        """Save database to disk."""
-        self._ensure_dir()
+    def _import_legacy_json(self, legacy: Path) -> None:
+        """Import the JSON database a fresh SQLite store replaces.
+
+        The import is marked pending when the schema is created and done
+        once it succeeds, so a failed import is retried on the next start.
+        """
+        backend = self._backend
+        if backend.created and legacy.exists():
+            backend.set_meta(LEGACY_IMPORT_KEY, "pending")
+        if backend.get_meta(LEGACY_IMPORT_KEY) != "pending":
+            return
+        if not legacy.exists():  # Removed since the failed attempt
+            backend.set_meta(LEGACY_IMPORT_KEY, "done")
+            return
         try:
-            with open(self.db_path, "w", encoding="utf-8") as f:
-                json.dump(self._data, f, indent=2, ensure_ascii=False)
-            logger.debug(f"[DNAStore] Saved {len(self._data.get('entries', {}))} entries")
-        except IOError as e:
-            logger.error(f"[DNAStore] Failed to save database: {e}")
+            with self.batch():
+                count = self.import_json(legacy)
+                backend.set_meta(LEGACY_IMPORT_KEY, "done")
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"[DNAStore] Failed to import {legacy}, will retry: {e}")
+            return
+        logger.info(f"[DNAStore] Imported {count} entries from {legacy}")
+
+    @property
+    def backend(self) -> DNABackend:
+        """The storage backend in use."""
+        return self._backend
 
     def _generate_id(self) -> str:
         """Generate a unique DNA ID."""
         return f"dna_{uuid.uuid4().hex[:8]}"
 
-    def _add_to_index(
-        self, dna_id: str, component_type: str, theme: str, project_id: str
-    ) -> None:
-        """Add entry to indices."""
-        # By component
-        if component_type not in self._data["index"]["by_component"]:
-            self._data["index"]["by_component"][component_type] = []
-        if dna_id not in self._data["index"]["by_component"][component_type]:
-            self._data["index"]["by_component"][component_type].append(dna_id)
-
-        # By theme
-        if theme not in self._data["index"]["by_theme"]:
-            self._data["index"]["by_theme"][theme] = []
-        if dna_id not in self._data["index"]["by_theme"][theme]:
-            self._data["index"]["by_theme"][theme].append(dna_id)
-
-        # By project
-        if project_id not in self._data["index"]["by_project"]:
-            self._data["index"]["by_project"][project_id] = []
-        if dna_id not in self._data["index"]["by_project"][project_id]:
-            self._data["index"]["by_project"][project_id].append(dna_id)
-
-    def _remove_from_index(
-        self, dna_id: str, component_type: str, theme: str, project_id: str
-    ) -> None:
-        """Remove entry from indices."""
-        for index_name, key in [
-            ("by_component", component_type),
-            ("by_theme", theme),
-            ("by_project", project_id),
-        ]:
-            if key in self._data["index"][index_name]:
-                ids = self._data["index"][index_name][key]
-                if dna_id in ids:
-                    ids.remove(dna_id)
-                if not ids:
-                    del self._data["index"][index_name][key]
-
-    def _evict_oldest(self) -> None:
-        """Evict oldest entries if we exceed max_entries."""
-        entries = self._data.get("entries", {})
-        if len(entries) <= self.max_entries:
-            return
-
-        # Sort by created_at
-        sorted_entries = sorted(
-            entries.items(),
-            key=lambda x: x[1].get("created_at", ""),
-        )
-
-        # Remove oldest entries
-        to_remove = len(entries) - self.max_entries
-        for dna_id, entry in sorted_entries[:to_remove]:
-            self._remove_from_index(
-                dna_id,
-                entry["component_type"],
-                entry["theme"],
-                entry["project_id"],
-            )
-            del entries[dna_id]
-
-        logger.info(f"[DNAStore] Evicted {to_remove} oldest entries")
+    def _created_at(self) -> str:
+        """Current time, strictly increasing within this store (newest-first order)."""
+        now = datetime.now()
+        if self._last_created is not None and now <= self._last_created:
+            now = self._last_created + timedelta(microseconds=1)
+        self._last_created = now
+        return now.isoformat(timespec="microseconds")
+
+    @contextmanager
+    def batch(self) -> Iterator["DNAStore"]:
+        """Group writes into one transaction with a single eviction pass.
+
+        Example:
+            >>> with store.batch():
+            ...     for component, dna in results.items():
+            ...         store.save(component, theme, dna, project_id)
+        """
+        with self._backend.transaction():
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+            if self._batch_depth == 0:
+                evicted = self._backend.evict(self.max_entries)
+                if evicted:
+                    logger.info(f"[DNAStore] Evicted {evicted} oldest entries")
 
     def save(
         self,
@@ -218,22 +733,7 @@ class DNAStore:
         Returns:
             The generated dna_id for retrieval
         """
-        dna_id = self._generate_id()
-        created_at = datetime.now().isoformat()
-
-        entry = DNAEntry(
-            dna_id=dna_id,
-            component_type=component_type,
-            theme=theme,
-            project_id=project_id,
-            created_at=created_at,
-            dna=dna,
-        )
-
-        self._data["entries"][dna_id] = entry.to_dict()
-        self._add_to_index(dna_id, component_type, theme, project_id)
-        self._evict_oldest()
-        self._save()
+        dna_id = self.save_many([(component_type, theme, dna, project_id)])[0]
 
         logger.info(
             f"[DNAStore] Saved DNA: {dna_id} "
@@ -242,6 +742,34 @@ class DNAStore:
 
         return dna_id
 
+    def save_many(
+        self, items: Iterable[tuple[str, str, DesignDNA, str]]
+    ) -> list[str]:
+        """
+        Save several DNA entries in one write.
+
+        Args:
+            items: (component_type, theme, dna, project_id) tuples
+
+        Returns:
+            The generated dna_ids, in input order
+        """
+        with self.batch():  # Holds the backend lock: timestamps stay ordered
+            entries = [
+                DNAEntry(
+                    dna_id=self._generate_id(),
+                    component_type=component_type,
+                    theme=theme,
+                    project_id=project_id,
+                    created_at=self._created_at(),
+                    dna=dna,
+                )
+                for component_type, theme, dna, project_id in items
+            ]
+            self._backend.put(entries)
+        self._index_entries(entries)
+        return [entry.dna_id for entry in entries]
+
     def get(self, dna_id: str) -> Optional[DesignDNA]:
         """
         Get a DNA entry by ID.
@@ -252,11 +780,8 @@ class DNAStore:
         Returns:
             DesignDNA object if found, None otherwise
         """
-        entry_data = self._data.get("entries", {}).get(dna_id)
-        if entry_data:
-            entry = DNAEntry.from_dict(entry_data)
-            return entry.dna
-        return None
+        entry = self._backend.get(dna_id)
+        return entry.dna if entry else None
 
     def get_entry(self, dna_id: str) -> Optional[DNAEntry]:
         """
@@ -268,10 +793,7 @@ class DNAStore:
         Returns:
             DNAEntry object if found, None otherwise
         """
-        entry_data = self._data.get("entries", {}).get(dna_id)
-        if entry_data:
-            return DNAEntry.from_dict(entry_data)
-        return None
+        return self._backend.get(dna_id)
 
     def get_latest(
         self,
@@ -290,36 +812,8 @@ class DNAStore:
         Returns:
             Most recent DesignDNA if found, None otherwise
         """
-        # Get candidate IDs from indices
-        component_ids = set(
-            self._data["index"]["by_component"].get(component_type, [])
-        )
-        project_ids = set(self._data["index"]["by_project"].get(project_id, []))
-
-        # Intersect with theme if provided
-        if theme:
-            theme_ids = set(self._data["index"]["by_theme"].get(theme, []))
-            candidate_ids = component_ids & project_ids & theme_ids
-        else:
-            candidate_ids = component_ids & project_ids
-
-        if not candidate_ids:
-            return None
-
-        # Find most recent
-        entries = self._data.get("entries", {})
-        latest_id = None
-        latest_time = ""
-
-        for dna_id in candidate_ids:
-            entry = entries.get(dna_id)
-            if entry and entry.get("created_at", "") > latest_time:
-                latest_time = entry["created_at"]
-                latest_id = dna_id
-
-        if latest_id:
-            return self.get(latest_id)
-        return None
+        entry = self._backend.latest(component_type, project_id, theme)
+        return entry.dna if entry else None
 
     def search(
         self,
@@ -340,37 +834,7 @@ class DNAStore:
         Returns:
             List of matching DNAEntry objects, sorted by created_at (newest first)
         """
-        entries = self._data.get("entries", {})
-
-        # Start with all entries if no filters
-        candidate_ids = set(entries.keys())
-
-        # Apply filters
-        if component_type:
-            component_ids = set(
-                self._data["index"]["by_component"].get(component_type, [])
-            )
-            candidate_ids &= component_ids
-
-        if theme:
-            theme_ids = set(self._data["index"]["by_theme"].get(theme, []))
-            candidate_ids &= theme_ids
-
-        if project_id:
-            project_ids = set(self._data["index"]["by_project"].get(project_id, []))
-            candidate_ids &= project_ids
-
-        # Convert to entries and sort
-        results = []
-        for dna_id in candidate_ids:
-            entry_data = entries.get(dna_id)
-            if entry_data:
-                results.append(DNAEntry.from_dict(entry_data))
-
-        # Sort by created_at (newest first)
-        results.sort(key=lambda x: x.created_at, reverse=True)
-
-        return results[:limit]
+        return self._backend.search(component_type, theme, project_id, limit)
 
     def delete(self, dna_id: str) -> bool:
         """
@@ -382,18 +846,10 @@ class DNAStore:
         Returns:
             True if deleted, False if not found
         """
-        entry_data = self._data.get("entries", {}).get(dna_id)
-        if not entry_data:
+        if not self._backend.delete([dna_id]):
             return False
-
-        self._remove_from_index(
-            dna_id,
-            entry_data["component_type"],
-            entry_data["theme"],
-            entry_data["project_id"],
-        )
-        del self._data["entries"][dna_id]
-        self._save()
+        if self._similarity is not None:
+            self._similarity.remove(dna_id)
 
         logger.info(f"[DNAStore] Deleted DNA: {dna_id}")
         return True
@@ -408,16 +864,110 @@ class DNAStore:
         Returns:
             Number of entries deleted
         """
-        dna_ids = list(self._data["index"]["by_project"].get(project_id, []))
-        count = 0
-
-        for dna_id in dna_ids:
-            if self.delete(dna_id):
-                count += 1
-
+        count = self._backend.delete_project(project_id)
+        if self._similarity is not None:
+            self._similarity.remove_project(project_id)
         logger.info(f"[DNAStore] Cleared project {project_id}: {count} entries")
         return count
 
+    def _index_entries(self, entries: list[DNAEntry]) -> None:
+        """Add new entries to the similarity index if it has been built."""
+        if self._similarity is not None:
+            for entry in entries:
+                self._similarity.add(entry)
+
+    def similarity_index(self) -> DNASimilarityIndex:
+        """The DNA vector index, built on first use.
+
+        Each call first indexes entries other processes wrote since the
+        last call (SQLite backend); saves in this process are added as
+        they happen.
+        """
+        if self._similarity is None:
+            self._similarity = DNASimilarityIndex()
+        index = self._similarity
+        with index.lock:
+            index.cursor, entries = self._backend.entries_since(index.cursor)
+            for entry in entries:
+                if entry.dna_id not in index.style:
+                    index.add(entry)
+        return index
+
+    def find_similar(
+        self,
+        query: Union[DesignDNA, str],
+        k: int = 5,
+        project_id: Optional[str] = None,
+        component_type: Optional[str] = None,
+        min_score: float = 0.0,
+    ) -> list[tuple[DNAEntry, float]]:
+        """
+        Find the stored DNA nearest to a DesignDNA or a free-text description.
+
+        A DesignDNA is compared on palette, typography, spacing, borders,
+        animation and mood; text is matched against the words of each
+        entry's project, component type, theme and mood.
+
+        Args:
+            query: DesignDNA to match, or text (e.g. a project context)
+            k: Maximum results to return
+            project_id: Only entries of this project
+            component_type: Only entries of this component type
+            min_score: Minimum cosine similarity (0-1)
+
+        Returns:
+            List of (DNAEntry, score), most similar first
+        """
+        index = self.similarity_index()
+        while True:
+            results, stale = [], False
+            for dna_id, score in index.search(query, k, project_id, component_type):
+                if score < min_score:
+                    break
+                entry = self._backend.get(dna_id)
+                if entry is None:  # Evicted or deleted elsewhere
+                    index.remove(dna_id)
+                    stale = True
+                    continue
+                results.append((entry, score))
+            if not stale:
+                return results
+
+    def import_json(self, path: Union[str, Path]) -> int:
+        """
+        Import entries from a JSON database file (format 1.0).
+
+        Entries keep their IDs; existing entries with the same ID are
+        replaced. Eviction applies afterwards as for any write.
+
+        Args:
+            path: JSON file written by export_json or the JSON backend
+
+        Returns:
+            Number of entries imported
+        """
+        entries = read_json_document(Path(path).expanduser())
+        with self.batch():
+            self._backend.put(entries)
+        self._index_entries(entries)
+        return len(entries)
+
+    def export_json(self, path: Union[str, Path]) -> int:
+        """
+        Export all entries to a JSON database file (format 1.0).
+
+        Args:
+            path: Destination file (written atomically)
+
+        Returns:
+            Number of entries exported
+        """
+        entries = list(self._backend.iter_entries())
+        target = Path(path).expanduser()
+        target.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write(target, json.dumps(to_json_document(entries), indent=2, ensure_ascii=False))
+        return len(entries)
+
     def get_stats(self) -> dict[str, Any]:
         """
         Get storage statistics.
@@ -425,19 +975,19 @@ class DNAStore:
         Returns:
             Dictionary with storage stats
         """
-        entries = self._data.get("entries", {})
         return {
-            "total_entries": len(entries),
+            "total_entries": self._backend.count(),
             "max_entries": self.max_entries,
-            "components": len(self._data["index"]["by_component"]),
-            "themes": len(self._data["index"]["by_theme"]),
-            "projects": len(self._data["index"]["by_project"]),
+            "components": len(self._backend.distinct("component_type")),
+            "themes": len(self._backend.distinct("theme")),
+            "projects": len(self._backend.distinct("project_id")),
             "db_path": str(self.db_path),
+            "backend": self._backend.name,
         }
 
     def list_projects(self) -> list[str]:
         """Get list of all project IDs."""
-        return list(self._data["index"]["by_project"].keys())
+        return self._backend.distinct("project_id")
 
     def list_components(self, project_id: Optional[str] = None) -> list[str]:
         """
@@ -449,16 +999,11 @@ class DNAStore:
         Returns:
             List of component type names
         """
-        if project_id:
-            project_ids = set(self._data["index"]["by_project"].get(project_id, []))
-            entries = self._data.get("entries", {})
-            components = set()
-            for dna_id in project_ids:
-                entry = entries.get(dna_id)
-                if entry:
-                    components.add(entry["component_type"])
-            return list(components)
-        return list(self._data["index"]["by_component"].keys())
+        return self._backend.distinct("component_type", project_id)
+
+    def close(self) -> None:
+        """Close the backend (database connection)."""
+        self._backend.close()
 
 
 # Global DNAStore instance
@@ -21,18 +21,29 @@ from __future__ import annotations
 import asyncio
 import logging
 import time
+from collections import Counter
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any, Callable, Optional
 
-from gemini_mcp.orchestration.context import AgentContext, QualityTarget
+from gemini_mcp.agents.base import merge_token_usage
+from gemini_mcp.agents.prompt_budget import estimate_tokens
+from gemini_mcp.orchestration.context import AgentContext, QualityTarget, get_speculative_config
 from gemini_mcp.orchestration.pipelines import (
+    ARTIFACT_CSS,
+    ARTIFACT_DNA,
+    ARTIFACT_HTML,
+    ARTIFACT_JS,
     Pipeline,
+    PipelineNode,
     PipelineStep,
     PipelineType,
-    ParallelGroup,
     get_pipeline,
 )
-from gemini_mcp.orchestration.telemetry import get_telemetry
+from gemini_mcp.orchestration.routing import ModelRoute, RoutingPolicy, estimate_cost, get_routing_policy
+from gemini_mcp.orchestration.scheduler import DEFAULT_MAX_CONCURRENCY, DAGScheduler
+from gemini_mcp.orchestration.telemetry import PipelineTelemetry, get_telemetry
+from gemini_mcp.error_recovery import DEFAULT_RETRY_BUDGET, current_retry_budget, retry_budget
+from gemini_mcp.rate_limiter import background_priority
 from gemini_mcp.few_shot_examples import (
     get_few_shot_examples_for_prompt,
     get_corporate_examples_for_prompt,
@@ -142,6 +153,8 @@ class PipelineResult:
     # Token usage
     total_tokens: int = 0
     tokens_per_agent: dict[str, int] = field(default_factory=dict)
+    # Pipeline-wide breakdown: input/output/thinking/cached/total tokens
+    token_usage: dict[str, int] = field(default_factory=dict)
 
     # Issues
     errors: list[str] = field(default_factory=list)
@@ -154,6 +167,12 @@ class PipelineResult:
     # Step results for Trifecta agent tracking
     step_results: list = field(default_factory=list)  # list[AgentResult]
 
+    # DAG scheduler statistics (wall/busy time, max parallel nodes)
+    schedule: dict[str, Any] = field(default_factory=dict)
+
+    # Retry budget usage (retries per layer, abort reason)
+    retry_budget: dict[str, Any] = field(default_factory=dict)
+
     def to_mcp_response(self) -> dict[str, Any]:
         """Convert to MCP tool response format."""
         response = {
@@ -162,6 +181,8 @@ class PipelineResult:
             "pipeline_type": self.pipeline_type.value,
             "execution_time_ms": round(self.execution_time_ms, 2),
             "total_tokens": self.total_tokens,
+            "tokens_per_agent": self.tokens_per_agent,
+            "token_usage": self.token_usage,
             "validation_passed": self.validation_passed,
             "warnings": self.warnings,
             "errors": self.errors,
@@ -171,9 +192,32 @@ class PipelineResult:
             response["css_output"] = self.css
         if self.js:
             response["js_output"] = self.js
+        if self.schedule:
+            response["schedule"] = self.schedule
+        if self.retry_budget.get("retries_used") or self.retry_budget.get("abort_reason"):
+            response["retry_budget"] = self.retry_budget
         return response
 
 
+@dataclass
+class _PipelineRunState:
+    """Mutable bookkeeping shared by the node runners of one pipeline run."""
+
+    tokens_per_agent: dict[str, int] = field(default_factory=dict)
+    token_usage: dict[str, int] = field(default_factory=dict)
+    total_tokens: int = 0
+    completed_steps: int = 0
+    errors: list[str] = field(default_factory=list)
+    warnings: list[str] = field(default_factory=list)
+    step_results: list = field(default_factory=list)  # list[AgentResult]
+    # Artifact → [(node, result)] from nodes that ran on forked contexts
+    forked_results: dict[str, list] = field(default_factory=dict)
+    # (artifact, section_index) → output, for section-local consumers
+    section_outputs: dict[tuple[str, int], str] = field(default_factory=dict)
+    schedule: dict[str, Any] = field(default_factory=dict)
+    retry_budget: dict[str, Any] = field(default_factory=dict)
+
+
 @dataclass
 class Checkpoint:
     """A saved state of the pipeline for recovery."""
@@ -228,7 +272,8 @@ class AgentOrchestrator:
     The orchestrator:
     1. Loads the appropriate pipeline based on tool type
     2. Initializes required agents
-    3. Executes steps in sequence (or parallel for page pipelines)
+    3. Schedules agent nodes by artifact dependencies (DAG), overlapping
+       independent nodes up to a concurrency cap
     4. Passes compressed context between agents
     5. Validates cross-layer consistency
     6. Handles errors and recovery via checkpoints
@@ -239,6 +284,9 @@ class AgentOrchestrator:
         client: "GeminiClient",
         enable_checkpoints: bool = True,
         enable_validation: bool = True,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        routing_policy: Optional[RoutingPolicy] = None,
+        speculative_candidates: Optional[int] = None,
     ):
         """
         Initialize the orchestrator.
@@ -247,10 +295,29 @@ class AgentOrchestrator:
             client: GeminiClient for API calls
             enable_checkpoints: Whether to save checkpoints for recovery
             enable_validation: Whether to run cross-layer validation
+            max_concurrency: Default cap on concurrently running pipeline nodes
+            routing_policy: Model routing per agent call; defaults to the global
+                policy when the client's config enables model routing, else
+                agents use their AgentConfig
+            speculative_candidates: Alchemist → Critic candidates per refiner
+                iteration; defaults to the client's config
+                (GEMINI_SPECULATIVE_CANDIDATES), else the quality target's
+                default of one
         """
         self.client = client
         self.enable_checkpoints = enable_checkpoints
         self.enable_validation = enable_validation
+        self.max_concurrency = max_concurrency
+        if routing_policy is None and getattr(
+            getattr(client, "config", None), "model_routing_enabled", False
+        ) is True:
+            routing_policy = get_routing_policy()
+        self.routing_policy = routing_policy
+        if speculative_candidates is None:
+            configured = getattr(getattr(client, "config", None), "speculative_candidates", None)
+            if isinstance(configured, int) and configured > 1:
+                speculative_candidates = configured
+        self.speculative_candidates = speculative_candidates
         self._agents: dict[str, "BaseAgent"] = {}
         self._checkpoint_manager = CheckpointManager()
         self._validators: dict[str, Callable] = {}
@@ -336,144 +403,51 @@ class AgentOrchestrator:
                 for name, preset in MICRO_INTERACTIONS.items()
             }
 
-        # Track metrics
-        tokens_per_agent: dict[str, int] = {}
-        total_tokens = 0
-        completed_steps = 0
-        errors: list[str] = []
-        warnings: list[str] = []
-        step_results: list = []  # Collect AgentResult for each step
-
-        try:
-            for step in pipeline.steps:
-                if isinstance(step, ParallelGroup):
-                    # Execute parallel steps
-                    results = await self._execute_parallel_group(step, context)
-                    # DEBUG: Log context.html_output immediately after parallel group returns
-                    logger.info(f"[DEBUG] After parallel group '{step.name}': html_output_len={len(context.html_output) if context.html_output else 0}")
-                    for agent_name, result in results.items():
-                        step_results.append(result)  # Collect for Trifecta tracking
-
-                        # Record telemetry for parallel agents
-                        agent_tokens = sum(result.token_usage.values()) if result.token_usage else 0
-                        telemetry.record_agent_execution(
-                            pipeline_id=context.pipeline_id,
-                            agent_name=agent_name,
-                            execution_time_ms=result.execution_time_ms,
-                            tokens_used=agent_tokens,
-                            success=result.success,
-                            error_message=result.errors[0] if result.errors else "",
-                        )
-
-                        if result.success:
-                            completed_steps += 1
-                            if result.token_usage:
-                                tokens = sum(result.token_usage.values())
-                                tokens_per_agent[agent_name] = tokens_per_agent.get(agent_name, 0) + tokens
-                                total_tokens += tokens
-                            warnings.extend(result.warnings)
-                        else:
-                            errors.extend(result.errors)
-
-                        if on_step_complete:
-                            on_step_complete(agent_name, result)
+        # Track metrics (shared by all node runners)
+        state = _PipelineRunState()
+
+        # === DAG Scheduling ===
+        # Nodes start as soon as the producers of their input artifacts have
+        # finished. Nodes that can overlap with others run on forked contexts
+        # and their artifacts are merged back once every producer is done.
+        nodes = {node.node_id: node for node in pipeline.graph()}
+        exclusive = pipeline.exclusive_nodes()
+        producers_left = Counter(node.output for node in nodes.values())
+        scheduler = DAGScheduler(
+            pipeline.dependencies(),
+            max_concurrency=pipeline.max_concurrency or self.max_concurrency,
+        )
 
-                else:
-                    # Execute single step
-                    if not step.should_run(context):
-                        logger.info(f"Skipping step: {step.agent_name}")
-                        continue
-
-                    # DEBUG: Log html_output state before each step
-                    logger.info(f"[DEBUG] Before step '{step.agent_name}': html_output_len={len(context.html_output) if context.html_output else 0}")
-                    result = await self._execute_step(step, context, pipeline)
-                    step_results.append(result)  # Collect for Trifecta tracking
-                    context.step_index += 1
-
-                    # Record telemetry for this agent
-                    agent_tokens = sum(result.token_usage.values()) if result.token_usage else 0
-                    telemetry.record_agent_execution(
-                        pipeline_id=context.pipeline_id,
-                        agent_name=step.agent_name,
-                        execution_time_ms=result.execution_time_ms,
-                        tokens_used=agent_tokens,
-                        success=result.success,
-                        error_message=result.errors[0] if result.errors else "",
-                    )
+        async def run_node(node_id: str) -> Optional["AgentResult"]:
+            node = nodes[node_id]
+            result = None
+            if not node.step.should_run(context):
+                logger.info(f"Skipping step: {node_id}")
+            elif node_id in exclusive:
+                result = await self._run_exclusive_node(
+                    node, context, pipeline, state, telemetry, on_step_complete
+                )
+            else:
+                result = await self._run_forked_node(
+                    node, context, pipeline, state, telemetry, on_step_complete
+                )
 
-                    if result.success:
-                        completed_steps += 1
-                        # Update context with output
-                        context.set_output(step.agent_name, result.output)
-                        # DEBUG: Log html_output after set_output
-                        logger.info(f"[DEBUG] After set_output('{step.agent_name}'): html_output_len={len(context.html_output) if context.html_output else 0}")
-                        if step.compress_output:
-                            context.compress_current_output(result.output, step.output_type)
-
-                        # === PHASE 7: DNA Propagation Fix ===
-                        # Propagate DNA from Strategist to context
-                        if step.agent_name == "strategist" and result.metadata:
-                            dna_data = result.metadata.get("design_dna")
-                            if dna_data:
-                                from gemini_mcp.orchestration.context import DesignDNA
-                                context.design_dna = DesignDNA.from_dict(dna_data)
-                                logger.info(
-                                    f"[Orchestrator] DNA propagated from Strategist: "
-                                    f"mood={context.design_dna.mood}"
-                                )
-
-                        # === CREATIVITY ENHANCEMENT: Reference Adherence Check ===
-                        # After Alchemist in REFERENCE pipeline, evaluate adherence
-                        if (
-                            pipeline_type == PipelineType.REFERENCE
-                            and step.agent_name == "alchemist"
-                            and context.design_tokens  # Tokens from Visionary
-                            and context.html_output
-                        ):
-                            try:
-                                from gemini_mcp.agents.critic import CriticAgent
-
-                                critic = CriticAgent(client=self.client)
-                                adherence_score, improvements = await critic.evaluate_reference_adherence(
-                                    reference_tokens=context.design_tokens,
-                                    generated_html=context.html_output,
-                                    generated_css=context.css_output or "",
-                                    context=context,
-                                )
-
-                                # Log adherence score
-                                logger.info(
-                                    f"[Orchestrator] Reference adherence: {adherence_score:.2f}"
-                                )
-
-                                # Add warning if adherence is low
-                                REFERENCE_ADHERENCE_THRESHOLD = 7.0
-                                if adherence_score < REFERENCE_ADHERENCE_THRESHOLD:
-                                    warnings.append(
-                                        f"Reference adherence is {adherence_score:.1f}/10 "
-                                        f"(threshold: {REFERENCE_ADHERENCE_THRESHOLD}). "
-                                        f"Improvements: {'; '.join(improvements[:3])}"
-                                    )
-                                    # Store improvements for potential retry
-                                    context.reference_adherence_improvements = improvements
-
-                            except Exception as e:
-                                logger.warning(f"Reference adherence check failed: {e}")
-
-                        # Track tokens
-                        if result.token_usage:
-                            tokens = sum(result.token_usage.values())
-                            tokens_per_agent[step.agent_name] = tokens
-                            total_tokens += tokens
-
-                        warnings.extend(result.warnings)
-                    else:
-                        errors.extend(result.errors)
-                        if step.required and not step.recoverable:
-                            raise RuntimeError(f"Required step {step.agent_name} failed: {result.errors}")
+            producers_left[node.output] -= 1
+            if producers_left[node.output] == 0 and state.forked_results.get(node.output):
+                await self._merge_forked_artifact(node.output, context, state)
+            return result
 
-                    if on_step_complete:
-                        on_step_complete(step.agent_name, result)
+        try:
+            # One retry budget for the whole pipeline, shared by every node
+            with retry_budget(
+                max_retries=max(DEFAULT_RETRY_BUDGET, context.total_steps),
+            ) as budget:
+                try:
+                    await scheduler.run(run_node)
+                finally:
+                    state.retry_budget = budget.to_dict()
+            state.schedule = scheduler.get_stats()
+            logger.info(f"[Scheduler] {pipeline.name}: {state.schedule}")
 
             # Run cross-layer validation
             validation_passed = True
@@ -482,20 +456,20 @@ class AgentOrchestrator:
             if self.enable_validation:
                 validation_passed, validation_issues = self._run_validation(context)
                 if not validation_passed:
-                    warnings.extend(validation_issues)
+                    state.warnings.extend(validation_issues)
 
             # === Phase 5: Post-Pipeline Density Validation ===
             # Validate output density against complexity requirements
             density_passed, density_issues = self._validate_output_density_post_pipeline(context)
             if not density_passed:
-                warnings.extend(density_issues)
+                state.warnings.extend(density_issues)
                 logger.warning(
                     f"[Orchestrator] Density validation failed: {density_issues}"
                 )
 
             # Build result
             execution_time = (time.time() - start_time) * 1000
-            pipeline_success = len(errors) == 0
+            pipeline_success = len(state.errors) == 0
 
             # End telemetry tracking
             telemetry.end_pipeline(context.pipeline_id, pipeline_success)
@@ -512,15 +486,18 @@ class AgentOrchestrator:
                 pipeline_type=pipeline_type,
                 pipeline_id=context.pipeline_id,
                 total_steps=context.total_steps,
-                completed_steps=completed_steps,
+                completed_steps=state.completed_steps,
                 execution_time_ms=execution_time,
-                total_tokens=total_tokens,
-                tokens_per_agent=tokens_per_agent,
-                errors=errors,
-                warnings=warnings,
+                total_tokens=state.total_tokens,
+                tokens_per_agent=state.tokens_per_agent,
+                token_usage=state.token_usage,
+                errors=state.errors,
+                warnings=state.warnings,
                 validation_passed=validation_passed,
                 validation_issues=validation_issues,
-                step_results=step_results,
+                step_results=state.step_results,
+                schedule=state.schedule,
+                retry_budget=state.retry_budget,
             )
 
         except Exception as e:
@@ -539,14 +516,17 @@ class AgentOrchestrator:
                 pipeline_type=pipeline_type,
                 pipeline_id=context.pipeline_id,
                 total_steps=context.total_steps,
-                completed_steps=completed_steps,
+                completed_steps=state.completed_steps,
                 execution_time_ms=execution_time,
-                total_tokens=total_tokens,
-                tokens_per_agent=tokens_per_agent,
-                errors=[str(e)] + errors,
-                warnings=warnings,
+                total_tokens=state.total_tokens,
+                tokens_per_agent=state.tokens_per_agent,
+                token_usage=state.token_usage,
+                errors=[str(e)] + state.errors,
+                warnings=state.warnings,
                 validation_passed=False,
-                step_results=step_results,
+                step_results=state.step_results,
+                schedule=state.schedule,
+                retry_budget=state.retry_budget,
             )
 
         finally:
@@ -724,6 +704,24 @@ class AgentOrchestrator:
 
         return passed, issues
 
+    @staticmethod
+    def _record_context_cache(
+        telemetry: PipelineTelemetry,
+        pipeline_id: str,
+        agent_name: str,
+        result: "AgentResult",
+    ) -> None:
+        """Forward an agent's context cache usage (if any) to telemetry."""
+        cache_info = result.metadata.get("context_cache") if result.metadata else None
+        if not cache_info:
+            return
+        telemetry.record_context_cache(
+            pipeline_id=pipeline_id,
+            agent_name=agent_name,
+            hit=bool(cache_info.get("hit")),
+            cached_tokens=cache_info.get("cached_tokens", 0),
+        )
+
     async def _execute_step(
         self,
         step: PipelineStep,
@@ -765,6 +763,351 @@ class AgentOrchestrator:
 
         return result
 
+    # =========================================================================
+    # DAG Node Execution
+    # =========================================================================
+
+    def _record_node_result(
+        self,
+        name: str,
+        result: "AgentResult",
+        context: AgentContext,
+        state: _PipelineRunState,
+        telemetry: PipelineTelemetry,
+    ) -> None:
+        """Record telemetry and token usage for a finished node."""
+        state.step_results.append(result)  # Collect for Trifecta tracking
+
+        agent_tokens = result.total_tokens
+        telemetry.record_agent_execution(
+            pipeline_id=context.pipeline_id,
+            agent_name=name,
+            execution_time_ms=result.execution_time_ms,
+            tokens_used=agent_tokens,
+            success=result.success,
+            error_message=result.errors[0] if result.errors else "",
+            token_usage=result.token_usage,
+        )
+        self._record_context_cache(telemetry, context.pipeline_id, name, result)
+        prompt_budget = result.metadata.get("prompt_budget") if result.metadata else None
+        if prompt_budget:
+            telemetry.record_prompt_budget(context.pipeline_id, name, prompt_budget)
+        for call in (result.metadata.get("model_routes", []) if result.metadata else []):
+            telemetry.record_route(context.pipeline_id, **call)
+
+        # Failed calls are billed too - count tokens regardless of success
+        if result.token_usage:
+            state.tokens_per_agent[name] = state.tokens_per_agent.get(name, 0) + agent_tokens
+            state.total_tokens += agent_tokens
+            merge_token_usage(state.token_usage, result.token_usage)
+
+    async def _run_exclusive_node(
+        self,
+        node: PipelineNode,
+        context: AgentContext,
+        pipeline: Pipeline,
+        state: _PipelineRunState,
+        telemetry: PipelineTelemetry,
+        on_step_complete: Optional[Callable[[str, "AgentResult"], None]],
+    ) -> "AgentResult":
+        """Run a node that never overlaps with others on the shared context."""
+        step = node.step
+
+        # DEBUG: Log html_output state before each step
+        logger.info(f"[DEBUG] Before step '{node.node_id}': html_output_len={len(context.html_output) if context.html_output else 0}")
+        result = await self._execute_step(step, context, pipeline)
+        context.step_index += 1
+        self._record_node_result(node.node_id, result, context, state, telemetry)
+
+        if result.success:
+            state.completed_steps += 1
+            # Update context with output
+            context.set_output(step.agent_name, result.output)
+            # DEBUG: Log html_output after set_output
+            logger.info(f"[DEBUG] After set_output('{step.agent_name}'): html_output_len={len(context.html_output) if context.html_output else 0}")
+            if step.compress_output:
+                context.compress_current_output(result.output, step.output_type)
+
+            # === PHASE 7: DNA Propagation Fix ===
+            # Propagate DNA from Strategist to context
+            if step.agent_name == "strategist":
+                self._propagate_dna(context, result)
+
+            # === CREATIVITY ENHANCEMENT: Reference Adherence Check ===
+            # After Alchemist in REFERENCE pipeline, evaluate adherence
+            if (
+                pipeline.pipeline_type == PipelineType.REFERENCE
+                and step.agent_name == "alchemist"
+                and context.design_tokens  # Tokens from Visionary
+                and context.html_output
+            ):
+                try:
+                    from gemini_mcp.agents.critic import CriticAgent
+
+                    critic = CriticAgent(client=self.client)
+                    adherence_score, improvements = await critic.evaluate_reference_adherence(
+                        reference_tokens=context.design_tokens,
+                        generated_html=context.html_output,
+                        generated_css=context.css_output or "",
+                        context=context,
+                    )
+
+                    # Log adherence score
+                    logger.info(
+                        f"[Orchestrator] Reference adherence: {adherence_score:.2f}"
+                    )
+
+                    # Add warning if adherence is low
+                    REFERENCE_ADHERENCE_THRESHOLD = 7.0
+                    if adherence_score < REFERENCE_ADHERENCE_THRESHOLD:
+                        state.warnings.append(
+                            f"Reference adherence is {adherence_score:.1f}/10 "
+                            f"(threshold: {REFERENCE_ADHERENCE_THRESHOLD}). "
+                            f"Improvements: {'; '.join(improvements[:3])}"
+                        )
+                        # Store improvements for potential retry
+                        context.reference_adherence_improvements = improvements
+
+                except Exception as e:
+                    logger.warning(f"Reference adherence check failed: {e}")
+
+            state.warnings.extend(result.warnings)
+        else:
+            state.errors.extend(result.errors)
+            if step.required and not step.recoverable:
+                raise RuntimeError(f"Required step {step.agent_name} failed: {result.errors}")
+
+        if on_step_complete:
+            on_step_complete(node.node_id, result)
+        return result
+
+    async def _run_forked_node(
+        self,
+        node: PipelineNode,
+        context: AgentContext,
+        pipeline: Pipeline,
+        state: _PipelineRunState,
+        telemetry: PipelineTelemetry,
+        on_step_complete: Optional[Callable[[str, "AgentResult"], None]],
+    ) -> Optional["AgentResult"]:
+        """Run a node that may overlap with others on a forked context.
+
+        The node's output is collected per artifact and merged into the
+        shared context by _merge_forked_artifact once all producers finish.
+        """
+        from gemini_mcp.agents.base import AgentResult, AgentRole
+
+        agent = self.get_agent(node.agent_name)
+        if agent is None:
+            logger.warning(f"Agent not registered: {node.agent_name}, skipping node {node.node_id}")
+            return None
+
+        section_type = ""
+        if node.section_index >= 0:
+            # Section-specific context (PAGE pipeline)
+            idx = node.section_index
+            section = context.sections[idx] if idx < len(context.sections) else {}
+            section_type = section.get("type", f"section_{idx}")
+            # Use lightweight fork for parallel execution (Issue 3 fix)
+            step_context = context.fork_for_parallel(step_index=idx, section_type=section_type)
+            step_context.component_type = section.get("type", "section")
+            # Set section-specific content structure if available
+            if section.get("content"):
+                step_context.content_structure = section.get("content", {})
+            # Section-local inputs (e.g. this section's HTML for its Alchemist)
+            section_html = state.section_outputs.get((ARTIFACT_HTML, idx))
+            if section_html and node.output != ARTIFACT_HTML:
+                step_context.html_output = section_html
+                step_context.previous_output = section_html
+        else:
+            step_context = context.fork_for_parallel()
+            step_context.pipeline_id = f"{context.pipeline_id}-{node.node_id}"
+
+        try:
+            result = await self._execute_with_correction(
+                agent,
+                step_context,
+                # Failed sections are covered by the sequential fallback
+                max_retries=0 if node.section_index >= 0 or not node.step.recoverable else pipeline.max_retries,
+            )
+        except Exception as e:
+            logger.error(f"Parallel task {node.node_id} failed: {e}")
+            result = AgentResult(
+                success=False,
+                output="",
+                agent_role=AgentRole.ARCHITECT,
+                execution_time_ms=0,
+                errors=[str(e)],
+            )
+
+        self._record_node_result(node.node_id, result, context, state, telemetry)
+        state.forked_results.setdefault(node.output, []).append((node, result))
+
+        if result.success:
+            state.completed_steps += 1
+            state.warnings.extend(result.warnings)
+            if node.section_index >= 0 and result.output:
+                state.section_outputs[(node.output, node.section_index)] = result.output
+                # Streaming: deliver each section as soon as its architect finishes
+                if node.output == ARTIFACT_HTML and context.section_callback is not None:
+                    await self._report_section(context.section_callback, section_type, result.output)
+        else:
+            logger.warning(f"Parallel node '{node.node_id}' failed: {result.errors}")
+            state.errors.extend(result.errors)
+            if node.step.required and not node.step.recoverable:
+                raise RuntimeError(f"Required step {node.node_id} failed: {result.errors}")
+
+        if on_step_complete:
+            on_step_complete(node.node_id, result)
+        return result
+
+    @staticmethod
+    async def _report_section(callback: Any, section_type: str, html: str) -> None:
+        """Hand a finished section to the streaming callback.
+
+        Callback failures are logged and never fail the section itself.
+        """
+        try:
+            await callback(section_type, html)
+        except Exception as e:
+            logger.warning(f"Section callback failed for '{section_type}': {e}")
+
+    @staticmethod
+    def _propagate_dna(context: AgentContext, result: "AgentResult") -> None:
+        """Copy the Strategist's DesignDNA from result metadata into context."""
+        dna_data = result.metadata.get("design_dna") if result.metadata else None
+        if dna_data:
+            from gemini_mcp.orchestration.context import DesignDNA
+
+            context.design_dna = DesignDNA.from_dict(dna_data)
+            logger.info(
+                f"[Orchestrator] DNA propagated from Strategist: "
+                f"mood={context.design_dna.mood}"
+            )
+
+    async def _merge_forked_artifact(
+        self,
+        artifact: str,
+        context: AgentContext,
+        state: _PipelineRunState,
+    ) -> None:
+        """
+        Merge an artifact produced on forked contexts into the shared context.
+
+        Called once every producer of the artifact has finished, before any
+        consumer starts:
+        - Section outputs are joined in section order (page HTML, and CSS/JS
+          with per-section styling). If every section architect failed, the
+          sequential fallback (BUG #16) is used.
+        - A single producer's output is stored as-is (e.g. Alchemist CSS
+          and Physicist JS running concurrently in the COMPONENT pipeline).
+        """
+        entries = state.forked_results.get(artifact, [])
+        succeeded = [(node, result) for node, result in entries if result.success and result.output]
+        sectioned = any(node.section_index >= 0 for node, _ in entries)
+
+        if artifact == ARTIFACT_DNA:
+            for _, result in succeeded:
+                self._propagate_dna(context, result)
+            return
+
+        if sectioned:
+            succeeded.sort(key=lambda entry: entry[0].section_index)
+            merged = "\n\n".join(result.output for _, result in succeeded)
+            if succeeded:
+                logger.info(f"Merged {len(succeeded)} section {artifact} outputs, total chars={len(merged)}")
+            elif artifact == ARTIFACT_HTML:
+                merged = await self._sequential_section_fallback(context, entries)
+        else:
+            merged = succeeded[-1][1].output if succeeded else ""
+
+        if not merged:
+            return
+
+        agent_type = {ARTIFACT_HTML: "architect", ARTIFACT_CSS: "alchemist", ARTIFACT_JS: "physicist"}.get(artifact)
+        if agent_type:
+            context.set_output(agent_type, merged)
+            if any(node.step.compress_output for node, _ in entries):
+                context.compress_current_output(merged, artifact)
+        logger.info(f"[ParallelMerge] {artifact} merged from {len(succeeded)} node(s): {len(merged)} chars")
+
+    async def _sequential_section_fallback(
+        self,
+        context: AgentContext,
+        entries: list,
+    ) -> str:
+        """
+        BUG #16 FIX: Re-run section architects one by one after all failed.
+
+        Args:
+            context: Shared pipeline context
+            entries: [(node, result)] of the failed section architects
+
+        Returns:
+            Merged section HTML, or an error page section if that fails too
+        """
+        logger.warning(f"[BUG16-FIX] All {len(entries)} section architects failed! Attempting sequential fallback...")
+
+        # Collect error info from failed results
+        failed_sections = []
+        for node, result in entries:
+            error_msg = result.errors[0][:100] if result.errors else 'No error message'
+            failed_sections.append(f"{node.node_id}: {error_msg}")
+
+        if failed_sections:
+            logger.error(f"[BUG16-FIX] Failed sections:\n" + "\n".join(failed_sections))
+
+        # SEQUENTIAL FALLBACK: Try running sections one by one
+        sequential_htmls = []
+        sections = context.sections if context.sections else []
+
+        for idx, section in enumerate(sections):
+            try:
+                section_type = section.get("type", f"section_{idx}")
+                logger.info(f"[BUG16-FIX] Sequential fallback - attempting section {idx}: {section_type}")
+
+                # Create context for this section
+                step_context = context.fork_for_parallel(
+                    step_index=idx,
+                    section_type=section_type,
+                )
+                step_context.component_type = section_type
+
+                # Get architect agent and execute
+                architect = self.get_agent("architect")
+                if architect:
+                    seq_result = await architect.execute(step_context)
+                    if seq_result.success and seq_result.output:
+                        sequential_htmls.append((idx, seq_result.output))
+                        logger.info(f"[BUG16-FIX] Sequential section {idx} SUCCESS: {len(seq_result.output)} chars")
+                    else:
+                        logger.warning(f"[BUG16-FIX] Sequential section {idx} FAILED: {seq_result.errors}")
+            except Exception as e:
+                logger.error(f"[BUG16-FIX] Sequential section {idx} EXCEPTION: {e}")
+
+        if sequential_htmls:
+            # Sequential fallback succeeded - use those results
+            sequential_htmls.sort(key=lambda x: x[0])
+            merged_html = "\n\n".join(html for _, html in sequential_htmls)
+            logger.info(f"[BUG16-FIX] Sequential fallback SUCCESS: merged {len(sequential_htmls)} sections, {len(merged_html)} chars")
+            return merged_html
+
+        # Even sequential failed - set error HTML
+        fallback_html = f'''<!-- SECTION: error -->
+<div class="min-h-screen flex items-center justify-center bg-slate-100 dark:bg-slate-900">
+    <div class="text-center p-8 bg-white dark:bg-slate-800 rounded-xl shadow-lg max-w-md">
+        <svg class="w-16 h-16 mx-auto text-amber-500 mb-4" fill="none" viewBox="0 0 24 24" stroke="currentColor">
+            <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M12 9v2m0 4h.01m-6.938 4h13.856c1.54 0 2.502-1.667 1.732-3L13.732 4c-.77-1.333-2.694-1.333-3.464 0L3.34 16c-.77 1.333.192 3 1.732 3z" />
+        </svg>
+        <h2 class="text-xl font-bold text-slate-900 dark:text-white mb-2">Sayfa Oluşturulamadı</h2>
+        <p class="text-slate-600 dark:text-slate-300 mb-4">Paralel ve sequential oluşturma başarısız oldu. Lütfen <code class="bg-slate-100 dark:bg-slate-700 px-2 py-1 rounded">use_trifecta=False</code> ile tekrar deneyin.</p>
+        <p class="text-xs text-slate-400">Hata: {len(entries)} section hem paralel hem sequential olarak başarısız</p>
+    </div>
+</div>
+<!-- /SECTION: error -->'''
+        logger.warning(f"[BUG16-FIX] Both parallel and sequential failed, set error HTML ({len(fallback_html)} chars)")
+        return fallback_html
+
     async def _execute_with_correction(
         self,
         agent: "BaseAgent",
@@ -778,17 +1121,31 @@ class AgentOrchestrator:
         """
         from gemini_mcp.agents.base import AgentResult
 
+        # Tokens from every attempt are billed, so report the sum
+        spent: dict[str, int] = {}
+        route = self._route_agent(agent, context)
+        routed_calls: list[dict[str, Any]] = []
+
         for attempt in range(max_retries + 1):
             context.attempt = attempt
 
             result = await agent.execute(context)
+            if route is not None:
+                # One record per attempt: retries may run on an escalated route
+                routed_calls.append(self._route_call(route, result))
+                result.metadata["model_routes"] = list(routed_calls)
+            merge_token_usage(spent, result.token_usage)
+            result.token_usage = dict(spent)
 
             if not result.success:
                 # Agent execution failed
-                if attempt < max_retries:
+                if attempt < max_retries and self._consume_retry("correction"):
                     logger.warning(
                         f"Agent {agent.name} failed, retrying ({attempt + 1}/{max_retries})"
                     )
+                    # Output rejected by the agent's own (strict) validation
+                    if result.output:
+                        route = self._escalate_route(context, route, validation_failed=True)
                     continue
                 return result
 
@@ -799,16 +1156,81 @@ class AgentOrchestrator:
                 return result
 
             # Validation failed
-            if attempt < max_retries:
+            if attempt < max_retries and self._consume_retry("correction"):
                 logger.warning(
                     f"Agent {agent.name} output invalid, retrying with feedback: {issues}"
                 )
                 context.correction_feedback = "\n".join(issues)
+                route = self._escalate_route(context, route, validation_failed=True)
             else:
                 result.warnings.extend(issues)
+                return result
 
         return result
 
+    # =========================================================================
+    # Model Routing
+    # =========================================================================
+
+    def _route_agent(self, agent: "BaseAgent", context: AgentContext) -> Optional[ModelRoute]:
+        """
+        Pick the model route for an agent's calls on this context.
+
+        The route is stored in context.model_routes, where the agent's
+        generation_kwargs() reads it. An escalated route is kept, so later
+        calls on the same context stay on Pro.
+        """
+        role = getattr(getattr(agent, "role", None), "value", None)
+        if self.routing_policy is None or not isinstance(role, str):
+            return None
+
+        current = context.model_routes.get(role)
+        if current is not None and current.escalated:
+            return current
+
+        tier = context.metadata.get("tier")
+        route = self.routing_policy.route(
+            role,
+            context.component_type,
+            context.quality_target,
+            tier if isinstance(tier, int) else None,
+        )
+        context.model_routes[role] = route
+        return route
+
+    def _escalate_route(
+        self,
+        context: AgentContext,
+        route: Optional[ModelRoute],
+        **signals: Any,
+    ) -> Optional[ModelRoute]:
+        """Move a Flash route to Pro when a result demands it (see RoutingPolicy.escalation_reason)."""
+        if route is None or self.routing_policy is None:
+            return route
+        reason = self.routing_policy.escalation_reason(route, **signals)
+        if not reason:
+            return route
+        route = self.routing_policy.escalate(route, reason)
+        context.model_routes[route.agent_name] = route
+        return route
+
+    @staticmethod
+    def _route_call(route: ModelRoute, result: "AgentResult") -> dict[str, Any]:
+        """PipelineTelemetry.record_route() arguments for one agent call."""
+        return {
+            "route": route.to_dict(),
+            "latency_ms": result.execution_time_ms,
+            "cost_usd": estimate_cost(route.model, result.token_usage),
+            "tokens": result.total_tokens,
+        }
+
+    @staticmethod
+    def _consume_retry(layer: str) -> bool:
+        """Take a retry from the request's RetryBudget (always allowed without one)."""
+        budget = current_retry_budget()
+        return budget is None or budget.consume(layer)
+
+    @background_priority
     async def _run_refiner_loop(
         self,
         context: AgentContext,
@@ -826,6 +1248,14 @@ class AgentOrchestrator:
         3. If score < QUALITY_THRESHOLD, feed improvements back to Alchemist
         4. Repeat until score >= threshold or MAX_REFINER_ITERATIONS
 
+        Speculative mode (opt-in via speculative_candidates, see
+        get_speculative_config) runs K Alchemist → Critic chains in parallel
+        per iteration and keeps the best-scoring candidate, trading tokens
+        for fewer serial round trips. Once the next round (Alchemist and
+        Critic tokens) would exceed the target's token budget the loop falls
+        back to a single candidate; before the first round is measured the
+        per-candidate cost is estimated from the HTML size and output caps.
+
         Args:
             context: Pipeline context with HTML output
             initial_css: Optional initial CSS to refine (empty for new generation)
@@ -848,6 +1278,7 @@ class AgentOrchestrator:
             return initial_css, CriticScores(), 0
 
         critic: CriticAgent = critic_agent
+        route = self._route_agent(alchemist, context)
 
         # Initialize
         current_css = initial_css
@@ -863,11 +1294,23 @@ class AgentOrchestrator:
         score_history: list[float] = []
         low_delta_count = 0  # Track consecutive low-improvement iterations
 
+        # === Speculative Candidates (per QualityTarget) ===
+        speculative_k, token_budget = get_speculative_config(
+            context.quality_target, self.speculative_candidates
+        )
+        tokens_spent = 0
+        tokens_per_candidate = (
+            self._estimate_candidate_tokens(context, alchemist, critic)
+            if speculative_k > 1 and token_budget else 0
+        )
+        measured = False
+
         logger.info(
             f"[RefinerLoop] Starting refinement. "
             f"Component: {context.component_type or 'unknown'}, "
             f"Adaptive threshold: {adaptive_threshold}, "
-            f"Max iterations: {MAX_REFINER_ITERATIONS}"
+            f"Max iterations: {MAX_REFINER_ITERATIONS}, "
+            f"Candidates: {speculative_k}"
         )
 
         for iteration in range(MAX_REFINER_ITERATIONS):
@@ -884,22 +1327,39 @@ class AgentOrchestrator:
                     f"Feedback: {len(context.critic_feedback)} items"
                 )
 
-            alchemist_result = await alchemist.execute(context)
+            # Speculative mode: only fan out while the next round fits the budget
+            candidates = speculative_k
+            if token_budget and tokens_spent + tokens_per_candidate * speculative_k > token_budget:
+                candidates = 1
+
+            # Step 2: Critic evaluates quality (every candidate, concurrently)
+            round_start = time.perf_counter()
+            outcome = await self._run_refiner_round(
+                alchemist, critic, context, candidates, adaptive_threshold
+            )
+            round_ms = (time.perf_counter() - round_start) * 1000
 
-            if not alchemist_result.success:
+            if outcome is None:
                 logger.warning(
                     f"[RefinerLoop] Alchemist failed at iteration {iteration + 1}"
                 )
                 break
 
-            current_css = alchemist_result.output
-
-            # Step 2: Critic evaluates quality
-            scores, improvements = await critic.evaluate(
-                html=context.html_output,
-                css=current_css,
-                js=context.js_output,
-                context=context,
+            current_css, scores, improvements, round_tokens = outcome
+            tokens_spent += round_tokens
+            # Measured cost replaces the initial estimate
+            per_candidate = round_tokens // candidates
+            tokens_per_candidate = (
+                max(tokens_per_candidate, per_candidate) if measured else per_candidate
+            )
+            measured = True
+            get_telemetry().record_refiner_round(
+                pipeline_id=context.pipeline_id,
+                iteration=iteration + 1,
+                candidates=candidates,
+                latency_ms=round_ms,
+                best_score=scores.overall,
+                tokens=round_tokens,
             )
 
             logger.info(
@@ -952,6 +1412,10 @@ class AgentOrchestrator:
             # Step 4: Feed improvements back for next iteration
             context.critic_feedback = improvements
             context.css_output = current_css  # Update for next Alchemist run
+            # A below-threshold score moves a Flash Alchemist to Pro
+            route = self._escalate_route(
+                context, route, critic_score=scores.overall, threshold=adaptive_threshold
+            )
 
         # Max iterations reached - return best result
         logger.info(
@@ -959,6 +1423,114 @@ class AgentOrchestrator:
         )
         return best_css, best_scores, MAX_REFINER_ITERATIONS
 
+    @staticmethod
+    def _estimate_candidate_tokens(context: AgentContext, *agents: Any) -> int:
+        """
+        Upper-bound tokens of one Alchemist → Critic chain before any is measured.
+
+        Each agent is sent the HTML and may use up to its output cap.
+        """
+        html_tokens = estimate_tokens(context.html_output)
+        total = 0
+        for agent in agents:
+            cap = getattr(getattr(agent, "config", None), "max_output_tokens", 0)
+            total += html_tokens + (cap if isinstance(cap, int) else 0)
+        return total
+
+    async def _run_refiner_round(
+        self,
+        alchemist: "BaseAgent",
+        critic: "CriticAgent",
+        context: AgentContext,
+        candidates: int,
+        threshold: Optional[float] = None,
+    ) -> Optional[tuple[str, "CriticScores", list[str], int]]:
+        """
+        Generate and score CSS candidates for one refiner iteration.
+
+        A single candidate runs on the shared context. Several candidates
+        each run on a forked context (the Alchemist samples at temperature
+        1.0, so the variants differ) and are scored concurrently; the best
+        one wins and its thought signatures are carried over. Candidates are
+        scored through CriticAgent.gated_evaluate, so a confident local
+        surrogate prediction against threshold replaces the remote call.
+
+        Returns:
+            Tuple of (css, scores, improvements, tokens) for the best
+            candidate, or None if no candidate produced CSS. tokens counts
+            the Alchemist and Critic calls of every candidate.
+        """
+        route = context.model_routes.get("alchemist") if self.routing_policy else None
+
+        def record_route(result: "AgentResult") -> None:
+            if route is not None:
+                get_telemetry().record_route(context.pipeline_id, **self._route_call(route, result))
+
+        if candidates <= 1:
+            result = await alchemist.execute(context)
+            record_route(result)
+            if not result.success:
+                return None
+            critic_usage: dict[str, int] = {}
+            scores, improvements = await critic.gated_evaluate(
+                html=context.html_output,
+                css=result.output,
+                js=context.js_output,
+                context=context,
+                threshold=threshold,
+                token_usage=critic_usage,
+            )
+            tokens = result.total_tokens + critic_usage.get("total_tokens", 0)
+            return result.output, scores, improvements, tokens
+
+        async def run_candidate(index: int):
+            fork = context.fork_for_parallel()
+            fork.pipeline_id = f"{context.pipeline_id}-candidate{index}"
+            result = await alchemist.execute(fork)
+            record_route(result)
+            if not result.success:
+                return None, result.total_tokens
+            critic_usage: dict[str, int] = {}
+            scores, improvements = await critic.gated_evaluate(
+                html=fork.html_output,
+                css=result.output,
+                js=fork.js_output,
+                context=fork,
+                threshold=threshold,
+                token_usage=critic_usage,
+            )
+            tokens = result.total_tokens + critic_usage.get("total_tokens", 0)
+            return (result.output, scores, improvements, fork), tokens
+
+        outcomes = await asyncio.gather(
+            *(run_candidate(i) for i in range(candidates)),
+            return_exceptions=True,
+        )
+
+        scored = []
+        tokens = 0
+        for index, outcome in enumerate(outcomes):
+            if isinstance(outcome, Exception):
+                logger.warning(f"[RefinerLoop] Candidate {index} failed: {outcome}")
+                continue
+            candidate, candidate_tokens = outcome
+            tokens += candidate_tokens
+            if candidate is not None:
+                scored.append(candidate)
+
+        if not scored:
+            return None
+
+        css, scores, improvements, fork = max(scored, key=lambda c: c[1].overall)
+        logger.info(
+            f"[RefinerLoop] {len(scored)}/{candidates} candidates scored: "
+            f"{', '.join(f'{c[1].overall:.2f}' for c in scored)} → kept {scores.overall:.2f}"
+        )
+        for signature in fork.thought_signatures[len(context.thought_signatures):]:
+            context.add_thought_signature(signature)
+        return css, scores, improvements, tokens
+
+    @background_priority
     async def _run_targeted_refiner(
         self,
         context: AgentContext,
@@ -1358,238 +1930,6 @@ class AgentOrchestrator:
 
         return best_html, best_css, best_js, corporate_metrics
 
-    async def _execute_parallel_group(
-        self,
-        group: ParallelGroup,
-        context: AgentContext,
-    ) -> dict[str, "AgentResult"]:
-        """
-        Execute a group of steps in parallel.
-
-        Handles different parallel group types:
-        - section_architects: PAGE pipeline section generation (merges HTML)
-        - styling_interaction: COMPONENT pipeline Alchemist + Physicist (merges CSS + JS)
-
-        Performance Impact:
-            - Sequential: ~5.5s (Alchemist ~1.8s + Physicist ~1.2s + overhead)
-            - Parallel:   ~4.4s (~20% faster for COMPONENT pipeline)
-        """
-        from gemini_mcp.agents.base import AgentResult, AgentRole
-
-        tasks = []
-        step_names = []
-        step_output_types = []  # Track output type for merge strategy
-        section_indices = []  # Track which section each task handles
-
-        # Check parallel group type
-        is_section_group = group.name == "section_architects"
-        is_styling_group = group.name == "styling_interaction"
-        sections = context.sections if is_section_group and context.sections else []
-
-        # DEBUG: Log parallel group execution context
-        logger.info(f"[DEBUG] Parallel group '{group.name}': is_section_group={is_section_group}, context.sections={context.sections}, sections={sections}")
-
-        for idx, step in enumerate(group.steps):
-            if not step.should_run(context):
-                continue
-
-            agent = self.get_agent(step.agent_name)
-            if agent is None:
-                continue
-
-            # For section architects, set section-specific context
-            if is_section_group and idx < len(sections):
-                section = sections[idx]
-                section_type = section.get("type", f"section_{idx}")
-                # Use lightweight fork for parallel execution (Issue 3 fix)
-                step_context = context.fork_for_parallel(
-                    step_index=idx,
-                    section_type=section_type,
-                )
-                step_context.component_type = section.get("type", "section")
-                # Set section-specific content structure if available
-                if section.get("content"):
-                    step_context.content_structure = section.get("content", {})
-
-                step_names.append(f"{step.agent_name}_{idx}")
-                step_output_types.append(step.output_type)
-                section_indices.append(idx)
-            else:
-                # Non-section parallel execution (styling_interaction, etc.)
-                # Use lightweight fork with shared HTML context for Alchemist/Physicist
-                step_context = context.fork_for_parallel(step_index=idx)
-                step_names.append(step.agent_name)
-                step_output_types.append(step.output_type)
-                section_indices.append(-1)
-
-            tasks.append(agent.execute(step_context))
-
-        if not tasks:
-            return {}
-
-        logger.info(f"Executing {len(tasks)} parallel tasks: {step_names}")
-
-        # Run all in parallel
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        # Map results to agent names
-        result_map: dict[str, AgentResult] = {}
-        section_htmls: list[tuple[int, str]] = []  # (index, html) for ordering
-
-        for name, result, section_idx, output_type in zip(
-            step_names, results, section_indices, step_output_types
-        ):
-            if isinstance(result, Exception):
-                result_map[name] = AgentResult(
-                    success=False,
-                    output="",
-                    agent_role=AgentRole.ARCHITECT,
-                    execution_time_ms=0,
-                    errors=[str(result)],
-                )
-                logger.error(f"Parallel task {name} failed: {result}")
-            else:
-                result_map[name] = result
-                # DEBUG: Log each result for section architect
-                logger.info(f"[DEBUG] Parallel result '{name}': section_idx={section_idx}, success={result.success}, output_len={len(result.output) if result.output else 0}")
-                # Collect section HTML for merging
-                if section_idx >= 0 and result.success:
-                    section_htmls.append((section_idx, result.output))
-                elif section_idx >= 0 and not result.success:
-                    logger.warning(f"[DEBUG] Section architect '{name}' failed: {result.errors}")
-
-        # === Merge Strategy: Section Architects (PAGE Pipeline) ===
-        # DEBUG: Log section_htmls and section_indices
-        logger.info(f"[DEBUG] section_htmls count={len(section_htmls)}, section_indices={section_indices}")
-        if section_htmls:
-            section_htmls.sort(key=lambda x: x[0])
-            merged_html = "\n\n".join(html for _, html in section_htmls)
-            context.html_output = merged_html
-            context.previous_output = merged_html
-            logger.info(f"Merged {len(section_htmls)} section HTMLs, total chars={len(merged_html)}")
-        elif is_section_group and section_indices:
-            # BUG #16 FIX: Fallback when all parallel section architects fail
-            logger.warning(f"[BUG16-FIX] All {len(section_indices)} section architects failed! Attempting sequential fallback...")
-            
-            # Collect error info from failed results
-            failed_sections = []
-            for name, result in result_map.items():
-                if not result.success:
-                    error_msg = result.errors[0][:100] if result.errors else 'No error message'
-                    failed_sections.append(f"{name}: {error_msg}")
-            
-            if failed_sections:
-                logger.error(f"[BUG16-FIX] Failed sections:\n" + "\n".join(failed_sections))
-            
-            # SEQUENTIAL FALLBACK: Try running sections one by one
-            sequential_htmls = []
-            sections = context.sections if context.sections else []
-            
-            for idx, section in enumerate(sections):
-                try:
-                    section_type = section.get("type", f"section_{idx}")
-                    logger.info(f"[BUG16-FIX] Sequential fallback - attempting section {idx}: {section_type}")
-                    
-                    # Create context for this section
-                    step_context = context.fork_for_parallel(
-                        step_index=idx,
-                        section_type=section_type,
-                    )
-                    step_context.component_type = section_type
-                    
-                    # Get architect agent and execute
-                    architect = self.get_agent("architect")
-                    if architect:
-                        seq_result = await architect.execute(step_context)
-                        if seq_result.success and seq_result.output:
-                            sequential_htmls.append((idx, seq_result.output))
-                            logger.info(f"[BUG16-FIX] Sequential section {idx} SUCCESS: {len(seq_result.output)} chars")
-                        else:
-                            logger.warning(f"[BUG16-FIX] Sequential section {idx} FAILED: {seq_result.errors}")
-                except Exception as e:
-                    logger.error(f"[BUG16-FIX] Sequential section {idx} EXCEPTION: {e}")
-            
-            if sequential_htmls:
-                # Sequential fallback succeeded - use those results
-                sequential_htmls.sort(key=lambda x: x[0])
-                merged_html = "\n\n".join(html for _, html in sequential_htmls)
-                context.html_output = merged_html
-                context.previous_output = merged_html
-                logger.info(f"[BUG16-FIX] Sequential fallback SUCCESS: merged {len(sequential_htmls)} sections, {len(merged_html)} chars")
-            else:
-                # Even sequential failed - set error HTML
-                fallback_html = f'''<!-- SECTION: error -->
-<div class="min-h-screen flex items-center justify-center bg-slate-100 dark:bg-slate-900">
-    <div class="text-center p-8 bg-white dark:bg-slate-800 rounded-xl shadow-lg max-w-md">
-        <svg class="w-16 h-16 mx-auto text-amber-500 mb-4" fill="none" viewBox="0 0 24 24" stroke="currentColor">
-            <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M12 9v2m0 4h.01m-6.938 4h13.856c1.54 0 2.502-1.667 1.732-3L13.732 4c-.77-1.333-2.694-1.333-3.464 0L3.34 16c-.77 1.333.192 3 1.732 3z" />
-        </svg>
-        <h2 class="text-xl font-bold text-slate-900 dark:text-white mb-2">Sayfa Oluşturulamadı</h2>
-        <p class="text-slate-600 dark:text-slate-300 mb-4">Paralel ve sequential oluşturma başarısız oldu. Lütfen <code class="bg-slate-100 dark:bg-slate-700 px-2 py-1 rounded">use_trifecta=False</code> ile tekrar deneyin.</p>
-        <p class="text-xs text-slate-400">Hata: {len(section_indices)} section hem paralel hem sequential olarak başarısız</p>
-    </div>
-</div>
-<!-- /SECTION: error -->'''
-                context.html_output = fallback_html
-                context.previous_output = fallback_html
-                logger.warning(f"[BUG16-FIX] Both parallel and sequential failed, set error HTML ({len(fallback_html)} chars)")
-        else:
-            logger.warning(f"[DEBUG] No section HTMLs to merge! is_section_group={is_section_group}, section_indices={section_indices}")
-
-        # === Merge Strategy: Styling + Interaction (COMPONENT Pipeline) ===
-        if is_styling_group:
-            self._merge_styling_interaction_results(result_map, context)
-
-        return result_map
-
-    def _merge_styling_interaction_results(
-        self,
-        results: dict[str, "AgentResult"],
-        context: AgentContext,
-    ) -> None:
-        """
-        Merge CSS and JS outputs from parallel Alchemist + Physicist execution.
-
-        This is the core merge strategy for COMPONENT pipeline parallel execution.
-        Each agent's output is stored in the appropriate context field:
-        - Alchemist output → context.css_output
-        - Physicist output → context.js_output
-
-        Args:
-            results: Map of agent_name → AgentResult from parallel execution
-            context: Pipeline context to update with merged outputs
-        """
-        css_merged = False
-        js_merged = False
-
-        for agent_name, result in results.items():
-            if not result.success:
-                continue
-
-            # Alchemist → CSS output
-            if agent_name == "alchemist" and result.output:
-                context.css_output = result.output
-                context.set_output("alchemist", result.output)
-                css_merged = True
-                logger.debug(
-                    f"[ParallelMerge] CSS merged: {len(result.output)} chars"
-                )
-
-            # Physicist → JS output
-            elif agent_name == "physicist" and result.output:
-                context.js_output = result.output
-                context.set_output("physicist", result.output)
-                js_merged = True
-                logger.debug(
-                    f"[ParallelMerge] JS merged: {len(result.output)} chars"
-                )
-
-        logger.info(
-            f"[ParallelMerge] Styling+Interaction complete. "
-            f"CSS: {'✓' if css_merged else '✗'}, "
-            f"JS: {'✓' if js_merged else '✗'}"
-        )
-
     def _run_validation(self, context: AgentContext) -> tuple[bool, list[str]]:
         """
         Run cross-layer validation.
@@ -1601,9 +1941,12 @@ class AgentOrchestrator:
         """
         issues: list[str] = []
 
+        # One shared parse of the HTML for every check below
+        doc = context.get_parsed_document() if context.html_output else None
+
         # ID Validation: Check JS doesn't reference non-existent IDs
-        if context.html_output and context.js_output:
-            html_ids = set(self._extract_ids(context.html_output))
+        if doc is not None and context.js_output:
+            html_ids = set(doc.id_index)
             js_ids = set(self._extract_js_selectors(context.js_output))
 
             missing_ids = js_ids - html_ids
@@ -1621,11 +1964,11 @@ class AgentOrchestrator:
                 )
 
         # === Phase 2: Anti-Laziness Density Validation ===
-        if context.html_output:
+        if doc is not None:
             from gemini_mcp.validation.density_validator import DensityValidator
 
             density_validator = DensityValidator(strict_mode=False)
-            density_result = density_validator.validate(context.html_output)
+            density_result = density_validator.validate(context.html_output, document=doc)
 
             if not density_result.meets_minimum:
                 issues.append(
@@ -1653,12 +1996,6 @@ class AgentOrchestrator:
 
         return len(issues) == 0, issues
 
-    def _extract_ids(self, html: str) -> list[str]:
-        """Extract element IDs from HTML."""
-        import re
-        pattern = r'id=["\']([^"\']+)["\']'
-        return re.findall(pattern, html)
-
     def _extract_js_selectors(self, js: str) -> list[str]:
         """Extract getElementById selectors from JS."""
         import re
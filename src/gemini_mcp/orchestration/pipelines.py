@@ -2,10 +2,13 @@
 Pipeline Definitions - Multi-Agent Workflow Configuration
 
 This module defines the different pipelines used by MCP design tools.
-Each pipeline specifies which agents run in what order.
+Each pipeline is a dependency graph (DAG) of agent nodes. A node declares
+the artifact it produces (html, css, js, dna, ...) and the artifacts it
+consumes; the scheduler starts a node as soon as all producers of its
+inputs have finished.
 
 Pipeline Types:
-    COMPONENT: design_frontend → Architect → Alchemist → Physicist → QualityGuard
+    COMPONENT: design_frontend → Architect → [Alchemist + Physicist] → QualityGuard
     PAGE: design_page → Strategist → [Architect × N] → Alchemist → Physicist → QualityGuard
     SECTION: design_section → Strategist(DNA) → Architect → Alchemist → Physicist
     REFINE: refine_frontend → Critic → Architect → Alchemist → Physicist → QualityGuard
@@ -15,6 +18,7 @@ Pipeline Types:
 
 from __future__ import annotations
 
+from collections import defaultdict
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import TYPE_CHECKING, Callable, Optional
@@ -24,6 +28,15 @@ if TYPE_CHECKING:
     from gemini_mcp.orchestration.context import AgentContext
 
 
+# Artifacts exchanged between pipeline nodes (PipelineStep.output_type values)
+ARTIFACT_HTML = "html"
+ARTIFACT_CSS = "css"
+ARTIFACT_JS = "js"
+ARTIFACT_DNA = "dna"
+ARTIFACT_ANALYSIS = "analysis"
+ARTIFACT_VALIDATION = "validation"
+
+
 class PipelineType(Enum):
     """Types of pipelines corresponding to MCP design tools."""
 
@@ -88,24 +101,58 @@ class ParallelGroup:
         self.steps.append(step)
 
 
+@dataclass
+class PipelineNode:
+    """
+    A node in a pipeline DAG.
+
+    Attributes:
+        node_id: Unique id within the pipeline (e.g., "architect_0")
+        step: The agent step to execute (its output_type is the produced artifact)
+        inputs: Artifacts this node consumes; it waits for all their producers
+        section_index: Section this node works on (-1 = whole page/component).
+            A section node consuming an artifact only waits for the producer
+            of the same section when one exists.
+        after: Explicit node-id dependencies in addition to artifact inputs
+    """
+
+    node_id: str
+    step: PipelineStep
+    inputs: tuple[str, ...] = ()
+    section_index: int = -1
+    after: tuple[str, ...] = ()
+
+    @property
+    def agent_name(self) -> str:
+        return self.step.agent_name
+
+    @property
+    def output(self) -> str:
+        return self.step.output_type
+
+
 @dataclass
 class Pipeline:
     """
     A complete pipeline definition.
 
-    A pipeline is a sequence of steps (and parallel groups) that defines
-    which agents run in what order to complete a design task.
+    A pipeline is a DAG of PipelineNodes with explicit artifact inputs and
+    outputs. Pipelines declared the legacy way (a list of steps and
+    ParallelGroups) are converted to a DAG where every stage depends on
+    the previous one.
     """
 
     pipeline_type: PipelineType
     name: str
     description: str
     steps: list[PipelineStep | ParallelGroup] = field(default_factory=list)
+    nodes: list[PipelineNode] = field(default_factory=list)
 
     # Configuration
     max_retries: int = 2
     timeout_seconds: float = 300.0
     enable_checkpoints: bool = True
+    max_concurrency: Optional[int] = None  # None = orchestrator default
 
     def add_step(self, step: PipelineStep) -> "Pipeline":
         """Add a sequential step to the pipeline."""
@@ -117,30 +164,166 @@ class Pipeline:
         self.steps.append(group)
         return self
 
+    def add_node(
+        self,
+        node_id: str,
+        step: PipelineStep,
+        inputs: tuple[str, ...] = (),
+        section_index: int = -1,
+    ) -> "Pipeline":
+        """Add a DAG node consuming the given artifacts."""
+        self.nodes.append(
+            PipelineNode(node_id=node_id, step=step, inputs=inputs, section_index=section_index)
+        )
+        return self
+
+    def graph(self) -> list[PipelineNode]:
+        """Get the pipeline's nodes, deriving them from legacy steps if needed."""
+        if self.nodes:
+            return self.nodes
+
+        nodes: list[PipelineNode] = []
+        previous_stage: tuple[str, ...] = ()
+        for stage in self.steps:
+            members = stage.steps if isinstance(stage, ParallelGroup) else [stage]
+            stage_ids = []
+            for idx, step in enumerate(members):
+                node_id = step.agent_name if len(members) == 1 else f"{step.agent_name}_{idx}"
+                stage_ids.append(node_id)
+                nodes.append(PipelineNode(node_id=node_id, step=step, after=previous_stage))
+            previous_stage = tuple(stage_ids)
+        return nodes
+
+    def dependencies(self) -> dict[str, set[str]]:
+        """Map each node id to the node ids it must wait for.
+
+        Raises:
+            ValueError: On duplicate node ids, unknown explicit dependencies,
+                or dependency cycles.
+        """
+        nodes = self.graph()
+        ids = [node.node_id for node in nodes]
+        if len(set(ids)) != len(ids):
+            raise ValueError(f"Duplicate node ids in pipeline '{self.name}': {ids}")
+
+        producers: dict[str, list[PipelineNode]] = defaultdict(list)
+        for node in nodes:
+            producers[node.output].append(node)
+
+        deps: dict[str, set[str]] = {}
+        for node in nodes:
+            unknown = set(node.after) - set(ids)
+            if unknown:
+                raise ValueError(f"Node '{node.node_id}' depends on unknown nodes: {sorted(unknown)}")
+            waits = set(node.after)
+            for artifact in node.inputs:
+                sources = [p for p in producers.get(artifact, []) if p.node_id != node.node_id]
+                if node.section_index >= 0:
+                    same_section = [p for p in sources if p.section_index == node.section_index]
+                    if same_section:
+                        sources = same_section
+                waits.update(p.node_id for p in sources)
+            deps[node.node_id] = waits
+
+        self._check_acyclic(deps)
+        return deps
+
+    @staticmethod
+    def _check_acyclic(deps: dict[str, set[str]]) -> None:
+        """Raise ValueError if the dependency map contains a cycle."""
+        remaining = {node_id: set(waits) for node_id, waits in deps.items()}
+        while remaining:
+            ready = [node_id for node_id, waits in remaining.items() if not waits]
+            if not ready:
+                raise ValueError(f"Pipeline dependency cycle among: {sorted(remaining)}")
+            for node_id in ready:
+                del remaining[node_id]
+            for waits in remaining.values():
+                waits.difference_update(ready)
+
+    def topological_order(self) -> list[PipelineNode]:
+        """Nodes in a valid execution order (declaration order among ready nodes)."""
+        deps = self.dependencies()
+        done: set[str] = set()
+        order: list[PipelineNode] = []
+        pending = list(self.graph())
+        while pending:
+            for node in pending:
+                if deps[node.node_id] <= done:
+                    order.append(node)
+                    done.add(node.node_id)
+                    pending.remove(node)
+                    break
+        return order
+
+    def exclusive_nodes(self) -> set[str]:
+        """Node ids that can never run concurrently with another node.
+
+        A node is exclusive when every other node is its ancestor or its
+        descendant. Exclusive nodes may work on the shared context directly;
+        all other nodes run on forks whose outputs are merged afterwards.
+        """
+        deps = self.dependencies()
+        ancestors: dict[str, set[str]] = {}
+
+        def _ancestors(node_id: str) -> set[str]:
+            if node_id not in ancestors:
+                found: set[str] = set()
+                for parent in deps[node_id]:
+                    found.add(parent)
+                    found |= _ancestors(parent)
+                ancestors[node_id] = found
+            return ancestors[node_id]
+
+        ids = list(deps)
+        exclusive = set()
+        for node_id in ids:
+            others = (other for other in ids if other != node_id)
+            if all(
+                other in _ancestors(node_id) or node_id in _ancestors(other)
+                for other in others
+            ):
+                exclusive.add(node_id)
+        return exclusive
+
     def get_agent_sequence(self) -> list[str]:
         """Get flat list of agent names in execution order."""
-        agents = []
-        for step in self.steps:
-            if isinstance(step, ParallelGroup):
-                agents.extend([s.agent_name for s in step.steps])
-            else:
-                agents.append(step.agent_name)
-        return agents
+        return [node.agent_name for node in self.topological_order()]
 
     def count_steps(self) -> int:
         """Count total number of agent executions."""
-        count = 0
-        for step in self.steps:
-            if isinstance(step, ParallelGroup):
-                count += len(step.steps)
-            else:
-                count += 1
-        return count
+        return len(self.graph())
 
 
 # === Pipeline Factory Functions ===
 
 
+def _architect_step() -> PipelineStep:
+    return PipelineStep(agent_name="architect", output_type=ARTIFACT_HTML, compress_output=True)
+
+
+def _alchemist_step(required: bool = True) -> PipelineStep:
+    return PipelineStep(
+        agent_name="alchemist",
+        output_type=ARTIFACT_CSS,
+        compress_output=True,
+        required=required,
+    )
+
+
+def _physicist_step() -> PipelineStep:
+    return PipelineStep(agent_name="physicist", output_type=ARTIFACT_JS, compress_output=False)
+
+
+def _quality_guard_step() -> PipelineStep:
+    return PipelineStep(
+        agent_name="quality_guard",
+        output_type=ARTIFACT_VALIDATION,
+        required=False,  # Validation failures don't block output
+        recoverable=True,
+    )
+
+
 def create_component_pipeline(enable_parallel: bool = True) -> Pipeline:
     """
     Create pipeline for design_frontend.
@@ -157,136 +340,82 @@ def create_component_pipeline(enable_parallel: bool = True) -> Pipeline:
         Sequential: ~5.5s total
         Parallel:   ~4.4s total (~20% faster)
     """
+    pipeline = Pipeline(
+        pipeline_type=PipelineType.COMPONENT,
+        name=f"Component Pipeline ({'Parallel' if enable_parallel else 'Sequential'})",
+        description="Generate a single UI component with HTML, CSS, and JS",
+    )
+    pipeline.add_node("architect", _architect_step())
+
     if enable_parallel:
-        # Parallel execution: Alchemist + Physicist run concurrently
-        return Pipeline(
-            pipeline_type=PipelineType.COMPONENT,
-            name="Component Pipeline (Parallel)",
-            description="Generate a single UI component with HTML, CSS, and JS",
-            steps=[
-                PipelineStep(
-                    agent_name="architect",
-                    output_type="html",
-                    compress_output=True,
-                ),
-                # PARALLEL: Styling + Interaction run concurrently
-                ParallelGroup(
-                    name="styling_interaction",
-                    steps=[
-                        PipelineStep(
-                            agent_name="alchemist",
-                            output_type="css",
-                            compress_output=True,
-                            required=False,  # CSS is optional if theme is simple
-                        ),
-                        PipelineStep(
-                            agent_name="physicist",
-                            output_type="js",
-                            compress_output=False,
-                        ),
-                    ],
-                ),
-                PipelineStep(
-                    agent_name="quality_guard",
-                    output_type="validation",
-                    required=False,  # Validation failures don't block output
-                    recoverable=True,
-                ),
-            ],
-        )
+        # Styling + Interaction both only need the HTML: they run concurrently
+        pipeline.add_node("alchemist", _alchemist_step(required=False), inputs=(ARTIFACT_HTML,))
+        pipeline.add_node("physicist", _physicist_step(), inputs=(ARTIFACT_HTML,))
     else:
-        # Sequential execution: For ULTRA complexity or debugging
-        return Pipeline(
-            pipeline_type=PipelineType.COMPONENT,
-            name="Component Pipeline (Sequential)",
-            description="Generate a single UI component with HTML, CSS, and JS",
-            steps=[
-                PipelineStep(
-                    agent_name="architect",
-                    output_type="html",
-                    compress_output=True,
-                ),
-                PipelineStep(
-                    agent_name="alchemist",
-                    output_type="css",
-                    compress_output=True,
-                ),
-                PipelineStep(
-                    agent_name="physicist",
-                    output_type="js",
-                    compress_output=False,
-                ),
-                PipelineStep(
-                    agent_name="quality_guard",
-                    output_type="validation",
-                    required=False,
-                    recoverable=True,
-                ),
-            ],
-        )
+        # ULTRA complexity or debugging: Physicist sees the final CSS
+        pipeline.add_node("alchemist", _alchemist_step(), inputs=(ARTIFACT_HTML,))
+        pipeline.add_node("physicist", _physicist_step(), inputs=(ARTIFACT_HTML, ARTIFACT_CSS))
+
+    pipeline.add_node(
+        "quality_guard",
+        _quality_guard_step(),
+        inputs=(ARTIFACT_HTML, ARTIFACT_CSS, ARTIFACT_JS),
+    )
+    return pipeline
 
 
-def create_page_pipeline(section_count: int = 1) -> Pipeline:
+def create_page_pipeline(
+    section_count: int = 1, per_section_styling: bool = False, enable_parallel: bool = False
+) -> Pipeline:
     """
     Create pipeline for design_page.
 
-    Flow: Strategist → [Architect × N] → Alchemist → Physicist → QualityGuard
+    Flow:
+        Strategist → [Architect × N] → Alchemist → Physicist → QualityGuard
+        per_section_styling:
+        Strategist → [Architect_i → Alchemist_i → Physicist_i] × N → QualityGuard
+
+    Args:
+        section_count: Number of sections (one Architect node each when > 1)
+        per_section_styling: Give every section its own Alchemist/Physicist
+            nodes, so styling of early sections overlaps with generation of
+            later ones. Costs one styling call per section instead of one.
+        enable_parallel: Run Physicist alongside Alchemist (it then does not
+            see the CSS), as in the component pipeline's parallel mode
     """
+    physicist_inputs = (ARTIFACT_HTML,) if enable_parallel else (ARTIFACT_HTML, ARTIFACT_CSS)
     pipeline = Pipeline(
         pipeline_type=PipelineType.PAGE,
         name="Page Pipeline",
         description="Generate a complete page with multiple sections",
-        steps=[
-            PipelineStep(
-                agent_name="strategist",
-                output_type="dna",
-                compress_output=False,
-            ),
-        ],
+    )
+    pipeline.add_node(
+        "strategist",
+        PipelineStep(agent_name="strategist", output_type=ARTIFACT_DNA, compress_output=False),
     )
 
-    # Add parallel group for section architects
     if section_count > 1:
-        parallel = ParallelGroup(name="section_architects")
         for i in range(section_count):
-            parallel.add_step(
-                PipelineStep(
-                    agent_name="architect",
-                    output_type="html",
-                    compress_output=True,
+            pipeline.add_node(f"architect_{i}", _architect_step(), inputs=(ARTIFACT_DNA,), section_index=i)
+            if per_section_styling:
+                pipeline.add_node(
+                    f"alchemist_{i}", _alchemist_step(), inputs=(ARTIFACT_HTML,), section_index=i
+                )
+                pipeline.add_node(
+                    f"physicist_{i}", _physicist_step(), inputs=physicist_inputs, section_index=i
                 )
-            )
-        pipeline.add_parallel_group(parallel)
     else:
-        pipeline.add_step(
-            PipelineStep(
-                agent_name="architect",
-                output_type="html",
-                compress_output=True,
-            )
-        )
+        pipeline.add_node("architect", _architect_step(), inputs=(ARTIFACT_DNA,))
 
-    # Add remaining steps
-    pipeline.add_step(
-        PipelineStep(
-            agent_name="alchemist",
-            output_type="css",
-            compress_output=True,
-        )
-    ).add_step(
-        PipelineStep(
-            agent_name="physicist",
-            output_type="js",
-            compress_output=False,
-        )
-    ).add_step(
-        PipelineStep(
-            agent_name="quality_guard",
-            output_type="validation",
-            required=False,
-        )
-    )
+    if section_count <= 1 or not per_section_styling:
+        pipeline.add_node("alchemist", _alchemist_step(), inputs=(ARTIFACT_HTML,))
+        pipeline.add_node("physicist", _physicist_step(), inputs=physicist_inputs)
 
+    pipeline.add_node(
+        "quality_guard",
+        _quality_guard_step(),
+        inputs=(ARTIFACT_HTML, ARTIFACT_CSS, ARTIFACT_JS),
+    )
     return pipeline
 
 
@@ -296,35 +425,25 @@ def create_section_pipeline() -> Pipeline:
 
     Flow: Strategist(DNA) → Architect → Alchemist → Physicist
     """
-    return Pipeline(
+    pipeline = Pipeline(
         pipeline_type=PipelineType.SECTION,
         name="Section Pipeline",
         description="Generate a single page section matching existing style",
-        steps=[
-            PipelineStep(
-                agent_name="strategist",
-                output_type="dna",
-                compress_output=False,
-                # Only run if there's previous HTML to extract DNA from
-                condition=lambda ctx: bool(ctx.previous_html),
-            ),
-            PipelineStep(
-                agent_name="architect",
-                output_type="html",
-                compress_output=True,
-            ),
-            PipelineStep(
-                agent_name="alchemist",
-                output_type="css",
-                compress_output=True,
-            ),
-            PipelineStep(
-                agent_name="physicist",
-                output_type="js",
-                compress_output=False,
-            ),
-        ],
     )
+    pipeline.add_node(
+        "strategist",
+        PipelineStep(
+            agent_name="strategist",
+            output_type=ARTIFACT_DNA,
+            compress_output=False,
+            # Only run if there's previous HTML to extract DNA from
+            condition=lambda ctx: bool(ctx.previous_html),
+        ),
+    )
+    pipeline.add_node("architect", _architect_step(), inputs=(ARTIFACT_DNA,))
+    pipeline.add_node("alchemist", _alchemist_step(), inputs=(ARTIFACT_HTML,))
+    pipeline.add_node("physicist", _physicist_step(), inputs=(ARTIFACT_HTML, ARTIFACT_CSS))
+    return pipeline
 
 
 def create_refine_pipeline() -> Pipeline:
@@ -333,38 +452,24 @@ def create_refine_pipeline() -> Pipeline:
 
     Flow: Critic → Architect → Alchemist → Physicist → QualityGuard
     """
-    return Pipeline(
+    pipeline = Pipeline(
         pipeline_type=PipelineType.REFINE,
         name="Refine Pipeline",
         description="Refine existing design based on user feedback",
-        steps=[
-            PipelineStep(
-                agent_name="critic",
-                output_type="analysis",
-                compress_output=False,
-            ),
-            PipelineStep(
-                agent_name="architect",
-                output_type="html",
-                compress_output=True,
-            ),
-            PipelineStep(
-                agent_name="alchemist",
-                output_type="css",
-                compress_output=True,
-            ),
-            PipelineStep(
-                agent_name="physicist",
-                output_type="js",
-                compress_output=False,
-            ),
-            PipelineStep(
-                agent_name="quality_guard",
-                output_type="validation",
-                required=False,
-            ),
-        ],
     )
+    pipeline.add_node(
+        "critic",
+        PipelineStep(agent_name="critic", output_type=ARTIFACT_ANALYSIS, compress_output=False),
+    )
+    pipeline.add_node("architect", _architect_step(), inputs=(ARTIFACT_ANALYSIS,))
+    pipeline.add_node("alchemist", _alchemist_step(), inputs=(ARTIFACT_HTML,))
+    pipeline.add_node("physicist", _physicist_step(), inputs=(ARTIFACT_HTML, ARTIFACT_CSS))
+    pipeline.add_node(
+        "quality_guard",
+        _quality_guard_step(),
+        inputs=(ARTIFACT_HTML, ARTIFACT_CSS, ARTIFACT_JS),
+    )
+    return pipeline
 
 
 def create_reference_pipeline() -> Pipeline:
@@ -373,38 +478,24 @@ def create_reference_pipeline() -> Pipeline:
 
     Flow: Visionary → Strategist → Architect → Alchemist → Physicist
     """
-    return Pipeline(
+    pipeline = Pipeline(
         pipeline_type=PipelineType.REFERENCE,
         name="Reference Pipeline",
         description="Generate design based on reference image",
-        steps=[
-            PipelineStep(
-                agent_name="visionary",
-                output_type="analysis",
-                compress_output=False,
-            ),
-            PipelineStep(
-                agent_name="strategist",
-                output_type="dna",
-                compress_output=False,
-            ),
-            PipelineStep(
-                agent_name="architect",
-                output_type="html",
-                compress_output=True,
-            ),
-            PipelineStep(
-                agent_name="alchemist",
-                output_type="css",
-                compress_output=True,
-            ),
-            PipelineStep(
-                agent_name="physicist",
-                output_type="js",
-                compress_output=False,
-            ),
-        ],
     )
+    pipeline.add_node(
+        "visionary",
+        PipelineStep(agent_name="visionary", output_type=ARTIFACT_ANALYSIS, compress_output=False),
+    )
+    pipeline.add_node(
+        "strategist",
+        PipelineStep(agent_name="strategist", output_type=ARTIFACT_DNA, compress_output=False),
+        inputs=(ARTIFACT_ANALYSIS,),
+    )
+    pipeline.add_node("architect", _architect_step(), inputs=(ARTIFACT_DNA,))
+    pipeline.add_node("alchemist", _alchemist_step(), inputs=(ARTIFACT_HTML,))
+    pipeline.add_node("physicist", _physicist_step(), inputs=(ARTIFACT_HTML, ARTIFACT_CSS))
+    return pipeline
 
 
 def create_replace_pipeline() -> Pipeline:
@@ -413,38 +504,24 @@ def create_replace_pipeline() -> Pipeline:
 
     Flow: Strategist(Surgeon) → Architect → Alchemist → Physicist → QualityGuard
     """
-    return Pipeline(
+    pipeline = Pipeline(
         pipeline_type=PipelineType.REPLACE,
         name="Replace Section Pipeline",
         description="Replace a single section in an existing page",
-        steps=[
-            PipelineStep(
-                agent_name="strategist",
-                output_type="dna",
-                compress_output=False,
-            ),
-            PipelineStep(
-                agent_name="architect",
-                output_type="html",
-                compress_output=True,
-            ),
-            PipelineStep(
-                agent_name="alchemist",
-                output_type="css",
-                compress_output=True,
-            ),
-            PipelineStep(
-                agent_name="physicist",
-                output_type="js",
-                compress_output=False,
-            ),
-            PipelineStep(
-                agent_name="quality_guard",
-                output_type="validation",
-                required=False,
-            ),
-        ],
     )
+    pipeline.add_node(
+        "strategist",
+        PipelineStep(agent_name="strategist", output_type=ARTIFACT_DNA, compress_output=False),
+    )
+    pipeline.add_node("architect", _architect_step(), inputs=(ARTIFACT_DNA,))
+    pipeline.add_node("alchemist", _alchemist_step(), inputs=(ARTIFACT_HTML,))
+    pipeline.add_node("physicist", _physicist_step(), inputs=(ARTIFACT_HTML, ARTIFACT_CSS))
+    pipeline.add_node(
+        "quality_guard",
+        _quality_guard_step(),
+        inputs=(ARTIFACT_HTML, ARTIFACT_CSS, ARTIFACT_JS),
+    )
+    return pipeline
 
 
 def get_pipeline(pipeline_type: PipelineType, **kwargs) -> Pipeline:
@@ -455,6 +532,10 @@ def get_pipeline(pipeline_type: PipelineType, **kwargs) -> Pipeline:
         pipeline_type: Type of pipeline to create
         **kwargs: Additional arguments:
             - section_count (int): For PAGE pipeline
+            - per_section_styling (bool): For PAGE pipeline (default False)
+            - enable_parallel (bool): For PAGE pipeline, overlap Physicist with
+              Alchemist (default False)
+            - max_concurrency (int): Cap on concurrently running nodes
             - enable_parallel (bool): For COMPONENT pipeline (default True)
             - component_type (str): For automatic parallel decision based on complexity
 
@@ -474,9 +555,20 @@ def get_pipeline(pipeline_type: PipelineType, **kwargs) -> Pipeline:
     if factory is None:
         raise ValueError(f"Unknown pipeline type: {pipeline_type}")
 
-    # Handle pipeline-specific arguments
-    if pipeline_type == PipelineType.PAGE and "section_count" in kwargs:
-        return factory(section_count=kwargs["section_count"])
+    pipeline = _create(factory, pipeline_type, **kwargs)
+    if kwargs.get("max_concurrency"):
+        pipeline.max_concurrency = int(kwargs["max_concurrency"])
+    return pipeline
+
+
+def _create(factory: Callable[..., Pipeline], pipeline_type: PipelineType, **kwargs) -> Pipeline:
+    """Call a pipeline factory with its pipeline-specific arguments."""
+    if pipeline_type == PipelineType.PAGE:
+        return factory(
+            section_count=kwargs.get("section_count", 1),
+            per_section_styling=kwargs.get("per_section_styling", False),
+            enable_parallel=kwargs.get("enable_parallel", False),
+        )
 
     if pipeline_type == PipelineType.COMPONENT:
         # Check for explicit enable_parallel flag
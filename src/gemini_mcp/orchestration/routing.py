@@ -0,0 +1,291 @@
+"""
+Model Routing - Model, Thinking Level and Output Cap per Agent Call
+
+Picks the cheapest configuration that fits the work instead of sending
+every call to Pro with high thinking and a 64K output cap:
+
+- Tier: the larger of constants.tier_mapping.get_component_tier() and the
+  complexity level from complexity.get_complexity_level() (SIMPLE=1 ...
+  ULTRA=4), or an explicit override
+- Model: Flash below PRO_MIN_TIER[quality_target], Pro at or above it;
+  the Strategist, Critic and Visionary always run on Pro since every
+  other agent builds on their judgement
+- Thinking level and output cap: ComplexityConfig for the quality target
+  (get_agent_thinking_level / get_agent_max_tokens); basic-tier work on
+  Flash thinks "low"
+
+A Flash route is escalated to Pro (high thinking) only when a result
+demands it - the agent's output failed validation, or the Critic scored it
+below the quality threshold. Callers record each call with
+PipelineTelemetry.record_route(), which reports cost and latency per route.
+
+Usage:
+    policy = get_routing_policy()
+    route = policy.route("architect", "button", QualityTarget.PRODUCTION)
+    response = await client.generate_text(prompt, **route.generation_kwargs())
+    reason = policy.escalation_reason(route, critic_score=6.2, threshold=8.0)
+    if reason:
+        route = policy.escalate(route, reason)
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import asdict, dataclass, replace
+from typing import Any, Optional, Union
+
+from gemini_mcp.constants.tier_mapping import ComponentTier, get_component_tier
+from gemini_mcp.orchestration.complexity import (
+    ComplexityLevel,
+    get_complexity_level,
+    get_config_for_quality_target,
+)
+from gemini_mcp.orchestration.context import QualityTarget
+
+logger = logging.getLogger(__name__)
+
+PRO_MODEL = "gemini-3-pro-preview"
+FLASH_MODEL = "gemini-3-flash-preview"
+
+# USD per 1K tokens. Pro matches maestro's CostAnalyzer PRICING; Flash is
+# billed at about a quarter of Pro in every category.
+MODEL_PRICING: dict[str, dict[str, float]] = {
+    PRO_MODEL: {
+        "input": 0.00025,
+        "output": 0.00125,
+        "thinking": 0.0025,
+        "cached_input": 0.0000625,
+    },
+    FLASH_MODEL: {
+        "input": 0.0000625,
+        "output": 0.0003125,
+        "thinking": 0.000625,
+        "cached_input": 0.000015625,
+    },
+}
+
+# Agents whose output the rest of the pipeline depends on
+PRO_AGENTS = frozenset({"strategist", "critic", "visionary"})
+
+# client.design_component: HTML, CSS and JS in a single call
+SINGLE_SHOT_AGENT = "design_component"
+
+# Lowest tier routed to Pro per quality target (5 = never, 1 = always)
+PRO_MIN_TIER: dict[QualityTarget, int] = {
+    QualityTarget.DRAFT: 5,
+    QualityTarget.STANDARD: 4,
+    QualityTarget.PRODUCTION: 3,
+    QualityTarget.HIGH: 2,
+    QualityTarget.PREMIUM: 1,
+    QualityTarget.ENTERPRISE: 1,
+}
+
+_COMPLEXITY_TIERS: dict[ComplexityLevel, int] = {
+    ComplexityLevel.SIMPLE: ComponentTier.BASIC,
+    ComplexityLevel.MEDIUM: ComponentTier.STANDARD,
+    ComplexityLevel.COMPLEX: ComponentTier.COMPLEX,
+    ComplexityLevel.ULTRA: ComponentTier.ENTERPRISE,
+}
+
+
+@dataclass(frozen=True)
+class ModelRoute:
+    """
+    Generation settings chosen for one agent call.
+
+    Attributes:
+        agent_name: Agent (or SINGLE_SHOT_AGENT) the route is for
+        model: Gemini model id
+        thinking_level: Gemini 3 thinking level
+        max_output_tokens: Output cap
+        tier: Resolved component tier (1-4)
+        quality_target: QualityTarget value
+        escalated: Moved to Pro after a failed validation or low Critic score
+        reason: Why the route was escalated
+    """
+
+    agent_name: str
+    model: str
+    thinking_level: str
+    max_output_tokens: int
+    tier: int
+    quality_target: str
+    escalated: bool = False
+    reason: str = ""
+
+    @property
+    def key(self) -> str:
+        """Telemetry key: agent, model and thinking level."""
+        return f"{self.agent_name}:{self.model}:{self.thinking_level}"
+
+    @property
+    def is_pro(self) -> bool:
+        return self.model == PRO_MODEL
+
+    def generation_kwargs(self) -> dict[str, Any]:
+        """model / thinking_level / max_output_tokens for generate_text()."""
+        return {
+            "model": self.model,
+            "thinking_level": self.thinking_level,
+            "max_output_tokens": self.max_output_tokens,
+        }
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def estimate_cost(model: str, token_usage: Optional[dict[str, int]]) -> float:
+    """
+    USD cost of one call from its token usage.
+
+    Args:
+        model: Model that served the call (unknown models are priced as Pro)
+        token_usage: input/output/thinking/cached token counts
+
+    Returns:
+        Estimated cost in USD (cached input tokens at the discounted rate)
+    """
+    if not token_usage:
+        return 0.0
+    prices = MODEL_PRICING.get(model, MODEL_PRICING[PRO_MODEL])
+    cached = token_usage.get("cached_tokens", 0)
+    uncached = max(token_usage.get("input_tokens", 0) - cached, 0)
+    return (
+        uncached * prices["input"]
+        + cached * prices["cached_input"]
+        + token_usage.get("output_tokens", 0) * prices["output"]
+        + token_usage.get("thinking_tokens", 0) * prices["thinking"]
+    ) / 1000
+
+
+def _quality_target(value: Union[QualityTarget, str]) -> QualityTarget:
+    if isinstance(value, QualityTarget):
+        return value
+    try:
+        return QualityTarget(str(value).lower())
+    except ValueError:
+        return QualityTarget.PRODUCTION
+
+
+class RoutingPolicy:
+    """
+    Chooses model, thinking level and output cap per (agent, tier, quality target).
+
+    Args:
+        pro_min_tier: Override of PRO_MIN_TIER per quality target
+        pro_agents: Agents that always run on Pro
+    """
+
+    def __init__(
+        self,
+        pro_min_tier: Optional[dict[QualityTarget, int]] = None,
+        pro_agents: frozenset[str] = PRO_AGENTS,
+    ):
+        self.pro_min_tier = {**PRO_MIN_TIER, **(pro_min_tier or {})}
+        self.pro_agents = pro_agents
+
+    @staticmethod
+    def resolve_tier(component_type: str, tier: Optional[int] = None) -> int:
+        """Explicit tier (1-4), else the larger of the tier map and complexity level."""
+        if tier is not None and 1 <= tier <= 4:
+            return tier
+        component_type = component_type or ""
+        return max(
+            get_component_tier(component_type),
+            _COMPLEXITY_TIERS[get_complexity_level(component_type)],
+        )
+
+    def route(
+        self,
+        agent_name: str,
+        component_type: str,
+        quality_target: Union[QualityTarget, str] = QualityTarget.PRODUCTION,
+        tier: Optional[int] = None,
+    ) -> ModelRoute:
+        """
+        Route one agent call.
+
+        Args:
+            agent_name: Agent role value, or SINGLE_SHOT_AGENT
+            component_type: Component or section type being generated
+            quality_target: QualityTarget (or its string value)
+            tier: Explicit component tier override (1-4)
+
+        Returns:
+            ModelRoute for the call
+        """
+        target = _quality_target(quality_target)
+        resolved_tier = self.resolve_tier(component_type, tier)
+        config = get_config_for_quality_target(component_type or "", target.value)
+
+        if agent_name == SINGLE_SHOT_AGENT:
+            thinking_level = config.get_agent_thinking_level("architect")
+            max_output_tokens = (
+                config.max_html_tokens + config.max_css_tokens + config.max_js_tokens
+            )
+        else:
+            thinking_level = config.get_agent_thinking_level(agent_name)
+            max_output_tokens = config.get_agent_max_tokens(agent_name)
+
+        pro = agent_name in self.pro_agents or resolved_tier >= self.pro_min_tier[target]
+        if not pro and resolved_tier == ComponentTier.BASIC:
+            thinking_level = "low"
+
+        return ModelRoute(
+            agent_name=agent_name,
+            model=PRO_MODEL if pro else FLASH_MODEL,
+            thinking_level=thinking_level,
+            max_output_tokens=max_output_tokens,
+            tier=resolved_tier,
+            quality_target=target.value,
+        )
+
+    @staticmethod
+    def escalation_reason(
+        route: ModelRoute,
+        critic_score: Optional[float] = None,
+        threshold: Optional[float] = None,
+        validation_failed: bool = False,
+    ) -> str:
+        """
+        Why a Flash route should move to Pro ("" = keep the route).
+
+        Args:
+            route: Route of the call that produced the result
+            critic_score: Critic overall score of the result, if scored
+            threshold: Quality threshold the score is held to
+            validation_failed: The result failed output validation
+        """
+        if route.is_pro:
+            return ""
+        if validation_failed:
+            return "validation failed"
+        if critic_score is not None and threshold is not None and critic_score < threshold:
+            return f"critic score {critic_score:.1f} < {threshold:.1f}"
+        return ""
+
+    @staticmethod
+    def escalate(route: ModelRoute, reason: str) -> ModelRoute:
+        """Pro with high thinking for the next attempt (Pro routes are returned as-is)."""
+        if route.is_pro:
+            return route
+        logger.info(f"[Routing] Escalating {route.agent_name} to {PRO_MODEL}: {reason}")
+        return replace(route, model=PRO_MODEL, thinking_level="high", escalated=True, reason=reason)
+
+
+# Global routing policy
+_routing_policy: Optional[RoutingPolicy] = None
+
+
+def get_routing_policy() -> RoutingPolicy:
+    """Get or create the global routing policy."""
+    global _routing_policy
+    if _routing_policy is None:
+        _routing_policy = RoutingPolicy()
+    return _routing_policy
+
+
+def reset_routing_policy() -> None:
+    """Drop the global routing policy (tests, config changes)."""
+    global _routing_policy
+    _routing_policy = None
@@ -10,7 +10,7 @@ This module provides telemetry and observability for the Trifecta Engine:
 Usage:
     telemetry = PipelineTelemetry()
     telemetry.start_pipeline("component", "pipeline_123")
-    telemetry.record_agent_execution("architect", 1500.0, 2048, True)
+    telemetry.record_agent_execution("pipeline_123", "architect", 1500.0, 2048, True)
     telemetry.end_pipeline(True)
     report = telemetry.get_report("pipeline_123")
 """
@@ -37,6 +37,8 @@ class AgentMetrics:
     success: bool
     error_message: str = ""
     timestamp: datetime = field(default_factory=datetime.now)
+    # Breakdown from usage_metadata (input/output/thinking/cached/total)
+    token_usage: dict[str, int] = field(default_factory=dict)
 
 
 @dataclass
@@ -72,6 +74,8 @@ class PipelineMetrics:
     initial_score: float = 0.0  # First critic score
     final_score: float = 0.0  # Final critic score after refinement
     score_improvement: float = 0.0  # final_score - initial_score
+    # Per refiner round: candidates, latency_ms, best_score, tokens
+    refiner_rounds: list[dict[str, Any]] = field(default_factory=list)
 
     # Fallback chain metrics
     fallbacks_triggered: int = 0  # Number of fallback levels used
@@ -80,6 +84,17 @@ class PipelineMetrics:
     # Agent hints metrics
     hints_passed: int = 0  # Number of hints passed between agents
 
+    # Context cache metrics (cached system prompts)
+    context_cache_hits: int = 0  # Agent calls served from a cached_content handle
+    context_cache_misses: int = 0  # Agent calls sent with the full system prompt
+    cached_tokens_saved: int = 0  # Prompt tokens billed at the cached rate
+
+    # Prompt budget: agent → PromptBudget.report() of its latest prompt
+    prompt_budgets: dict[str, dict[str, Any]] = field(default_factory=dict)
+
+    # Model routing: ModelRoute.key → calls, escalations, latency_ms, cost_usd
+    routes: dict[str, dict[str, Any]] = field(default_factory=dict)
+
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
         return {
@@ -102,14 +117,21 @@ class PipelineMetrics:
             "initial_score": self.initial_score,
             "final_score": self.final_score,
             "score_improvement": self.score_improvement,
+            "refiner_rounds": self.refiner_rounds,
             "fallbacks_triggered": self.fallbacks_triggered,
             "fallback_level_used": self.fallback_level_used,
             "hints_passed": self.hints_passed,
+            "context_cache_hits": self.context_cache_hits,
+            "context_cache_misses": self.context_cache_misses,
+            "cached_tokens_saved": self.cached_tokens_saved,
+            "prompt_budgets": self.prompt_budgets,
+            "routes": self.routes,
             "agents": [
                 {
                     "name": m.agent_name,
                     "time_ms": m.execution_time_ms,
                     "tokens": m.tokens_used,
+                    "token_usage": m.token_usage,
                     "success": m.success,
                     "error": m.error_message,
                 }
@@ -144,6 +166,7 @@ class PipelineTelemetry:
         self._successful_pipelines = 0
         self._total_tokens_used = 0
         self._agent_stats: dict[str, dict[str, Any]] = {}
+        self._route_stats: dict[str, dict[str, Any]] = {}
 
         logger.info("PipelineTelemetry initialized")
 
@@ -174,8 +197,15 @@ class PipelineTelemetry:
         tokens_used: int,
         success: bool,
         error_message: str = "",
+        token_usage: Optional[dict[str, int]] = None,
     ) -> None:
-        """Record metrics for a single agent execution."""
+        """Record metrics for a single agent execution.
+
+        Args:
+            token_usage: Optional per-category token counts (input_tokens,
+                output_tokens, thinking_tokens, cached_tokens) used for
+                per-agent averages when tuning thinking_level/max_output_tokens.
+        """
         if pipeline_id not in self._current:
             logger.warning(f"[Telemetry] Unknown pipeline: {pipeline_id}")
             return
@@ -187,11 +217,14 @@ class PipelineTelemetry:
             tokens_used=tokens_used,
             success=success,
             error_message=error_message,
+            token_usage=dict(token_usage or {}),
         )
         metrics.agent_metrics.append(agent_metrics)
 
         # Update aggregate stats
-        self._update_agent_stats(agent_name, execution_time_ms, tokens_used, success)
+        self._update_agent_stats(
+            agent_name, execution_time_ms, tokens_used, success, token_usage
+        )
 
         logger.debug(
             f"[Telemetry] Agent {agent_name}: {execution_time_ms:.0f}ms, "
@@ -260,6 +293,42 @@ class PipelineTelemetry:
             f"improvement={metrics.score_improvement:+.2f}"
         )
 
+    def record_refiner_round(
+        self,
+        pipeline_id: str,
+        iteration: int,
+        candidates: int,
+        latency_ms: float,
+        best_score: float,
+        tokens: int = 0,
+    ) -> None:
+        """
+        Record latency versus score for one refiner loop round.
+
+        Args:
+            pipeline_id: Pipeline ID
+            iteration: Refiner iteration number (1, 2, 3, ...)
+            candidates: CSS candidates generated and scored this round
+            latency_ms: Wall-clock time of the round
+            best_score: Best Critic score among the round's candidates
+            tokens: Alchemist tokens spent on the round
+        """
+        if pipeline_id not in self._current:
+            return
+
+        self._current[pipeline_id].refiner_rounds.append({
+            "iteration": iteration,
+            "candidates": candidates,
+            "latency_ms": round(latency_ms, 1),
+            "best_score": round(best_score, 2),
+            "tokens": tokens,
+        })
+
+        logger.debug(
+            f"[Telemetry] Refiner round {iteration}: {candidates} candidate(s), "
+            f"{latency_ms:.0f}ms, best={best_score:.2f}"
+        )
+
     def record_fallback_usage(
         self,
         pipeline_id: str,
@@ -312,6 +381,118 @@ class PipelineTelemetry:
             f"[Telemetry] Hint passed: {from_agent} → {to_agent}, keys={hint_keys}"
         )
 
+    def record_context_cache(
+        self,
+        pipeline_id: str,
+        agent_name: str,
+        hit: bool,
+        cached_tokens: int = 0,
+    ) -> None:
+        """
+        Record whether an agent call was served from the context cache.
+
+        Args:
+            pipeline_id: Pipeline ID
+            agent_name: Agent that made the call
+            hit: True if a cached_content handle was used
+            cached_tokens: cached_content_token_count reported by the API
+        """
+        if pipeline_id not in self._current:
+            return
+
+        metrics = self._current[pipeline_id]
+        if hit:
+            metrics.context_cache_hits += 1
+            metrics.cached_tokens_saved += cached_tokens
+        else:
+            metrics.context_cache_misses += 1
+
+        logger.debug(
+            f"[Telemetry] Context cache {'hit' if hit else 'miss'} for {agent_name}: "
+            f"{cached_tokens} cached tokens"
+        )
+
+    def record_prompt_budget(
+        self,
+        pipeline_id: str,
+        agent_name: str,
+        report: dict[str, Any],
+    ) -> None:
+        """
+        Record the per-section token breakdown of an agent's prompt.
+
+        Args:
+            pipeline_id: Pipeline ID
+            agent_name: Agent that built the prompt
+            report: PromptBudget.report() (budget, totals, sections)
+        """
+        if pipeline_id not in self._current:
+            return
+
+        self._current[pipeline_id].prompt_budgets[agent_name] = report
+
+        shrunk = [
+            name for name, section in report.get("sections", {}).items()
+            if section.get("action") != "kept"
+        ]
+        logger.debug(
+            f"[Telemetry] Prompt for {agent_name}: {report.get('total_tokens', 0)}/"
+            f"{report.get('budget', 0)} tokens"
+            + (f", shrunk: {', '.join(shrunk)}" if shrunk else "")
+        )
+
+    def record_route(
+        self,
+        pipeline_id: str,
+        route: dict[str, Any],
+        latency_ms: float,
+        cost_usd: float,
+        tokens: int = 0,
+    ) -> None:
+        """
+        Record one call made on a model route.
+
+        Calls outside a pipeline (empty or unknown pipeline_id) still count
+        toward the global per-route stats.
+
+        Args:
+            pipeline_id: Pipeline ID ("" for direct client calls)
+            route: ModelRoute.to_dict() of the call
+            latency_ms: Call latency
+            cost_usd: Estimated cost (routing.estimate_cost)
+            tokens: Total tokens of the call
+        """
+        key = f"{route.get('agent_name')}:{route.get('model')}:{route.get('thinking_level')}"
+        targets = [self._route_stats]
+        if pipeline_id in self._current:
+            targets.append(self._current[pipeline_id].routes)
+
+        for routes in targets:
+            stats = routes.setdefault(key, {
+                "agent_name": route.get("agent_name"),
+                "model": route.get("model"),
+                "thinking_level": route.get("thinking_level"),
+                "max_output_tokens": route.get("max_output_tokens"),
+                "calls": 0,
+                "escalations": 0,
+                "total_latency_ms": 0.0,
+                "total_cost_usd": 0.0,
+                "total_tokens": 0,
+            })
+            stats["calls"] += 1
+            if route.get("escalated"):
+                stats["escalations"] += 1
+            stats["total_latency_ms"] += latency_ms
+            stats["total_cost_usd"] += cost_usd
+            stats["total_tokens"] += tokens
+            stats["avg_latency_ms"] = stats["total_latency_ms"] / stats["calls"]
+            stats["avg_cost_usd"] = stats["total_cost_usd"] / stats["calls"]
+
+        logger.debug(
+            f"[Telemetry] Route {key}: {latency_ms:.0f}ms, ${cost_usd:.5f}"
+            + (f" (escalated: {route.get('reason')})" if route.get("escalated") else "")
+        )
+
     def end_pipeline(self, pipeline_id: str, success: bool) -> Optional[PipelineMetrics]:
         """End tracking for a pipeline and compute final metrics."""
         if pipeline_id not in self._current:
@@ -349,7 +530,12 @@ class PipelineTelemetry:
         return metrics
 
     def _update_agent_stats(
-        self, agent_name: str, time_ms: float, tokens: int, success: bool
+        self,
+        agent_name: str,
+        time_ms: float,
+        tokens: int,
+        success: bool,
+        token_usage: Optional[dict[str, int]] = None,
     ) -> None:
         """Update aggregate statistics for an agent."""
         if agent_name not in self._agent_stats:
@@ -373,6 +559,13 @@ class PipelineTelemetry:
         stats["avg_tokens"] = stats["total_tokens"] / stats["total_executions"]
         stats["success_rate"] = stats["successful_executions"] / stats["total_executions"]
 
+        # Per-category averages (input/output/thinking/cached)
+        for key in ("input_tokens", "output_tokens", "thinking_tokens", "cached_tokens"):
+            if token_usage and key in token_usage:
+                stats[f"total_{key}"] = stats.get(f"total_{key}", 0) + token_usage[key]
+            if f"total_{key}" in stats:
+                stats[f"avg_{key}"] = stats[f"total_{key}"] / stats["total_executions"]
+
     def get_report(self, pipeline_id: str) -> Optional[dict[str, Any]]:
         """Get detailed report for a specific pipeline."""
         # Check current pipelines
@@ -393,6 +586,8 @@ class PipelineTelemetry:
         total_critic_iterations = sum(m.critic_iterations for m in self._history)
         total_fallbacks = sum(m.fallbacks_triggered for m in self._history)
         total_hints = sum(m.hints_passed for m in self._history)
+        cache_hits = sum(m.context_cache_hits for m in self._history)
+        cache_lookups = cache_hits + sum(m.context_cache_misses for m in self._history)
 
         # Average score improvement
         score_improvements = [
@@ -432,8 +627,15 @@ class PipelineTelemetry:
             "avg_score_improvement": avg_score_improvement,
             "total_fallbacks_triggered": total_fallbacks,
             "total_hints_passed": total_hints,
+            "context_cache_hit_rate": cache_hits / cache_lookups if cache_lookups > 0 else 0.0,
+            "total_cached_tokens_saved": sum(m.cached_tokens_saved for m in self._history),
+            "route_stats": self._route_stats,
         }
 
+    def get_route_stats(self) -> dict[str, dict[str, Any]]:
+        """Cost and latency per model route (agent:model:thinking_level)."""
+        return self._route_stats
+
     def get_agent_stats(self, agent_name: str) -> Optional[dict[str, Any]]:
         """Get statistics for a specific agent."""
         return self._agent_stats.get(agent_name)
@@ -462,6 +664,7 @@ class PipelineTelemetry:
         self._successful_pipelines = 0
         self._total_tokens_used = 0
         self._agent_stats.clear()
+        self._route_stats.clear()
         logger.info("[Telemetry] Reset complete")
 
 
@@ -0,0 +1,289 @@
+"""Adaptive concurrency limiting for Vertex AI calls.
+
+Bounds the number of concurrent generate_content calls per model across the
+whole process. Each model gets an AIMD limiter:
+
+- Additive increase: every successful call raises the limit by 1/limit,
+  i.e. roughly +1 slot per "window" of successful calls, up to the ceiling.
+- Multiplicative decrease: a RATE_LIMIT error (see classify_error) halves
+  the limit, at most once per window so a burst of 429s from calls that
+  were already in flight counts as one signal.
+
+Callers that cannot get a slot wait in a priority queue: interactive tool
+calls are served before background refinement. Priority is carried by a
+context variable, so agents and pipelines do not need to pass it through.
+
+Example:
+    >>> controller = get_rate_controller()
+    >>> async with controller.slot("gemini-3-pro-preview"):
+    ...     response = await client.aio.models.generate_content(...)
+    >>> controller.get_stats()["gemini-3-pro-preview"]["queue_depth"]
+    0
+"""
+
+import asyncio
+import contextvars
+import functools
+import heapq
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional, TypeVar
+
+from .error_recovery import ErrorType, classify_error
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Default ceiling of concurrent calls per model
+DEFAULT_MAX_CONCURRENCY = 8
+
+# Multiplicative decrease factor applied on RATE_LIMIT
+DECREASE_FACTOR = 0.5
+
+
+class Priority(IntEnum):
+    """Queue priority of an API call (lower is served first)."""
+
+    INTERACTIVE = 0  # Direct MCP tool calls
+    BACKGROUND = 1  # Refinement loops and other speculative work
+
+
+_current_priority: contextvars.ContextVar[Priority] = contextvars.ContextVar(
+    "gemini_call_priority", default=Priority.INTERACTIVE
+)
+
+
+def current_priority() -> Priority:
+    """Priority of API calls made from the current task."""
+    return _current_priority.get()
+
+
+@contextmanager
+def priority_scope(priority: Priority) -> Iterator[None]:
+    """Run API calls made inside the block (and tasks it spawns) at a priority."""
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def background_priority(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+    """Decorator running an async function's API calls at BACKGROUND priority."""
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs) -> T:
+        with priority_scope(Priority.BACKGROUND):
+            return await func(*args, **kwargs)
+
+    return wrapper
+
+
+@dataclass
+class LimiterMetrics:
+    """Counters for one model's limiter."""
+
+    acquired: int = 0
+    queued: int = 0
+    rate_limited: int = 0
+    decreases: int = 0
+    total_wait_ms: float = 0.0
+    max_wait_ms: float = 0.0
+    max_queue_depth: int = 0
+    wait_ms_by_priority: Dict[str, float] = field(default_factory=dict)
+
+    def record_wait(self, priority: Priority, wait_ms: float) -> None:
+        """Record the queue wait of one acquired slot."""
+        self.acquired += 1
+        self.total_wait_ms += wait_ms
+        self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+        name = priority.name.lower()
+        self.wait_ms_by_priority[name] = self.wait_ms_by_priority.get(name, 0.0) + wait_ms
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limiter with a priority wait queue for one model.
+
+    Attributes:
+        name: Model name (for logs and stats)
+        max_limit: Ceiling for the adaptive limit
+        min_limit: Floor for the adaptive limit
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_limit: int = DEFAULT_MAX_CONCURRENCY,
+        min_limit: int = 1,
+    ):
+        self.name = name
+        self.max_limit = max(1, max_limit)
+        self.min_limit = max(1, min(min_limit, self.max_limit))
+        self._limit = float(self.max_limit)
+        self._in_flight = 0
+        self._waiters: List[tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        # Calls started before this sequence number predate the last decrease
+        self._decrease_epoch = 0
+        self._started = itertools.count()
+        self.metrics = LimiterMetrics()
+
+    @property
+    def limit(self) -> int:
+        """Current number of concurrent calls allowed."""
+        return max(self.min_limit, int(self._limit))
+
+    @property
+    def in_flight(self) -> int:
+        """Calls currently holding a slot."""
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        """Callers waiting for a slot."""
+        return sum(1 for _, _, waiter in self._waiters if not waiter.done())
+
+    async def acquire(self, priority: Optional[Priority] = None) -> int:
+        """Wait for a slot.
+
+        Args:
+            priority: Queue priority (defaults to current_priority()).
+
+        Returns:
+            Start ticket, passed back to release().
+        """
+        priority = current_priority() if priority is None else priority
+        started = time.perf_counter()
+
+        if self._in_flight < self.limit and not self.queue_depth:
+            self._in_flight += 1
+        else:
+            waiter = asyncio.get_running_loop().create_future()
+            heapq.heappush(self._waiters, (int(priority), next(self._sequence), waiter))
+            self.metrics.queued += 1
+            self.metrics.max_queue_depth = max(self.metrics.max_queue_depth, self.queue_depth)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                # Granted just before cancellation: hand the slot on
+                if waiter.done() and not waiter.cancelled():
+                    self._in_flight -= 1
+                    self._wake()
+                raise
+
+        self.metrics.record_wait(priority, (time.perf_counter() - started) * 1000)
+        return next(self._started)
+
+    def release(self, ticket: int, error: Optional[BaseException] = None) -> None:
+        """Free a slot and adapt the limit to the call's outcome.
+
+        Args:
+            ticket: Value returned by acquire().
+            error: Exception raised by the call, if any.
+        """
+        self._in_flight -= 1
+
+        if error is None:
+            if self._limit < self.max_limit:
+                self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+        elif isinstance(error, Exception) and classify_error(error) == ErrorType.RATE_LIMIT:
+            self.metrics.rate_limited += 1
+            if ticket >= self._decrease_epoch:
+                self._limit = max(self.min_limit, self._limit * DECREASE_FACTOR)
+                self._decrease_epoch = next(self._started)
+                self.metrics.decreases += 1
+                logger.warning(
+                    f"[RateLimiter] {self.name}: rate limited, concurrency -> {self.limit}"
+                )
+
+        self._wake()
+
+    def _wake(self) -> None:
+        """Grant free slots to the highest-priority waiters."""
+        while self._waiters and self._in_flight < self.limit:
+            _, _, waiter = heapq.heappop(self._waiters)
+            if waiter.done():
+                continue
+            self._in_flight += 1
+            waiter.set_result(None)
+
+    @asynccontextmanager
+    async def slot(self, priority: Optional[Priority] = None) -> AsyncIterator[None]:
+        """Hold a slot for the duration of the block."""
+        ticket = await self.acquire(priority)
+        try:
+            yield
+        except BaseException as e:
+            self.release(ticket, e)
+            raise
+        else:
+            self.release(ticket)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Current limit, queue depth and wait-time statistics."""
+        metrics = self.metrics
+        return {
+            "limit": self.limit,
+            "max_limit": self.max_limit,
+            "in_flight": self._in_flight,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": metrics.max_queue_depth,
+            "acquired": metrics.acquired,
+            "queued": metrics.queued,
+            "rate_limited": metrics.rate_limited,
+            "decreases": metrics.decreases,
+            "avg_wait_ms": round(metrics.total_wait_ms / metrics.acquired, 1) if metrics.acquired else 0.0,
+            "max_wait_ms": round(metrics.max_wait_ms, 1),
+            "wait_ms_by_priority": {k: round(v, 1) for k, v in metrics.wait_ms_by_priority.items()},
+        }
+
+
+class RateController:
+    """Process-wide registry of per-model adaptive limiters."""
+
+    def __init__(self, max_concurrency: int = DEFAULT_MAX_CONCURRENCY):
+        self.max_concurrency = max_concurrency
+        self._limiters: Dict[str, AdaptiveLimiter] = {}
+
+    def limiter(self, model: str) -> AdaptiveLimiter:
+        """Get (or create) the limiter for a model."""
+        limiter = self._limiters.get(model)
+        if limiter is None:
+            limiter = AdaptiveLimiter(model, max_limit=self.max_concurrency)
+            self._limiters[model] = limiter
+        return limiter
+
+    def slot(self, model: str, priority: Optional[Priority] = None):
+        """Async context manager holding one of the model's slots."""
+        return self.limiter(model).slot(priority)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Limiter statistics per model."""
+        return {model: limiter.get_stats() for model, limiter in self._limiters.items()}
+
+
+# Global instance
+_rate_controller: Optional[RateController] = None
+
+
+def get_rate_controller(max_concurrency: Optional[int] = None) -> RateController:
+    """Get the global rate controller (created on first use).
+
+    Args:
+        max_concurrency: Per-model ceiling, only used when creating it.
+    """
+    global _rate_controller
+    if _rate_controller is None:
+        _rate_controller = RateController(max_concurrency or DEFAULT_MAX_CONCURRENCY)
+    return _rate_controller
+
+
+def reset_rate_controller() -> None:
+    """Reset the global rate controller (for testing)."""
+    global _rate_controller
+    _rate_controller = None
@@ -10,8 +10,12 @@ Section Marker Format:
 """
 
 import functools
+import json
 import re
-from typing import Dict, List, Optional, Tuple
+import sys
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
 
 # Pattern to match section markers (precompiled for extract_all_sections)
 SECTION_PATTERN = re.compile(r'<!-- SECTION: (\w+) -->(.*?)<!-- /SECTION: \1 -->', re.DOTALL)
@@ -19,8 +23,16 @@ SECTION_PATTERN = re.compile(r'<!-- SECTION: (\w+) -->(.*?)<!-- /SECTION: \1 -->
 # Precompiled class extraction pattern
 _CLASS_PATTERN = re.compile(r'class="([^"]*)"')
 
+# Opening marker only (used by the streaming parser)
+_OPEN_MARKER_PATTERN = re.compile(r'<!-- SECTION: (\w+) -->')
+
+# Callback invoked with (section_type, section_html) when a streamed section closes
+SectionCallback = Callable[[str, str], Awaitable[None]]
+
 # =============================================================================
 # Performance Fix: Cached Regex Patterns (Issue 6)
+# Name-based lookups now go through SectionedPage (single marker scan);
+# these remain for callers that need a per-section regex.
 # =============================================================================
 
 @functools.lru_cache(maxsize=64)
@@ -78,6 +90,316 @@ VALID_SECTION_TYPES = {
 }
 
 
+# =============================================================================
+# SectionedPage: single-scan section index with piece splicing
+# =============================================================================
+
+# Opening and closing markers in one pattern (one scan finds both)
+_MARKER_PATTERN = re.compile(r'<!-- (/?)SECTION: (\w+) -->')
+
+
+@dataclass
+class PageSection:
+    """A matched <!-- SECTION: name --> ... <!-- /SECTION: name --> block.
+
+    Offsets are absolute when returned by SectionedPage and relative to the
+    owning piece inside it.
+
+    Attributes:
+        name: Section name from the markers.
+        start: Offset of the opening marker.
+        content_start: Offset just past the opening marker.
+        content_end: Offset of the closing marker.
+        end: Offset just past the closing marker.
+        depth: Number of enclosing sections (0 = top level).
+    """
+    name: str
+    start: int
+    content_start: int
+    content_end: int
+    end: int
+    depth: int = 0
+
+    def shifted(self, offset: int) -> "PageSection":
+        """Copy with all offsets moved by ``offset``."""
+        return PageSection(
+            name=self.name,
+            start=self.start + offset,
+            content_start=self.content_start + offset,
+            content_end=self.content_end + offset,
+            end=self.end + offset,
+            depth=self.depth,
+        )
+
+
+@dataclass
+class _Piece:
+    """One piece of a SectionedPage: a top-level section or markup between sections."""
+    text: str
+    sections: List[PageSection] = field(default_factory=list)  # relative, by start
+    open_names: List[str] = field(default_factory=list)  # every opening marker, in order
+
+
+def _scan_pieces(text: str) -> List[_Piece]:
+    """Scan markers once and split text into top-level section pieces.
+
+    For each name whose markers balance, a closing marker matches the most
+    recent unmatched opening marker, so nested same-name sections pair up
+    correctly. For names with stray opening markers, pairing falls back to
+    the classic regex behaviour (first opening marker with the next closing
+    marker, left to right). Markers of different names never close each
+    other; unmatched markers stay in the surrounding markup.
+    """
+    markers_by_name: Dict[str, List[Tuple[bool, int, int]]] = {}
+    openings: List[Tuple[int, str]] = []
+
+    for match in _MARKER_PATTERN.finditer(text):
+        closing, name = match.groups()
+        markers_by_name.setdefault(name, []).append((bool(closing), match.start(), match.end()))
+        if not closing:
+            openings.append((match.start(), name))
+
+    spans: List[PageSection] = []
+    for name, markers in markers_by_name.items():
+        pending: List[Tuple[int, int]] = []
+        nested: List[PageSection] = []
+        for closing, start, end in markers:
+            if not closing:
+                pending.append((start, end))
+            elif pending:
+                open_start, content_start = pending.pop()
+                nested.append(PageSection(name, open_start, content_start, start, end))
+        if not pending:
+            spans.extend(nested)
+            continue
+
+        # Unbalanced: first opener pairs with the next closer
+        opened: Optional[Tuple[int, int]] = None
+        for closing, start, end in markers:
+            if not closing and opened is None:
+                opened = (start, end)
+            elif closing and opened is not None:
+                spans.append(PageSection(name, opened[0], opened[1], start, end))
+                opened = None
+
+    spans.sort(key=lambda span: span.start)
+
+    # Group spans under top-level sections (overlapping spans join the group)
+    groups: List[Tuple[int, int, List[PageSection]]] = []
+    for span in spans:
+        if groups and span.start < groups[-1][1]:
+            start, end, members = groups[-1]
+            members.append(span)
+            groups[-1] = (start, max(end, span.end), members)
+        else:
+            groups.append((span.start, span.end, [span]))
+
+    pieces: List[_Piece] = []
+    opening_index = 0
+
+    def add_piece(start: int, end: int, members: List[PageSection]) -> None:
+        nonlocal opening_index
+        piece = _Piece(text=text[start:end])
+        while opening_index < len(openings) and openings[opening_index][0] < end:
+            piece.open_names.append(openings[opening_index][1])
+            opening_index += 1
+        enclosing_ends: List[int] = []
+        for span in members:
+            while enclosing_ends and enclosing_ends[-1] <= span.start:
+                enclosing_ends.pop()
+            relative = span.shifted(-start)
+            relative.depth = len(enclosing_ends)
+            piece.sections.append(relative)
+            enclosing_ends.append(span.end)
+        pieces.append(piece)
+
+    position = 0
+    for start, end, members in groups:
+        if start > position:
+            add_piece(position, start, [])
+        add_piece(start, end, members)
+        position = end
+    if position < len(text) or not pieces:
+        add_piece(position, len(text), [])
+    return pieces
+
+
+class SectionedPage:
+    """Page HTML indexed by its section markers, scanned once.
+
+    The page is held as a list of pieces (top-level sections and the
+    markup between them). Lookups read the recorded offsets instead of
+    re-running a regex over the whole page, and edits rebuild only the
+    pieces they touch; the full string is joined lazily when ``text`` is
+    read. Chained operations (list, extract, replace, insert, remove)
+    should share one SectionedPage.
+
+    Nested sections and repeated section names are supported: name-based
+    operations act on the outermost occurrences of that name, and lookups
+    return the first one.
+
+    Example:
+        >>> page = SectionedPage(html)
+        >>> page.names
+        ['navbar', 'hero', 'footer']
+        >>> page.replace('hero', '<section>New hero</section>')
+        >>> updated = page.text
+    """
+
+    def __init__(self, html: str):
+        self._pieces: List[_Piece] = _scan_pieces(html)
+        self._text: Optional[str] = html
+
+    # -------------------------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------------------------
+
+    @property
+    def text(self) -> str:
+        """Current page HTML."""
+        if self._text is None:
+            self._text = "".join(piece.text for piece in self._pieces)
+        return self._text
+
+    def __str__(self) -> str:
+        return self.text
+
+    @property
+    def names(self) -> List[str]:
+        """Names of all opening markers in page order (duplicates and unclosed included)."""
+        return [name for piece in self._pieces for name in piece.open_names]
+
+    @property
+    def sections(self) -> List[PageSection]:
+        """All matched sections with absolute offsets, by start offset."""
+        result: List[PageSection] = []
+        offset = 0
+        for piece in self._pieces:
+            result.extend(section.shifted(offset) for section in piece.sections)
+            offset += len(piece.text)
+        return result
+
+    def top_level(self) -> List[Tuple[str, str]]:
+        """(name, content) for each top-level section, content stripped."""
+        result = []
+        for piece in self._pieces:
+            if piece.sections:
+                section = piece.sections[0]
+                result.append(
+                    (section.name, piece.text[section.content_start:section.content_end].strip())
+                )
+        return result
+
+    def find(self, name: str) -> Optional[PageSection]:
+        """First section with the given name (absolute offsets)."""
+        offset = 0
+        for piece in self._pieces:
+            for section in piece.sections:
+                if section.name == name:
+                    return section.shifted(offset)
+            offset += len(piece.text)
+        return None
+
+    def __contains__(self, name: str) -> bool:
+        return any(
+            section.name == name for piece in self._pieces for section in piece.sections
+        )
+
+    def extract(self, name: str) -> Optional[str]:
+        """Content of the first section with the given name, stripped."""
+        section = self.find(name)
+        if section is None:
+            return None
+        return self.text[section.content_start:section.content_end].strip()
+
+    def boundaries(self, name: str) -> Optional[Tuple[int, int]]:
+        """(start, end) of the first section with the given name, markers included."""
+        section = self.find(name)
+        return (section.start, section.end) if section else None
+
+    def with_markers(self, name: str) -> Optional[str]:
+        """First section with the given name, markers included."""
+        section = self.find(name)
+        return self.text[section.start:section.end] if section else None
+
+    # -------------------------------------------------------------------------
+    # Edits
+    # -------------------------------------------------------------------------
+
+    def replace(self, name: str, new_content: str) -> None:
+        """Replace the content of every outermost section with this name.
+
+        Raises:
+            ValueError: If the section is not found.
+        """
+        new_content = new_content.strip()
+
+        def splice(text: str, section: PageSection) -> str:
+            return f"{text[:section.content_start]}\n{new_content}\n{text[section.content_end:]}"
+
+        self._edit(name, splice)
+
+    def remove(self, name: str) -> None:
+        """Remove every outermost section with this name and the newlines after it.
+
+        Raises:
+            ValueError: If the section is not found.
+        """
+        self._edit(name, lambda text, section: text[:section.start] + text[section.end:].lstrip("\n"))
+
+        # A removed top-level section's trailing newlines start the next piece
+        for index, piece in enumerate(self._pieces):
+            if piece.text == "" and index + 1 < len(self._pieces):
+                following = self._pieces[index + 1]
+                if not following.sections and following.text.startswith("\n"):
+                    self._pieces[index + 1] = _Piece(
+                        text=following.text.lstrip("\n"), open_names=following.open_names
+                    )
+        self._pieces = [piece for piece in self._pieces if piece.text]
+        self._text = None
+
+    def insert_after(self, after_section: str, new_section_type: str, new_content: str) -> None:
+        """Insert a new section after every outermost section named ``after_section``.
+
+        Raises:
+            ValueError: If the reference section is not found.
+        """
+        new_section = (
+            f"\n<!-- SECTION: {new_section_type} -->\n"
+            f"{new_content.strip()}\n"
+            f"<!-- /SECTION: {new_section_type} -->"
+        )
+        self._edit(
+            after_section,
+            lambda text, section: text[:section.end] + new_section + text[section.end:],
+        )
+
+    def _edit(self, name: str, splice: Callable[[str, PageSection], str]) -> None:
+        """Apply ``splice`` to each outermost section ``name``, rebuilding only touched pieces."""
+        touched: List[Tuple[int, List[PageSection]]] = []
+        for index, piece in enumerate(self._pieces):
+            outermost: List[PageSection] = []
+            for section in piece.sections:
+                if section.name != name:
+                    continue
+                if outermost and section.start < outermost[-1].end:
+                    continue  # Nested inside an occurrence being edited
+                outermost.append(section)
+            if outermost:
+                touched.append((index, outermost))
+
+        if not touched:
+            raise ValueError(f"Section '{name}' not found in HTML")
+
+        # Back to front so earlier piece indexes and offsets stay valid
+        for index, outermost in reversed(touched):
+            text = self._pieces[index].text
+            for section in reversed(outermost):
+                text = splice(text, section)
+            self._pieces[index:index + 1] = _scan_pieces(text) if text else [_Piece(text="")]
+        self._text = None
+
+
 def extract_section(html: str, section_name: str) -> Optional[str]:
     """Extract a specific section's content from HTML.
 
@@ -95,10 +417,7 @@ def extract_section(html: str, section_name: str) -> Optional[str]:
         >>> extract_section(html, 'navbar')
         '<nav>Navigation</nav>'
     """
-    # Use cached compiled pattern (Issue 6 fix)
-    pattern = _get_section_pattern(section_name)
-    match = pattern.search(html)
-    return match.group(1).strip() if match else None
+    return SectionedPage(html).extract(section_name)
 
 
 def replace_section(html: str, section_name: str, new_content: str) -> str:
@@ -122,17 +441,9 @@ def replace_section(html: str, section_name: str, new_content: str) -> str:
         >>> replace_section(html, 'navbar', '<nav>New Nav</nav>')
         '<!-- SECTION: navbar -->\\n<nav>New Nav</nav>\\n<!-- /SECTION: navbar -->'
     """
-    # Use cached compiled pattern (Issue 6 fix)
-    pattern = _get_section_with_groups_pattern(section_name)
-
-    if not pattern.search(html):
-        raise ValueError(f"Section '{section_name}' not found in HTML")
-
-    # Clean up the new content
-    new_content = new_content.strip()
-    replacement = rf'\1\n{new_content}\n\3'
-
-    return pattern.sub(replacement, html)
+    page = SectionedPage(html)
+    page.replace(section_name, new_content)
+    return page.text
 
 
 def list_sections(html: str) -> List[str]:
@@ -150,7 +461,7 @@ def list_sections(html: str) -> List[str]:
         >>> list_sections(html)
         ['navbar', 'hero']
     """
-    return re.findall(r'<!-- SECTION: (\w+) -->', html)
+    return SectionedPage(html).names
 
 
 def get_section_boundaries(html: str, section_name: str) -> Optional[Tuple[int, int]]:
@@ -168,10 +479,7 @@ def get_section_boundaries(html: str, section_name: str) -> Optional[Tuple[int,
         >>> get_section_boundaries(html, 'navbar')
         (0, 64)
     """
-    # Use cached compiled pattern (Issue 6 fix)
-    pattern = _get_section_boundaries_pattern(section_name)
-    match = pattern.search(html)
-    return (match.start(), match.end()) if match else None
+    return SectionedPage(html).boundaries(section_name)
 
 
 def validate_section_type(section_type: str) -> bool:
@@ -196,10 +504,7 @@ def get_section_with_markers(html: str, section_name: str) -> Optional[str]:
     Returns:
         The complete section including markers if found, None otherwise.
     """
-    # Use cached compiled pattern (Issue 6 fix)
-    pattern = _get_section_boundaries_pattern(section_name)
-    match = pattern.search(html)
-    return match.group(0) if match else None
+    return SectionedPage(html).with_markers(section_name)
 
 
 def insert_section_after(
@@ -222,17 +527,9 @@ def insert_section_after(
     Raises:
         ValueError: If the reference section is not found.
     """
-    pattern = rf'(<!-- /SECTION: {after_section} -->)'
-
-    if not re.search(pattern, html):
-        raise ValueError(f"Section '{after_section}' not found in HTML")
-
-    new_section = f"""
-<!-- SECTION: {new_section_type} -->
-{new_content.strip()}
-<!-- /SECTION: {new_section_type} -->"""
-
-    return re.sub(pattern, rf'\1{new_section}', html)
+    page = SectionedPage(html)
+    page.insert_after(after_section, new_section_type, new_content)
+    return page.text
 
 
 def remove_section(html: str, section_name: str) -> str:
@@ -248,20 +545,27 @@ def remove_section(html: str, section_name: str) -> str:
     Raises:
         ValueError: If the section is not found.
     """
-    # Use cached compiled pattern (Issue 6 fix)
-    pattern = _get_section_boundaries_pattern(section_name)
+    page = SectionedPage(html)
+    page.remove(section_name)
+    return page.text.strip()
 
-    if not pattern.search(html):
-        raise ValueError(f"Section '{section_name}' not found in HTML")
 
-    # Remove the section and any trailing newlines
-    # Note: We need a separate pattern for the trailing newlines
-    full_pattern = re.compile(
-        rf'<!-- SECTION: {re.escape(section_name)} -->.*?<!-- /SECTION: {re.escape(section_name)} -->\n*',
-        re.DOTALL
-    )
-    result = full_pattern.sub('', html)
-    return result.strip()
+# Token categories shared by the extractors and ProjectTokenIndex
+DESIGN_TOKEN_CATEGORIES = ("colors", "typography", "spacing", "effects")
+
+
+def _token_category(cls: str) -> Optional[str]:
+    """Design-token category of a Tailwind class, or None if it has none."""
+    # Colors - check common prefixes first, then text-color variants
+    if cls.startswith(_COLOR_PREFIXES) or cls.startswith(_TEXT_COLOR_PREFIXES):
+        return "colors"
+    if cls.startswith(_TYPOGRAPHY_PREFIXES):
+        return "typography"
+    if cls.startswith(_SPACING_PREFIXES):
+        return "spacing"
+    if cls.startswith(_EFFECTS_PREFIXES):
+        return "effects"
+    return None
 
 
 def extract_design_tokens_from_section(html: str, section_name: str) -> Dict[str, List[str]]:
@@ -476,11 +780,12 @@ def combine_sections(sections: List[Tuple[str, str]], page_wrapper: bool = True)
     return combined
 
 
-def extract_all_sections(html: str) -> Dict[str, str]:
+def extract_all_sections(html: Union[str, SectionedPage]) -> Dict[str, str]:
     """Extract all sections from HTML into a dictionary.
 
     Args:
-        html: The full HTML content with section markers.
+        html: The full HTML content with section markers, or an already
+              scanned SectionedPage.
 
     Returns:
         Dictionary mapping section types to their content (without markers).
@@ -491,17 +796,12 @@ def extract_all_sections(html: str) -> Dict[str, str]:
         >>> extract_all_sections(html)
         {'navbar': '<nav>Nav</nav>', 'hero': '<section>Hero</section>'}
     """
-    sections = {}
-    # SECTION_PATTERN is precompiled at module level
-    for match in SECTION_PATTERN.finditer(html):
-        section_type = match.group(1)
-        content = match.group(2).strip()
-        sections[section_type] = content
-    return sections
+    page = html if isinstance(html, SectionedPage) else SectionedPage(html)
+    return dict(page.top_level())
 
 
 def extract_design_tokens_batch(
-    html: str,
+    html: Union[str, SectionedPage],
     exclude_section: str = ""
 ) -> Dict[str, Dict[str, List[str]]]:
     """Extract design tokens from all sections in a single pass.
@@ -510,7 +810,7 @@ def extract_design_tokens_batch(
     multiple times, as it scans the HTML only once.
 
     Args:
-        html: Full HTML content with section markers.
+        html: Full HTML content with section markers (or a SectionedPage).
         exclude_section: Optional section name to skip (e.g., the one being replaced).
 
     Returns:
@@ -566,6 +866,149 @@ def extract_design_tokens_batch(
     return result
 
 
+class ProjectTokenIndex:
+    """Design tokens of a project's saved sections, maintained incrementally.
+
+    Each saved section's Tailwind classes are counted per category
+    (colors, typography, spacing, effects) and folded into running
+    project-wide frequencies. Saving a section scans only that section's
+    HTML (re-saving it replaces its earlier counts), so chained
+    design_section calls no longer re-send and re-scan the page built so
+    far. summary() is cached until the next save, so lookups are O(1).
+
+    Token strings are interned: a page repeats the same few hundred
+    classes, and every section shares one copy of each.
+
+    Example:
+        >>> index = ProjectTokenIndex("acme")
+        >>> index.update_section("hero", '<section class="bg-blue-600 py-24">')
+        >>> index.summary()["colors"]
+        ['bg-blue-600']
+    """
+
+    def __init__(self, project_id: str = ""):
+        self.project_id = project_id
+        self._sections: Dict[str, Dict[str, Counter]] = {}
+        self._totals: Dict[str, Counter] = {c: Counter() for c in DESIGN_TOKEN_CATEGORIES}
+        self._summaries: Dict[int, Dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._sections)
+
+    def __contains__(self, section_type: object) -> bool:
+        return section_type in self._sections
+
+    @property
+    def sections(self) -> List[str]:
+        """Indexed section types, in the order they were first saved."""
+        return list(self._sections)
+
+    def update_section(self, section_type: str, html: str) -> None:
+        """Index a saved section, replacing its previous tokens if any."""
+        counts: Dict[str, Counter] = {c: Counter() for c in DESIGN_TOKEN_CATEGORIES}
+        for class_attr in _CLASS_PATTERN.findall(html):
+            for cls in class_attr.split():
+                category = _token_category(cls)
+                if category is not None:
+                    counts[category][sys.intern(cls)] += 1
+
+        self._discard(section_type)
+        self._sections[section_type] = counts
+        for category, counter in counts.items():
+            self._totals[category].update(counter)
+        self._summaries.clear()
+
+    def update_page(self, html: str, default_section: str = "previous") -> None:
+        """Index every top-level section of marked page HTML.
+
+        HTML without section markers is indexed as one section named
+        ``default_section``.
+        """
+        sections = SectionedPage(html).top_level()
+        for name, content in sections or [(default_section, html)]:
+            self.update_section(name, content)
+
+    def remove_section(self, section_type: str) -> bool:
+        """Drop a section's tokens. Returns False if it was not indexed."""
+        if section_type not in self._sections:
+            return False
+        self._discard(section_type)
+        del self._sections[section_type]
+        self._summaries.clear()
+        return True
+
+    def frequencies(self, category: str) -> Dict[str, int]:
+        """Token -> occurrence count across all sections for one category."""
+        return dict(self._totals[category])
+
+    def summary(self, top_n: int = 8) -> Dict[str, Any]:
+        """Compact token summary for the next section's prompt.
+
+        Args:
+            top_n: Tokens kept per category, most frequent first.
+
+        Returns:
+            Dict with "sections" (indexed section types) and one list per
+            category. Shaped like extract_design_tokens_batch() output, so
+            it can be passed anywhere design_tokens are accepted.
+        """
+        cached = self._summaries.get(top_n)
+        if cached is None:
+            cached = {"sections": self.sections}
+            for category in DESIGN_TOKEN_CATEGORIES:
+                cached[category] = [token for token, _ in self._totals[category].most_common(top_n)]
+            self._summaries[top_n] = cached
+        return cached
+
+    def clear(self) -> None:
+        """Forget all indexed sections."""
+        self._sections.clear()
+        for counter in self._totals.values():
+            counter.clear()
+        self._summaries.clear()
+
+    def _discard(self, section_type: str) -> None:
+        """Subtract a section's counts from the project totals."""
+        previous = self._sections.get(section_type)
+        if previous is None:
+            return
+        for category, counter in previous.items():
+            totals = self._totals[category]
+            totals.subtract(counter)
+            for token in counter:
+                if totals[token] <= 0:
+                    del totals[token]
+
+
+# Per-project indexes, least recently used first
+_project_token_indexes: "OrderedDict[str, ProjectTokenIndex]" = OrderedDict()
+MAX_PROJECT_TOKEN_INDEXES = 128
+
+
+def get_project_token_index(project_id: str) -> ProjectTokenIndex:
+    """Get (or create) the token index for a project.
+
+    Indexes live in process memory; the least recently used ones are
+    dropped beyond MAX_PROJECT_TOKEN_INDEXES projects.
+    """
+    index = _project_token_indexes.get(project_id)
+    if index is None:
+        index = _project_token_indexes[project_id] = ProjectTokenIndex(project_id)
+        while len(_project_token_indexes) > MAX_PROJECT_TOKEN_INDEXES:
+            _project_token_indexes.popitem(last=False)
+    else:
+        _project_token_indexes.move_to_end(project_id)
+    return index
+
+
+def reset_project_token_indexes() -> None:
+    """Drop all project token indexes.
+
+    design_section(reset_token_index=True) resets a single project.
+    """
+    _project_token_indexes.clear()
+
+
 def validate_page_structure(html: str, required_sections: Optional[List[str]] = None) -> Tuple[bool, List[str]]:
     """Validate that a page has the required section structure.
 
@@ -637,3 +1080,95 @@ def reorder_sections(html: str, section_order: List[str]) -> str:
             ordered_sections.append((section_type, content))
 
     return combine_sections(ordered_sections, page_wrapper=False)
+
+
+class SectionStreamParser:
+    """Incrementally detect completed sections in streamed model output.
+
+    Feed text chunks as they arrive; each call returns the sections whose
+    closing marker has been seen since the previous call. Markers split
+    across chunk boundaries are handled, and each closing marker is only
+    searched for in the newly arrived text, so parsing stays linear in the
+    response size.
+
+    Args:
+        json_escaped: Set when the HTML is streamed inside a JSON string
+            (response_mime_type="application/json"); section content is
+            then unescaped before being returned.
+
+    Example:
+        >>> parser = SectionStreamParser()
+        >>> parser.feed("<!-- SECTION: hero --><h1>Hi</h1><!-- /SEC")
+        []
+        >>> parser.feed("TION: hero -->")
+        [('hero', '<h1>Hi</h1>')]
+    """
+
+    # Longest partial opening marker that may straddle a chunk boundary
+    _MAX_OPEN_MARKER = 64
+
+    def __init__(self, json_escaped: bool = False):
+        self.json_escaped = json_escaped
+        self._buffer = ""
+        self._scan_pos = 0
+        self._open_name: Optional[str] = None
+        self._content_start = 0
+        self._close_search_pos = 0
+        self.completed: List[str] = []
+
+    @property
+    def text(self) -> str:
+        """All text fed so far."""
+        return self._buffer
+
+    def feed(self, chunk: str) -> List[Tuple[str, str]]:
+        """Add a chunk of streamed text.
+
+        Args:
+            chunk: Newly received text.
+
+        Returns:
+            List of (section_type, content) for sections closed by this chunk.
+        """
+        if not chunk:
+            return []
+        self._buffer += chunk
+        closed: List[Tuple[str, str]] = []
+
+        while True:
+            if self._open_name is None:
+                match = _OPEN_MARKER_PATTERN.search(self._buffer, self._scan_pos)
+                if match is None:
+                    # Keep a tail in case an opening marker is split
+                    self._scan_pos = max(
+                        self._scan_pos, len(self._buffer) - self._MAX_OPEN_MARKER
+                    )
+                    break
+                self._open_name = match.group(1)
+                self._content_start = match.end()
+                self._close_search_pos = match.end()
+
+            close_marker = f"<!-- /SECTION: {self._open_name} -->"
+            end = self._buffer.find(close_marker, self._close_search_pos)
+            if end == -1:
+                self._close_search_pos = max(
+                    self._content_start, len(self._buffer) - len(close_marker) + 1
+                )
+                break
+
+            content = self._decode(self._buffer[self._content_start:end]).strip()
+            closed.append((self._open_name, content))
+            self.completed.append(self._open_name)
+            self._scan_pos = end + len(close_marker)
+            self._open_name = None
+
+        return closed
+
+    def _decode(self, raw: str) -> str:
+        """Unescape JSON string content if the stream is a JSON document."""
+        if not self.json_escaped:
+            return raw
+        try:
+            return json.loads(f'"{raw}"')
+        except json.JSONDecodeError:
+            return raw.replace('\\n', '\n').replace('\\"', '"').replace('\\/', '/')
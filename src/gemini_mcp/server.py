@@ -11,15 +11,18 @@ Provides frontend design tools powered by Gemini models on Vertex AI:
 - list_models: Available models and capabilities
 """
 
+import asyncio
 import json
 import logging
 import re
+from typing import Optional
 
 # GAP 7: State Management & Persistence
 from .state import draft_manager
+from .draft_compiler import compile_project
 
 
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import Context, FastMCP
 
 from .client import get_gemini_client, fix_js_fallbacks
 from .config import AVAILABLE_MODELS, get_config
@@ -102,9 +105,8 @@ from .theme_factories import (
 )
 
 from .section_utils import (
+    SectionedPage,
     extract_section,
-    replace_section,
-    list_sections,
     extract_design_tokens_from_section,
     extract_design_tokens_batch,  # Performance: single-pass token extraction
     wrap_content_with_markers,
@@ -116,6 +118,8 @@ from .section_utils import (
     extract_all_sections,
     # BUG-004 FIX: Add markers to pages without them
     migrate_to_markers,
+    # Per-project token index for design_section chains
+    get_project_token_index,
 )
 
 # GAP 3: Error Handling and Recovery
@@ -128,6 +132,7 @@ from .error_recovery import (
     create_fallback_response,
     with_retry,
     retry_async,
+    retry_budget,
     ResponseValidator,
 )
 
@@ -143,6 +148,7 @@ from .orchestration import (
     # === Quality Target (Corporate Quality Enhancement) ===
     QualityTarget,
 )
+from .orchestration.dna_store import project_id_from_context
 
 # GAP 4, 5, 6: Validation Layer
 from .validators import (
@@ -164,6 +170,9 @@ from .validators import (
     ValidationReport,
 )
 
+# Incremental page validation (per-section result cache)
+from .validation.incremental import get_incremental_validator
+
 # Logger instance - configured in main() to use stderr (not stdout)
 # IMPORTANT: Do NOT use logging.basicConfig() here - it breaks MCP stdio protocol
 logger = logging.getLogger(__name__)
@@ -171,7 +180,8 @@ logger = logging.getLogger(__name__)
 # =============================================================================
 # PRECOMPILED PATTERNS - Performance optimization (Issue 8)
 # =============================================================================
-# Pattern for extracting body content from HTML documents
+# Pattern for extracting body content from HTML documents (compile_project_drafts
+# now streams with draft_compiler.find_body_span, which follows the same rule)
 _BODY_CONTENT_PATTERN = re.compile(r'<body[^>]*>(.*?)</body>', re.DOTALL)
 
 
@@ -233,6 +243,7 @@ def _auto_save_design_output(
     tool_name: str,
     name_prefix: str,
     extra_metadata: dict | None = None,
+    project_name: str = "auto_save",
 ) -> dict:
     """Auto-save design output HTML, CSS, and JS to temp_designs/ folder.
 
@@ -247,6 +258,7 @@ def _auto_save_design_output(
         tool_name: Name of the calling tool (for metadata)
         name_prefix: Prefix for the saved file name
         extra_metadata: Additional metadata to include
+        project_name: Draft project folder (default: auto_save)
 
     Returns:
         The result dict with 'saved_to', 'saved_css_to', 'saved_js_to' paths
@@ -276,7 +288,7 @@ def _auto_save_design_output(
             html_path = draft_manager.save_artifact(
                 content=html_content,
                 extension="html",
-                project_name="auto_save",
+                project_name=project_name,
                 component_type=name_prefix,
                 metadata=metadata,
             )
@@ -289,7 +301,7 @@ def _auto_save_design_output(
             css_path = draft_manager.save_artifact(
                 content=result["css_output"],
                 extension="css",
-                project_name="auto_save",
+                project_name=project_name,
                 component_type=f"{name_prefix}_styles",
                 metadata=metadata,
             )
@@ -302,7 +314,7 @@ def _auto_save_design_output(
             js_path = draft_manager.save_artifact(
                 content=result["js_output"],
                 extension="js",
-                project_name="auto_save",
+                project_name=project_name,
                 component_type=f"{name_prefix}_scripts",
                 metadata=metadata,
             )
@@ -319,6 +331,37 @@ def _auto_save_design_output(
     return result
 
 
+async def _auto_save_design_output_async(
+    result: dict,
+    tool_name: str,
+    name_prefix: str,
+    extra_metadata: dict | None = None,
+    project_name: str = "auto_save",
+) -> dict:
+    """Run _auto_save_design_output in a worker thread.
+
+    Design tools await this so the (up to three) atomic file writes and
+    manifest appends never block the event loop.
+    """
+    return await asyncio.to_thread(
+        _auto_save_design_output, result, tool_name, name_prefix, extra_metadata, project_name
+    )
+
+
+async def _validate_page_async(page_html: str) -> dict | None:
+    """Validate a sectioned page in a worker thread (IncrementalValidator).
+
+    Returns:
+        The validation report dict, or None if validation failed.
+    """
+    try:
+        report = await asyncio.to_thread(get_incremental_validator().validate_page, page_html)
+    except Exception as e:
+        logger.warning(f"Incremental page validation failed: {e}")
+        return None
+    return report.to_dict()
+
+
 # Create MCP server
 mcp = FastMCP(
     "Gemini MCP",
@@ -406,14 +449,16 @@ async def safe_design_call(
     partial_result = None
 
     try:
-        # Execute with retry
-        result = await with_retry(
-            api_call,
-            strategy=DESIGN_RECOVERY_STRATEGY,
-            on_retry=lambda attempt, e: logger.warning(
-                f"Retry {attempt + 1} for {component_type}: {classify_error(e).value}"
-            ),
-        )
+        # Execute with retry - one budget shared with the client's own retries
+        with retry_budget():
+            result = await with_retry(
+                api_call,
+                strategy=DESIGN_RECOVERY_STRATEGY,
+                on_retry=lambda attempt, e: logger.warning(
+                    f"Retry {attempt + 1} for {component_type}: {classify_error(e).value}"
+                ),
+                layer="safe_design_call",
+            )
 
         # Validate response
         is_valid, missing = ResponseValidator.validate(result, response_type)
@@ -446,6 +491,62 @@ async def safe_design_call(
             raise
 
 
+# =============================================================================
+# STREAMING PROGRESS (incremental section delivery)
+# =============================================================================
+
+def _section_progress_reporter(ctx: Optional[Context], total: int):
+    """Build a section callback that forwards completed sections to the client.
+
+    Each completed section is sent as an MCP progress notification whose
+    message carries the section's marked HTML, so clients can render the
+    page while later sections are still being generated.
+
+    Only requests that carry a progressToken (the client asked for
+    progress) get a callback; FastMCP injects ctx into every call, and
+    without a token the streaming path would only add overhead. Requests
+    coalesced onto an identical in-flight call (DesignCache.coalesce)
+    share its result but receive no progress of their own.
+
+    Args:
+        ctx: FastMCP request context (None when called outside MCP).
+        total: Expected number of sections (for progress/total).
+
+    Returns:
+        Async callback(section_type, html), or None if the request did
+        not ask for progress.
+    """
+    if ctx is None:
+        return None
+    try:
+        meta = ctx.request_context.meta
+    except ValueError:
+        # ctx used outside an active request
+        return None
+    if meta is None or getattr(meta, "progressToken", None) is None:
+        return None
+
+    delivered: list = []
+
+    async def _report(section_type: str, html: str) -> None:
+        if section_type in delivered:
+            return
+        delivered.append(section_type)
+        done = len(delivered)
+        try:
+            await ctx.report_progress(
+                done,
+                total=max(total, done),
+                message=f"section {section_type} ({done}/{max(total, done)})\n"
+                f"{wrap_content_with_markers(html, section_type)}",
+            )
+        except Exception as e:
+            # Progress is best-effort; never fail the design call
+            logger.debug(f"Section progress notification failed: {e}")
+
+    return _report
+
+
 # =============================================================================
 # TRIFECTA PIPELINE HELPER
 # =============================================================================
@@ -465,6 +566,7 @@ async def run_trifecta_pipeline(
     industry: str = "",  # NEW: Industry context for corporate designs
     formality: str = "",  # NEW: Formality level for corporate designs
     sections: list = None,  # PAGE pipeline: sections to generate (e.g., ["hero", "features"])
+    section_callback=None,  # Streaming: async (section_type, html) per completed section
     **kwargs,
 ) -> dict:
     """Run a Trifecta multi-agent pipeline for design generation.
@@ -486,6 +588,8 @@ async def run_trifecta_pipeline(
         industry: Industry context (finance, healthcare, legal, tech, manufacturing, consulting)
         formality: Formality level (formal, semi-formal, approachable)
         sections: List of section types for PAGE pipeline (e.g., ["hero", "features", "footer"])
+        section_callback: Optional async callback invoked with (section_type, html)
+            as each section completes (see _section_progress_reporter)
         **kwargs: Additional pipeline-specific parameters
 
     Returns:
@@ -526,6 +630,7 @@ async def run_trifecta_pipeline(
             modification_request=modification_request,
             quality_target=quality_target_enum,  # NEW: Quality target
             sections=sections_dicts,  # PAGE pipeline: sections for Architect
+            section_callback=section_callback,
         )
 
         # Add industry/formality context if provided
@@ -949,10 +1054,12 @@ async def design_frontend(
     # =================================================================
     inject_js_fallbacks: bool = False,  # Inject Modal/Dropdown/Carousel/etc. JS
 ) -> dict:
-    """Design a frontend UI component using Gemini 3 Pro.
+    """Design a frontend UI component using Gemini 3 (Flash or Pro).
 
     This tool generates high-quality, production-ready HTML components with
-    TailwindCSS. Always uses gemini-3-pro-preview for best design quality.
+    TailwindCSS. With GEMINI_MODEL_ROUTING on (the default), each call goes
+    to gemini-3-flash-preview or gemini-3-pro-preview by component tier and
+    quality_target; with it off, gemini-3-pro-preview is always used.
     Perfect for creating UI components that Claude Code can then integrate
     into a larger application.
 
@@ -967,7 +1074,7 @@ async def design_frontend(
     1. Claude analyzes the feature requirements
     2. Claude breaks down into atomic components (atoms, molecules, organisms)
     3. Claude calls design_frontend for each component with the same theme
-    4. Gemini 3 Pro generates high-quality HTML with TailwindCSS
+    4. Gemini 3 (routed model) generates high-quality HTML with TailwindCSS
     5. Claude assembles the components into a complete page
 
     Args:
@@ -1115,7 +1222,9 @@ async def design_frontend(
         - micro_interactions: Animation/transition classes
         - design_notes: Gemini's explanation of design decisions
         - theme_config: Advanced theme configuration used
-        - model_used: Always gemini-3-pro-preview
+        - model_used: Model that generated the design - gemini-3-flash-preview
+                      or gemini-3-pro-preview when GEMINI_MODEL_ROUTING is on
+                      (the default), else always gemini-3-pro-preview
 
         When use_trifecta=True, additional fields:
         - trifecta_enabled: True
@@ -1337,6 +1446,8 @@ async def design_frontend(
             style_guide=style_guide_dict,
             project_context=project_context,
             content_language=content_language,
+            quality_target=quality_target,
+            tier=resolved_tier,
         ),
         component_type=component_type,
         response_type="design"
@@ -1372,7 +1483,7 @@ async def design_frontend(
         metadata["vibe"] = vibe
     if tier:
         metadata["tier"] = resolved_tier
-    result = _auto_save_design_output(
+    result = await _auto_save_design_output_async(
         result, "design_frontend", f"component_{component_type}", metadata
     )
 
@@ -1465,50 +1576,40 @@ def start_project(project_name: str) -> str:
 
 
 @mcp.tool()
-def compile_project_drafts(project_name: str, output_filename: str = "index.html") -> str:
+async def compile_project_drafts(
+    project_name: str,
+    output_filename: str = "index.html",
+    bundle_assets: bool = False,
+) -> str:
     """Combine all HTML drafts in a project into a single file.
-    
-    Simple concatenation of latest version of each component.
+
+    Concatenates the latest version of each component. Drafts are streamed
+    into the output file, so large projects compile in bounded memory.
+
+    Args:
+        project_name: Name of the project (folder in temp_designs)
+        output_filename: Kept for compatibility (the page is saved as a
+            timestamped compiled_full_page draft)
+        bundle_assets: Also emit one CSS and one JS bundle from the
+            components' latest CSS/JS drafts (repeated CSS rules and
+            identical scripts are dropped) and link them from the page
     """
-    drafts = draft_manager.list_drafts(project_name)
-    if not drafts:
+    result = await asyncio.to_thread(compile_project, draft_manager, project_name, bundle_assets)
+    if not result.components and not result.path:
         return "No drafts found."
-        
-    # Simple logic: Sort by type, dedup
-    # This is a naive implementation for the MVP
-    
-    unique_components = {}
-    for d in sorted(drafts, key=lambda x: x['created_at']):
-        if d['type'] == 'html':
-              unique_components[d['component_type']] = d['path']
-              
-    combined_html = """<!DOCTYPE html><html lang="tr"><head>
-    <meta charset="UTF-8"><meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <script src="https://cdn.tailwindcss.com"></script>
-    <script defer src="https://cdn.jsdelivr.net/npm/alpinejs@3.x.x/dist/cdn.min.js"></script>
-    <link href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap" rel="stylesheet">
-    </head><body class="bg-gray-50">"""
-    
-    for c_type, path in unique_components.items():
-        try:
-            with open(path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                # Strip <html> tags if full page (using precompiled pattern)
-                body_match = _BODY_CONTENT_PATTERN.search(content)
-                if body_match:
-                    content = body_match.group(1)
-                combined_html += f"\n<!-- SECTION: {c_type} -->\n{content}\n"
-        except Exception as e:
-            combined_html += f"\n<!-- FAILED TO LOAD {c_type}: {e} -->\n"
-            
-    combined_html += "</body></html>"
-    
-    # Save compilation
-    save_path = draft_manager.save_artifact(
-        combined_html, "html", project_name, component_type="compiled_full_page"
-    )
-    
-    return f"Compiled {len(unique_components)} components into {save_path}"
+
+    message = f"Compiled {result.components} components into {result.path}"
+    if result.css_path:
+        message += (
+            f"\nCSS bundle: {result.css_path} ({result.css_rules} rules, "
+            f"{result.css_duplicates} duplicates dropped)"
+        )
+    if result.js_path:
+        message += (
+            f"\nJS bundle: {result.js_path} ({result.js_files} files, "
+            f"{result.js_duplicates} duplicates dropped)"
+        )
+    return message
 
 
 @mcp.tool()
@@ -1767,8 +1868,9 @@ async def design_page(
     content_language: str = "tr",
     # TRIFECTA ENGINE
     use_trifecta: bool = False,
+    ctx: Optional[Context] = None,
 ) -> dict:
-    """Design a full page layout using Gemini 3 Pro.
+    """Design a full page layout using Gemini 3 (Flash or Pro, see GEMINI_MODEL_ROUTING).
 
     This tool generates complete page layouts with multiple sections.
     Content language is configurable (default: Turkish).
@@ -1794,6 +1896,8 @@ async def design_page(
         project_context: Project-specific context for design consistency.
         content_language: Language code for content generation (default: "tr").
                          Supported: "tr" (Turkish), "en" (English), "de" (German).
+        ctx: Injected by MCP. When the client requests progress, each section
+             is streamed as a progress notification as soon as it completes.
 
     Returns:
         Dict containing:
@@ -1802,7 +1906,9 @@ async def design_page(
         - html: Complete HTML with TailwindCSS
         - sections: List of sections included
         - design_notes: Gemini's explanation of design decisions
-        - model_used: Always gemini-3-pro-preview
+        - model_used: Model that generated the design - gemini-3-flash-preview
+                      or gemini-3-pro-preview when GEMINI_MODEL_ROUTING is on
+                      (the default), else always gemini-3-pro-preview
     """
     try:
         template = get_page_template(template_type)
@@ -1835,6 +1941,9 @@ async def design_page(
             "is_full_page": True,
         }
 
+        # Streaming: report each section as it completes
+        on_section = _section_progress_reporter(ctx, len(template.get("sections", [])))
+
         # =================================================================
         # TRIFECTA ENGINE - Multi-Agent Pipeline Mode
         # =================================================================
@@ -1855,6 +1964,7 @@ async def design_page(
                 project_context=project_context,
                 content_language=content_language,
                 sections=template_sections,  # Pass sections for Architect
+                section_callback=on_section,
             )
         else:
             # Call the design method with page template and GAP 3 error handling
@@ -1867,6 +1977,7 @@ async def design_page(
                     constraints=constraints,
                     project_context=project_context,
                     content_language=content_language,
+                    on_section=on_section,
                 ),
                 component_type=f"page:{template_type}",
                 response_type="page",
@@ -1929,7 +2040,7 @@ async def design_page(
             result["section_markers_validated"] = is_valid
 
         # Auto-save design output
-        result = _auto_save_design_output(
+        result = await _auto_save_design_output_async(
             result, "design_page", f"page_{template_type}",
             {"template_type": template_type, "theme": theme, "content_language": content_language}
         )
@@ -1956,6 +2067,8 @@ async def refine_frontend(
     use_trifecta: bool = False,
     # OPTIONAL JS FALLBACKS
     inject_js_fallbacks: bool = False,
+    # OPTIONAL PAGE VALIDATION
+    validate_page: bool = False,
 ) -> dict:
     """Refine an existing component design based on feedback.
 
@@ -1975,6 +2088,8 @@ async def refine_frontend(
                       - "Mobil responsive sorunlarını düzelt"
                       - "Hover efektlerini daha belirgin yap"
         project_context: Optional project context for consistency.
+        validate_page: Validate the refined page (sectioned HTML only) and
+                      return the report (default: False).
 
     Returns:
         Dict containing:
@@ -1982,7 +2097,12 @@ async def refine_frontend(
         - html: The modified HTML with TailwindCSS
         - changes_made: Summary of changes applied
         - design_notes: Explanation of modifications
-        - model_used: Always gemini-3-pro-preview
+        - model_used: gemini-3-pro-preview (with use_trifecta=True and
+                      GEMINI_MODEL_ROUTING on, each agent runs on its routed
+                      Flash or Pro model)
+        - validation: Page validation report (only with validate_page=True
+                      and section markers; unchanged sections come from
+                      the section cache)
 
     Example:
         refine_frontend(
@@ -2033,8 +2153,12 @@ async def refine_frontend(
             except Exception as e:
                 logger.warning(f"JS fallback injection failed: {e}")
 
+        # Sectioned pages: revalidate only the sections the refinement changed
+        if validate_page and "html" in result and has_section_markers(result["html"]):
+            result["validation"] = await _validate_page_async(result["html"])
+
         # Auto-save design output
-        result = _auto_save_design_output(
+        result = await _auto_save_design_output_async(
             result, "refine_frontend", f"refined_{result.get('component_id', 'component')}",
             {"modifications": modifications[:100]}  # Truncate for metadata
         )
@@ -2067,6 +2191,9 @@ async def design_section(
     use_trifecta: bool = False,
     # OPTIONAL JS FALLBACKS
     inject_js_fallbacks: bool = False,
+    use_token_index: bool = True,
+    reset_token_index: bool = False,
+    ctx: Optional[Context] = None,
 ) -> dict:
     """Design a single page section that matches previous sections.
 
@@ -2078,7 +2205,9 @@ async def design_section(
 
     Chain Workflow:
     1. Design first section (e.g., hero) - no previous_html needed
-    2. Design second section with previous_html from step 1
+    2. Design second section with previous_html from step 1 (or, with
+       "Project: X" in project_context, omit it to chain from the project's
+       token index)
     3. Continue chain, each section matches the previous style
     4. Combine all sections into a complete page
 
@@ -2121,6 +2250,17 @@ async def design_section(
         project_context: Project-specific context for design consistency.
         content_language: Language code for content generation (default: "tr").
                          Supported: "tr" (Turkish), "en" (English), "de" (German).
+        use_token_index: When project_context names a project ("Project: X"),
+                        keep a token index of the project's sections: each
+                        designed section is indexed once, and later calls
+                        without previous_html get a compact token summary
+                        instead. An explicit previous_html is always sent
+                        as given and reseeds the index from it.
+                        Default: True
+        reset_token_index: Forget the project's indexed sections before this
+                          call (e.g. when starting a new page). Default: False
+        ctx: Injected by MCP. When the client requests progress, the section
+             HTML is sent as a progress notification as soon as it is complete.
 
     Returns:
         Dict containing:
@@ -2132,7 +2272,9 @@ async def design_section(
         - responsive_breakpoints: Breakpoints used
         - dark_mode_support: Whether dark mode is supported
         - design_notes: Gemini's design decisions explanation
-        - model_used: Always gemini-3-pro-preview
+        - model_used: gemini-3-pro-preview (with use_trifecta=True and
+                      GEMINI_MODEL_ROUTING on, each agent runs on its routed
+                      Flash or Pro model)
 
     Example Chain:
         # 1. Start with hero
@@ -2190,9 +2332,27 @@ async def design_section(
                 style_guide["css_variables"] = {}
             style_guide["css_variables"].update(get_vibe_css_variables(vibe))
 
+        # Project token index: chain from its summary instead of re-sending
+        # the page built so far. An explicit previous_html wins: it is sent
+        # as given and replaces whatever the index held.
+        token_index = None
+        token_summary = None
+        project_id = project_id_from_context(project_context) if use_token_index else ""
+        if project_id:
+            token_index = get_project_token_index(project_id)
+            if reset_token_index or previous_html:
+                token_index.clear()
+            if previous_html:
+                token_index.update_page(previous_html)
+            elif token_index:
+                token_summary = token_index.summary()
+
         # =================================================================
         # TRIFECTA ENGINE - Multi-Agent Pipeline Mode
         # =================================================================
+        # Streaming: report the section HTML as soon as it is complete
+        on_section = _section_progress_reporter(ctx, 1)
+
         if use_trifecta:
             logger.info(f"[Trifecta] Using SECTION pipeline for {section_type}")
             result = await run_trifecta_pipeline(
@@ -2205,6 +2365,7 @@ async def design_section(
                 previous_html=previous_html,
                 project_context=project_context,
                 content_language=content_language,
+                section_callback=on_section,
             )
         else:
             # Call the design_section method with GAP 3 error handling
@@ -2219,6 +2380,8 @@ async def design_section(
                     theme=theme,
                     project_context=project_context,
                     content_language=content_language,
+                    on_section=on_section,
+                    token_summary=token_summary,
                 ),
                 component_type=section_type,
                 response_type="section",
@@ -2246,11 +2409,20 @@ async def design_section(
             result["html"] = ensure_section_markers(result["html"], section_type)
             result["section_markers"] = True
 
+        # Index the saved section for the next call in the chain
+        if token_index is not None and result.get("html"):
+            token_index.update_section(section_type, result["html"])
+            result["token_index"] = {
+                "project_id": project_id,
+                "sections": token_index.sections,
+                "used_for_prompt": token_summary is not None,
+            }
+
         # Auto-save design output
         metadata = {"section_type": section_type, "theme": theme}
         if vibe:
             metadata["vibe"] = vibe
-        result = _auto_save_design_output(
+        result = await _auto_save_design_output_async(
             result, "design_section", f"section_{section_type}",
             metadata
         )
@@ -2344,7 +2516,9 @@ async def design_from_reference(
         - html: Generated HTML (only if extract_only=False)
         - design_notes: How the reference was interpreted
         - modifications: Changes made based on instructions
-        - model_used: Always gemini-3-pro-preview
+        - model_used: gemini-3-pro-preview (with use_trifecta=True and
+                      GEMINI_MODEL_ROUTING on, each agent runs on its routed
+                      Flash or Pro model)
 
     Examples:
         # Extract only - useful for understanding a design
@@ -2439,7 +2613,7 @@ async def design_from_reference(
 
         # Auto-save design output (only if not extract_only mode)
         if not extract_only:
-            result = _auto_save_design_output(
+            result = await _auto_save_design_output_async(
                 result, "design_from_reference", f"from_ref_{component_type or 'component'}",
                 {"reference_image": image_path, "component_type": component_type}
             )
@@ -2489,6 +2663,9 @@ async def replace_section_in_page(
     content_language: str = "tr",
     # TRIFECTA ENGINE
     use_trifecta: bool = False,
+    # OPTIONAL PAGE VALIDATION
+    validate_page: bool = False,
+    project_context: str = "",
 ) -> dict:
     """Replace a single section in an existing page with an improved version.
 
@@ -2515,6 +2692,11 @@ async def replace_section_in_page(
         preserve_design_tokens: Keep colors/typography consistent with page (default: True)
         theme: Visual style preset for the new section
         content_language: Language code for content (default: "tr")
+        validate_page: Validate the updated page and return the report
+                      (default: False)
+        project_context: When it names a project ("Project: X"), the
+                        project's design_section token index is reseeded
+                        from the updated page.
 
     Returns:
         Dict containing:
@@ -2522,6 +2704,9 @@ async def replace_section_in_page(
         - modified_section: Which section was replaced
         - preserved_sections: List of sections that were NOT modified
         - design_notes: Explanation of design decisions
+        - validation: Page validation report (only with validate_page=True);
+                      only sections that changed since the last validated
+                      version are revalidated
         - error: Error message if the operation failed
 
     Example:
@@ -2537,8 +2722,11 @@ async def replace_section_in_page(
         # Hero, Features, Pricing, Footer etc. are unchanged
     """
     try:
+        # Scan section markers once; every lookup and the final splice use it
+        page = SectionedPage(page_html)
+
         # 1. Validate page has section markers
-        if not has_section_markers(page_html):
+        if not page.names:
             return {
                 "error": "Page HTML does not contain section markers. "
                         "Section markers must be in format: <!-- SECTION: type --> ... <!-- /SECTION: type -->",
@@ -2547,7 +2735,7 @@ async def replace_section_in_page(
             }
 
         # 2. List available sections
-        available_sections = list_sections(page_html)
+        available_sections = page.names
 
         if section_type not in available_sections:
             return {
@@ -2559,13 +2747,13 @@ async def replace_section_in_page(
             }
 
         # 3. Extract current section content
-        current_section = extract_section(page_html, section_type)
+        current_section = page.extract(section_type)
 
         # 4. Extract design tokens for consistency (single-pass batch extraction)
         design_tokens = {}
         if preserve_design_tokens:
             # Extract all tokens in single pass, excluding the section we're replacing
-            all_tokens = extract_design_tokens_batch(page_html, exclude_section=section_type)
+            all_tokens = extract_design_tokens_batch(page, exclude_section=section_type)
             # Use tokens from first available section (priority order from available_sections)
             for section_name in available_sections:
                 if section_name in all_tokens and all_tokens[section_name]:
@@ -2635,7 +2823,8 @@ async def replace_section_in_page(
 
         # 8. Replace the section in the page
         try:
-            updated_page = replace_section(page_html, section_type, new_html_content)
+            page.replace(section_type, new_html_content)
+            updated_page = page.text
         except ValueError as e:
             return {
                 "error": str(e),
@@ -2643,7 +2832,19 @@ async def replace_section_in_page(
                 "modified_section": None,
             }
 
-        # 9. Return the result
+        # 9. Validate the updated page on request. Sections are cached by
+        # content hash, so in an edit session only the replaced section is
+        # revalidated.
+        validation = await _validate_page_async(updated_page) if validate_page else None
+
+        # Keep the project's token index in step with the edited page
+        project_id = project_id_from_context(project_context)
+        if project_id:
+            token_index = get_project_token_index(project_id)
+            token_index.clear()
+            token_index.update_page(updated_page)
+
+        # 10. Return the result
         preserved = [s for s in available_sections if s != section_type]
 
         result = {
@@ -2653,10 +2854,11 @@ async def replace_section_in_page(
             "design_notes": new_section_result.get("design_notes", ""),
             "design_tokens_used": design_tokens if preserve_design_tokens else None,
             "model_used": new_section_result.get("model_used", "gemini-3-pro-preview"),
+            "validation": validation,
         }
 
         # Auto-save design output
-        result = _auto_save_design_output(
+        result = await _auto_save_design_output_async(
             result, "replace_section_in_page", f"page_updated_{section_type}",
             {"modified_section": section_type, "preserved_sections": preserved}
         )
@@ -3121,16 +3323,17 @@ async def maestro_execute(
 
         # Auto-save if HTML is present
         if result.get("html"):
-            result = _auto_save_design_output(
+            result = await _auto_save_design_output_async(
                 result,
-                component_type=f"maestro_{decision.mode}",
-                project_name="maestro_output",
-                metadata={
+                "maestro_execute",
+                f"maestro_{decision.mode}",
+                {
                     "mode": decision.mode,
                     "trifecta_enabled": use_trifecta,
                     "quality_target": quality_target,
                     "confidence": decision.confidence,
                 },
+                project_name="maestro_output",
             )
 
         result["status"] = "complete"
@@ -5,15 +5,59 @@ This module handles:
 1. Automatic persistence of design artifacts (HTML, CSS, JSON) to disk.
 2. Project state tracking (manifests).
 3. Draft management for iterative workflows.
+
+Storage layout (per project directory):
+- Artifact files are written to a temp file and moved into place with
+  os.replace, so a crash never leaves a half-written draft behind.
+- manifest.jsonl is append-only: one JSON entry per saved artifact. A save
+  appends a single line instead of rewriting the whole manifest, and a torn
+  last line after a crash is skipped on load.
+- An in-memory index (entries in save order + latest entry per component)
+  answers list_drafts/get_latest_draft without re-reading the manifest.
+  The index tails manifest.jsonl by byte offset, so entries appended by
+  another process are picked up on the next query.
+- Legacy manifest.json files are imported once into manifest.jsonl.
+
+Blob storage (default on, GEMINI_DRAFT_BLOBS=0 disables):
+- Every artifact body also goes to a shared content-addressed BlobStore
+  (<root>/.blobs), compressed and stored once per unique content; manifest
+  entries reference it via "blob". Optionally a version is delta-encoded
+  against the previous version of the same component.
+- The readable file at entry["path"] is a working copy. Identical content
+  is hardlinked instead of rewritten, and RetentionPolicy.keep_files can
+  limit how many working copies per component GC keeps; older versions are
+  read back with read_artifact()/restore_artifact().
+- gc() applies the retention policy (versions per component, blob size
+  quota) and sweeps unreferenced blobs. It runs every gc_interval saves.
+- The default policy never deletes a draft: every path a tool returned
+  stays on disk and every manifest entry keeps its blob. Pruning working
+  copies (GEMINI_DRAFT_KEEP_FILES), dropping versions
+  (GEMINI_DRAFT_MAX_VERSIONS) and the blob quota (GEMINI_DRAFT_QUOTA_MB)
+  are opt-in; with them set, paths handed out by earlier saves may vanish.
+- Manifest compaction rewrites manifest.jsonl via os.replace. Appends and
+  compaction hold an flock on manifest.jsonl.lock, so another process's
+  append is never written to the replaced inode (POSIX only; elsewhere
+  run a single process per draft directory when GC drops entries).
 """
 
+import asyncio
 import os
 import json
 import logging
-from typing import Dict, Any, List, Optional
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, BinaryIO, Iterable, List, Optional
 from datetime import datetime
 from pathlib import Path
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+from .blob_store import BlobStore, atomic_write
+
+try:
+    import fcntl
+except ImportError:  # Windows: manifest locking is per-process only
+    fcntl = None
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +65,10 @@ logger = logging.getLogger(__name__)
 # Users can override this via env var GEMINI_DRAFT_DIR
 DEFAULT_DRAFT_DIR = os.environ.get("GEMINI_DRAFT_DIR", "./temp_designs")
 
+MANIFEST_FILE = "manifest.jsonl"
+LEGACY_MANIFEST_FILE = "manifest.json"
+BLOB_DIR = ".blobs"
+
 
 @dataclass
 class DesignArtifact:
@@ -33,12 +81,129 @@ class DesignArtifact:
     model_used: str
 
 
+@dataclass
+class RetentionPolicy:
+    """What draft GC keeps on disk.
+
+    Attributes:
+        keep_files: Readable working copies kept per component (blob mode,
+            0 = keep all); older versions stay readable through their blobs
+        max_versions: Manifest entries kept per component (0 = unlimited)
+        max_blob_bytes: Blob store quota; oldest non-latest versions are
+            dropped until it fits (0 = unlimited)
+        gc_interval: Saves between automatic GC runs (0 = manual only)
+        grace_seconds: Unreferenced blobs touched this recently are kept,
+            so a sweep never races a concurrent save that reused them
+        delta: Delta-encode versions against the previous version of the
+            same component
+    """
+    keep_files: int = 0
+    max_versions: int = 0
+    max_blob_bytes: int = 0
+    gc_interval: int = 50
+    grace_seconds: float = 60.0
+    delta: bool = False
+
+    @classmethod
+    def from_env(cls) -> "RetentionPolicy":
+        """Build a policy from GEMINI_DRAFT_* environment variables."""
+        return cls(
+            keep_files=int(os.getenv("GEMINI_DRAFT_KEEP_FILES", "0")),
+            max_versions=int(os.getenv("GEMINI_DRAFT_MAX_VERSIONS", "0")),
+            max_blob_bytes=int(float(os.getenv("GEMINI_DRAFT_QUOTA_MB", "0")) * 1024 * 1024),
+            gc_interval=int(os.getenv("GEMINI_DRAFT_GC_INTERVAL", "50")),
+            delta=os.getenv("GEMINI_DRAFT_DELTA", "").lower() in ("1", "true", "yes"),
+        )
+
+
+@contextmanager
+def _manifest_file_lock(manifest_path: Path):
+    """Exclusive cross-process lock for appending to / rewriting a manifest."""
+    if fcntl is None:
+        yield
+        return
+    fd = os.open(manifest_path.with_name(manifest_path.name + ".lock"), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)
+
+
+@dataclass
+class _ProjectIndex:
+    """In-memory view of one project's manifest.jsonl."""
+    manifest_path: Path
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    entries: List[Dict] = field(default_factory=list)
+    latest: Dict[str, Dict] = field(default_factory=dict)
+    latest_by_type: Dict[tuple, Dict] = field(default_factory=dict)
+    by_blob: Dict[str, Dict] = field(default_factory=dict)
+    ids: set = field(default_factory=set)
+    offset: int = 0
+    inode: int = 0
+
+    def add(self, entry: Dict) -> None:
+        self.entries.append(entry)
+        self.ids.add(entry.get("id", ""))
+        self.latest[entry.get("component_type", "")] = entry
+        self.latest_by_type[(entry.get("component_type", ""), entry.get("type", ""))] = entry
+        if entry.get("blob"):
+            self.by_blob[entry["blob"]] = entry
+
+    def refresh(self) -> None:
+        """Read entries appended since the last refresh (caller holds lock)."""
+        try:
+            stat = self.manifest_path.stat()
+        except FileNotFoundError:
+            return
+        if stat.st_ino != self.inode or stat.st_size < self.offset:
+            # Replaced by a GC compaction (here or in another process)
+            self.entries, self.latest, self.latest_by_type, self.by_blob = [], {}, {}, {}
+            self.offset, self.inode = 0, stat.st_ino
+        if stat.st_size <= self.offset:
+            return
+        with open(self.manifest_path, "rb") as f:
+            f.seek(self.offset)
+            chunk = f.read(stat.st_size - self.offset)
+        # Only consume complete lines; a partial trailing line is either
+        # still being written by another process or torn by a crash.
+        end = chunk.rfind(b"\n") + 1
+        for line in chunk[:end].splitlines():
+            if not line.strip():
+                continue
+            try:
+                self.add(json.loads(line))
+            except ValueError:
+                logger.warning(f"Skipping corrupt manifest line in {self.manifest_path}")
+        self.offset += end
+
+
+def _atomic_write(path: Path, data: str) -> None:
+    """Write text to path via a temp file in the same directory and os.replace."""
+    atomic_write(path, data)
+
+
 class DraftManager:
     """Manages separate draft files for generated designs."""
 
-    def __init__(self, root_dir: str = DEFAULT_DRAFT_DIR):
+    def __init__(
+        self,
+        root_dir: str = DEFAULT_DRAFT_DIR,
+        use_blobs: Optional[bool] = None,
+        policy: Optional[RetentionPolicy] = None,
+    ):
         self.root = Path(root_dir).resolve()
         self._ensure_root()
+        self._indexes: Dict[str, _ProjectIndex] = {}
+        self._indexes_lock = threading.Lock()
+
+        if use_blobs is None:
+            use_blobs = os.getenv("GEMINI_DRAFT_BLOBS", "1").lower() not in ("0", "false", "no")
+        self.blobs: Optional[BlobStore] = BlobStore(self.root / BLOB_DIR) if use_blobs else None
+        self.policy = policy or RetentionPolicy.from_env()
+        self._gc_lock = threading.Lock()
+        self._saves_since_gc = 0
         logger.info(f"DraftManager initialized at {self.root}")
 
     def _ensure_root(self):
@@ -51,6 +216,77 @@ class DraftManager:
         project_dir.mkdir(parents=True, exist_ok=True)
         return project_dir
 
+    def _project_names(self) -> List[str]:
+        """Projects on disk that have a manifest."""
+        return sorted(
+            p.name for p in self.root.iterdir()
+            if p.is_dir() and not p.name.startswith(".")
+            and ((p / MANIFEST_FILE).exists() or (p / LEGACY_MANIFEST_FILE).exists())
+        )
+
+    def _get_index(self, project_name: str) -> _ProjectIndex:
+        """Get the project's index, loading (and migrating) it on first use."""
+        index = self._indexes.get(project_name)
+        if index is not None:
+            return index
+
+        with self._indexes_lock:
+            index = self._indexes.get(project_name)
+            if index is None:
+                project_dir = self._get_project_dir(project_name)
+                index = _ProjectIndex(manifest_path=project_dir / MANIFEST_FILE)
+                with index.lock:
+                    self._migrate_legacy_manifest(project_dir)
+                    index.refresh()
+                self._indexes[project_name] = index
+        return index
+
+    def _migrate_legacy_manifest(self, project_dir: Path) -> None:
+        """Import a pre-JSONL manifest.json into manifest.jsonl (once)."""
+        legacy_path = project_dir / LEGACY_MANIFEST_FILE
+        manifest_path = project_dir / MANIFEST_FILE
+        if manifest_path.exists() or not legacy_path.exists():
+            return
+        try:
+            with open(legacy_path, "r", encoding="utf-8") as f:
+                artifacts = json.load(f).get("artifacts", [])
+        except Exception:
+            logger.warning(f"Corrupt legacy manifest at {legacy_path}, skipping import.")
+            return
+
+        # Legacy entries were unordered appends; sort once so save order holds
+        artifacts.sort(key=lambda x: x.get("created_at", ""))
+        lines = "".join(json.dumps(a, ensure_ascii=False) + "\n" for a in artifacts)
+        _atomic_write(manifest_path, lines)
+        logger.info(f"Imported {len(artifacts)} artifacts from {legacy_path}")
+
+    def _reserve_id(self, index: _ProjectIndex, project_dir: Path, base_id: str, extension: str) -> str:
+        """Pick an artifact id whose file name is free (caller holds lock).
+
+        Two saves of the same component within one second used to overwrite
+        each other; later ones now get a numeric suffix.
+        """
+        artifact_id = base_id
+        counter = 1
+        while artifact_id in index.ids or (project_dir / f"{artifact_id}.{extension}").exists():
+            counter += 1
+            artifact_id = f"{base_id}_{counter}"
+        index.ids.add(artifact_id)
+        return artifact_id
+
+    @staticmethod
+    def _serialize(content: Any, extension: str) -> str:
+        """Render content as the text stored on disk."""
+        if extension == "json" or isinstance(content, (dict, list)):
+            # If content is string but ext is json, try to parse first to pretty print
+            if isinstance(content, str):
+                try:
+                    content = json.loads(content)
+                except ValueError:
+                    pass
+            return json.dumps(content, indent=2, ensure_ascii=False)
+        return str(content)
+
     def save_artifact(
         self,
         content: Any,
@@ -62,110 +298,441 @@ class DraftManager:
         """
         Save a design artifact to disk.
         Returns the absolute path to the saved file.
+
+        Blocking; use save_artifact_async from coroutines.
         """
         project_dir = self._get_project_dir(project_name)
+        index = self._get_index(project_name)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
+
         # Create a unique filename
         # e.g., 20251223_143000_hero_v1.html
-        filename = f"{timestamp}_{component_type}.{extension}"
+        with index.lock:
+            artifact_id = self._reserve_id(index, project_dir, f"{timestamp}_{component_type}", extension)
+            previous = index.latest.get(component_type)
+        filename = f"{artifact_id}.{extension}"
         file_path = project_dir / filename
 
         # Write content
         try:
-            if extension == "json" or isinstance(content, (dict, list)):
-                with open(file_path, "w", encoding="utf-8") as f:
-                    # If content is string but ext is json, try to parse first to pretty print
-                    if isinstance(content, str):
-                        try:
-                            content = json.loads(content)
-                        except:
-                            pass
-                    json.dump(content, f, indent=2, ensure_ascii=False)
-            else:
-                with open(file_path, "w", encoding="utf-8") as f:
-                    f.write(str(content))
-            
-            # If metadata provided, save sidecar file
-            if metadata:
-                meta_path = file_path.with_suffix(".meta.json")
-                with open(meta_path, "w", encoding="utf-8") as f:
-                    # Enforce timestamp in metadata
-                    metadata["saved_at"] = timestamp
-                    metadata["original_file"] = str(file_path)
-                    json.dump(metadata, f, indent=2, ensure_ascii=False)
-
-            logger.info(f"Saved artifact: {file_path}")
-            
-            # Update project manifest
-            self._update_manifest(project_name, {
-                "id": f"{timestamp}_{component_type}",
+            text = self._serialize(content, extension)
+            entry = {
+                "id": artifact_id,
                 "type": extension,
                 "path": str(file_path),
                 "created_at": timestamp,
                 "component_type": component_type,
                 "model_used": metadata.get("model_used", "unknown") if metadata else "unknown"
-            })
+            }
 
-            return str(file_path)
+            if self.blobs is not None:
+                data = text.encode("utf-8")
+                base = None
+                if self.policy.delta and previous and previous.get("type") == extension:
+                    base = previous.get("blob")
+                blob = self.blobs.put(data, base=base)
+                entry["blob"] = blob.digest
+                entry["size"] = blob.size
+                # The blob is the durable copy; the working copy only needs
+                # to be atomic, and identical content is hardlinked.
+                self._write_working_copy(index, file_path, text, blob.digest)
+            else:
+                _atomic_write(file_path, text)
+
+            return self._finish_save(project_name, entry, file_path, timestamp, metadata)
 
         except Exception as e:
             logger.error(f"Failed to save artifact {filename}: {e}")
             return ""
 
-    def _update_manifest(self, project_name: str, artifact_info: Dict):
-        """Update the project's manifest.json file."""
+    def save_artifact_stream(
+        self,
+        chunks: Iterable[str],
+        extension: str,
+        project_name: str = "default",
+        component_type: str = "unknown",
+        metadata: Optional[Dict] = None
+    ) -> str:
+        """Save an artifact produced piece by piece, without joining it in memory.
+
+        Chunks are written straight to a temp file (and, in blob mode, to a
+        streaming blob writer) and moved into place when the iterator ends.
+        Returns the absolute path to the saved file ("" on error).
+        """
         project_dir = self._get_project_dir(project_name)
-        manifest_path = project_dir / "manifest.json"
+        index = self._get_index(project_name)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        with index.lock:
+            artifact_id = self._reserve_id(index, project_dir, f"{timestamp}_{component_type}", extension)
+        file_path = project_dir / f"{artifact_id}.{extension}"
+        tmp_path = file_path.with_name(f".{file_path.name}.tmp")
+        blob_writer = self.blobs.writer() if self.blobs is not None else None
+
+        try:
+            size = 0
+            with open(tmp_path, "wb") as f:
+                for chunk in chunks:
+                    data = chunk.encode("utf-8")
+                    f.write(data)
+                    if blob_writer is not None:
+                        blob_writer.write(data)
+                    size += len(data)
+                if blob_writer is None:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp_path, file_path)
+
+            entry = {
+                "id": artifact_id,
+                "type": extension,
+                "path": str(file_path),
+                "created_at": timestamp,
+                "component_type": component_type,
+                "model_used": metadata.get("model_used", "unknown") if metadata else "unknown"
+            }
+            if blob_writer is not None:
+                blob = blob_writer.close()
+                blob_writer = None
+                entry["blob"] = blob.digest
+                entry["size"] = size
+            return self._finish_save(project_name, entry, file_path, timestamp, metadata)
+
+        except Exception as e:
+            logger.error(f"Failed to save artifact {file_path.name}: {e}")
+            tmp_path.unlink(missing_ok=True)
+            if blob_writer is not None:
+                blob_writer.abort()
+            return ""
 
-        manifest = {"project": project_name, "artifacts": [], "last_updated": ""}
-        
-        if manifest_path.exists():
+    def _finish_save(
+        self, project_name: str, entry: Dict, file_path: Path, timestamp: str, metadata: Optional[Dict]
+    ) -> str:
+        """Write the metadata sidecar, append the manifest entry, maybe GC."""
+        # If metadata provided, save sidecar file
+        if metadata:
+            meta_path = file_path.with_suffix(".meta.json")
+            # Enforce timestamp in metadata
+            metadata["saved_at"] = timestamp
+            metadata["original_file"] = str(file_path)
+            _atomic_write(meta_path, json.dumps(metadata, indent=2, ensure_ascii=False))
+
+        logger.info(f"Saved artifact: {file_path}")
+
+        # Update project manifest
+        self._update_manifest(project_name, entry)
+        self._maybe_gc()
+
+        return str(file_path)
+
+    def _write_working_copy(self, index: _ProjectIndex, file_path: Path, text: str, digest: str) -> None:
+        """Write the readable copy, hardlinking an identical earlier one."""
+        with index.lock:
+            same = index.by_blob.get(digest)
+        if same:
             try:
-                with open(manifest_path, "r", encoding="utf-8") as f:
-                    manifest = json.load(f)
-            except Exception:
-                logger.warning(f"Corrupt manifest at {manifest_path}, creating new one.")
+                os.link(same["path"], file_path)
+                return
+            except OSError:
+                pass  # Pruned, cross-device or unsupported: write instead
+        atomic_write(file_path, text, durable=False)
 
-        # Add new artifact
-        manifest["artifacts"].append(artifact_info)
-        manifest["last_updated"] = datetime.now().isoformat()
+    async def save_artifact_async(
+        self,
+        content: Any,
+        extension: str,
+        project_name: str = "default",
+        component_type: str = "unknown",
+        metadata: Optional[Dict] = None
+    ) -> str:
+        """Async save_artifact: the file writes run in a worker thread."""
+        return await asyncio.to_thread(
+            self.save_artifact, content, extension, project_name, component_type, metadata
+        )
 
-        # Write back
-        with open(manifest_path, "w", encoding="utf-8") as f:
-            json.dump(manifest, f, indent=2, ensure_ascii=False)
+    def _update_manifest(self, project_name: str, artifact_info: Dict):
+        """Append one entry to the project's manifest.jsonl and index it."""
+        index = self._get_index(project_name)
+        line = (json.dumps(artifact_info, ensure_ascii=False) + "\n").encode("utf-8")
+
+        with index.lock, _manifest_file_lock(index.manifest_path):
+            # One O_APPEND write per entry: concurrent writers (threads or
+            # processes) never interleave inside a line. The file lock keeps
+            # the append off an inode that _compact is about to replace.
+            fd = os.open(index.manifest_path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                # A crash mid-append leaves a torn last line; terminate it so
+                # this entry starts on its own line (the fragment is skipped).
+                size = os.fstat(fd).st_size
+                if size and os.pread(fd, 1, size - 1) != b"\n":
+                    line = b"\n" + line
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+            index.refresh()
 
     def list_drafts(self, project_name: str = "default") -> List[Dict]:
-        """List all drafts for a project."""
-        project_dir = self._get_project_dir(project_name)
-        manifest_path = project_dir / "manifest.json"
-        
-        if not manifest_path.exists():
-            return []
-            
-        try:
-            with open(manifest_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                return data.get("artifacts", [])
-        except Exception:
-            return []
+        """List all drafts for a project, oldest first."""
+        index = self._get_index(project_name)
+        with index.lock:
+            index.refresh()
+            return list(index.entries)
 
     def get_latest_draft(self, project_name: str = "default", component_type: str = "") -> Optional[Dict]:
         """Get the most recent draft for a specific component."""
-        drafts = self.list_drafts(project_name)
-        if not drafts:
-            return None
-            
-        # Filter by component if requested
-        if component_type:
-            drafts = [d for d in drafts if d.get("component_type") == component_type]
-            
-        if not drafts:
-            return None
-            
-        # Sort by creation time (descending)
-        drafts.sort(key=lambda x: x.get("created_at", ""), reverse=True)
-        return drafts[0]
+        index = self._get_index(project_name)
+        with index.lock:
+            index.refresh()
+            if component_type:
+                return index.latest.get(component_type)
+            return index.entries[-1] if index.entries else None
+
+    def latest_by_component(self, project_name: str = "default", extension: str = "html") -> Dict[str, Dict]:
+        """Latest draft of the given type for each component.
+
+        Components are ordered by their first draft of that type.
+        """
+        index = self._get_index(project_name)
+        with index.lock:
+            index.refresh()
+            return {
+                component: entry
+                for (component, ext), entry in index.latest_by_type.items()
+                if ext == extension
+            }
+
+    # =========================================================================
+    # Blob-backed reads
+    # =========================================================================
+
+    def open_artifact(self, entry: Dict) -> Optional[BinaryIO]:
+        """Open a draft for streaming binary reads (working copy, else blob)."""
+        try:
+            return open(entry.get("path", ""), "rb")
+        except OSError:
+            pass
+        if self.blobs is not None and entry.get("blob"):
+            try:
+                return self.blobs.open(entry["blob"])
+            except (OSError, ValueError) as e:
+                logger.warning(f"Blob for {entry.get('id')} unreadable: {e}")
+        return None
+
+    def read_artifact(self, entry: Dict) -> Optional[str]:
+        """Return a draft's content from its working copy or its blob."""
+        path = Path(entry.get("path", ""))
+        try:
+            return path.read_text(encoding="utf-8")
+        except OSError:
+            pass
+        if self.blobs is not None and entry.get("blob"):
+            try:
+                return self.blobs.get(entry["blob"]).decode("utf-8")
+            except (OSError, ValueError) as e:
+                logger.warning(f"Blob for {entry.get('id')} unreadable: {e}")
+        return None
+
+    def restore_artifact(self, entry: Dict) -> str:
+        """Re-create a pruned working copy from its blob; returns the path ("" if lost)."""
+        path = Path(entry.get("path", ""))
+        if path.exists():
+            return str(path)
+        content = self.read_artifact(entry)
+        if content is None:
+            return ""
+        atomic_write(path, content, durable=False)
+        return str(path)
+
+    # =========================================================================
+    # Retention / GC
+    # =========================================================================
+
+    def _maybe_gc(self) -> None:
+        """Run gc() every policy.gc_interval saves."""
+        if not self.policy.gc_interval:
+            return
+        with self._gc_lock:
+            self._saves_since_gc += 1
+            if self._saves_since_gc < self.policy.gc_interval:
+                return
+            self._saves_since_gc = 0
+        try:
+            self.gc()
+        except Exception as e:
+            logger.warning(f"Draft GC failed: {e}")
+
+    def gc(self, project_name: Optional[str] = None) -> Dict[str, int]:
+        """Apply the retention policy and sweep unreferenced blobs.
+
+        Args:
+            project_name: Limit version/working-copy retention to one
+                project (the blob sweep and quota always span all projects,
+                since blobs are shared)
+
+        Returns:
+            Counts: dropped_entries, pruned_files, deleted_blobs, blob_bytes
+        """
+        started = time.time()
+        stats = {"dropped_entries": 0, "pruned_files": 0, "deleted_blobs": 0, "blob_bytes": 0}
+
+        with self._gc_lock:
+            for name in ([project_name] if project_name else self._project_names()):
+                self._apply_retention(name, stats)
+
+            if self.blobs is None:
+                return stats
+
+            blob_bytes = self._sweep_blobs(started, stats)
+            quota = self.policy.max_blob_bytes
+            while quota and blob_bytes > quota:
+                candidates = self._quota_candidates()
+                if not candidates:
+                    break
+                batch = candidates[:max(1, len(candidates) // 10)]
+                for name in {name for name, _ in batch}:
+                    ids = {entry["id"] for n, entry in batch if n == name}
+                    self._compact(name, lambda entry: entry.get("id") not in ids, stats)
+                freed_from = blob_bytes
+                blob_bytes = self._sweep_blobs(started, stats)
+                if blob_bytes >= freed_from:
+                    break  # Remaining blobs are within the grace period
+            stats["blob_bytes"] = blob_bytes
+
+        if any(stats[k] for k in ("dropped_entries", "pruned_files", "deleted_blobs")):
+            logger.info(f"Draft GC: {stats}")
+        return stats
+
+    def _apply_retention(self, project_name: str, stats: Dict[str, int]) -> None:
+        """Drop versions beyond max_versions and prune old working copies."""
+        index = self._get_index(project_name)
+        with index.lock:
+            index.refresh()
+            groups: Dict[tuple, List[Dict]] = {}
+            for entry in index.entries:
+                groups.setdefault((entry.get("component_type"), entry.get("type")), []).append(entry)
+
+        keep_ids = set()
+        for entries in groups.values():
+            kept = entries[-self.policy.max_versions:] if self.policy.max_versions else entries
+            keep_ids.update(entry.get("id") for entry in kept)
+            if self.blobs is None:
+                continue
+            # Older versions stay readable from their blobs
+            stale = kept[:-self.policy.keep_files] if self.policy.keep_files else []
+            for entry in stale:
+                path = Path(entry.get("path", ""))
+                if entry.get("blob") and path.exists():
+                    path.unlink(missing_ok=True)
+                    stats["pruned_files"] += 1
+
+        if len(keep_ids) < len(index.entries):
+            self._compact(project_name, lambda entry: entry.get("id") in keep_ids, stats)
+
+    def _compact(self, project_name: str, keep, stats: Dict[str, int]) -> None:
+        """Rewrite the project's manifest with only the entries keep() accepts.
+
+        Holds the manifest file lock across re-read and rewrite, so an entry
+        another process appends meanwhile is either included or waits.
+        """
+        index = self._get_index(project_name)
+        with index.lock, _manifest_file_lock(index.manifest_path):
+            index.refresh()
+            kept = [entry for entry in index.entries if keep(entry)]
+            dropped = [entry for entry in index.entries if not keep(entry)]
+            if not dropped:
+                return
+            atomic_write(
+                index.manifest_path,
+                "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in kept),
+            )
+            index.refresh()
+
+        for entry in dropped:
+            path = Path(entry.get("path", ""))
+            path.unlink(missing_ok=True)
+            path.with_suffix(".meta.json").unlink(missing_ok=True)
+        stats["dropped_entries"] += len(dropped)
+
+    def _quota_candidates(self) -> List[tuple]:
+        """(project, entry) pairs that may be dropped for the quota, oldest first.
+
+        The latest version of each component is never a candidate.
+        """
+        candidates = []
+        for name in self._project_names():
+            index = self._get_index(name)
+            with index.lock:
+                index.refresh()
+                latest_ids = {id(entry) for entry in index.latest.values()}
+                candidates.extend(
+                    (name, entry) for entry in index.entries
+                    if entry.get("blob") and id(entry) not in latest_ids
+                )
+        candidates.sort(key=lambda pair: pair[1].get("created_at", ""))
+        return candidates
+
+    def _sweep_blobs(self, started: float, stats: Dict[str, int]) -> int:
+        """Delete unreferenced blobs older than the grace period.
+
+        Returns:
+            Bytes used by the remaining blobs
+        """
+        live = set()
+        for name in self._project_names():
+            index = self._get_index(name)
+            with index.lock:
+                index.refresh()
+                live.update(entry["blob"] for entry in index.entries if entry.get("blob"))
+
+        # Delta bases of live blobs are live too
+        pending = list(live)
+        while pending:
+            try:
+                base = self.blobs.read_header(pending.pop())[3]
+            except (OSError, ValueError):
+                continue
+            if base and base not in live:
+                live.add(base)
+                pending.append(base)
+
+        cutoff = started - self.policy.grace_seconds
+        remaining = 0
+        for digest, stat in list(self.blobs.iter_blobs()):
+            if digest not in live and stat.st_mtime < cutoff:
+                self.blobs.delete(digest)
+                stats["deleted_blobs"] += 1
+            else:
+                remaining += stat.st_size
+        return remaining
+
+    def get_storage_stats(self) -> Dict[str, Any]:
+        """Disk usage summary for the draft store."""
+        stats: Dict[str, Any] = {
+            "projects": 0,
+            "entries": 0,
+            "logical_bytes": 0,
+            "working_copy_bytes": 0,
+            "blob_bytes": 0,
+            "blobs": 0,
+            "codec": self.blobs.codec if self.blobs else None,
+        }
+        seen_inodes = set()
+        for name in self._project_names():
+            stats["projects"] += 1
+            for entry in self.list_drafts(name):
+                stats["entries"] += 1
+                stats["logical_bytes"] += entry.get("size", 0)
+                try:
+                    st = os.stat(entry.get("path", ""))
+                except OSError:
+                    continue
+                if (st.st_dev, st.st_ino) not in seen_inodes:
+                    seen_inodes.add((st.st_dev, st.st_ino))
+                    stats["working_copy_bytes"] += st.st_size
+        if self.blobs is not None:
+            for _, stat in self.blobs.iter_blobs():
+                stats["blobs"] += 1
+                stats["blob_bytes"] += stat.st_size
+        return stats
 
 # Global instance
 draft_manager = DraftManager()
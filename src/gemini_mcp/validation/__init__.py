@@ -12,6 +12,18 @@ Key Validators:
 - ProfessionalValidator: Validates against corporate/professional standards
 - AntiPatternValidator: Enterprise anti-pattern detection with auto-fix
 
+Shared Parse:
+- ParsedDocument: Single-pass HTML index (elements, ids, classes, lines, sections)
+  built once per HTML output and passed to every validator
+
+HTML Skeleton:
+- skeletonize_html / expand_skeleton: Compact, structure-reversible form
+  (tag tree, ids, class dictionary, data-*, sections) for agent context
+
+Incremental Validation:
+- IncrementalValidator: Per-section result cache for section edits; only
+  changed sections are revalidated, page-level checks come from the indexes
+
 Shared Types:
 - ValidationSeverity: ERROR, WARNING, INFO
 - ValidationIssue: Single validation issue
@@ -39,6 +51,18 @@ from gemini_mcp.validation.utils import (
     extract_color_pairs,
 )
 
+from gemini_mcp.validation.document import (
+    ParsedDocument,
+    Element,
+    SectionSpan,
+    parse_document,
+)
+from gemini_mcp.validation.skeleton import (
+    SKELETON_LEGEND,
+    HTMLSkeleton,
+    expand_skeleton,
+    skeletonize_html,
+)
 from gemini_mcp.validation.html_validator import HTMLValidator
 from gemini_mcp.validation.css_validator import CSSValidator
 from gemini_mcp.validation.js_validator import JSValidator
@@ -91,12 +115,29 @@ from gemini_mcp.validation.anti_pattern_validator import (
     STYLING_ANTIPATTERNS,
     ALPINE_ANTIPATTERNS,
 )
+from gemini_mcp.validation.incremental import (
+    IncrementalValidator,
+    PageValidationReport,
+    SectionValidation,
+    get_incremental_validator,
+    reset_incremental_validator,
+)
 
 __all__ = [
     # Shared Types
     "ValidationSeverity",
     "ValidationIssue",
     "ValidationResult",
+    # Shared Parse
+    "ParsedDocument",
+    "Element",
+    "SectionSpan",
+    "parse_document",
+    # HTML Skeleton
+    "SKELETON_LEGEND",
+    "HTMLSkeleton",
+    "expand_skeleton",
+    "skeletonize_html",
     # Core Validators
     "HTMLValidator",
     "CSSValidator",
@@ -145,4 +186,10 @@ __all__ = [
     "PERFORMANCE_ANTIPATTERNS",
     "STYLING_ANTIPATTERNS",
     "ALPINE_ANTIPATTERNS",
+    # Incremental Validation (section edits)
+    "IncrementalValidator",
+    "PageValidationReport",
+    "SectionValidation",
+    "get_incremental_validator",
+    "reset_incremental_validator",
 ]
@@ -14,8 +14,14 @@ from __future__ import annotations
 import re
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Optional
+from typing import Iterator, Optional
 
+from gemini_mcp.validation.document import ParsedDocument, build_line_offsets, line_at
+
+try:  # Python 3.11+
+    from re import _parser as _sre_parse
+except ImportError:  # pragma: no cover - Python 3.10
+    import sre_parse as _sre_parse
 from gemini_mcp.validation.types import (
     ValidationSeverity,
     ValidationIssue,
@@ -348,6 +354,153 @@ ALL_ANTIPATTERNS = (
 )
 
 
+# === COMPILED RULE ENGINE ===
+
+# Flags every anti-pattern regex is matched with
+PATTERN_FLAGS = re.IGNORECASE | re.DOTALL
+
+
+def _leading_literals(items) -> Optional[set[str]]:
+    """
+    Literal strings one of which every match must start with.
+
+    Walks the parsed regex: consecutive literals form a prefix; a leading
+    group, mandatory repeat or alternation contributes its own prefixes.
+    Anything else (character classes, lookarounds, optional parts) makes
+    the answer unknown (None), so the rule is never prefiltered.
+    """
+    prefix = ""
+    for op, av in items:
+        if op is _sre_parse.LITERAL:
+            prefix += chr(av)
+            continue
+        if op is _sre_parse.AT:
+            continue  # Zero-width anchors (\b, ^) do not consume text
+        if prefix:
+            break
+        if op is _sre_parse.SUBPATTERN:
+            return _leading_literals(av[-1])
+        if op in (_sre_parse.MAX_REPEAT, _sre_parse.MIN_REPEAT) and av[0] >= 1:
+            return _leading_literals(av[2])
+        if op is _sre_parse.BRANCH:
+            literals: set[str] = set()
+            for branch in av[1]:
+                branch_literals = _leading_literals(branch)
+                if not branch_literals:
+                    return None
+                literals |= branch_literals
+            return literals
+        return None
+    return {prefix} if prefix else None
+
+
+def required_literals(pattern: str) -> Optional[frozenset[str]]:
+    """
+    Lowercase literals at least one of which occurs in any matching text.
+
+    Args:
+        pattern: Regex source (matched with PATTERN_FLAGS)
+
+    Returns:
+        Literal set, or None if no safe prefilter could be derived
+    """
+    try:
+        literals = _leading_literals(_sre_parse.parse(pattern, PATTERN_FLAGS))
+    except re.error:
+        return None
+    if not literals:
+        return None
+    return frozenset(literal.lower() for literal in literals)
+
+
+@dataclass
+class CompiledAntiPattern:
+    """
+    An AntiPattern with its regexes compiled once.
+
+    Attributes:
+        pattern: Source definition
+        regex: Compiled detection regex
+        fix_regex: Compiled auto-fix regex (if auto_fixable)
+        literals: Prefilter literals (lowercase); None = always run
+    """
+    pattern: AntiPattern
+    regex: re.Pattern
+    fix_regex: Optional[re.Pattern] = None
+    literals: Optional[frozenset[str]] = None
+
+
+# (pattern, fix_pattern) → compiled rule; shared by every validator instance
+_compiled_rules: dict[tuple[str, Optional[str]], Optional[CompiledAntiPattern]] = {}
+
+
+def compile_antipattern(pattern: AntiPattern) -> Optional[CompiledAntiPattern]:
+    """
+    Compile (and cache) one anti-pattern.
+
+    Returns:
+        CompiledAntiPattern, or None if the detection regex is invalid
+    """
+    key = (pattern.pattern, pattern.fix_pattern)
+    if key not in _compiled_rules:
+        try:
+            regex = re.compile(pattern.pattern, PATTERN_FLAGS)
+        except re.error:
+            _compiled_rules[key] = None
+            return None
+        fix_regex = None
+        if pattern.auto_fixable and pattern.fix_pattern:
+            try:
+                fix_regex = re.compile(pattern.fix_pattern, PATTERN_FLAGS)
+            except re.error:
+                fix_regex = None
+        _compiled_rules[key] = CompiledAntiPattern(
+            pattern=pattern,
+            regex=regex,
+            fix_regex=fix_regex,
+            literals=required_literals(pattern.pattern),
+        )
+    rule = _compiled_rules[key]
+    if rule is not None and rule.pattern is not pattern:
+        # Same regexes, different metadata (message, severity...)
+        rule = CompiledAntiPattern(pattern, rule.regex, rule.fix_regex, rule.literals)
+    return rule
+
+
+class AntiPatternEngine:
+    """
+    Runs a fixed set of compiled anti-patterns over content.
+
+    Before any regex runs, one pass over a lowercased copy of the content
+    checks which prefilter literals occur at all (deduplicated across
+    rules); rules whose literals are all absent are skipped.
+    """
+
+    def __init__(self, patterns: list[AntiPattern]):
+        self.rules = [
+            rule for rule in (compile_antipattern(p) for p in patterns)
+            if rule is not None
+        ]
+        self.literals = frozenset(
+            literal for rule in self.rules if rule.literals for literal in rule.literals
+        )
+
+    def candidates(self, content: str) -> list[CompiledAntiPattern]:
+        """Rules that can possibly match the content."""
+        lowered = content.lower()
+        present = {literal for literal in self.literals if literal in lowered}
+        return [
+            rule for rule in self.rules
+            if rule.literals is None or not rule.literals.isdisjoint(present)
+        ]
+
+    def scan(self, content: str) -> Iterator[tuple[CompiledAntiPattern, re.Match]]:
+        """Yield (rule, match) for every match, rule by rule."""
+        for rule in self.candidates(content):
+            for match in rule.regex.finditer(content):
+                yield rule, match
+
+
 class AntiPatternValidator:
     """
     Validator for detecting enterprise anti-patterns in HTML/CSS/JS.
@@ -381,48 +534,62 @@ class AntiPatternValidator:
             if p.category in self.categories
         ]
 
-    def validate(self, content: str, content_type: str = "html") -> ValidationResult:
+        # Compiled engine over the patterns at or above the threshold
+        threshold = ValidationSeverity.get_order(self.severity_threshold)
+        self._engine = AntiPatternEngine([
+            p for p in self.patterns
+            if ValidationSeverity.get_order(p.severity) >= threshold
+        ])
+        self._fix_rules = [
+            rule for rule in (compile_antipattern(p) for p in self.patterns)
+            if rule is not None and rule.fix_regex is not None and rule.pattern.fix_replacement
+        ]
+
+    def validate(
+        self,
+        content: str,
+        content_type: str = "html",
+        document: Optional[ParsedDocument] = None,
+    ) -> ValidationResult:
         """
         Validate content for anti-patterns.
 
         Args:
             content: HTML/CSS/JS content to validate
             content_type: Type of content ("html", "css", "js")
+            document: Shared parse of ``content``; its line offsets are
+                used for line numbers (ignored if it is for other content)
 
         Returns:
             ValidationResult with all detected anti-patterns
         """
         issues: list[ValidationIssue] = []
-
-        for pattern in self.patterns:
-            # Skip if below severity threshold
-            if ValidationSeverity.get_order(pattern.severity) < ValidationSeverity.get_order(self.severity_threshold):
-                continue
-
-            # Find all matches
-            try:
-                matches = list(re.finditer(pattern.pattern, content, re.IGNORECASE | re.DOTALL))
-            except re.error:
-                continue
-
-            for match in matches:
-                # Calculate line number
-                line_num = content[:match.start()].count('\n') + 1
-
-                # Get context snippet
-                start = max(0, match.start() - 20)
-                end = min(len(content), match.end() + 20)
-                location = content[start:end].replace('\n', ' ')
-
-                issues.append(ValidationIssue(
-                    severity=pattern.severity,
-                    message=pattern.message,
-                    line=line_num,
-                    suggestion=pattern.suggestion,
-                    location=f"...{location}...",
-                    rule=f"{pattern.category.value}/{pattern.name}",
-                    auto_fixable=pattern.auto_fixable,
-                ))
+        line_offsets: Optional[list[int]] = None
+        if document is not None and document.html == content:
+            line_offsets = document.line_offsets
+
+        for rule, match in self._engine.scan(content):
+            pattern = rule.pattern
+
+            # Calculate line number (newline index built on first match)
+            if line_offsets is None:
+                line_offsets = build_line_offsets(content)
+            line_num = line_at(line_offsets, match.start())
+
+            # Get context snippet
+            start = max(0, match.start() - 20)
+            end = min(len(content), match.end() + 20)
+            location = content[start:end].replace('\n', ' ')
+
+            issues.append(ValidationIssue(
+                severity=pattern.severity,
+                message=pattern.message,
+                line=line_num,
+                suggestion=pattern.suggestion,
+                location=f"...{location}...",
+                rule=f"{pattern.category.value}/{pattern.name}",
+                auto_fixable=pattern.auto_fixable,
+            ))
 
         # Determine validity (no critical or errors = valid)
         has_blockers = any(
@@ -435,12 +602,17 @@ class AntiPatternValidator:
             issues=issues,
         )
 
-    def validate_and_fix(self, content: str) -> tuple[str, ValidationResult]:
+    def validate_and_fix(
+        self,
+        content: str,
+        document: Optional[ParsedDocument] = None,
+    ) -> tuple[str, ValidationResult]:
         """
         Validate and auto-fix content where possible.
 
         Args:
             content: HTML/CSS/JS content to validate and fix
+            document: Shared parse of ``content`` (reused if nothing was fixed)
 
         Returns:
             Tuple of (fixed_content, validation_result)
@@ -448,33 +620,28 @@ class AntiPatternValidator:
         fixed_content = content
         fixed_issues: list[ValidationIssue] = []
 
-        for pattern in self.patterns:
-            if not pattern.auto_fixable or not pattern.fix_pattern or not pattern.fix_replacement:
-                continue
-
+        for rule in self._fix_rules:
+            pattern = rule.pattern
             try:
-                # Apply fix
-                new_content = re.sub(
-                    pattern.fix_pattern,
-                    pattern.fix_replacement,
-                    fixed_content,
-                    flags=re.IGNORECASE | re.DOTALL,
-                )
-
-                if new_content != fixed_content:
-                    fixed_issues.append(ValidationIssue(
-                        severity=ValidationSeverity.INFO,
-                        message=f"Auto-fixed: {pattern.message}",
-                        suggestion=f"Applied: {pattern.suggestion}",
-                        rule=f"{pattern.category.value}/{pattern.name}",
-                        auto_fixable=True,
-                    ))
-                    fixed_content = new_content
+                new_content = rule.fix_regex.sub(pattern.fix_replacement, fixed_content)
             except re.error:
                 continue
 
+            if new_content != fixed_content:
+                fixed_issues.append(ValidationIssue(
+                    severity=ValidationSeverity.INFO,
+                    message=f"Auto-fixed: {pattern.message}",
+                    suggestion=f"Applied: {pattern.suggestion}",
+                    rule=f"{pattern.category.value}/{pattern.name}",
+                    auto_fixable=True,
+                ))
+                fixed_content = new_content
+
         # Now validate the fixed content
-        result = self.validate(fixed_content)
+        result = self.validate(
+            fixed_content,
+            document=document if fixed_content is content else None,
+        )
 
         # Add info about auto-fixes
         for fix_issue in fixed_issues:
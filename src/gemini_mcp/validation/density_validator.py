@@ -15,6 +15,8 @@ import re
 from dataclasses import dataclass, field
 from typing import Optional
 
+from gemini_mcp.validation.document import ParsedDocument, parse_document
+
 
 @dataclass
 class ElementDensity:
@@ -29,6 +31,7 @@ class ElementDensity:
     has_dark_mode: bool  # dark: classes
     meets_target: bool
     recommendations: list[str] = field(default_factory=list)
+    background_layers: int = 0  # 4-layer background rule (0-4)
 
 
 @dataclass
@@ -98,12 +101,8 @@ class DensityValidator:
         "main",
     }
 
-    # Regex patterns
-    ELEMENT_PATTERN = re.compile(
-        r'<(button|a|input|select|textarea|label|div|section|article|header|footer|nav|aside|main)'
-        r'[^>]*class=["\']([^"\']*)["\']',
-        re.IGNORECASE,
-    )
+    # Elements whose class density is analyzed
+    ANALYZED_ELEMENTS = tuple(sorted(INTERACTIVE_ELEMENTS | CONTAINER_ELEMENTS))
 
     CLASS_SPLIT_PATTERN = re.compile(r'\s+')
 
@@ -125,38 +124,62 @@ class DensityValidator:
         self.target_classes = target_classes
         self.strict_mode = strict_mode
 
-    def validate(self, html: str) -> DensityValidationResult:
+    def validate(
+        self,
+        html: str,
+        document: Optional[ParsedDocument] = None,
+    ) -> DensityValidationResult:
         """
         Validate HTML class density.
 
         Args:
             html: HTML content to validate
+            document: Shared parse of ``html`` (parsed here if omitted)
 
         Returns:
             DensityValidationResult with analysis and recommendations
         """
         element_details = []
-        total_classes = 0
-        elements_below_minimum = 0
-        elements_below_target = 0
+
+        doc = document if document is not None else parse_document(html)
 
         # Find all elements with class attributes
-        for match in self.ELEMENT_PATTERN.finditer(html):
-            element_type = match.group(1).lower()
-            class_string = match.group(2)
-            classes = self._parse_classes(class_string)
+        for element in doc.find_all(*self.ANALYZED_ELEMENTS):
+            if "class" not in element.attrs:
+                continue
+            element_type = element.tag
+            classes = self._parse_classes(element.attrs["class"])
 
             # Only analyze interactive elements strictly
             is_interactive = element_type in self.INTERACTIVE_ELEMENTS
             threshold = self.target_classes if is_interactive else self.minimum_classes
 
-            # Analyze element
-            density = self._analyze_element(element_type, classes, threshold)
-            element_details.append(density)
+            element_details.append(self._analyze_element(element_type, classes, threshold))
+
+        return self.summarize(element_details)
+
+    def summarize(self, element_details: list[ElementDensity]) -> DensityValidationResult:
+        """
+        Build a validation result from analyzed elements.
+
+        Used by validate() and by callers that merge element details from
+        several fragments (e.g. per-section incremental validation).
+
+        Args:
+            element_details: Analyzed elements in document order
+
+        Returns:
+            DensityValidationResult for the combined elements
+        """
+        total_classes = 0
+        elements_below_minimum = 0
+        elements_below_target = 0
+
+        for density in element_details:
             total_classes += density.class_count
 
             # Count violations
-            if is_interactive:
+            if density.element_type in self.INTERACTIVE_ELEMENTS:
                 if density.class_count < self.minimum_classes:
                     elements_below_minimum += 1
                 if density.class_count < self.target_classes:
@@ -250,6 +273,7 @@ class DensityValidator:
             has_dark_mode=has_dark,
             meets_target=meets_target,
             recommendations=recommendations,
+            background_layers=self._count_background_layers(classes),
         )
 
     def _build_recommendations(
@@ -309,31 +333,31 @@ class DensityValidator:
 
     def _check_background_layers(self, element_details: list[ElementDensity]) -> int:
         """Check average background layer count."""
-        layer_counts = []
-
-        for element in element_details:
-            layers = 0
-            classes = element.classes
+        if not element_details:
+            return 0
+        return sum(element.background_layers for element in element_details) // len(element_details)
 
-            # Layer 1: Base background
-            if any(c.startswith("bg-") and not c.startswith("bg-gradient") for c in classes):
-                layers += 1
+    def _count_background_layers(self, classes: list[str]) -> int:
+        """Background layers (0-4) present in one element's classes."""
+        layers = 0
 
-            # Layer 2: Gradient
-            if any(c.startswith(("bg-gradient", "from-", "to-", "via-")) for c in classes):
-                layers += 1
+        # Layer 1: Base background
+        if any(c.startswith("bg-") and not c.startswith("bg-gradient") for c in classes):
+            layers += 1
 
-            # Layer 3: Pattern/texture (via backdrop, opacity, etc.)
-            if any(c.startswith(("backdrop-", "opacity-", "mix-blend-")) for c in classes):
-                layers += 1
+        # Layer 2: Gradient
+        if any(c.startswith(("bg-gradient", "from-", "to-", "via-")) for c in classes):
+            layers += 1
 
-            # Layer 4: Hover state
-            if any(c.startswith("hover:bg-") for c in classes):
-                layers += 1
+        # Layer 3: Pattern/texture (via backdrop, opacity, etc.)
+        if any(c.startswith(("backdrop-", "opacity-", "mix-blend-")) for c in classes):
+            layers += 1
 
-            layer_counts.append(layers)
+        # Layer 4: Hover state
+        if any(c.startswith("hover:bg-") for c in classes):
+            layers += 1
 
-        return sum(layer_counts) // len(layer_counts) if layer_counts else 0
+        return layers
 
     def _calculate_score(
         self,
@@ -0,0 +1,270 @@
+"""
+ParsedDocument - Shared single-pass HTML parse for the validation stack
+
+Every validator used to re-scan the same 50-200KB HTML output with its own
+regexes (tags, ids, classes, images, buttons, headings...). A ParsedDocument
+is built once per HTML string and indexes everything those checks need:
+
+- elements: every start/end tag in document order, with parsed attributes
+- tag_index / class_index / id_index / attribute_index: value → element positions
+- line_offsets: start offset of every line (offset → line via bisect)
+- sections: <!-- SECTION: x --> ... <!-- /SECTION: x --> spans (nesting-aware)
+
+The scan is deliberately regex-based and tolerant (no tree building, no
+error recovery) so validators see the same tags they saw before.
+
+Usage:
+    doc = parse_document(html)
+    doc.id_index.get("hero-cta")        # element positions with that id
+    doc.find_all("img")                 # opening <img> elements
+    doc.line_of(match.start())          # 1-based line number
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+# ═══════════════════════════════════════════════════════════════
+# REGEX PATTERNS
+# ═══════════════════════════════════════════════════════════════
+
+# Start and end tags: <tag ...>, </tag>, <tag ... />
+TAG_PATTERN = re.compile(r"<(/?)(\w+)([^>]*)>")
+
+# Attributes inside a tag: name, name="v", name='v', name=v
+ATTRIBUTE_PATTERN = re.compile(
+    r"""([^\s"'<>/=]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'=<>`]+)))?"""
+)
+
+# Line breaks (line offset index)
+NEWLINE_PATTERN = re.compile("\n")
+
+# Section markers written by the Architect / section_utils
+SECTION_MARKER_PATTERN = re.compile(r"<!--\s*(/?)SECTION:\s*(\w+)\s*-->")
+
+
+def content_hash(html: str) -> str:
+    """Stable short hash used to cache parsed documents by content."""
+    return hashlib.sha256(html.encode()).hexdigest()[:16]
+
+
+def build_line_offsets(text: str) -> list[int]:
+    """Start offset of every line (line N starts at offsets[N - 1])."""
+    offsets = [0]
+    offsets.extend(match.end() for match in NEWLINE_PATTERN.finditer(text))
+    return offsets
+
+
+def line_at(offsets: list[int], offset: int) -> int:
+    """1-based line number of an offset, given build_line_offsets() output."""
+    return bisect_right(offsets, offset)
+
+
+# ═══════════════════════════════════════════════════════════════
+# DATA CLASSES
+# ═══════════════════════════════════════════════════════════════
+
+@dataclass
+class Element:
+    """
+    A single start or end tag.
+
+    Attributes:
+        index: Position in ParsedDocument.elements
+        tag: Lowercase tag name
+        start: Offset of '<'
+        end: Offset just past '>'
+        closing: True for </tag>
+        self_closing: True for <tag ... />
+        attrs: Attribute name (lowercase) → value ("" for bare attributes)
+    """
+    index: int
+    tag: str
+    start: int
+    end: int
+    closing: bool = False
+    self_closing: bool = False
+    attrs: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def classes(self) -> list[str]:
+        """Class tokens of the element's class attribute."""
+        return self.attrs.get("class", "").split()
+
+
+@dataclass
+class SectionSpan:
+    """
+    A <!-- SECTION: name --> block.
+
+    Attributes:
+        name: Section name from the marker
+        start: Offset of the opening marker
+        end: Offset just past the closing marker (None if unclosed)
+        content_start: Offset just past the opening marker
+        content_end: Offset of the closing marker (None if unclosed)
+        depth: Nesting depth (0 = top level)
+    """
+    name: str
+    start: int
+    end: Optional[int]
+    content_start: int
+    content_end: Optional[int]
+    depth: int = 0
+
+
+@dataclass
+class ParsedDocument:
+    """
+    Indexed view of one HTML string, shared by all validators.
+
+    Index values are positions in ``elements``; every index only contains
+    opening tags, in document order.
+    """
+    html: str
+    content_hash: str
+    elements: list[Element] = field(default_factory=list)
+    tag_index: dict[str, list[int]] = field(default_factory=dict)
+    class_index: dict[str, list[int]] = field(default_factory=dict)
+    id_index: dict[str, list[int]] = field(default_factory=dict)
+    attribute_index: dict[str, list[int]] = field(default_factory=dict)
+    line_offsets: list[int] = field(default_factory=list)
+    sections: list[SectionSpan] = field(default_factory=list)
+
+    def line_of(self, offset: int) -> int:
+        """1-based line number of a character offset."""
+        return line_at(self.line_offsets, offset)
+
+    def find_all(self, *tags: str) -> list[Element]:
+        """Opening elements with any of the given tag names, in document order."""
+        if len(tags) == 1:
+            return [self.elements[i] for i in self.tag_index.get(tags[0], ())]
+        positions = sorted(i for tag in tags for i in self.tag_index.get(tag, ()))
+        return [self.elements[i] for i in positions]
+
+    def with_attribute(self, name: str) -> list[Element]:
+        """Opening elements carrying an attribute, in document order."""
+        return [self.elements[i] for i in self.attribute_index.get(name, ())]
+
+    def ids(self) -> list[str]:
+        """Every id attribute value in document order (duplicates kept)."""
+        return [self.elements[i].attrs["id"] for i in self.attribute_index.get("id", ())]
+
+    def class_tokens(self) -> set[str]:
+        """All distinct class tokens."""
+        return set(self.class_index)
+
+    def next_element(self, element: Element) -> Optional[Element]:
+        """Element following another in document order."""
+        position = element.index + 1
+        return self.elements[position] if position < len(self.elements) else None
+
+    def text_between(self, first: Element, second: Element) -> str:
+        """Raw text between two elements."""
+        return self.html[first.end:second.start]
+
+    def raw(self, element: Element) -> str:
+        """Source text of an element's tag."""
+        return self.html[element.start:element.end]
+
+    def section(self, name: str) -> Optional[SectionSpan]:
+        """First closed section with the given name."""
+        for span in self.sections:
+            if span.name == name and span.end is not None:
+                return span
+        return None
+
+    @property
+    def section_names(self) -> list[str]:
+        """Section marker names in document order."""
+        return [span.name for span in self.sections]
+
+
+# ═══════════════════════════════════════════════════════════════
+# PARSER
+# ═══════════════════════════════════════════════════════════════
+
+def parse_document(html: str, digest: Optional[str] = None) -> ParsedDocument:
+    """
+    Scan HTML once and build all indexes.
+
+    Args:
+        html: HTML content
+        digest: Precomputed content_hash(html), if the caller has it
+
+    Returns:
+        ParsedDocument for the content
+    """
+    doc = ParsedDocument(html=html, content_hash=digest or content_hash(html))
+    elements = doc.elements
+    tag_index = doc.tag_index
+    class_index = doc.class_index
+    id_index = doc.id_index
+    attribute_index = doc.attribute_index
+
+    for match in TAG_PATTERN.finditer(html):
+        closing, tag, attr_text = match.groups()
+        position = len(elements)
+        element = Element(
+            index=position,
+            tag=tag.lower(),
+            start=match.start(),
+            end=match.end(),
+            closing=bool(closing),
+        )
+        elements.append(element)
+        if closing:
+            continue
+
+        element.self_closing = attr_text.endswith("/")
+        tag_index.setdefault(element.tag, []).append(position)
+
+        if not attr_text.strip(" /"):
+            continue
+
+        attrs = element.attrs
+        for name, double, single, bare in ATTRIBUTE_PATTERN.findall(attr_text):
+            name = name.lower()
+            if name in attrs:
+                continue  # First occurrence wins, like browsers
+            attrs[name] = double or single or bare
+            attribute_index.setdefault(name, []).append(position)
+
+        if "id" in attrs and attrs["id"]:
+            id_index.setdefault(attrs["id"], []).append(position)
+        if "class" in attrs:
+            for token in set(attrs["class"].split()):
+                class_index.setdefault(token, []).append(position)
+
+    doc.line_offsets = build_line_offsets(html)
+
+    # Section spans (stack handles nesting; unmatched closers are ignored)
+    open_sections: list[SectionSpan] = []
+    for match in SECTION_MARKER_PATTERN.finditer(html):
+        is_close, name = match.groups()
+        if not is_close:
+            span = SectionSpan(
+                name=name,
+                start=match.start(),
+                end=None,
+                content_start=match.end(),
+                content_end=None,
+                depth=len(open_sections),
+            )
+            doc.sections.append(span)
+            open_sections.append(span)
+            continue
+        for depth in range(len(open_sections) - 1, -1, -1):
+            if open_sections[depth].name == name:
+                span = open_sections[depth]
+                span.content_end = match.start()
+                span.end = match.end()
+                del open_sections[depth:]
+                break
+
+    return doc
@@ -14,8 +14,10 @@ Validates HTML output from The Architect agent for:
 from __future__ import annotations
 
 import re
+from typing import Optional
 
 from gemini_mcp.validation.contrast_checker import check_wcag_compliance
+from gemini_mcp.validation.document import ParsedDocument, parse_document
 from gemini_mcp.validation.types import (
     ValidationSeverity,
     ValidationIssue,
@@ -58,6 +60,9 @@ class HTMLValidator:
         "footer", "figure", "figcaption", "details", "summary",
     }
 
+    # Tailwind responsive prefixes
+    RESPONSIVE_PREFIXES = ("sm:", "md:", "lg:", "xl:", "2xl:")
+
     # Interactive elements that should have IDs
     INTERACTIVE_ELEMENTS = {
         "button", "input", "select", "textarea", "a", "form",
@@ -81,12 +86,17 @@ class HTMLValidator:
         self.check_contrast = check_contrast
         self.wcag_level = wcag_level
 
-    def validate(self, html: str) -> ValidationResult:
+    def validate(
+        self,
+        html: str,
+        document: Optional[ParsedDocument] = None,
+    ) -> ValidationResult:
         """
         Validate HTML content.
 
         Args:
             html: HTML string to validate
+            document: Shared parse of ``html`` (parsed here if omitted)
 
         Returns:
             ValidationResult with issues found
@@ -100,14 +110,16 @@ class HTMLValidator:
             ))
             return ValidationResult(valid=False, issues=issues)
 
+        doc = document if document is not None else parse_document(html)
+
         # Run all validation checks
-        issues.extend(self._check_forbidden_elements(html))
-        issues.extend(self._check_tag_closure(html))
-        issues.extend(self._check_id_uniqueness(html))
-        issues.extend(self._check_accessibility(html))
-        issues.extend(self._check_semantic_structure(html))
+        issues.extend(self._check_forbidden_elements(doc))
+        issues.extend(self._check_tag_closure(doc))
+        issues.extend(self._check_id_uniqueness(doc))
+        issues.extend(self._check_accessibility(doc))
+        issues.extend(self._check_semantic_structure(doc))
         issues.extend(self._check_responsive_classes(html))
-        issues.extend(self._check_inline_styles(html))
+        issues.extend(self._check_inline_styles(doc))
 
         # WCAG Contrast check (Phase 6)
         if self.check_contrast:
@@ -123,18 +135,18 @@ class HTMLValidator:
 
         return ValidationResult(valid=valid, issues=issues)
 
-    def _check_forbidden_elements(self, html: str) -> list[ValidationIssue]:
+    def _check_forbidden_elements(self, doc: ParsedDocument) -> list[ValidationIssue]:
         """Check for forbidden elements like style and script."""
         issues = []
 
-        if re.search(r"<style", html, re.IGNORECASE):
+        if "style" in doc.tag_index:
             issues.append(ValidationIssue(
                 severity=ValidationSeverity.ERROR,
                 message="Contains <style> tag - HTML should not include CSS",
                 suggestion="Remove style tags - CSS is handled by The Alchemist",
             ))
 
-        if re.search(r"<script", html, re.IGNORECASE):
+        if "script" in doc.tag_index:
             issues.append(ValidationIssue(
                 severity=ValidationSeverity.ERROR,
                 message="Contains <script> tag - HTML should not include JS",
@@ -143,101 +155,121 @@ class HTMLValidator:
 
         return issues
 
-    def _check_tag_closure(self, html: str) -> list[ValidationIssue]:
+    def _check_tag_closure(self, doc: ParsedDocument) -> list[ValidationIssue]:
         """Check for unclosed or improperly nested tags."""
-        issues = []
+        issues: list[ValidationIssue] = []
+        stack: list[str] = []
 
-        # Extract all tags
-        tag_pattern = r"<(/?)(\w+)[^>]*(/?)>"
-        matches = re.findall(tag_pattern, html)
+        self.match_tags(self.tag_events(doc), stack, issues)
 
-        stack = []
-        for is_closing, tag_name, is_self_closing in matches:
-            tag_name = tag_name.lower()
+        # Check for unclosed tags
+        issues.extend(self.unclosed_tag_issues(stack))
+        return issues
 
+    def tag_events(self, doc: ParsedDocument) -> list[tuple[bool, str]]:
+        """(closing, tag) pairs for every non-void tag, in document order."""
+        return [
+            (element.closing, element.tag)
+            for element in doc.elements
             # Skip void elements and self-closing tags
-            if tag_name in self.VOID_ELEMENTS or is_self_closing:
-                continue
+            if element.tag not in self.VOID_ELEMENTS and not element.self_closing
+        ]
 
-            if not is_closing:
+    def match_tags(
+        self,
+        events: list[tuple[bool, str]],
+        stack: list[str],
+        issues: list[ValidationIssue],
+        stray_closers: Optional[list[str]] = None,
+    ) -> None:
+        """
+        Match opening and closing tags against a stack of open tags.
+
+        Args:
+            events: (closing, tag) pairs in document order
+            stack: Open tags, updated in place
+            issues: Nesting issues are appended here
+            stray_closers: If given, closing tags with nothing open are
+                collected here instead of being reported (a fragment's
+                closers may match tags opened by an earlier fragment)
+        """
+        for closing, tag_name in events:
+            if not closing:
                 # Opening tag
                 stack.append(tag_name)
-            else:
-                # Closing tag
-                if not stack:
+            elif not stack:
+                if stray_closers is not None:
+                    stray_closers.append(tag_name)
+                else:
                     issues.append(ValidationIssue(
                         severity=ValidationSeverity.ERROR,
                         message=f"Unexpected closing tag </{tag_name}>",
                     ))
-                elif stack[-1] != tag_name:
-                    issues.append(ValidationIssue(
-                        severity=ValidationSeverity.ERROR,
-                        message=f"Mismatched tags: expected </{stack[-1]}>, found </{tag_name}>",
-                    ))
-                    # Try to recover by popping
-                    if tag_name in stack:
-                        while stack and stack[-1] != tag_name:
-                            stack.pop()
-                        if stack:
-                            stack.pop()
-                else:
-                    stack.pop()
+            elif stack[-1] != tag_name:
+                issues.append(ValidationIssue(
+                    severity=ValidationSeverity.ERROR,
+                    message=f"Mismatched tags: expected </{stack[-1]}>, found </{tag_name}>",
+                ))
+                # Try to recover by popping
+                if tag_name in stack:
+                    while stack and stack[-1] != tag_name:
+                        stack.pop()
+                    if stack:
+                        stack.pop()
+            else:
+                stack.pop()
 
-        # Check for unclosed tags
-        for unclosed in stack:
-            issues.append(ValidationIssue(
+    def unclosed_tag_issues(self, stack: list[str]) -> list[ValidationIssue]:
+        """Issues for tags still open at the end of the document."""
+        return [
+            ValidationIssue(
                 severity=ValidationSeverity.ERROR,
                 message=f"Unclosed tag: <{unclosed}>",
-            ))
-
-        return issues
+            )
+            for unclosed in stack
+        ]
 
-    def _check_id_uniqueness(self, html: str) -> list[ValidationIssue]:
+    def _check_id_uniqueness(self, doc: ParsedDocument) -> list[ValidationIssue]:
         """Check that all IDs are unique."""
-        issues = []
-
-        id_pattern = r'id=["\']([^"\']+)["\']'
-        ids = re.findall(id_pattern, html, re.IGNORECASE)
+        return self.duplicate_id_issues(
+            {id_val: len(positions) for id_val, positions in doc.id_index.items()}
+        )
 
-        seen = {}
-        for id_value in ids:
-            if id_value in seen:
-                seen[id_value] += 1
-            else:
-                seen[id_value] = 1
+    def duplicate_id_issues(self, id_counts: dict[str, int]) -> list[ValidationIssue]:
+        """Issues for ids that occur more than once (id → occurrence count)."""
+        issues = []
 
-        duplicates = [id_val for id_val, count in seen.items() if count > 1]
+        duplicates = [id_val for id_val, count in id_counts.items() if count > 1]
         for dup in duplicates:
             issues.append(ValidationIssue(
                 severity=ValidationSeverity.ERROR,
-                message=f"Duplicate ID: '{dup}' appears {seen[dup]} times",
+                message=f"Duplicate ID: '{dup}' appears {id_counts[dup]} times",
                 suggestion=f"Make IDs unique: {dup}-1, {dup}-2, etc.",
             ))
 
         return issues
 
-    def _check_accessibility(self, html: str) -> list[ValidationIssue]:
+    def _check_accessibility(self, doc: ParsedDocument) -> list[ValidationIssue]:
         """Check for accessibility issues."""
         issues = []
 
         # Check images for alt attributes
-        img_pattern = r"<img[^>]*>"
-        for img in re.findall(img_pattern, html, re.IGNORECASE):
-            if 'alt=' not in img.lower():
+        for img in doc.find_all("img"):
+            if "alt" not in img.attrs:
                 issues.append(ValidationIssue(
                     severity=ValidationSeverity.WARNING,
                     message="Image missing alt attribute",
                     suggestion="Add alt attribute for accessibility",
                 ))
 
-        # Check buttons for accessible names
-        button_pattern = r"<button[^>]*>([^<]*)</button>"
-        for match in re.finditer(button_pattern, html, re.IGNORECASE):
-            button_tag = match.group(0)
-            button_content = match.group(1).strip()
+        # Check buttons for accessible names (text-only buttons: <button>text</button>)
+        for button in doc.find_all("button"):
+            closer = doc.next_element(button)
+            if closer is None or not closer.closing or closer.tag != "button":
+                continue
 
-            has_aria_label = 'aria-label' in button_tag.lower()
-            has_content = bool(button_content)
+            has_aria_label = "aria-label" in button.attrs
+            has_content = bool(doc.text_between(button, closer).strip())
 
             if not has_aria_label and not has_content:
                 issues.append(ValidationIssue(
@@ -247,12 +279,11 @@ class HTMLValidator:
                 ))
 
         # Check form inputs for labels
-        input_pattern = r"<input[^>]*>"
-        for input_tag in re.findall(input_pattern, html, re.IGNORECASE):
-            input_type = re.search(r'type=["\']([^"\']+)["\']', input_tag)
-            if input_type and input_type.group(1).lower() not in ['submit', 'button', 'hidden']:
-                has_id = 'id=' in input_tag.lower()
-                has_aria_label = 'aria-label' in input_tag.lower()
+        for input_tag in doc.find_all("input"):
+            input_type = input_tag.attrs.get("type")
+            if input_type and input_type.lower() not in ['submit', 'button', 'hidden']:
+                has_id = "id" in input_tag.attrs
+                has_aria_label = "aria-label" in input_tag.attrs
 
                 if not has_id and not has_aria_label:
                     issues.append(ValidationIssue(
@@ -263,17 +294,28 @@ class HTMLValidator:
 
         return issues
 
-    def _check_semantic_structure(self, html: str) -> list[ValidationIssue]:
+    def _check_semantic_structure(self, doc: ParsedDocument) -> list[ValidationIssue]:
         """Check for proper semantic HTML usage."""
-        issues = []
-
-        # Check for non-semantic div soup
-        div_count = len(re.findall(r"<div", html, re.IGNORECASE))
+        div_count = len(doc.tag_index.get("div", ()))
         semantic_count = sum(
-            len(re.findall(f"<{elem}", html, re.IGNORECASE))
+            len(doc.tag_index.get(elem, ()))
             for elem in self.SEMANTIC_ELEMENTS
         )
+        headings = doc.find_all("h1", "h2", "h3", "h4", "h5", "h6")
+        heading_levels = [int(h.tag[1]) for h in headings]
 
+        return self.semantic_structure_issues(div_count, semantic_count, heading_levels)
+
+    def semantic_structure_issues(
+        self,
+        div_count: int,
+        semantic_count: int,
+        heading_levels: list[int],
+    ) -> list[ValidationIssue]:
+        """Div soup and heading hierarchy issues from element counts."""
+        issues = []
+
+        # Check for non-semantic div soup
         if div_count > 10 and semantic_count == 0:
             issues.append(ValidationIssue(
                 severity=ValidationSeverity.INFO,
@@ -282,9 +324,6 @@ class HTMLValidator:
             ))
 
         # Check for heading hierarchy
-        headings = re.findall(r"<(h[1-6])", html, re.IGNORECASE)
-        heading_levels = [int(h[1]) for h in headings]
-
         if heading_levels and heading_levels[0] != 1:
             issues.append(ValidationIssue(
                 severity=ValidationSeverity.INFO,
@@ -303,38 +342,41 @@ class HTMLValidator:
 
         return issues
 
+    def has_responsive_classes(self, html: str) -> bool:
+        """True if any Tailwind responsive prefix appears in the HTML."""
+        return any(prefix in html for prefix in self.RESPONSIVE_PREFIXES)
+
     def _check_responsive_classes(self, html: str) -> list[ValidationIssue]:
         """Check for responsive design patterns."""
-        issues = []
-
-        # Check for Tailwind responsive prefixes
-        responsive_prefixes = ["sm:", "md:", "lg:", "xl:", "2xl:"]
-        has_responsive = any(prefix in html for prefix in responsive_prefixes)
-
-        if not has_responsive:
-            issues.append(ValidationIssue(
-                severity=ValidationSeverity.INFO,
-                message="No responsive Tailwind classes detected",
-                suggestion="Consider adding responsive breakpoints (sm:, md:, lg:)",
-            ))
-
-        return issues
-
-    def _check_inline_styles(self, html: str) -> list[ValidationIssue]:
+        return self.responsive_issues(self.has_responsive_classes(html))
+
+    def responsive_issues(self, has_responsive: bool) -> list[ValidationIssue]:
+        """Issue raised when no responsive Tailwind classes are used."""
+        if has_responsive:
+            return []
+        return [ValidationIssue(
+            severity=ValidationSeverity.INFO,
+            message="No responsive Tailwind classes detected",
+            suggestion="Consider adding responsive breakpoints (sm:, md:, lg:)",
+        )]
+
+    def count_inline_styles(self, doc: ParsedDocument) -> int:
+        """Number of elements with a non-empty style attribute."""
+        return sum(1 for el in doc.with_attribute("style") if el.attrs["style"])
+
+    def _check_inline_styles(self, doc: ParsedDocument) -> list[ValidationIssue]:
         """Check for inline styles."""
-        issues = []
-
-        inline_style_pattern = r'style=["\'][^"\']+["\']'
-        inline_styles = re.findall(inline_style_pattern, html, re.IGNORECASE)
-
-        if inline_styles:
-            issues.append(ValidationIssue(
-                severity=ValidationSeverity.ERROR,
-                message=f"Found {len(inline_styles)} inline style attribute(s)",
-                suggestion="Use Tailwind classes instead of inline styles",
-            ))
-
-        return issues
+        return self.inline_style_issues(self.count_inline_styles(doc))
+
+    def inline_style_issues(self, count: int) -> list[ValidationIssue]:
+        """Issue raised when inline style attributes are present."""
+        if not count:
+            return []
+        return [ValidationIssue(
+            severity=ValidationSeverity.ERROR,
+            message=f"Found {count} inline style attribute(s)",
+            suggestion="Use Tailwind classes instead of inline styles",
+        )]
 
     def _check_color_contrast(self, html: str) -> list[ValidationIssue]:
         """Check WCAG color contrast compliance."""
@@ -17,6 +17,7 @@ import re
 from dataclasses import dataclass, field
 from typing import Optional
 
+from gemini_mcp.validation.document import ParsedDocument, parse_document
 from gemini_mcp.validation.html_validator import ValidationSeverity, ValidationIssue, ValidationResult
 
 
@@ -75,13 +76,19 @@ class IDValidator:
         """
         self.strict_mode = strict_mode
 
-    def validate(self, html: str, js: str) -> ValidationResult:
+    def validate(
+        self,
+        html: str,
+        js: str,
+        document: Optional[ParsedDocument] = None,
+    ) -> ValidationResult:
         """
         Validate that JS selectors match HTML IDs/classes.
 
         Args:
             html: HTML content from The Architect
             js: JavaScript content from The Physicist
+            document: Shared parse of ``html`` (parsed here if omitted)
 
         Returns:
             ValidationResult with cross-layer issues
@@ -102,9 +109,37 @@ class IDValidator:
             return ValidationResult(valid=False, issues=issues)
 
         # Extract IDs and classes from HTML
-        html_ids = self._extract_html_ids(html)
-        html_classes = self._extract_html_classes(html)
-        html_data_attrs = self._extract_data_attributes(html)
+        doc = document if document is not None else parse_document(html)
+        return self.validate_references(
+            js,
+            html_ids=self._extract_html_ids(doc),
+            html_classes=self._extract_html_classes(doc),
+            html_data_attrs=self._extract_data_attributes(doc),
+        )
+
+    def validate_references(
+        self,
+        js: str,
+        html_ids: set[str],
+        html_classes: set[str],
+        html_data_attrs: set[str],
+    ) -> ValidationResult:
+        """
+        Validate JS selectors against already-extracted HTML indexes.
+
+        Lets callers that keep their own id/class/data-attribute indexes
+        (e.g. merged per-section indexes) skip re-reading the HTML.
+
+        Args:
+            js: JavaScript content from The Physicist
+            html_ids: All id values in the HTML
+            html_classes: All class tokens in the HTML
+            html_data_attrs: All data-* attribute names in the HTML
+
+        Returns:
+            ValidationResult with cross-layer issues
+        """
+        issues: list[ValidationIssue] = []
 
         # Extract selectors from JS
         js_id_refs = self._extract_js_id_references(js)
@@ -137,24 +172,17 @@ class IDValidator:
 
         return ValidationResult(valid=valid, issues=issues)
 
-    def _extract_html_ids(self, html: str) -> set[str]:
+    def _extract_html_ids(self, doc: ParsedDocument) -> set[str]:
         """Extract all IDs from HTML."""
-        pattern = r'id=["\']([^"\']+)["\']'
-        return set(re.findall(pattern, html, re.IGNORECASE))
+        return set(doc.id_index)
 
-    def _extract_html_classes(self, html: str) -> set[str]:
+    def _extract_html_classes(self, doc: ParsedDocument) -> set[str]:
         """Extract all classes from HTML."""
-        pattern = r'class=["\']([^"\']+)["\']'
-        matches = re.findall(pattern, html, re.IGNORECASE)
-        classes = set()
-        for match in matches:
-            classes.update(match.split())
-        return classes
-
-    def _extract_data_attributes(self, html: str) -> set[str]:
+        return doc.class_tokens()
+
+    def _extract_data_attributes(self, doc: ParsedDocument) -> set[str]:
         """Extract all data-* attributes from HTML."""
-        pattern = r'(data-[a-z0-9-]+)'
-        return set(re.findall(pattern, html, re.IGNORECASE))
+        return {name for name in doc.attribute_index if name.startswith("data-")}
 
     def _extract_js_id_references(self, js: str) -> set[str]:
         """Extract IDs referenced via getElementById."""
@@ -332,8 +360,9 @@ class IDValidator:
         Returns:
             CrossLayerReport with all extracted data
         """
-        html_ids = list(self._extract_html_ids(html))
-        html_classes = list(self._extract_html_classes(html))
+        doc = parse_document(html)
+        html_ids = list(self._extract_html_ids(doc))
+        html_classes = list(self._extract_html_classes(doc))
         js_id_refs = list(self._extract_js_id_references(js))
         js_class_refs = list(self._extract_js_class_references(js))
         query_selectors = self._extract_query_selectors(js)
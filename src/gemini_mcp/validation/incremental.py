@@ -0,0 +1,477 @@
+"""
+IncrementalValidator - Per-section validation cache for section edits
+
+replace_section_in_page and refine_frontend change one
+<!-- SECTION: x --> block at a time. When a caller asks them to validate
+the result (validate_page=True), running the whole HTML/ID/density/a11y
+stack over the entire page after every edit would repeat the work for
+sections that did not change.
+
+The IncrementalValidator splits a page into its top-level sections (plus
+the markup between them), validates each chunk on its own and caches the
+result by chunk content hash. On the next pass only chunks whose content
+changed are parsed and validated; everything else is read from the cache.
+
+Each cached SectionValidation keeps:
+- section-local issues (forbidden tags, nesting, alt/labels, anti-patterns,
+  a11y checks other than heading order) with section-relative line numbers
+- indexes for page-level checks: id counts, class tokens, data attributes,
+  heading levels, div/semantic/inline-style counts, density element details
+- tags left open and closers left unmatched inside the chunk
+
+Page-level checks (duplicate IDs across sections, JS selector → ID/class
+consistency, heading order, density score, tags opened in one chunk and
+closed in another) are recomputed from those indexes on every pass, which
+is cheap compared to re-parsing and re-running the validators.
+
+validate_page() is thread-safe (one page at a time), so async callers
+can run it with asyncio.to_thread().
+
+Usage:
+    validator = get_incremental_validator()
+    report = validator.validate_page(page_html, js)
+    report.revalidated   # ['hero'] after a hero-only edit
+    report.to_dict()
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field, replace
+from typing import TYPE_CHECKING, Any, Optional
+
+from gemini_mcp.validation.anti_pattern_validator import AntiPatternValidator
+from gemini_mcp.validation.density_validator import (
+    DensityValidationResult,
+    DensityValidator,
+    ElementDensity,
+)
+from gemini_mcp.validation.document import (
+    SECTION_MARKER_PATTERN,
+    content_hash,
+    parse_document,
+)
+from gemini_mcp.validation.html_validator import HTMLValidator
+from gemini_mcp.validation.id_validator import IDValidator
+from gemini_mcp.validation.types import (
+    ValidationIssue,
+    ValidationResult,
+    ValidationSeverity,
+)
+
+if TYPE_CHECKING:
+    from gemini_mcp.validators import A11yIssue
+
+logger = logging.getLogger(__name__)
+
+# Cached chunks kept across passes (a 12-section page uses ~13-25 entries)
+SECTION_CACHE_SIZE = 256
+
+
+# ═══════════════════════════════════════════════════════════════
+# DATA CLASSES
+# ═══════════════════════════════════════════════════════════════
+
+@dataclass
+class SectionValidation:
+    """
+    Cached validation of one page chunk.
+
+    Attributes:
+        name: Section name, or None for markup between sections
+        content_hash: Hash of the chunk (markers included)
+        newline_count: Newlines in the chunk (to shift line numbers)
+        issues: Section-local issues, lines relative to the chunk
+        a11y_issues: Section-local accessibility findings
+        id_counts: id value → occurrences in the chunk
+        classes: Class tokens used in the chunk
+        data_attributes: data-* attribute names used in the chunk
+        heading_levels: Heading levels in document order
+        div_count: Number of <div> elements
+        semantic_count: Number of semantic HTML5 elements
+        inline_style_count: Elements with a non-empty style attribute
+        has_responsive: Whether responsive Tailwind prefixes appear
+        density_details: Analyzed elements for the density score
+        open_tags: Tags still open at the end of the chunk
+        stray_closers: Closing tags with no opener inside the chunk
+    """
+    name: Optional[str]
+    content_hash: str
+    newline_count: int
+    issues: list[ValidationIssue] = field(default_factory=list)
+    a11y_issues: list[A11yIssue] = field(default_factory=list)
+    id_counts: dict[str, int] = field(default_factory=dict)
+    classes: frozenset[str] = frozenset()
+    data_attributes: frozenset[str] = frozenset()
+    heading_levels: list[int] = field(default_factory=list)
+    div_count: int = 0
+    semantic_count: int = 0
+    inline_style_count: int = 0
+    has_responsive: bool = False
+    density_details: list[ElementDensity] = field(default_factory=list)
+    open_tags: list[str] = field(default_factory=list)
+    stray_closers: list[str] = field(default_factory=list)
+    # Issues shifted to page lines, reused while the section does not move
+    _page_issues: Optional[list[ValidationIssue]] = field(default=None, repr=False)
+    _page_line_offset: int = field(default=0, repr=False)
+
+    def issues_at(self, line_offset: int) -> list[ValidationIssue]:
+        """Issues with line numbers shifted by the section's page offset."""
+        if not line_offset:
+            return self.issues
+        if self._page_issues is None or self._page_line_offset != line_offset:
+            self._page_issues = [
+                replace(issue, line=issue.line + line_offset) if issue.line is not None else issue
+                for issue in self.issues
+            ]
+            self._page_line_offset = line_offset
+        return self._page_issues
+
+
+@dataclass
+class PageValidationReport:
+    """
+    Result of one incremental page validation pass.
+
+    Attributes:
+        html: Section-local and page-level HTML/anti-pattern issues
+        cross_layer: JS selector checks (None when no JS was given)
+        density: Page density result built from per-section details
+        a11y_issues: Accessibility findings
+        sections: Section names in page order
+        revalidated: Sections validated in this pass (cache misses)
+        reused: Sections read from the cache
+        elapsed_ms: Time spent in validate_page
+    """
+    html: ValidationResult
+    cross_layer: Optional[ValidationResult]
+    density: DensityValidationResult
+    a11y_issues: list[A11yIssue] = field(default_factory=list)
+    sections: list[str] = field(default_factory=list)
+    revalidated: list[str] = field(default_factory=list)
+    reused: list[str] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+
+    @property
+    def valid(self) -> bool:
+        """True if neither HTML nor cross-layer checks found errors."""
+        return self.html.valid and (self.cross_layer is None or self.cross_layer.valid)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for tool responses."""
+        return {
+            "valid": self.valid,
+            "html": self.html.to_dict(),
+            "cross_layer": self.cross_layer.to_dict() if self.cross_layer else None,
+            "density_score": self.density.score,
+            "a11y_issues": [
+                {"severity": i.severity, "rule": i.rule, "message": i.message}
+                for i in self.a11y_issues
+            ],
+            "sections": self.sections,
+            "revalidated_sections": self.revalidated,
+            "reused_sections": self.reused,
+            "elapsed_ms": round(self.elapsed_ms, 2),
+        }
+
+
+# ═══════════════════════════════════════════════════════════════
+# PAGE SPLITTING
+# ═══════════════════════════════════════════════════════════════
+
+def split_page(html: str) -> list[tuple[Optional[str], str]]:
+    """
+    Split a page into top-level section chunks and the markup between them.
+
+    Nested sections stay inside their parent chunk; unclosed sections are
+    treated as plain markup.
+
+    Args:
+        html: Full page HTML
+
+    Returns:
+        (section name or None, chunk text) pairs covering the whole page
+    """
+    spans: list[tuple[str, int, int]] = []
+    open_sections: list[tuple[str, int]] = []
+    for match in SECTION_MARKER_PATTERN.finditer(html):
+        is_close, name = match.groups()
+        if not is_close:
+            open_sections.append((name, match.start()))
+            continue
+        for depth in range(len(open_sections) - 1, -1, -1):
+            if open_sections[depth][0] == name:
+                if depth == 0:
+                    spans.append((name, open_sections[0][1], match.end()))
+                del open_sections[depth:]
+                break
+
+    chunks: list[tuple[Optional[str], str]] = []
+    position = 0
+    for name, start, end in spans:
+        if start > position:
+            chunks.append((None, html[position:start]))
+        chunks.append((name, html[start:end]))
+        position = end
+    if position < len(html):
+        chunks.append((None, html[position:]))
+    return chunks
+
+
+# ═══════════════════════════════════════════════════════════════
+# INCREMENTAL VALIDATOR
+# ═══════════════════════════════════════════════════════════════
+
+class IncrementalValidator:
+    """
+    Page validator that only revalidates sections whose content changed.
+
+    Section results are cached by content hash (LRU, shared across pages),
+    so an edit to one section of a 12-section page costs one section's
+    validation plus the page-level merge.
+    """
+
+    def __init__(self, strict_mode: bool = False, cache_size: int = SECTION_CACHE_SIZE):
+        """
+        Initialize the validator.
+
+        Args:
+            strict_mode: If True, missing JS selector targets are errors
+            cache_size: Maximum number of cached chunks
+        """
+        # Deferred: gemini_mcp.validators imports this package
+        from gemini_mcp.validators import A11yValidator
+
+        self.strict_mode = strict_mode
+        self.cache_size = cache_size
+        self._html_validator = HTMLValidator(strict_mode=False)
+        self._id_validator = IDValidator(strict_mode=strict_mode)
+        self._density_validator = DensityValidator()
+        self._antipattern_validator = AntiPatternValidator()
+        self._a11y_validator = A11yValidator()
+        self._cache: OrderedDict[str, SectionValidation] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        # Tool calls validate from worker threads; the cache and the
+        # validator instances are shared
+        self._lock = threading.Lock()
+
+    def validate_page(self, html: str, js: str = "") -> PageValidationReport:
+        """
+        Validate a full page, reusing cached results for unchanged sections.
+
+        Args:
+            html: Full page HTML with section markers
+            js: Optional JavaScript to check against the page's ids/classes
+
+        Returns:
+            PageValidationReport for the page
+        """
+        with self._lock:
+            return self._validate_page(html, js)
+
+    def _validate_page(self, html: str, js: str) -> PageValidationReport:
+        start_time = time.perf_counter()
+        html_validator = self._html_validator
+
+        if not html or not html.strip():
+            return PageValidationReport(
+                html=html_validator.validate(html),
+                cross_layer=None,
+                density=self._density_validator.summarize([]),
+                elapsed_ms=(time.perf_counter() - start_time) * 1000,
+            )
+
+        report = PageValidationReport(
+            html=ValidationResult(valid=True),
+            cross_layer=None,
+            density=DensityValidationResult(
+                is_valid=True,
+                overall_density=0.0,
+                elements_analyzed=0,
+                elements_below_minimum=0,
+                elements_below_target=0,
+            ),
+        )
+        issues = report.html.issues
+        results: list[SectionValidation] = []
+
+        line_offset = 0
+        for name, chunk in split_page(html):
+            if name is None and not chunk.strip():
+                line_offset += chunk.count("\n")
+                continue
+
+            result, cached = self.validate_section(chunk, name)
+            results.append(result)
+            if name is not None:
+                report.sections.append(name)
+                (report.reused if cached else report.revalidated).append(name)
+
+            issues.extend(result.issues_at(line_offset))
+            report.a11y_issues.extend(result.a11y_issues)
+            line_offset += result.newline_count
+
+        # Tags opened in one chunk and closed in another
+        stack: list[str] = []
+        for result in results:
+            events = [(True, tag) for tag in result.stray_closers]
+            events.extend((False, tag) for tag in result.open_tags)
+            html_validator.match_tags(events, stack, issues)
+        issues.extend(html_validator.unclosed_tag_issues(stack))
+
+        # Page-level checks from merged per-section indexes
+        id_counts: Counter[str] = Counter()
+        classes: set[str] = set()
+        data_attributes: set[str] = set()
+        heading_levels: list[int] = []
+        density_details: list[ElementDensity] = []
+        for result in results:
+            id_counts.update(result.id_counts)
+            classes.update(result.classes)
+            data_attributes.update(result.data_attributes)
+            heading_levels.extend(result.heading_levels)
+            density_details.extend(result.density_details)
+
+        issues.extend(html_validator.duplicate_id_issues(id_counts))
+        issues.extend(html_validator.semantic_structure_issues(
+            sum(r.div_count for r in results),
+            sum(r.semantic_count for r in results),
+            heading_levels,
+        ))
+        issues.extend(html_validator.responsive_issues(any(r.has_responsive for r in results)))
+        issues.extend(html_validator.inline_style_issues(
+            sum(r.inline_style_count for r in results)
+        ))
+        report.html.valid = not any(
+            i.severity in (ValidationSeverity.ERROR, ValidationSeverity.CRITICAL)
+            for i in issues
+        )
+
+        self._a11y_validator.check_heading_levels(heading_levels, report.a11y_issues, [])
+        report.density = self._density_validator.summarize(density_details)
+
+        if js and js.strip():
+            report.cross_layer = self._id_validator.validate_references(
+                js,
+                html_ids=set(id_counts),
+                html_classes=classes,
+                html_data_attrs=data_attributes,
+            )
+
+        report.elapsed_ms = (time.perf_counter() - start_time) * 1000
+        logger.debug(
+            f"[IncrementalValidator] {len(report.revalidated)} revalidated, "
+            f"{len(report.reused)} reused in {report.elapsed_ms:.1f}ms"
+        )
+        return report
+
+    def validate_section(
+        self,
+        chunk: str,
+        name: Optional[str] = None,
+    ) -> tuple[SectionValidation, bool]:
+        """
+        Validate one chunk, or return its cached result.
+
+        Args:
+            chunk: Section HTML (markers included) or markup between sections
+            name: Section name (None for markup between sections)
+
+        Returns:
+            (SectionValidation, True if it came from the cache)
+        """
+        digest = content_hash(chunk)
+        cached = self._cache.get(digest)
+        if cached is not None:
+            self._cache.move_to_end(digest)
+            self.hits += 1
+            return cached, True
+
+        self.misses += 1
+        result = self._validate_chunk(chunk, name, digest)
+        self._cache[digest] = result
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return result, False
+
+    def _validate_chunk(self, chunk: str, name: Optional[str], digest: str) -> SectionValidation:
+        """Run the section-local checks and build page-level indexes."""
+        html_validator = self._html_validator
+        doc = parse_document(chunk, digest)
+
+        result = SectionValidation(
+            name=name,
+            content_hash=digest,
+            newline_count=len(doc.line_offsets) - 1,
+            id_counts={id_val: len(positions) for id_val, positions in doc.id_index.items()},
+            classes=frozenset(doc.class_index),
+            data_attributes=frozenset(
+                attr for attr in doc.attribute_index if attr.startswith("data-")
+            ),
+            heading_levels=[int(h.tag[1]) for h in doc.find_all("h1", "h2", "h3", "h4", "h5", "h6")],
+            div_count=len(doc.tag_index.get("div", ())),
+            semantic_count=sum(
+                len(doc.tag_index.get(elem, ())) for elem in html_validator.SEMANTIC_ELEMENTS
+            ),
+            inline_style_count=html_validator.count_inline_styles(doc),
+            has_responsive=html_validator.has_responsive_classes(chunk),
+            density_details=self._density_validator.validate(chunk, document=doc).element_details,
+        )
+
+        issues = result.issues
+        issues.extend(html_validator._check_forbidden_elements(doc))
+        html_validator.match_tags(
+            html_validator.tag_events(doc), result.open_tags, issues, result.stray_closers
+        )
+        issues.extend(html_validator._check_accessibility(doc))
+        issues.extend(self._antipattern_validator.validate(chunk, document=doc).issues)
+        if name is not None:
+            for issue in issues:
+                issue.location = issue.location or f"section:{name}"
+
+        # Heading order is a page-level check (see validate_page)
+        result.a11y_issues = [
+            issue for issue in self._a11y_validator.validate(chunk, document=doc).issues
+            if issue.rule != "heading-order"
+        ]
+        return result
+
+    def clear(self) -> None:
+        """Drop all cached section results."""
+        self._cache.clear()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Cache statistics."""
+        total = self.hits + self.misses
+        return {
+            "cached_sections": len(self._cache),
+            "cache_size": self.cache_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
+
+
+# ═══════════════════════════════════════════════════════════════
+# GLOBAL INSTANCE
+# ═══════════════════════════════════════════════════════════════
+
+_incremental_validator: Optional[IncrementalValidator] = None
+
+
+def get_incremental_validator() -> IncrementalValidator:
+    """Get the shared IncrementalValidator (section cache survives tool calls)."""
+    global _incremental_validator
+    if _incremental_validator is None:
+        _incremental_validator = IncrementalValidator()
+    return _incremental_validator
+
+
+def reset_incremental_validator() -> None:
+    """Reset the shared IncrementalValidator (for testing)."""
+    global _incremental_validator
+    _incremental_validator = None
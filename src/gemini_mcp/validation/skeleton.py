@@ -0,0 +1,327 @@
+"""
+HTML Skeleton - Structure-preserving compact form for inter-agent context
+
+Downstream agents (Alchemist, Physicist, refinement Architect) need the
+page structure - tag tree, ids, class lists, data-* interaction hooks,
+section markers - but not the copy. skeletonize_html() keeps exactly that
+and writes it one element per line:
+
+    $1 relative py-24 bg-white
+    $2 rounded-2xl p-8 shadow-sm
+    @hero
+     section#hero$1[interaction=parallax trigger=scroll]
+      article$2*3
+       h3~
+       p~
+
+- ``$n`` lines: class dictionary; every distinct class list is written once
+- ``@name``: <!-- SECTION: name --> block, its content indented below
+- ``tag#id$n[k=v ...]``: element with id, class list $n and data-k="v"
+- ``~``: the element has text content (elided)
+- ``*N``: N identical consecutive siblings (same subtree), written once
+- one space of indentation per nesting level
+
+The form is structure-reversible, not lossless: expand_skeleton() rebuilds
+HTML with the same tag tree, ids, classes, data-* attributes and section
+markers, and skeletonizing that HTML again gives the same skeleton. Text
+becomes "…" and every other attribute is dropped - Alpine bindings
+(x-data, @click, :class), type, href/src, alt and aria-* do not survive,
+so expanded HTML is for structure checks, not for rendering.
+
+Usage:
+    skeleton = skeletonize_html(html)
+    skeleton.text               # compact form for the prompt
+    skeleton.compression_ratio  # source chars / skeleton chars
+    expand_skeleton(skeleton.text)
+"""
+
+from __future__ import annotations
+
+import html as html_lib
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Optional
+
+from gemini_mcp.validation.document import Element, ParsedDocument, parse_document
+
+
+# One-line legend for prompts that embed a skeleton
+SKELETON_LEGEND = (
+    "HTML skeleton: one element per line, indented by depth; tag#id$n[data-*]; "
+    "$n = class list n from the dictionary at the top; @name = section; "
+    "~ = text elided; *N = N identical siblings."
+)
+
+# Elements without a closing tag
+VOID_ELEMENTS = frozenset({
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link",
+    "meta", "param", "source", "track", "wbr",
+})
+
+# Elements whose content is not markup
+RAW_TEXT_ELEMENTS = frozenset({"script", "style", "textarea"})
+
+# Placeholder for elided text in expanded HTML
+ELIDED_TEXT = "…"
+
+_COMMENT_PATTERN = re.compile(r"<!--.*?-->", re.DOTALL)
+_QUOTED = r'"(?:[^"\\]|\\.)*"'
+_LINE_PATTERN = re.compile(
+    rf"^(?P<indent> *)(?:@(?P<section>\w+)|(?P<tag>\w+)"
+    rf"(?:#(?P<id>{_QUOTED}|[^\s$\[~*\"]+))?"
+    rf"(?:\$(?P<cls>\d+))?"
+    rf"(?:\[(?P<data>(?:{_QUOTED}|[^\]\"])*)\])?"
+    rf"(?P<text>~)?(?:\*(?P<count>\d+))?)$"
+)
+_DATA_PAIR_PATTERN = re.compile(rf"([^\s=\]]+)=({_QUOTED}|[^\s\]]+)")
+_PLAIN_ID = re.compile(r'[^\s$\[~*"]+')
+_PLAIN_VALUE = re.compile(r'[^\s\]"=]+')
+
+
+@dataclass
+class _Node:
+    """Element or section marker in the skeleton tree."""
+
+    tag: str  # "" for a section
+    section: str = ""
+    element_id: Optional[str] = None
+    class_ref: int = 0  # 1-based index into the class dictionary, 0 = none
+    data: list[tuple[str, str]] = field(default_factory=list)
+    has_text: bool = False
+    count: int = 1
+    children: list["_Node"] = field(default_factory=list)
+
+    def lines(self, depth: int = 0) -> list[str]:
+        """Skeleton lines of this subtree (repeated siblings collapsed)."""
+        out = [" " * depth + self._head()]
+        blocks: list[Optional[list[str]]] = [child.lines(depth + 1) for child in self.children]
+        previous: Optional[list[str]] = None
+        repeats = 0
+        for block in blocks + [None]:
+            if block is not None and block == previous:
+                repeats += 1
+                continue
+            if previous is not None:
+                if repeats > 1:
+                    previous = [previous[0] + f"*{repeats}"] + previous[1:]
+                out.extend(previous)
+            previous, repeats = block, 1
+        return out
+
+    def _head(self) -> str:
+        if not self.tag:
+            return f"@{self.section}"
+        head = self.tag
+        if self.element_id is not None:
+            plain = _PLAIN_ID.fullmatch(self.element_id)
+            head += f"#{self.element_id}" if plain else f"#{json.dumps(self.element_id)}"
+        if self.class_ref:
+            head += f"${self.class_ref}"
+        if self.data:
+            pairs = " ".join(
+                f"{key}={value if _PLAIN_VALUE.fullmatch(value) else json.dumps(value)}"
+                for key, value in self.data
+            )
+            head += f"[{pairs}]"
+        if self.has_text:
+            head += "~"
+        return head
+
+
+@dataclass
+class HTMLSkeleton:
+    """
+    Skeleton of one HTML string.
+
+    Attributes:
+        text: Compact skeleton (class dictionary + tree lines)
+        classes: Class dictionary; classes[n - 1] is class list $n
+        source_chars: Length of the source HTML
+    """
+
+    text: str
+    classes: list[str]
+    source_chars: int
+
+    @property
+    def compression_ratio(self) -> float:
+        """Source size over skeleton size (higher is smaller)."""
+        return round(self.source_chars / len(self.text), 2) if self.text else 0.0
+
+
+def _has_text(fragment: str) -> bool:
+    return bool(_COMMENT_PATTERN.sub("", fragment).strip())
+
+
+def skeletonize_html(html: str, doc: Optional[ParsedDocument] = None) -> HTMLSkeleton:
+    """
+    Build the skeleton of an HTML string.
+
+    Args:
+        html: HTML content
+        doc: Shared parse of the same HTML (AgentContext.get_parsed_document),
+            if the caller has one
+
+    Returns:
+        HTMLSkeleton with the compact text and its class dictionary
+    """
+    if doc is None:
+        doc = parse_document(html)
+
+    # Tags and section markers as one offset-ordered stream of
+    # (start, end, element, marker); marker is ("open" | "close", name)
+    tokens: list[tuple[int, int, Optional[Element], Optional[tuple[str, str]]]] = [
+        (element.start, element.end, element, None) for element in doc.elements
+    ]
+    for span in doc.sections:
+        tokens.append((span.start, span.content_start, None, ("open", span.name)))
+        if span.content_end is not None and span.end is not None:
+            tokens.append((span.content_end, span.end, None, ("close", span.name)))
+    tokens.sort(key=lambda token: token[0])
+
+    class_refs: dict[str, int] = {}
+    root = _Node(tag="")
+    stack: list[_Node] = [root]
+    position = 0
+
+    for start, end, element, marker in tokens:
+        if start < position:
+            continue  # inside a raw-text element skipped below
+
+        if len(stack) > 1 and _has_text(html[position:start]):
+            stack[-1].has_text = True
+        position = end
+
+        if marker is not None:
+            kind, name = marker
+            if kind == "open":
+                node = _Node(tag="", section=name)
+                stack[-1].children.append(node)
+                stack.append(node)
+            else:
+                _close(stack, "", name)
+            continue
+
+        if element is None:
+            continue
+        if element.closing:
+            _close(stack, element.tag)
+            continue
+
+        # Attribute values are kept unescaped; expand_skeleton() escapes them again
+        attrs = {name: html_lib.unescape(value) for name, value in element.attrs.items()}
+        node = _Node(tag=element.tag, element_id=attrs.get("id"))
+        class_list = " ".join(attrs.get("class", "").split())
+        if class_list:
+            node.class_ref = class_refs.setdefault(class_list, len(class_refs) + 1)
+        node.data = [(name[5:], value) for name, value in attrs.items() if name.startswith("data-")]
+        stack[-1].children.append(node)
+
+        if element.self_closing or element.tag in VOID_ELEMENTS:
+            continue
+        if element.tag in RAW_TEXT_ELEMENTS:
+            # <script>/<style>/<textarea> content is not markup: jump to its end tag
+            close = re.compile(rf"</{element.tag}\s*>", re.IGNORECASE).search(html, end)
+            content_end = close.start() if close else len(html)
+            node.has_text = _has_text(html[end:content_end])
+            position = close.end() if close else len(html)
+            continue
+        stack.append(node)
+
+    classes = list(class_refs)
+    lines = [f"${n} {class_list}" for n, class_list in enumerate(classes, 1)]
+    lines.extend(root.lines(-1)[1:])  # the root itself is not written
+    return HTMLSkeleton(text="\n".join(lines), classes=classes, source_chars=len(html))
+
+
+def _close(stack: list[_Node], tag: str, section: str = "") -> None:
+    """Pop the innermost open node matching a closing tag or marker (if any)."""
+    for depth in range(len(stack) - 1, 0, -1):
+        if stack[depth].tag == tag and stack[depth].section == section:
+            del stack[depth:]
+            return
+
+
+def _parse_value(raw: str) -> str:
+    return json.loads(raw) if raw.startswith('"') else raw
+
+
+def expand_skeleton(text: str) -> str:
+    """
+    Rebuild HTML from a skeleton (structure only; see the module docstring
+    for the attributes that are not restored).
+
+    Args:
+        text: HTMLSkeleton.text
+
+    Returns:
+        HTML with the skeleton's tags, ids, classes, data-* attributes and
+        section markers; elided text is written as "…"
+
+    Raises:
+        ValueError: If a line is not valid skeleton syntax
+    """
+    classes: dict[int, str] = {}
+    root = _Node(tag="")
+    stack: list[tuple[int, _Node]] = [(-1, root)]
+
+    for number, line in enumerate(text.splitlines(), 1):
+        if not line.strip():
+            continue
+        if line.startswith("$"):
+            ref, _, class_list = line[1:].partition(" ")
+            classes[int(ref)] = class_list
+            continue
+        match = _LINE_PATTERN.match(line)
+        if match is None:
+            raise ValueError(f"Invalid skeleton line {number}: {line!r}")
+
+        depth = len(match.group("indent"))
+        while stack[-1][0] >= depth:
+            stack.pop()
+
+        if match.group("section"):
+            node = _Node(tag="", section=match.group("section"))
+        else:
+            node = _Node(
+                tag=match.group("tag"),
+                element_id=_parse_value(match.group("id")) if match.group("id") else None,
+                class_ref=int(match.group("cls") or 0),
+                data=[
+                    (key, _parse_value(value))
+                    for key, value in _DATA_PAIR_PATTERN.findall(match.group("data") or "")
+                ],
+                has_text=bool(match.group("text")),
+            )
+        node.count = int(match.group("count") or 1)
+        stack[-1][1].children.append(node)
+        stack.append((depth, node))
+
+    return "\n".join(_render(child, classes) for child in root.children)
+
+
+def _render(node: _Node, classes: dict[int, str]) -> str:
+    """HTML for a node, repeated node.count times."""
+    inner = "\n".join(_render(child, classes) for child in node.children)
+    if not node.tag:
+        html = f"<!-- SECTION: {node.section} -->\n{inner}\n<!-- /SECTION: {node.section} -->"
+    else:
+        attrs = ""
+        if node.element_id is not None:
+            attrs += f' id="{_escape(node.element_id)}"'
+        if node.class_ref:
+            attrs += f' class="{_escape(classes.get(node.class_ref, ""))}"'
+        for key, value in node.data:
+            attrs += f' data-{key}="{_escape(value)}"'
+        if node.tag in VOID_ELEMENTS:
+            html = f"<{node.tag}{attrs}>"
+        else:
+            text = ELIDED_TEXT if node.has_text else ""
+            body = f"{text}\n{inner}\n" if inner else text
+            html = f"<{node.tag}{attrs}>{body}</{node.tag}>"
+    return "\n".join([html] * node.count)
+
+
+def _escape(value: str) -> str:
+    return html_lib.escape(value, quote=True)
@@ -11,6 +11,8 @@ from dataclasses import dataclass, field
 from enum import Enum
 from typing import Dict, List, Optional, Set, Tuple
 
+from .validation.document import ParsedDocument, parse_document
+
 
 # =============================================================================
 # GAP 4: Token Extraction - Arbitrary Values & Opacity Modifiers
@@ -421,6 +423,19 @@ def _check_common_responsive_issues(html: str, issues: List[str], suggestions: L
 # GAP 6: Accessibility (A11y) Enforcement
 # =============================================================================
 
+_HEADING_TAGS = ("h1", "h2", "h3", "h4", "h5", "h6")
+
+# Attribute prefixes that make an element clickable
+_CLICK_ATTRIBUTES = ("@click", "onclick", "x-on:click")
+
+# Contrast hints, matched against a single class attribute value
+_LIGHT_ON_LIGHT_PATTERN = re.compile(
+    r'\bbg-(?:white|gray-50|gray-100|slate-50|slate-100)[^"]*\btext-(?:gray-300|gray-400|slate-300|slate-400)'
+)
+_DARK_ON_DARK_PATTERN = re.compile(
+    r'\bbg-(?:gray-800|gray-900|slate-800|slate-900|black)[^"]*\btext-(?:gray-600|gray-700|slate-600|slate-700)'
+)
+
 class A11yLevel(Enum):
     """WCAG conformance levels."""
     A = "A"
@@ -473,27 +488,29 @@ class A11yValidator:
     def __init__(self, level: A11yLevel = A11yLevel.AA):
         self.level = level
 
-    def validate(self, html: str) -> A11yReport:
+    def validate(self, html: str, document: Optional[ParsedDocument] = None) -> A11yReport:
         """Validate HTML for accessibility issues.
 
         Args:
             html: HTML string to validate
+            document: Shared parse of ``html`` (parsed here if omitted)
 
         Returns:
             A11yReport with all findings
         """
         issues: List[A11yIssue] = []
         passed: List[str] = []
+        doc = document if document is not None else parse_document(html)
 
         # Run all checks
-        self._check_heading_hierarchy(html, issues, passed)
-        self._check_aria_attributes(html, issues, passed)
-        self._check_focus_states(html, issues, passed)
-        self._check_form_labels(html, issues, passed)
-        self._check_image_alt(html, issues, passed)
-        self._check_link_text(html, issues, passed)
-        self._check_color_contrast_hints(html, issues, passed)
-        self._check_interactive_roles(html, issues, passed)
+        self._check_heading_hierarchy(doc, issues, passed)
+        self._check_aria_attributes(doc, issues, passed)
+        self._check_focus_states(doc, issues, passed)
+        self._check_form_labels(doc, issues, passed)
+        self._check_image_alt(doc, issues, passed)
+        self._check_link_text(doc, issues, passed)
+        self._check_color_contrast_hints(doc, issues, passed)
+        self._check_interactive_roles(doc, issues, passed)
 
         # Calculate score
         total_checks = len(issues) + len(passed)
@@ -541,16 +558,23 @@ class A11yValidator:
 
         return result
 
-    def _check_heading_hierarchy(self, html: str, issues: List[A11yIssue], passed: List[str]):
+    def _check_heading_hierarchy(self, doc: ParsedDocument, issues: List[A11yIssue], passed: List[str]):
         """Check for proper heading hierarchy (h1 -> h2 -> h3, no skipping)."""
-        headings = re.findall(r'<h(\d)[^>]*>', html, re.IGNORECASE)
+        levels = [int(h.tag[1]) for h in doc.find_all(*_HEADING_TAGS)]
+        self.check_heading_levels(levels, issues, passed)
 
-        if not headings:
+    def check_heading_levels(self, levels: List[int], issues: List[A11yIssue], passed: List[str]):
+        """Heading hierarchy check on heading levels in document order.
+
+        Args:
+            levels: Heading levels (1-6) in document order
+            issues: Findings are appended here
+            passed: Passed check names are appended here
+        """
+        if not levels:
             passed.append("No headings to validate")
             return
 
-        levels = [int(h) for h in headings]
-
         # Check for h1
         if 1 not in levels:
             issues.append(A11yIssue(
@@ -575,10 +599,19 @@ class A11yValidator:
         if not any(i.rule == "heading-order" for i in issues):
             passed.append("Heading hierarchy is correct")
 
-    def _check_aria_attributes(self, html: str, issues: List[A11yIssue], passed: List[str]):
+    def _check_aria_attributes(self, doc: ParsedDocument, issues: List[A11yIssue], passed: List[str]):
         """Check for proper ARIA attribute usage."""
         # Check for aria-label on interactive elements without visible text
-        buttons_no_text = re.findall(r'<button[^>]*>(\s*<[^>]+>\s*)</button>', html, re.IGNORECASE)
+        # (buttons whose only content is a single tag, e.g. an icon)
+        buttons_no_text = []
+        for button in doc.find_all("button"):
+            inner = doc.next_element(button)
+            closer = doc.next_element(inner) if inner is not None else None
+            if closer is None or not closer.closing or closer.tag != "button":
+                continue
+            if doc.text_between(button, inner).strip() or doc.text_between(inner, closer).strip():
+                continue
+            buttons_no_text.append(doc.html[button.end:closer.start])
         for match in buttons_no_text:
             # Icon-only buttons need aria-label
             if 'aria-label' not in match and 'aria-labelledby' not in match:
@@ -592,7 +625,7 @@ class A11yValidator:
                 ))
 
         # Check for invalid ARIA roles
-        roles = re.findall(r'role="([^"]+)"', html)
+        roles = [el.attrs["role"] for el in doc.with_attribute("role") if el.attrs["role"]]
         valid_roles = {'button', 'link', 'checkbox', 'radio', 'textbox', 'listbox',
                        'menu', 'menuitem', 'tab', 'tabpanel', 'tablist', 'dialog',
                        'alert', 'alertdialog', 'navigation', 'main', 'banner',
@@ -611,11 +644,14 @@ class A11yValidator:
         if not any(i.rule.startswith("aria") for i in issues):
             passed.append("ARIA attributes are valid")
 
-    def _check_focus_states(self, html: str, issues: List[A11yIssue], passed: List[str]):
+    def _check_focus_states(self, doc: ParsedDocument, issues: List[A11yIssue], passed: List[str]):
         """Check for focus visibility on interactive elements."""
         # Look for interactive elements
-        interactive_pattern = r'<(button|a|input|select|textarea)[^>]*class="([^"]*)"[^>]*>'
-        matches = re.findall(interactive_pattern, html, re.IGNORECASE)
+        matches = [
+            (el.tag, el.attrs["class"])
+            for el in doc.find_all("button", "a", "input", "select", "textarea")
+            if "class" in el.attrs
+        ]
 
         missing_focus = []
         for element, classes in matches:
@@ -638,14 +674,15 @@ class A11yValidator:
         else:
             passed.append("Focus states are defined")
 
-    def _check_form_labels(self, html: str, issues: List[A11yIssue], passed: List[str]):
+    def _check_form_labels(self, doc: ParsedDocument, issues: List[A11yIssue], passed: List[str]):
         """Check that form inputs have associated labels."""
         # Find inputs without labels
-        inputs = re.findall(r'<input[^>]*id="([^"]*)"[^>]*>', html, re.IGNORECASE)
-        labels = re.findall(r'<label[^>]*for="([^"]*)"[^>]*>', html, re.IGNORECASE)
+        input_elements = doc.find_all("input")
+        inputs = [el.attrs["id"] for el in input_elements if "id" in el.attrs]
+        labels = [el.attrs["for"] for el in doc.find_all("label") if "for" in el.attrs]
 
         # Also check for aria-label
-        aria_labeled = re.findall(r'<input[^>]*aria-label="[^"]*"[^>]*>', html, re.IGNORECASE)
+        aria_labeled = [el for el in input_elements if "aria-label" in el.attrs]
 
         unlabeled = set(inputs) - set(labels)
         if unlabeled and len(aria_labeled) < len(unlabeled):
@@ -658,10 +695,10 @@ class A11yValidator:
         else:
             passed.append("Form inputs have labels")
 
-    def _check_image_alt(self, html: str, issues: List[A11yIssue], passed: List[str]):
+    def _check_image_alt(self, doc: ParsedDocument, issues: List[A11yIssue], passed: List[str]):
         """Check that images have alt attributes."""
         # Images without alt
-        imgs_no_alt = re.findall(r'<img(?![^>]*alt=)[^>]*>', html, re.IGNORECASE)
+        imgs_no_alt = [el for el in doc.find_all("img") if "alt" not in el.attrs]
 
         if imgs_no_alt:
             issues.append(A11yIssue(
@@ -674,11 +711,15 @@ class A11yValidator:
         else:
             passed.append("Images have alt attributes")
 
-    def _check_link_text(self, html: str, issues: List[A11yIssue], passed: List[str]):
+    def _check_link_text(self, doc: ParsedDocument, issues: List[A11yIssue], passed: List[str]):
         """Check that links have meaningful text."""
-        # Find links with generic text
+        # Find links with generic text (text-only links: <a ...>text</a>)
         generic_texts = ['click here', 'here', 'read more', 'learn more', 'more', 'link']
-        links = re.findall(r'<a[^>]*>([^<]*)</a>', html, re.IGNORECASE)
+        links = []
+        for link in doc.find_all("a"):
+            closer = doc.next_element(link)
+            if closer is not None and closer.closing and closer.tag == "a":
+                links.append(doc.text_between(link, closer))
 
         generic_found = []
         for text in links:
@@ -695,16 +736,15 @@ class A11yValidator:
         else:
             passed.append("Link text is descriptive")
 
-    def _check_color_contrast_hints(self, html: str, issues: List[A11yIssue], passed: List[str]):
+    def _check_color_contrast_hints(self, doc: ParsedDocument, issues: List[A11yIssue], passed: List[str]):
         """Basic check for potential color contrast issues."""
         # This is a hint-based check since we can't calculate actual contrast
         # without rendering
 
+        class_values = [doc.elements[i].attrs["class"] for i in doc.attribute_index.get("class", ())]
+
         # Light text on light backgrounds
-        light_on_light = re.findall(
-            r'class="[^"]*\bbg-(?:white|gray-50|gray-100|slate-50|slate-100)[^"]*\btext-(?:gray-300|gray-400|slate-300|slate-400)',
-            html
-        )
+        light_on_light = [c for c in class_values if _LIGHT_ON_LIGHT_PATTERN.search(c)]
 
         if light_on_light:
             issues.append(A11yIssue(
@@ -715,10 +755,7 @@ class A11yValidator:
             ))
 
         # Dark text on dark backgrounds
-        dark_on_dark = re.findall(
-            r'class="[^"]*\bbg-(?:gray-800|gray-900|slate-800|slate-900|black)[^"]*\btext-(?:gray-600|gray-700|slate-600|slate-700)',
-            html
-        )
+        dark_on_dark = [c for c in class_values if _DARK_ON_DARK_PATTERN.search(c)]
 
         if dark_on_dark:
             issues.append(A11yIssue(
@@ -731,18 +768,21 @@ class A11yValidator:
         if not light_on_light and not dark_on_dark:
             passed.append("No obvious contrast issues detected")
 
-    def _check_interactive_roles(self, html: str, issues: List[A11yIssue], passed: List[str]):
+    def _check_interactive_roles(self, doc: ParsedDocument, issues: List[A11yIssue], passed: List[str]):
         """Check that interactive elements have proper roles."""
         # Divs with onClick should have button role
-        clickable_divs = re.findall(r'<div[^>]*(?:@click|onclick|x-on:click)[^>]*>', html, re.IGNORECASE)
+        clickable_divs = [
+            el for el in doc.find_all("div")
+            if any(attr.startswith(_CLICK_ATTRIBUTES) for attr in el.attrs)
+        ]
 
         for div in clickable_divs:
-            if 'role="button"' not in div and 'role="link"' not in div:
+            if div.attrs.get("role") not in ("button", "link"):
                 issues.append(A11yIssue(
                     severity="error",
                     rule="interactive-role",
                     message="Clickable div without button/link role",
-                    element=div[:80],
+                    element=doc.raw(div)[:80],
                     suggestion="Add role='button' and tabindex='0'",
                     auto_fixable=True,
                 ))
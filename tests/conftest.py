@@ -25,6 +25,17 @@ def pytest_configure(config):
     )
 
 
+@pytest.fixture(autouse=True)
+def isolated_dna_store(tmp_path, monkeypatch):
+    """Point the default DNA store at tmp_path instead of the user's HOME."""
+    from gemini_mcp.orchestration import dna_store
+
+    monkeypatch.setattr(dna_store.DNAStore, "DEFAULT_PATH", str(tmp_path / "dna_db.db"))
+    dna_store.reset_dna_store()
+    yield
+    dna_store.reset_dna_store()
+
+
 @pytest.fixture
 def mock_genai_client():
     """Mock Google GenAI client."""
@@ -0,0 +1,919 @@
+"""Tests for Phase 5 caching and request-deduplication layers.
+
+- Persistent L2 (SQLite) tier for DesignCache
+- Gemini context caching for agent system prompts
+- Real token usage from usage_metadata
+- Single-flight coalescing of identical in-flight requests
+- Near-duplicate (reworded) design request lookup
+- Prompt-size budget for agent prompts
+"""
+
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+
+# =============================================================================
+# DesignCache L2 Disk Tier
+# =============================================================================
+
+
+class TestDesignCacheDiskTier:
+    """Tests for the persistent SQLite second-level cache."""
+
+    def test_disk_tier_roundtrip_compressed(self, tmp_path):
+        """Values survive a roundtrip and are stored compressed."""
+        from gemini_mcp.cache import DiskCacheTier
+
+        tier = DiskCacheTier(str(tmp_path / "cache.db"))
+        value = {"html": "<div class='p-4'>" + "x" * 5000 + "</div>"}
+
+        assert tier.set("k1", value, ttl_seconds=60)
+        found = tier.get("k1")
+
+        assert found is not None
+        assert found[0] == value
+        assert tier.get_stats()["bytes"] < 1000  # zlib compressed
+
+    def test_disk_tier_ttl_expiration(self, tmp_path):
+        """Expired entries are not returned."""
+        from gemini_mcp.cache import DiskCacheTier
+
+        tier = DiskCacheTier(str(tmp_path / "cache.db"))
+        tier.set("old", {"v": 1}, ttl_seconds=60, created_at=time.time() - 120)
+
+        assert tier.get("old") is None
+        assert tier.get_stats()["expirations"] >= 1
+
+    def test_disk_tier_size_eviction(self, tmp_path):
+        """Least recently accessed entries are evicted over the size quota."""
+        import os
+        from gemini_mcp.cache import DiskCacheTier
+
+        tier = DiskCacheTier(str(tmp_path / "cache.db"), max_bytes=1500)
+        for i in range(5):
+            # Hex payload compresses to roughly 550 bytes per entry
+            tier.set(f"k{i}", {"blob": os.urandom(512).hex()}, ttl_seconds=60)
+
+        stats = tier.get_stats()
+        assert stats["bytes"] <= 1500
+        assert stats["evictions"] > 0
+        assert tier.get("k4") is not None  # Newest survives
+
+    def test_warm_start_after_restart(self, tmp_path):
+        """A new cache instance serves entries written by a previous one."""
+        from gemini_mcp.cache import DesignCache
+
+        db = str(tmp_path / "cache.db")
+        first = DesignCache(ttl_hours=1, max_entries=10, disk_path=db)
+        first.set({"html": "<nav/>"}, component_type="navbar", theme="dark")
+
+        second = DesignCache(ttl_hours=1, max_entries=10, disk_path=db)
+        assert second.get_stats()["warm_loaded"] == 1
+        assert second.get(component_type="navbar", theme="dark") == {"html": "<nav/>"}
+
+    def test_l1_miss_falls_through_to_disk(self, tmp_path):
+        """Entries evicted from memory are promoted back from disk."""
+        from gemini_mcp.cache import DesignCache
+
+        cache = DesignCache(ttl_hours=1, max_entries=2, disk_path=str(tmp_path / "c.db"))
+        cache.set({"v": 1}, key="a")
+        cache.set({"v": 2}, key="b")
+        cache.set({"v": 3}, key="c")  # Evicts 'a' from L1 only
+
+        assert cache.get(key="a") == {"v": 1}
+        assert cache.get_stats()["l2_hits"] == 1
+
+    async def test_async_access_keeps_disk_off_the_loop(self, tmp_path, monkeypatch):
+        """aget()/aset() run SQLite reads and writes in a worker thread."""
+        import threading
+
+        from gemini_mcp.cache import DesignCache
+
+        cache = DesignCache(ttl_hours=1, max_entries=1, disk_path=str(tmp_path / "c.db"))
+        loop_thread = threading.get_ident()
+        disk_threads = []
+        for name in ("get", "set"):
+            original = getattr(cache._disk, name)
+
+            def spy(*args, _original=original, **kwargs):
+                disk_threads.append(threading.get_ident())
+                return _original(*args, **kwargs)
+
+            monkeypatch.setattr(cache._disk, name, spy)
+
+        await cache.aset({"v": 1}, key="a")
+        await cache.aset({"v": 2}, key="b")  # Evicts 'a' from L1 only
+
+        assert await cache.aget(key="a") == {"v": 1}
+        assert cache.get_stats()["l2_hits"] == 1
+        assert len(disk_threads) == 3
+        assert loop_thread not in disk_threads
+
+    def test_invalidate_and_clear_cover_both_tiers(self, tmp_path):
+        """invalidate() and clear() remove entries from disk too."""
+        from gemini_mcp.cache import DesignCache
+
+        db = str(tmp_path / "cache.db")
+        cache = DesignCache(ttl_hours=1, max_entries=10, disk_path=db)
+        cache.set({"v": 1}, key="a")
+        cache.set({"v": 2}, key="b")
+
+        assert cache.invalidate(key="a") is True
+        # 'b' is held in both tiers
+        assert cache.clear() == 2
+
+        reopened = DesignCache(ttl_hours=1, max_entries=10, disk_path=db)
+        assert reopened.get(key="a") is None
+        assert reopened.get(key="b") is None
+
+    def test_memory_only_by_default(self):
+        """Without disk_path the cache stays memory-only."""
+        from gemini_mcp.cache import DesignCache
+
+        cache = DesignCache(ttl_hours=1, max_entries=10)
+        assert "disk" not in cache.get_stats()
+
+    def test_unwritable_disk_path_degrades(self, tmp_path):
+        """An unusable disk path leaves a working memory-only cache."""
+        from gemini_mcp.cache import DesignCache
+
+        blocker = tmp_path / "file"
+        blocker.write_text("not a dir")
+        cache = DesignCache(disk_path=str(blocker / "cache.db"))
+
+        cache.set({"v": 1}, key="a")
+        assert cache.get(key="a") == {"v": 1}
+        assert "disk" not in cache.get_stats()
+
+
+# =============================================================================
+# Gemini Context Cache Mode
+# =============================================================================
+
+
+LONG_PROMPT = "You are The Architect. " * 500  # ~11K chars, above the 2048 token minimum
+
+
+def _make_cache_client(mock_genai_client, name="cachedContents/abc"):
+    """Attach async cache endpoints to the mocked genai client."""
+    mock_genai_client.aio.caches = MagicMock()
+    mock_genai_client.aio.caches.create = AsyncMock(return_value=SimpleNamespace(name=name))
+    mock_genai_client.aio.caches.update = AsyncMock()
+    return mock_genai_client
+
+
+def _make_gemini_client(mock_genai_client):
+    """GeminiClient with context-cache mode on and a mocked genai client."""
+    from gemini_mcp.client import GeminiClient
+    from gemini_mcp.config import GeminiConfig
+
+    config = GeminiConfig(
+        project_id="test-project",
+        design_cache_path="",
+        context_cache_enabled=True,
+    )
+    client = GeminiClient(config=config)
+    client._client = _make_cache_client(mock_genai_client)
+    return client
+
+
+def _response(text="ok", cached_tokens=0):
+    return SimpleNamespace(
+        text=text,
+        candidates=[],
+        usage_metadata=SimpleNamespace(cached_content_token_count=cached_tokens),
+    )
+
+
+class TestContextCacheMode:
+    """Tests for per-agent cached_content handles."""
+
+    async def test_get_or_create_uses_sdk_signature(self, mock_genai_client):
+        """Handles are created with model + CreateCachedContentConfig."""
+        from google.genai import types
+        from gemini_mcp.context_cache import GeminiContextCache
+
+        genai_client = _make_cache_client(mock_genai_client)
+        cache = GeminiContextCache("test-project", client_provider=lambda: genai_client)
+
+        cached = await cache.get_or_create("architect", LONG_PROMPT, "gemini-3-pro-preview", "EXAMPLES")
+
+        assert cached.cache_name == "cachedContents/abc"
+        kwargs = genai_client.aio.caches.create.call_args.kwargs
+        assert kwargs["model"] == "gemini-3-pro-preview"
+        assert isinstance(kwargs["config"], types.CreateCachedContentConfig)
+        assert kwargs["config"].contents[0].parts[0].text == "EXAMPLES"
+
+    async def test_handles_keyed_per_agent_and_model(self, mock_genai_client):
+        """The same prompt gets separate handles per agent and per model."""
+        from gemini_mcp.context_cache import GeminiContextCache
+
+        genai_client = _make_cache_client(mock_genai_client)
+        cache = GeminiContextCache("test-project", client_provider=lambda: genai_client)
+
+        await cache.get_or_create("architect", LONG_PROMPT, "gemini-3-pro-preview")
+        await cache.get_or_create("architect", LONG_PROMPT, "gemini-3-pro-preview")
+        await cache.get_or_create("critic", LONG_PROMPT, "gemini-3-pro-preview")
+        await cache.get_or_create("architect", LONG_PROMPT, "gemini-3-flash-preview")
+
+        assert genai_client.aio.caches.create.await_count == 3
+        assert cache.get_metrics()["hits"] == 1
+
+    async def test_short_prompt_not_cached(self, mock_genai_client):
+        """Prompts below the caching minimum return None."""
+        from gemini_mcp.context_cache import GeminiContextCache
+
+        genai_client = _make_cache_client(mock_genai_client)
+        cache = GeminiContextCache("test-project", client_provider=lambda: genai_client)
+
+        assert await cache.get_or_create("critic", "short", "gemini-3-pro-preview") is None
+        genai_client.aio.caches.create.assert_not_awaited()
+
+    async def test_handle_refreshed_before_expiry(self, mock_genai_client):
+        """A handle inside the refresh margin has its TTL extended."""
+        from gemini_mcp.context_cache import GeminiContextCache
+
+        genai_client = _make_cache_client(mock_genai_client)
+        cache = GeminiContextCache("test-project", client_provider=lambda: genai_client)
+
+        cached = await cache.get_or_create("architect", LONG_PROMPT, "gemini-3-pro-preview")
+        cached.expires_at = time.time() + 5
+
+        again = await cache.get_or_create("architect", LONG_PROMPT, "gemini-3-pro-preview")
+
+        assert again is cached
+        assert cached.ttl_remaining > 3000
+        genai_client.aio.caches.update.assert_awaited_once()
+        assert cache.get_metrics()["refreshes"] == 1
+
+    async def test_generate_text_uses_cached_content(self, mock_genai_client):
+        """In cache mode the request carries cached_content and no system instruction."""
+        client = _make_gemini_client(mock_genai_client)
+        mock_genai_client.aio.models.generate_content.return_value = _response(cached_tokens=2800)
+
+        result = await client.generate_text(
+            prompt="## Component Type\nhero",
+            system_instruction=LONG_PROMPT,
+            cache_agent="architect",
+        )
+
+        call = mock_genai_client.aio.models.generate_content.call_args.kwargs
+        assert call["config"].cached_content == "cachedContents/abc"
+        assert call["config"].system_instruction is None
+        assert call["contents"] == "## Component Type\nhero"
+        assert result["context_cache"]["hit"] is True
+        assert result["context_cache"]["cached_tokens"] == 2800
+        assert client.context_cache.get_metrics()["tokens_served_from_cache"] == 2800
+
+    async def test_generate_text_falls_back_when_handle_expired(self, mock_genai_client):
+        """A server-side expired handle is invalidated and the full prompt is sent."""
+        client = _make_gemini_client(mock_genai_client)
+        mock_genai_client.aio.models.generate_content.side_effect = [
+            Exception("404 NOT_FOUND: CachedContent not found (or permission denied)"),
+            _response(),
+        ]
+
+        result = await client.generate_text(
+            prompt="user part",
+            system_instruction=LONG_PROMPT,
+            cache_agent="architect",
+            cacheable_prefix="EXAMPLES",
+        )
+
+        retry = mock_genai_client.aio.models.generate_content.call_args.kwargs
+        assert retry["config"].system_instruction == LONG_PROMPT
+        assert retry["contents"] == "EXAMPLES\n\nuser part"
+        assert result["context_cache"]["hit"] is False
+        assert client.context_cache.get_metrics()["invalidations"] == 1
+
+    async def test_mode_off_leaves_request_unchanged(self, mock_genai_client):
+        """Without the mode, cache_agent is ignored and no metadata is added."""
+        client = _make_gemini_client(mock_genai_client)
+        client.disable_context_cache()
+        mock_genai_client.aio.models.generate_content.return_value = _response()
+
+        result = await client.generate_text(
+            prompt="p", system_instruction=LONG_PROMPT, cache_agent="architect"
+        )
+
+        call = mock_genai_client.aio.models.generate_content.call_args.kwargs
+        assert call["config"].cached_content is None
+        assert "context_cache" not in result
+        mock_genai_client.aio.caches.create.assert_not_awaited()
+
+    def test_agent_moves_few_shot_into_cacheable_prefix(self):
+        """With caching on, few-shot examples leave the per-call prompt."""
+        from gemini_mcp.agents import ArchitectAgent
+        from gemini_mcp.orchestration.context import AgentContext
+
+        context = AgentContext(component_type="hero")
+        context.few_shot_examples = [{"component_type": "hero", "html": "<section>x</section>"}]
+
+        uncached = ArchitectAgent(MagicMock(context_cache_enabled=False))
+        cached = ArchitectAgent(MagicMock(context_cache_enabled=True))
+
+        assert "REFERENCE EXAMPLES" in uncached._build_architect_prompt(context)
+        assert "REFERENCE EXAMPLES" not in cached._build_architect_prompt(context)
+        assert uncached.context_cache_kwargs("x") == {}
+        assert cached.context_cache_kwargs("x") == {"cache_agent": "architect", "cacheable_prefix": "x"}
+
+    def test_telemetry_reports_cache_savings(self):
+        """Cached token savings are aggregated per pipeline and in the summary."""
+        from gemini_mcp.orchestration.telemetry import PipelineTelemetry
+
+        telemetry = PipelineTelemetry()
+        telemetry.start_pipeline("component", "p1")
+        telemetry.record_context_cache("p1", "architect", hit=True, cached_tokens=3000)
+        telemetry.record_context_cache("p1", "alchemist", hit=False)
+        metrics = telemetry.end_pipeline("p1", success=True)
+
+        assert metrics.to_dict()["cached_tokens_saved"] == 3000
+        summary = telemetry.get_summary()
+        assert summary["context_cache_hit_rate"] == 0.5
+        assert summary["total_cached_tokens_saved"] == 3000
+
+
+# =============================================================================
+# Real Token Usage (usage_metadata)
+# =============================================================================
+
+
+def _usage(prompt=1000, candidates=400, thoughts=250, cached=600, total=1650):
+    return SimpleNamespace(
+        prompt_token_count=prompt,
+        candidates_token_count=candidates,
+        thoughts_token_count=thoughts,
+        cached_content_token_count=cached,
+        tool_use_prompt_token_count=None,
+        total_token_count=total,
+    )
+
+
+class _UsageAgent:
+    """Minimal agent stub that reports fixed token usage."""
+
+    name = "The Architect"
+
+    def __init__(self, outcomes):
+        self._outcomes = list(outcomes)
+
+    async def execute(self, context):
+        from gemini_mcp.agents.base import AgentResult, AgentRole
+
+        success, usage = self._outcomes.pop(0)
+        return AgentResult(
+            success=success,
+            output="<section id='hero'></section>",
+            agent_role=AgentRole.ARCHITECT,
+            execution_time_ms=1.0,
+            token_usage=dict(usage),
+        )
+
+    def validate_output(self, output):
+        return True, []
+
+
+class TestTokenUsage:
+    """Tests for threading usage_metadata from the client to reports."""
+
+    def test_extract_token_usage(self):
+        """usage_metadata is mapped to input/output/thinking/cached/total."""
+        from gemini_mcp.client import extract_token_usage
+
+        usage = extract_token_usage(SimpleNamespace(usage_metadata=_usage()))
+
+        assert usage == {
+            "input_tokens": 1000,
+            "output_tokens": 400,
+            "thinking_tokens": 250,
+            "cached_tokens": 600,
+            "total_tokens": 1650,
+        }
+        assert extract_token_usage(SimpleNamespace(usage_metadata=None)) == {}
+
+    async def test_generate_text_returns_and_accumulates_usage(self, mock_genai_client):
+        """generate_text reports usage and the client keeps per-model totals."""
+        client = _make_gemini_client(mock_genai_client)
+        client.disable_context_cache()
+        mock_genai_client.aio.models.generate_content.return_value = SimpleNamespace(
+            text="ok", candidates=[], usage_metadata=_usage()
+        )
+
+        first = await client.generate_text(prompt="p", model="gemini-3-pro-preview")
+        await client.generate_text(prompt="p", model="gemini-3-pro-preview")
+
+        assert first["token_usage"]["thinking_tokens"] == 250
+        totals = client.get_usage_stats()["gemini-3-pro-preview"]
+        assert totals["calls"] == 2
+        assert totals["total_tokens"] == 3300
+
+    async def test_agent_result_carries_token_usage(self):
+        """Agents copy the client's token usage onto AgentResult."""
+        from gemini_mcp.agents import AlchemistAgent
+        from gemini_mcp.orchestration.context import AgentContext
+
+        client = MagicMock(context_cache_enabled=False)
+        client.generate_text = AsyncMock(return_value={
+            "text": "```css\n:root { --brand: #fff; }\n```",
+            "token_usage": {"input_tokens": 900, "output_tokens": 300, "total_tokens": 1200},
+        })
+        agent = AlchemistAgent(client)
+
+        result = await agent.execute(AgentContext(component_type="hero"))
+
+        assert result.token_usage["input_tokens"] == 900
+        assert result.total_tokens == 1200
+
+    async def test_correction_retries_sum_token_usage(self):
+        """Tokens from failed attempts are included in the step's usage."""
+        from gemini_mcp.orchestration.context import AgentContext
+        from gemini_mcp.orchestration.orchestrator import AgentOrchestrator
+
+        usage = {"input_tokens": 100, "output_tokens": 50, "total_tokens": 150}
+        agent = _UsageAgent([(False, usage), (True, usage)])
+        orchestrator = AgentOrchestrator(MagicMock())
+
+        result = await orchestrator._execute_with_correction(agent, AgentContext(), max_retries=1)
+
+        assert result.total_tokens == 300
+        assert result.token_usage["input_tokens"] == 200
+
+    async def test_run_pipeline_reports_real_tokens(self):
+        """PipelineResult and telemetry carry the agents' real token counts."""
+        from gemini_mcp.orchestration.context import AgentContext
+        from gemini_mcp.orchestration.orchestrator import AgentOrchestrator
+        from gemini_mcp.orchestration.pipelines import PipelineType
+        from gemini_mcp.orchestration.telemetry import get_telemetry, reset_telemetry
+
+        reset_telemetry()
+        usage = {"input_tokens": 1000, "output_tokens": 400, "thinking_tokens": 250,
+                 "cached_tokens": 600, "total_tokens": 1650}
+        orchestrator = AgentOrchestrator(MagicMock())
+        orchestrator.enable_validation = False
+        orchestrator.register_agent("architect", _UsageAgent([(True, usage)]))
+
+        result = await orchestrator.run_pipeline(
+            PipelineType.REFINE,
+            AgentContext(previous_output="<section></section>", modification_request="tighter"),
+        )
+
+        assert result.tokens_per_agent == {"architect": 1650}
+        assert result.total_tokens == 1650
+        assert result.to_mcp_response()["token_usage"]["cached_tokens"] == 600
+        stats = get_telemetry().get_agent_stats("architect")
+        assert stats["total_tokens"] == 1650
+        assert stats["avg_thinking_tokens"] == 250
+        reset_telemetry()
+
+    def test_cost_analyzer_records_real_usage(self):
+        """Cached input tokens are priced at the discounted rate."""
+        from gemini_mcp.maestro.analytics.cost_analyzer import PRICING, CostAnalyzer
+
+        analyzer = CostAnalyzer()
+        analyzer.record_usage("s1", {"input_tokens": 2000, "output_tokens": 1000,
+                                     "thinking_tokens": 0, "cached_tokens": 1000})
+        cost = analyzer.get_session_cost("s1")
+
+        expected_input = PRICING["input"] + PRICING["cached_input"]
+        assert cost.input_cost == pytest.approx(expected_input)
+        assert cost.to_dict()["tokens"]["cached"] == 1000
+
+
+# =============================================================================
+# Single-Flight Request Coalescing
+# =============================================================================
+
+
+class TestSingleFlight:
+    """Tests for coalescing concurrent identical requests."""
+
+    async def test_concurrent_calls_share_one_execution(self):
+        """Only the first caller runs; followers get a copy of its result."""
+        from gemini_mcp.cache import SingleFlight
+
+        flights = SingleFlight()
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"html": "<div></div>"}
+
+        results = await asyncio.gather(*(flights.do("k", work) for _ in range(5)))
+
+        assert calls == 1
+        assert all(r == {"html": "<div></div>"} for r in results)
+        assert results[0] is not results[1]  # per-caller dicts
+        assert flights.get_stats() == {"leaders": 1, "coalesced": 4, "in_flight": 0}
+
+    async def test_errors_reach_every_waiter_and_key_is_released(self):
+        """A failing call fails all waiters; the next call runs again."""
+        from gemini_mcp.cache import SingleFlight
+
+        flights = SingleFlight()
+
+        async def boom():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("quota")
+
+        results = await asyncio.gather(
+            flights.do("k", boom), flights.do("k", boom), return_exceptions=True
+        )
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+        async def ok():
+            return "fine"
+
+        assert await flights.do("k", ok) == "fine"
+
+    async def test_cancelled_waiter_does_not_cancel_others(self):
+        """Cancelling the leader's caller leaves the shared call running."""
+        from gemini_mcp.cache import SingleFlight
+
+        flights = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.02)
+            return "done"
+
+        leader = asyncio.ensure_future(flights.do("k", work))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flights.do("k", work))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        assert await follower == "done"
+
+    async def test_design_component_burst_makes_one_api_call(self, mock_genai_client):
+        """Identical concurrent design_component calls share one generation."""
+        from gemini_mcp.cache import DesignCache
+        from gemini_mcp.client import GeminiClient
+        from gemini_mcp.config import GeminiConfig
+
+        async def slow_generate(**kwargs):
+            await asyncio.sleep(0.01)
+            return SimpleNamespace(
+                text=json.dumps({"component_id": "hero-1", "html": "<section></section>"}),
+                candidates=[],
+                usage_metadata=None,
+            )
+
+        mock_genai_client.aio.models.generate_content = AsyncMock(side_effect=slow_generate)
+        client = GeminiClient(config=GeminiConfig(project_id="test-project", design_cache_path=""))
+        client._client = mock_genai_client
+        client._cache = DesignCache()
+
+        results = await asyncio.gather(*(
+            client.design_component("hero", {"context": "SaaS"}) for _ in range(3)
+        ))
+
+        assert mock_genai_client.aio.models.generate_content.await_count == 1
+        assert {r["component_id"] for r in results} == {"hero-1"}
+        assert client._cache.get_stats()["coalesced"] == 2
+
+    async def test_context_cache_burst_creates_one_handle(self, mock_genai_client):
+        """A burst of get_or_create calls creates a single remote cache."""
+        from gemini_mcp.context_cache import GeminiContextCache
+
+        genai_client = _make_cache_client(mock_genai_client)
+
+        async def slow_create(**kwargs):
+            await asyncio.sleep(0.01)
+            return SimpleNamespace(name="cachedContents/burst")
+
+        genai_client.aio.caches.create = AsyncMock(side_effect=slow_create)
+        cache = GeminiContextCache("test-project", client_provider=lambda: genai_client)
+
+        handles = await asyncio.gather(*(
+            cache.get_or_create("architect", LONG_PROMPT, "gemini-3-pro-preview")
+            for _ in range(4)
+        ))
+
+        assert genai_client.aio.caches.create.await_count == 1
+        assert {h.cache_name for h in handles} == {"cachedContents/burst"}
+        metrics = cache.get_metrics()
+        assert metrics["misses"] == 1
+        assert metrics["coalesced"] == 3
+
+
+# =============================================================================
+# Near-Duplicate Design Requests
+# =============================================================================
+
+
+def _design_params(context, content=None, theme="modern-minimal"):
+    return {
+        "component_type": "button",
+        "design_spec": {"context": context, "content_structure": content or {"label": "Subscribe"}},
+        "style_guide": {"theme": theme},
+        "constraints": None,
+        "content_language": "en",
+    }
+
+
+class TestNearDuplicateCache:
+    """Tests for the second-stage lookup over normalized request text."""
+
+    def test_reworded_request_hits_and_reports_uplift(self):
+        """Case/whitespace/filler-word variants reuse the cached design."""
+        from gemini_mcp.cache import DesignCache
+
+        cache = DesignCache(near_duplicate_threshold=0.9)
+        cache.set({"html": "<button>Subscribe</button>"}, **_design_params("Primary CTA for newsletter"))
+
+        hit = cache.get(**_design_params("  primary CTA for   the Newsletter "))
+        assert hit["html"] == "<button>Subscribe</button>"
+        assert hit["_near_duplicate"] == {"similarity": 1.0}
+        assert cache.get(**_design_params("Secondary link in footer")) is None
+
+        stats = cache.get_stats()
+        assert stats["hit_rate"] == 0.5 and stats["exact_hit_rate"] == 0.0
+        assert stats["near_duplicate"]["hits"] == 1
+        assert stats["near_duplicate"]["hit_rate_uplift"] == 0.5
+
+    def test_other_parameters_must_match_exactly(self):
+        """Only context/content_structure are compared by similarity."""
+        from gemini_mcp.cache import DesignCache
+
+        cache = DesignCache(near_duplicate_threshold=0.9)
+        cache.set({"html": "<button/>"}, **_design_params("Primary CTA for newsletter"))
+
+        assert cache.get(**_design_params("primary cta newsletter", theme="cyberpunk")) is None
+        assert DesignCache().get(**_design_params("primary cta newsletter")) is None  # Off by default
+
+    def test_changed_content_is_never_returned_verbatim(self):
+        """Only the context wording may vary; other content can only seed a refine."""
+        from gemini_mcp.cache import DesignCache
+
+        def pricing(title):
+            content = {"title": title, "price": "$29", "features": ["Unlimited projects", "Priority support"]}
+            return _design_params("Pricing card for the SaaS landing page", content=content)
+
+        cache = DesignCache(near_duplicate_threshold=0.5)
+        cache.set({"html": "<h3>Pro plan</h3>"}, **pricing("Pro plan"))
+
+        assert cache.get(**pricing("PRO   plan"))["html"] == "<h3>Pro plan</h3>"
+        assert cache.get(**pricing("Team plan")) is None
+        value, similarity = cache.find_similar(0.5, **pricing("Team plan"))
+        assert value == {"html": "<h3>Pro plan</h3>"} and similarity < 1.0
+
+    def test_off_by_default_in_config(self, monkeypatch):
+        from gemini_mcp.config import GeminiConfig
+
+        monkeypatch.delenv("GEMINI_NEAR_DUP_THRESHOLD", raising=False)
+        assert GeminiConfig(project_id="test-project").near_duplicate_threshold == 0
+
+    def test_threshold_and_find_similar(self):
+        """Partial overlap is below the hit threshold but can seed a refine."""
+        from gemini_mcp.cache import DesignCache
+
+        cache = DesignCache(near_duplicate_threshold=0.9)
+        cache.set({"html": "<button/>"}, **_design_params("Primary CTA button for weekly newsletter signup form"))
+        params = _design_params("Primary CTA button for weekly newsletter signup form in sidebar")
+
+        assert cache.get(**params) is None
+        value, similarity = cache.find_similar(0.5, **params)
+        assert value == {"html": "<button/>"} and 0.5 <= similarity < 0.9
+        assert cache.find_similar(0.99, **params) is None
+
+    def test_index_survives_restart_and_eviction(self, tmp_path):
+        """The index is rebuilt from L2; evicted entries stop matching."""
+        from gemini_mcp.cache import DesignCache
+
+        db = str(tmp_path / "cache.db")
+        cache = DesignCache(max_entries=10, disk_path=db, near_duplicate_threshold=0.9)
+        cache.set({"html": "<button/>"}, **_design_params("Primary CTA for newsletter"))
+        cache._disk.close()
+
+        reopened = DesignCache(max_entries=10, disk_path=db, warm_start=False, near_duplicate_threshold=0.9)
+        assert reopened.get(**_design_params("PRIMARY cta, newsletter!"))["html"] == "<button/>"
+
+        memory = DesignCache(max_entries=2, near_duplicate_threshold=0.9)
+        memory.set({"html": "a"}, **_design_params("Primary CTA for newsletter"))
+        memory.set({"html": "b"}, **_design_params("Pricing toggle"))
+        memory.set({"html": "c"}, **_design_params("Cookie banner accept"))
+        assert memory.get(**_design_params("primary cta newsletter")) is None
+        assert memory.get_stats()["near_duplicate"]["indexed"] == 2
+
+    async def test_design_component_refines_similar_design(self, mock_genai_client):
+        """Above the refine threshold, a similar design is refined, not regenerated."""
+        from gemini_mcp.cache import DesignCache
+        from gemini_mcp.client import GeminiClient
+        from gemini_mcp.config import GeminiConfig
+        from gemini_mcp.orchestration.routing import SINGLE_SHOT_AGENT, RoutingPolicy
+
+        mock_genai_client.aio.models.generate_content = AsyncMock(return_value=SimpleNamespace(
+            text=json.dumps({"html": "<button>Join</button>", "modifications_applied": ["label"]}),
+            candidates=[],
+            usage_metadata=None,
+        ))
+        client = GeminiClient(config=GeminiConfig(
+            project_id="test-project", design_cache_path="", near_duplicate_refine_threshold=0.5,
+        ))
+        client._client = mock_genai_client
+        client._cache = DesignCache(near_duplicate_threshold=0.9)
+        spec = {"context": "Primary CTA button for weekly newsletter signup form"}
+        client._cache.set(
+            {"component_id": "cta-1", "html": "<button>Subscribe</button>"},
+            component_type="button", design_spec=spec, style_guide=None,
+            constraints=None, content_language="tr",
+            model=RoutingPolicy().route(SINGLE_SHOT_AGENT, "button").model,
+        )
+
+        result = await client.design_component(
+            "button", {"context": "Primary CTA button for weekly newsletter signup form in sidebar"}
+        )
+
+        prompt = mock_genai_client.aio.models.generate_content.await_args.kwargs["contents"]
+        assert "<button>Subscribe</button>" in prompt
+        assert result["html"] == "<button>Join</button>" and result["component_id"] == "cta-1"
+        assert 0.5 <= result["seeded_from_cache"]["similarity"] < 0.9
+        assert client._cache.get_stats()["near_duplicate"]["refine_seeds"] == 1
+
+    async def test_design_component_refines_near_hit_with_other_content(self, mock_genai_client):
+        """A near hit refused for different content goes through the refine path."""
+        from gemini_mcp.cache import DesignCache
+        from gemini_mcp.client import GeminiClient
+        from gemini_mcp.config import GeminiConfig
+        from gemini_mcp.orchestration.routing import SINGLE_SHOT_AGENT, RoutingPolicy
+
+        mock_genai_client.aio.models.generate_content = AsyncMock(return_value=SimpleNamespace(
+            text=json.dumps({"html": "<h3>Team plan</h3>", "modifications_applied": ["title"]}),
+            candidates=[],
+            usage_metadata=None,
+        ))
+        client = GeminiClient(config=GeminiConfig(
+            project_id="test-project", design_cache_path="",
+            near_duplicate_threshold=0.5, near_duplicate_refine_threshold=0,
+        ))
+        client._client = mock_genai_client
+        client._cache = DesignCache(near_duplicate_threshold=0.5)
+        cached = {"context": "Pricing card", "content_structure": {"title": "Pro plan", "price": "$29"}}
+        client._cache.set(
+            {"component_id": "card-1", "html": "<h3>Pro plan</h3>"},
+            component_type="pricing_card", design_spec=cached, style_guide=None,
+            constraints=None, content_language="tr",
+            model=RoutingPolicy().route(SINGLE_SHOT_AGENT, "pricing_card").model,
+        )
+
+        result = await client.design_component(
+            "pricing_card", {"context": "Pricing card", "content_structure": {"title": "Team plan", "price": "$29"}}
+        )
+
+        prompt = mock_genai_client.aio.models.generate_content.await_args.kwargs["contents"]
+        assert "<h3>Pro plan</h3>" in prompt and "Team plan" in prompt
+        assert result["html"] == "<h3>Team plan</h3>" and "_near_duplicate" not in result
+        assert client._cache.get_stats()["near_duplicate"]["hits"] == 0
+
+
+# =============================================================================
+# Prompt Budget
+# =============================================================================
+
+
+def _budget_context(token_budget: int):
+    """Architect context with DNA, previous HTML, examples and negative examples."""
+    from gemini_mcp.orchestration.context import AgentContext, DesignDNA
+
+    context = AgentContext(
+        component_type="hero",
+        content_structure={"headline": "Merhaba"},
+        token_budget=token_budget,
+    )
+    context.design_dna = DesignDNA(colors={"primary": "#112233"}, mood="minimal")
+    context.previous_html = (
+        '<section id="hero"><h1 class="text-4xl font-bold">Title</h1>'
+        + "<p class=\"text-gray-600\">Lorem ipsum dolor sit amet.</p>" * 100
+        + "</section>"
+    )
+    context.few_shot_examples = [
+        {"component_type": f"example{i}", "html": "<div>" + "x" * 1500 + "</div>"}
+        for i in range(3)
+    ]
+    context.metadata["negative_examples"] = "## Common Mistakes to Avoid:\n" + "bad " * 300
+    return context
+
+
+class TestPromptBudget:
+    """Tests for PromptBudget and the agent prompt builders that use it."""
+
+    def test_shrinks_lowest_priority_first(self):
+        """Sections shrink in priority order until the prompt fits."""
+        from gemini_mcp.agents.prompt_budget import Priority, PromptBudget
+
+        budget = PromptBudget(budget_tokens=250)
+        budget.add("task", "t" * 400)
+        budget.add("user_content", "u" * 400, Priority.USER_CONTENT)
+        budget.add("dna", "d" * 400, Priority.DNA, "d" * 40)
+        budget.add("few_shot", "f" * 400, Priority.FEW_SHOT, "f" * 200, "")
+        budget.add("negative_examples", "n" * 400, Priority.NEGATIVE_EXAMPLES, "")
+
+        prompt = budget.render()
+        sections = budget.report()["sections"]
+
+        assert budget.total_tokens <= 250
+        assert sections["negative_examples"]["action"] == "dropped"
+        assert sections["few_shot"]["action"] == "dropped"
+        assert sections["dna"]["action"] == "shrunk"
+        assert sections["user_content"]["action"] == "kept"
+        assert prompt == "\n\n".join(["t" * 400, "u" * 400, "d" * 40])
+
+    def test_required_and_user_content_never_shrink(self):
+        """An impossible budget leaves required sections intact."""
+        from gemini_mcp.agents.prompt_budget import Priority, PromptBudget
+
+        budget = PromptBudget(budget_tokens=10)
+        budget.add("task", "t" * 400, Priority.REQUIRED, "")
+        budget.add("user_content", "u" * 400, Priority.USER_CONTENT, "")
+
+        assert budget.render() == "t" * 400 + "\n\n" + "u" * 400
+        assert budget.report()["total_tokens"] == 200
+
+    def test_architect_prompt_fits_budget(self):
+        """The Architect drops examples and swaps HTML for its skeleton over budget."""
+        from gemini_mcp.agents import ArchitectAgent
+        from gemini_mcp.agents.prompt_budget import PromptBudget
+
+        agent = ArchitectAgent(MagicMock(context_cache_enabled=False))
+        roomy = agent._build_architect_prompt(_budget_context(32768))
+        budget = PromptBudget(1200)
+        tight = agent._build_architect_prompt(_budget_context(1200), budget)
+        sections = budget.report()["sections"]
+
+        assert "Common Mistakes to Avoid" in roomy and "Example 3" in roomy
+        assert len(tight) // 4 <= 1200
+        assert "Common Mistakes to Avoid" not in tight
+        assert sections["user_content"]["action"] == "kept"
+        assert "Merhaba" in tight and "#112233" in tight
+        assert sections["few_shot"]["action"] in ("shrunk", "dropped")
+
+    def test_previous_output_swapped_for_skeleton(self):
+        """Full previous HTML is replaced by the HTML skeleton."""
+        from gemini_mcp.agents import ArchitectAgent
+        from gemini_mcp.agents.prompt_budget import PromptBudget
+
+        context = _budget_context(0)
+        context.previous_output = context.previous_html
+        agent = ArchitectAgent(MagicMock(context_cache_enabled=False))
+        full = PromptBudget(0)
+        agent.build_prompt(context, full)
+
+        budget = PromptBudget(full.total_tokens - 500)
+        prompt = agent.build_prompt(context, budget)
+
+        assert budget.report()["sections"]["previous_output"]["action"] == "shrunk"
+        assert "PREVIOUS AGENT OUTPUT (structure)" in prompt
+        assert "section#hero" in prompt and "p$2~*100" in prompt
+        assert budget.total_tokens <= budget.budget_tokens
+
+    def test_agents_keep_compact_selector_lists(self):
+        """Alchemist/Physicist get the flat lists; the skeleton would be larger."""
+        from gemini_mcp.agents import AlchemistAgent, PhysicistAgent
+        from gemini_mcp.validation import SKELETON_LEGEND
+
+        context = _budget_context(0)
+        context.html_output = context.previous_html
+        context.compress_current_output(context.html_output, "html")
+        client = MagicMock(context_cache_enabled=False)
+
+        css = AlchemistAgent(client)._build_alchemist_prompt(context)
+        js = PhysicistAgent(client)._build_physicist_prompt(context)
+        assert "IDs: #hero" in css and "## Available IDs\nhero" in css
+        assert "## Available Element IDs" in js and "hero" in js
+        assert SKELETON_LEGEND not in css and SKELETON_LEGEND not in js
+
+    def test_dna_is_minified_before_dropping_structure(self):
+        """DNA keeps every token, just without JSON indentation."""
+        from gemini_mcp.agents import PhysicistAgent
+        from gemini_mcp.agents.prompt_budget import PromptBudget
+
+        context = _budget_context(0)
+        context.few_shot_examples = [{"component_type": "hero", "js": "x" * 1000}]
+        agent = PhysicistAgent(MagicMock(context_cache_enabled=False))
+        full = PromptBudget(0)
+        agent._build_physicist_prompt(context, full)
+
+        context.token_budget = full.total_tokens - full.report()["sections"]["few_shot"]["tokens"] - 1
+        budget = PromptBudget(context.token_budget)
+        prompt = agent._build_physicist_prompt(context, budget)
+
+        assert budget.report()["sections"]["few_shot"]["action"] == "dropped"
+        assert budget.report()["sections"]["design_dna"]["action"] == "shrunk"
+        assert '{"animation":' in prompt
+
+    def test_telemetry_records_prompt_breakdown(self):
+        """Agent prompt reports are kept per pipeline under prompt_budgets."""
+        from gemini_mcp.orchestration.telemetry import PipelineTelemetry
+
+        telemetry = PipelineTelemetry()
+        telemetry.start_pipeline("component", "p1")
+        report = {"budget": 100, "total_tokens": 90, "sections": {"dna": {"action": "shrunk"}}}
+        telemetry.record_prompt_budget("p1", "architect", report)
+
+        assert telemetry.end_pipeline("p1", True).to_dict()["prompt_budgets"] == {"architect": report}
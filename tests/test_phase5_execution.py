@@ -0,0 +1,1805 @@
+"""Tests for Phase 5 execution-layer features.
+
+- Streaming design calls with incremental section delivery
+- DAG pipeline scheduling with artifact dependencies
+- Speculative parallel candidates in the refiner loop
+- Local learned Critic surrogate gating remote Critic calls
+- Adaptive per-model concurrency limiting with priorities
+- Request-wide retry budget shared by nested retry layers
+- Event-loop-safe retries and credential refresh
+- Single-scan SectionedPage for section lookups and splicing
+- Per-project design-token index for section chains
+- Model routing (Flash vs Pro) per agent, tier and quality target with escalation
+"""
+
+import asyncio
+import json
+import threading
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+
+# =============================================================================
+# Streaming Section Delivery
+# =============================================================================
+
+
+PAGE_HTML = (
+    "<!-- SECTION: navbar -->\n<nav>Nav</nav>\n<!-- /SECTION: navbar -->\n"
+    "<!-- SECTION: hero -->\n<section>Hero</section>\n<!-- /SECTION: hero -->\n"
+    "<!-- SECTION: footer -->\n<footer>Foot</footer>\n<!-- /SECTION: footer -->"
+)
+
+
+def _chunks(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def _stream(chunks, usage=None):
+    """Async iterator standing in for generate_content_stream."""
+
+    async def _iterate():
+        for i, chunk in enumerate(chunks):
+            last = i == len(chunks) - 1
+            yield SimpleNamespace(
+                text=chunk,
+                candidates=[],
+                usage_metadata=usage if last else None,
+            )
+
+    return _iterate()
+
+
+def _make_streaming_client(mock_genai_client, chunks, usage=None):
+    from gemini_mcp.client import GeminiClient
+    from gemini_mcp.config import GeminiConfig
+
+    client = GeminiClient(config=GeminiConfig(project_id="test-project", design_cache_path=""))
+    mock_genai_client.aio.models.generate_content_stream = AsyncMock(
+        return_value=_stream(chunks, usage)
+    )
+    client._client = mock_genai_client
+    return client
+
+
+class TestSectionStreamParser:
+    """Tests for incremental section detection."""
+
+    @pytest.mark.parametrize("size", [1, 7, 64, 10_000])
+    def test_sections_detected_at_any_chunk_size(self, size):
+        """Every section is reported once, in order, regardless of chunking."""
+        from gemini_mcp.section_utils import SectionStreamParser
+
+        parser = SectionStreamParser()
+        found = []
+        for chunk in _chunks(PAGE_HTML, size):
+            found.extend(parser.feed(chunk))
+
+        assert [name for name, _ in found] == ["navbar", "hero", "footer"]
+        assert found[1][1] == "<section>Hero</section>"
+        assert parser.text == PAGE_HTML
+
+    def test_section_reported_when_closing_marker_arrives(self):
+        """A section is emitted by the chunk that completes its closing marker."""
+        from gemini_mcp.section_utils import SectionStreamParser
+
+        parser = SectionStreamParser()
+        assert parser.feed("<!-- SECTION: hero --><h1>Hi</h1><!-- /SEC") == []
+        assert parser.feed("TION: hero --><!-- SECTION: cta -->") == [("hero", "<h1>Hi</h1>")]
+        assert parser.completed == ["hero"]
+
+    def test_json_escaped_stream(self):
+        """HTML streamed inside a JSON string is unescaped."""
+        from gemini_mcp.section_utils import SectionStreamParser
+
+        document = json.dumps({"html": PAGE_HTML, "design_notes": "x"})
+        parser = SectionStreamParser(json_escaped=True)
+        found = []
+        for chunk in _chunks(document, 5):
+            found.extend(parser.feed(chunk))
+
+        assert [name for name, _ in found] == ["navbar", "hero", "footer"]
+        assert found[0][1] == "<nav>Nav</nav>"
+
+
+class TestStreamingDesignCalls:
+    """Tests for GeminiClient streaming via generate_content_stream."""
+
+    async def test_generate_text_streams_sections(self, mock_genai_client):
+        """on_section fires per closed section and the full text is returned."""
+        usage = SimpleNamespace(prompt_token_count=10, candidates_token_count=20)
+        client = _make_streaming_client(mock_genai_client, _chunks(PAGE_HTML, 9), usage)
+        received = []
+
+        async def on_section(name, html):
+            received.append((name, html))
+
+        result = await client.generate_text("build page", on_section=on_section)
+
+        assert [r[0] for r in received] == ["navbar", "hero", "footer"]
+        assert result["text"] == PAGE_HTML
+        assert result["token_usage"]["output_tokens"] == 20
+        mock_genai_client.aio.models.generate_content_stream.assert_awaited_once()
+        mock_genai_client.aio.models.generate_content.assert_not_called()
+
+    async def test_generate_text_without_callback_does_not_stream(self, mock_genai_client):
+        """The non-streaming path is unchanged when no callback is given."""
+        client = _make_streaming_client(mock_genai_client, [PAGE_HTML])
+        mock_genai_client.aio.models.generate_content.return_value = SimpleNamespace(
+            text=PAGE_HTML, candidates=[], usage_metadata=None
+        )
+
+        await client.generate_text("build page")
+
+        mock_genai_client.aio.models.generate_content.assert_awaited_once()
+        mock_genai_client.aio.models.generate_content_stream.assert_not_called()
+
+    async def test_design_component_streams_json_page(self, mock_genai_client):
+        """Page sections inside the JSON response are delivered before parsing."""
+        document = json.dumps({
+            "component_id": "page-1",
+            "html": PAGE_HTML,
+            "design_notes": "notes",
+        })
+        client = _make_streaming_client(mock_genai_client, _chunks(document, 11))
+        received = []
+
+        async def on_section(name, html):
+            received.append(name)
+
+        result = await client.design_component(
+            component_type="page:landing_page",
+            design_spec={"context": "test"},
+            on_section=on_section,
+        )
+
+        assert received == ["navbar", "hero", "footer"]
+        assert "<!-- SECTION: hero -->" in result["html"]
+
+    async def test_design_section_without_markers_delivered_once(self, mock_genai_client):
+        """A section returned without markers is delivered after parsing."""
+        document = json.dumps({"html": "<section>Hero</section>", "design_notes": "x"})
+        client = _make_streaming_client(mock_genai_client, _chunks(document, 8))
+        received = []
+
+        async def on_section(name, html):
+            received.append((name, html))
+
+        await client.design_section(section_type="hero", on_section=on_section)
+
+        assert received == [("hero", "<section>Hero</section>")]
+
+
+class TestSectionProgressReporter:
+    """Tests for MCP progress notifications per completed section."""
+
+    def test_no_context_no_callback(self):
+        """Outside an MCP request there is nothing to report to."""
+        from gemini_mcp.server import _section_progress_reporter
+
+        assert _section_progress_reporter(None, 3) is None
+
+    def test_no_progress_token_no_callback(self):
+        """Requests that did not ask for progress keep the non-streaming path."""
+        from gemini_mcp.server import _section_progress_reporter
+
+        ctx = MagicMock()
+        ctx.request_context.meta = SimpleNamespace(progressToken=None)
+        assert _section_progress_reporter(ctx, 3) is None
+        ctx.request_context.meta = None
+        assert _section_progress_reporter(ctx, 3) is None
+
+    async def test_reports_each_section_once(self):
+        """Progress counts sections and carries the marked HTML."""
+        from gemini_mcp.server import _section_progress_reporter
+
+        ctx = MagicMock()
+        ctx.request_context.meta = SimpleNamespace(progressToken="tok-1")
+        ctx.report_progress = AsyncMock()
+        report = _section_progress_reporter(ctx, 2)
+
+        await report("hero", "<section>Hero</section>")
+        await report("hero", "<section>Hero</section>")
+        await report("footer", "<footer>Foot</footer>")
+
+        assert ctx.report_progress.await_count == 2
+        args, kwargs = ctx.report_progress.await_args_list[0]
+        assert args == (1,)
+        assert kwargs["total"] == 2
+        assert "<!-- SECTION: hero -->" in kwargs["message"]
+
+    async def test_progress_errors_swallowed(self):
+        """A failing notification never fails the design call."""
+        from gemini_mcp.server import _section_progress_reporter
+
+        ctx = MagicMock()
+        ctx.report_progress = AsyncMock(side_effect=RuntimeError("closed"))
+        report = _section_progress_reporter(ctx, 1)
+
+        await report("hero", "<section>Hero</section>")
+
+    async def test_parallel_section_architects_reported(self):
+        """PAGE pipeline delivers each section as its architect finishes."""
+        from gemini_mcp.orchestration.context import AgentContext
+        from gemini_mcp.orchestration.orchestrator import AgentOrchestrator
+        from gemini_mcp.orchestration.pipelines import PipelineType
+
+        orchestrator = AgentOrchestrator(MagicMock(), enable_validation=False)
+        orchestrator.register_agent("architect", _StubAgent("architect"))
+        received = []
+
+        async def on_section(name, html):
+            received.append(name)
+
+        context = AgentContext(
+            sections=[{"type": "hero"}, {"type": "footer"}],
+            section_callback=on_section,
+        )
+
+        await orchestrator.run_pipeline(PipelineType.PAGE, context, section_count=2)
+
+        assert sorted(received) == ["footer", "hero"]
+        assert "<section>hero</section>" in context.html_output
+
+
+# =============================================================================
+# DAG Pipeline Scheduling
+# =============================================================================
+
+
+class _StubAgent:
+    """Agent stub producing a marker output per artifact after a delay."""
+
+    def __init__(self, kind, delay=0.0, fail=False):
+        self.name = kind
+        self.kind = kind
+        self.delay = delay
+        self.fail = fail
+        self.calls = []
+
+    async def execute(self, context):
+        from gemini_mcp.agents.base import AgentResult, AgentRole
+
+        self.calls.append(context.current_section_type or context.html_output)
+        await asyncio.sleep(self.delay)
+        if self.kind == "architect":
+            output = f"<section>{context.current_section_type}</section>"
+        elif self.kind == "alchemist":
+            output = f"/* css for {context.html_output} */"
+        else:
+            output = f"// {self.kind}"
+        return AgentResult(
+            success=not self.fail,
+            output="" if self.fail else output,
+            agent_role=AgentRole.ARCHITECT,
+            execution_time_ms=self.delay * 1000,
+            errors=["boom"] if self.fail else [],
+        )
+
+    def validate_output(self, output):
+        return True, []
+
+
+class TestPipelineDAG:
+    """Tests for artifact-driven pipeline graphs."""
+
+    def test_page_pipeline_dependencies(self):
+        """Architects wait for DNA; styling waits for every section's HTML."""
+        from gemini_mcp.orchestration.pipelines import PipelineType, get_pipeline
+
+        pipeline = get_pipeline(PipelineType.PAGE, section_count=3)
+        deps = pipeline.dependencies()
+
+        assert deps["architect_1"] == {"strategist"}
+        assert deps["alchemist"] == {"architect_0", "architect_1", "architect_2"}
+        # Physicist sees the CSS unless the overlap is requested
+        assert deps["physicist"] == deps["alchemist"] | {"alchemist"}
+        assert {"alchemist", "physicist"} <= deps["quality_guard"]
+        assert pipeline.exclusive_nodes() == {"strategist", "alchemist", "physicist", "quality_guard"}
+        assert pipeline.count_steps() == 7
+
+        parallel = get_pipeline(PipelineType.PAGE, section_count=3, enable_parallel=True)
+        assert parallel.dependencies()["physicist"] == parallel.dependencies()["alchemist"]
+        assert parallel.exclusive_nodes() == {"strategist", "quality_guard"}
+
+    def test_per_section_styling_is_section_local(self):
+        """A section's Alchemist only waits for that section's Architect."""
+        from gemini_mcp.orchestration.pipelines import PipelineType, get_pipeline
+
+        pipeline = get_pipeline(PipelineType.PAGE, section_count=2, per_section_styling=True)
+        deps = pipeline.dependencies()
+
+        assert deps["alchemist_1"] == {"architect_1"}
+        assert deps["physicist_0"] == {"architect_0", "alchemist_0"}
+        assert "alchemist" not in deps
+
+    def test_linear_pipelines_stay_sequential(self):
+        """Sequential pipelines keep their order and run on the shared context."""
+        from gemini_mcp.orchestration.pipelines import PipelineType, get_pipeline
+
+        pipeline = get_pipeline(PipelineType.REFINE)
+
+        assert pipeline.get_agent_sequence() == [
+            "critic", "architect", "alchemist", "physicist", "quality_guard",
+        ]
+        assert pipeline.exclusive_nodes() == set(pipeline.dependencies())
+
+    def test_legacy_step_list_converted(self):
+        """Pipelines declared with steps and ParallelGroups still schedule."""
+        from gemini_mcp.orchestration.pipelines import (
+            ParallelGroup, Pipeline, PipelineStep, PipelineType,
+        )
+
+        pipeline = Pipeline(
+            pipeline_type=PipelineType.COMPONENT,
+            name="legacy",
+            description="",
+            steps=[
+                PipelineStep(agent_name="architect"),
+                ParallelGroup(steps=[PipelineStep(agent_name="alchemist"), PipelineStep(agent_name="physicist")]),
+                PipelineStep(agent_name="quality_guard"),
+            ],
+        )
+
+        deps = pipeline.dependencies()
+        assert deps["alchemist_0"] == {"architect"}
+        assert deps["quality_guard"] == {"alchemist_0", "physicist_1"}
+
+    def test_cycle_rejected(self):
+        """Cyclic artifact dependencies are a declaration error."""
+        from gemini_mcp.orchestration.pipelines import Pipeline, PipelineStep, PipelineType
+
+        pipeline = Pipeline(pipeline_type=PipelineType.COMPONENT, name="cyclic", description="")
+        pipeline.add_node("a", PipelineStep(agent_name="architect", output_type="html"), inputs=("css",))
+        pipeline.add_node("b", PipelineStep(agent_name="alchemist", output_type="css"), inputs=("html",))
+
+        with pytest.raises(ValueError, match="cycle"):
+            pipeline.dependencies()
+
+
+class TestDAGScheduler:
+    """Tests for the dependency-driven scheduler."""
+
+    async def test_concurrency_cap_respected(self):
+        """Independent nodes overlap but never exceed the cap."""
+        from gemini_mcp.orchestration.scheduler import DAGScheduler
+
+        running = 0
+        peak = 0
+
+        async def run_node(node_id):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return node_id
+
+        deps = {"root": set(), **{f"n{i}": {"root"} for i in range(5)}}
+        scheduler = DAGScheduler(deps, max_concurrency=2)
+        results = await scheduler.run(run_node)
+
+        assert set(results) == set(deps)
+        assert peak == 2
+        assert scheduler.get_stats()["max_parallel"] == 2
+
+    async def test_dependencies_finish_first(self):
+        """A node starts only after all of its dependencies completed."""
+        from gemini_mcp.orchestration.scheduler import DAGScheduler
+
+        order = []
+
+        async def run_node(node_id):
+            await asyncio.sleep(0.02 if node_id == "slow" else 0)
+            order.append(node_id)
+
+        scheduler = DAGScheduler({"slow": set(), "fast": set(), "join": {"slow", "fast"}})
+        await scheduler.run(run_node)
+
+        assert order == ["fast", "slow", "join"]
+
+    async def test_failure_aborts_run(self):
+        """An exception from a node propagates and stops scheduling."""
+        from gemini_mcp.orchestration.scheduler import DAGScheduler
+
+        started = []
+
+        async def run_node(node_id):
+            started.append(node_id)
+            if node_id == "a":
+                raise RuntimeError("required step failed")
+
+        with pytest.raises(RuntimeError):
+            await DAGScheduler({"a": set(), "b": {"a"}}).run(run_node)
+        assert started == ["a"]
+
+    async def test_failure_awaits_cancelled_siblings(self):
+        """Running siblings are cancelled and finished before run() raises."""
+        from gemini_mcp.orchestration.scheduler import DAGScheduler
+
+        cancelled = []
+
+        async def run_node(node_id):
+            if node_id == "a":
+                raise RuntimeError("required step failed")
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                await asyncio.sleep(0)
+                cancelled.append(node_id)
+                raise
+
+        with pytest.raises(RuntimeError):
+            await DAGScheduler({"a": set(), "b": set(), "c": set()}).run(run_node)
+        # No sibling task outlives the run
+        assert sorted(cancelled) == ["b", "c"]
+
+    async def test_page_pipeline_overlaps_styling(self):
+        """Sections merge in order; with enable_parallel Alchemist/Physicist overlap."""
+        from gemini_mcp.orchestration.context import AgentContext
+        from gemini_mcp.orchestration.orchestrator import AgentOrchestrator
+        from gemini_mcp.orchestration.pipelines import PipelineType
+
+        orchestrator = AgentOrchestrator(MagicMock(), enable_validation=False)
+        orchestrator.register_agent("architect", _StubAgent("architect", delay=0.01))
+        orchestrator.register_agent("alchemist", _StubAgent("alchemist", delay=0.02))
+        orchestrator.register_agent("physicist", _StubAgent("physicist", delay=0.02))
+        context = AgentContext(sections=[{"type": "hero"}, {"type": "features"}, {"type": "footer"}])
+
+        result = await orchestrator.run_pipeline(
+            PipelineType.PAGE, context, section_count=3, enable_parallel=True
+        )
+
+        assert result.html.index("hero") < result.html.index("features") < result.html.index("footer")
+        assert result.css.startswith("/* css for <section>hero</section>")
+        assert result.js == "// physicist"
+        assert result.schedule["max_parallel"] >= 2
+        assert set(result.tokens_per_agent) <= {"architect_0", "architect_1", "architect_2", "alchemist", "physicist"}
+
+    async def test_per_section_styling_uses_section_html(self):
+        """Per-section Alchemists see only their section and CSS is joined."""
+        from gemini_mcp.orchestration.context import AgentContext
+        from gemini_mcp.orchestration.orchestrator import AgentOrchestrator
+        from gemini_mcp.orchestration.pipelines import PipelineType
+
+        orchestrator = AgentOrchestrator(MagicMock(), enable_validation=False, max_concurrency=3)
+        alchemist = _StubAgent("alchemist")
+        orchestrator.register_agent("architect", _StubAgent("architect"))
+        orchestrator.register_agent("alchemist", alchemist)
+        context = AgentContext(sections=[{"type": "hero"}, {"type": "footer"}])
+
+        result = await orchestrator.run_pipeline(
+            PipelineType.PAGE, context, section_count=2, per_section_styling=True
+        )
+
+        assert result.css == (
+            "/* css for <section>hero</section> */\n\n/* css for <section>footer</section> */"
+        )
+        assert result.schedule["max_parallel"] <= 3
+
+    async def test_all_sections_failing_uses_sequential_fallback(self):
+        """BUG #16 fallback still runs when every section architect fails."""
+        from gemini_mcp.orchestration.context import AgentContext
+        from gemini_mcp.orchestration.orchestrator import AgentOrchestrator
+        from gemini_mcp.orchestration.pipelines import PipelineType
+
+        orchestrator = AgentOrchestrator(MagicMock(), enable_validation=False)
+        orchestrator.register_agent("architect", _StubAgent("architect", fail=True))
+        context = AgentContext(sections=[{"type": "hero"}, {"type": "footer"}])
+
+        result = await orchestrator.run_pipeline(PipelineType.PAGE, context, section_count=2)
+
+        assert "<!-- SECTION: error -->" in result.html
+        assert not result.success
+
+
+# =============================================================================
+# Speculative Refiner Loop
+# =============================================================================
+
+
+class _VariantAlchemist:
+    """Alchemist stub returning a distinct CSS variant per call."""
+
+    name = "alchemist"
+
+    def __init__(self, delay=0.02, tokens=100):
+        self.delay = delay
+        self.tokens = tokens
+        self.calls = 0
+
+    async def execute(self, context):
+        from gemini_mcp.agents.base import AgentResult, AgentRole
+
+        self.calls += 1
+        variant = self.calls
+        await asyncio.sleep(self.delay)
+        return AgentResult(
+            success=True,
+            output=f"/* v{variant} */",
+            agent_role=AgentRole.ALCHEMIST,
+            execution_time_ms=self.delay * 1000,
+            token_usage={"total_tokens": self.tokens},
+        )
+
+
+def _refiner_orchestrator(alchemist, scores_by_css, speculative_candidates=None, critic_tokens=0):
+    """Orchestrator with a real CriticAgent whose evaluate is scripted."""
+    from gemini_mcp.agents.critic import CriticAgent, CriticScores
+    from gemini_mcp.orchestration.orchestrator import AgentOrchestrator
+
+    critic = CriticAgent(MagicMock())
+
+    async def evaluate(html, css, js="", context=None, token_usage=None):
+        await asyncio.sleep(0.02)
+        if token_usage is not None and critic_tokens:
+            token_usage["total_tokens"] = token_usage.get("total_tokens", 0) + critic_tokens
+        value = scores_by_css(css)
+        return CriticScores(**{dim: value for dim in CriticScores().WEIGHTS}), [f"improve {css}"]
+
+    critic.evaluate = AsyncMock(side_effect=evaluate)
+    orchestrator = AgentOrchestrator(
+        MagicMock(), enable_validation=False, speculative_candidates=speculative_candidates
+    )
+    orchestrator.register_agent("alchemist", alchemist)
+    orchestrator.register_agent("critic", critic)
+    return orchestrator, critic
+
+
+class TestSpeculativeRefiner:
+    """Tests for K-candidate refiner iterations."""
+
+    def test_speculative_config_per_target(self):
+        """Speculative mode is opt-in; the budget scales with the quality target."""
+        from gemini_mcp.orchestration.context import QualityTarget, get_speculative_config
+
+        assert get_speculative_config(QualityTarget.PRODUCTION) == (1, 0)
+        k, budget = get_speculative_config(QualityTarget.PREMIUM)
+        assert k == 1 and budget > 0
+        assert get_speculative_config(QualityTarget.PREMIUM, 3) == (3, budget)
+
+    def test_candidates_from_client_config(self):
+        """GEMINI_SPECULATIVE_CANDIDATES reaches the orchestrator via the config."""
+        from gemini_mcp.orchestration.orchestrator import AgentOrchestrator
+
+        client = MagicMock()
+        client.config.speculative_candidates = 3
+        assert AgentOrchestrator(client).speculative_candidates == 3
+        assert AgentOrchestrator(MagicMock()).speculative_candidates is None
+
+    async def test_best_candidate_kept(self):
+        """All candidates are scored concurrently and the best CSS wins."""
+        from gemini_mcp.orchestration.context import AgentContext, QualityTarget
+
+        alchemist = _VariantAlchemist()
+        orchestrator, critic = _refiner_orchestrator(
+            alchemist, lambda css: 9.5 if css == "/* v2 */" else 6.0, speculative_candidates=3
+        )
+        context = AgentContext(html_output="<div></div>", quality_target=QualityTarget.PREMIUM)
+
+        start = asyncio.get_running_loop().time()
+        css, scores, iterations = await orchestrator._run_refiner_loop(context)
+        elapsed = asyncio.get_running_loop().time() - start
+
+        assert css == "/* v2 */"
+        assert iterations == 1
+        assert scores.overall == pytest.approx(9.5)
+        assert critic.evaluate.await_count == 3
+        # Three alchemist+critic chains overlapped into one round trip
+        assert elapsed < 0.1
+
+    async def test_serial_path_for_single_candidate(self):
+        """Targets with one candidate keep the serial loop on the shared context."""
+        from gemini_mcp.orchestration.context import AgentContext, QualityTarget
+
+        alchemist = _VariantAlchemist(delay=0)
+        orchestrator, critic = _refiner_orchestrator(alchemist, lambda css: 9.5)
+        context = AgentContext(html_output="<div></div>", quality_target=QualityTarget.PRODUCTION)
+
+        css, _, _ = await orchestrator._run_refiner_loop(context)
+
+        assert css == "/* v1 */"
+        assert alchemist.calls == 1
+        assert critic.evaluate.await_args.kwargs["context"] is context
+
+    async def test_default_runs_single_candidate(self):
+        """Without opting in, HIGH and above keep the serial loop."""
+        from gemini_mcp.orchestration.context import AgentContext, QualityTarget
+
+        alchemist = _VariantAlchemist(delay=0)
+        orchestrator, critic = _refiner_orchestrator(alchemist, lambda css: 9.5)
+        context = AgentContext(html_output="<div></div>", quality_target=QualityTarget.PREMIUM)
+
+        await orchestrator._run_refiner_loop(context)
+
+        assert alchemist.calls == 1
+        assert critic.evaluate.await_count == 1
+
+    async def test_budget_falls_back_to_single_candidate(self):
+        """Rounds whose Alchemist + Critic cost would exceed the budget run one candidate."""
+        from gemini_mcp.orchestration.context import (
+            QUALITY_TARGET_CONFIG, AgentContext, QualityTarget,
+        )
+        from gemini_mcp.orchestration.telemetry import get_telemetry, reset_telemetry
+
+        reset_telemetry()
+        telemetry = get_telemetry()
+        telemetry.start_pipeline(pipeline_type="component", pipeline_id="budget-1")
+        alchemist = _VariantAlchemist(delay=0, tokens=1000)
+        orchestrator, _ = _refiner_orchestrator(
+            alchemist, lambda css: 5.0 + alchemist.calls * 0.5,
+            speculative_candidates=2, critic_tokens=500,
+        )
+        context = AgentContext(
+            html_output="<div></div>", quality_target=QualityTarget.HIGH, pipeline_id="budget-1"
+        )
+        budget = QUALITY_TARGET_CONFIG[QualityTarget.HIGH]["speculative_token_budget"]
+        QUALITY_TARGET_CONFIG[QualityTarget.HIGH]["speculative_token_budget"] = 5000
+        try:
+            await orchestrator._run_refiner_loop(context)
+        finally:
+            QUALITY_TARGET_CONFIG[QualityTarget.HIGH]["speculative_token_budget"] = budget
+        rounds = telemetry.end_pipeline("budget-1", True).to_dict()["refiner_rounds"]
+        reset_telemetry()
+
+        # Round 1: the estimate (Critic output cap x 2) exceeds the budget → 1 candidate.
+        # Round 2: 1500 spent + 2 x 1500 fits. Round 3: 4500 + 3000 does not.
+        assert [r["candidates"] for r in rounds] == [1, 2, 1]
+        assert [r["tokens"] for r in rounds] == [1500, 3000, 1500]
+
+    async def test_latency_and_score_recorded(self):
+        """Telemetry gets one latency/score row per refiner round."""
+        from gemini_mcp.orchestration.context import AgentContext, QualityTarget
+        from gemini_mcp.orchestration.telemetry import get_telemetry, reset_telemetry
+
+        reset_telemetry()
+        telemetry = get_telemetry()
+        telemetry.start_pipeline(pipeline_type="component", pipeline_id="spec-1")
+        orchestrator, _ = _refiner_orchestrator(
+            _VariantAlchemist(delay=0), lambda css: 9.5, speculative_candidates=2
+        )
+        context = AgentContext(
+            html_output="<div></div>",
+            quality_target=QualityTarget.HIGH,
+            pipeline_id="spec-1",
+        )
+
+        await orchestrator._run_refiner_loop(context)
+        metrics = telemetry.end_pipeline("spec-1", True)
+
+        rounds = metrics.to_dict()["refiner_rounds"]
+        assert rounds == [
+            {"iteration": 1, "candidates": 2, "latency_ms": rounds[0]["latency_ms"],
+             "best_score": 9.5, "tokens": 200},
+        ]
+        reset_telemetry()
+
+
+# =============================================================================
+# Critic Surrogate
+# =============================================================================
+
+
+RICH_HTML = (
+    '<header class="flex gap-4 md:grid dark:bg-slate-900 hover:bg-slate-800">'
+    '<nav aria-label="Main"><a href="#" aria-current="page" '
+    'class="focus-visible:ring-2 transition duration-200">Home</a></nav></header>'
+)
+POOR_HTML = '<div><div style="color:red"><a href="#">Home</a></div><img src="x.png"></div>'
+
+
+def _surrogate_samples(count=40):
+    """(features, scores) where richer markup scores higher, with some noise."""
+    import random
+
+    from gemini_mcp.agents.critic_surrogate import extract_features
+
+    rng = random.Random(1)
+    samples = []
+    for i in range(count):
+        rich = i % 2 == 0
+        features = extract_features(RICH_HTML if rich else POOR_HTML, css="a{}" * rng.randrange(1, 50))
+        base = (8.8 if rich else 4.2) + rng.uniform(-0.2, 0.2)
+        samples.append((features, {dim: base for dim in ("layout", "typography", "color",
+                        "interaction", "accessibility", "visual_density", "animation_quality",
+                        "code_quality", "state_management")}))
+    return samples
+
+
+class TestCriticSurrogate:
+    """Tests for the trainable local scorer and the refiner gate."""
+
+    def test_fit_predict_and_model_file(self, tmp_path):
+        from gemini_mcp.agents.critic_surrogate import (
+            SurrogateModel, extract_features, train,
+        )
+
+        model = train(_surrogate_samples(), holdout=0.25, threshold=7.5)
+
+        assert model.predict(extract_features(RICH_HTML)).overall > 8.0
+        assert model.predict(extract_features(POOR_HTML)).overall < 5.0
+        calibration = model.calibration
+        assert calibration["holdout_samples"] == 10 and calibration["mae"] < 0.5
+        assert calibration["skip_rate"] == 1.0 and calibration["skip_error_rate"] == 0.0
+
+        path = tmp_path / "model.json"
+        model.save(path)
+        loaded = SurrogateModel.load(path)
+        assert loaded.predict(extract_features(RICH_HTML)).to_dict() == \
+            model.predict(extract_features(RICH_HTML)).to_dict()
+
+        data = json.loads(path.read_text())
+        data["features_version"] = 0
+        with pytest.raises(ValueError, match="retrain"):
+            SurrogateModel.from_dict(data)
+
+    def test_pure_python_fit_matches_numpy(self, monkeypatch):
+        from gemini_mcp.agents import critic_surrogate
+        from gemini_mcp.agents.critic_surrogate import SurrogateModel, extract_features
+
+        if not critic_surrogate.NUMPY_AVAILABLE:
+            pytest.skip("NumPy not installed")
+        samples = _surrogate_samples(20)
+        expected = SurrogateModel.fit(samples).predict(extract_features(RICH_HTML)).overall
+        monkeypatch.setattr(critic_surrogate, "NUMPY_AVAILABLE", False)
+        actual = SurrogateModel.fit(samples).predict(extract_features(RICH_HTML)).overall
+        assert actual == pytest.approx(expected, abs=1e-6)
+
+    async def test_real_evaluations_are_logged(self, tmp_path, monkeypatch):
+        """Parsed Critic evaluations append (features, scores) to the sample log."""
+        from gemini_mcp.agents.critic import CriticAgent
+        from gemini_mcp.agents.critic_surrogate import SampleLog, reset_critic_surrogate
+
+        log = tmp_path / "samples.jsonl"
+        monkeypatch.setenv("GEMINI_CRITIC_SAMPLES", str(log))
+        reset_critic_surrogate()
+        client = MagicMock()
+        client.generate_text = AsyncMock(side_effect=[
+            {"text": json.dumps({"scores": {"layout": 9.0}, "improvements": []})},
+            {"text": "not json"},
+        ])
+        critic = CriticAgent(client)
+
+        await critic.evaluate(RICH_HTML, "")
+        await critic.evaluate(RICH_HTML, "")
+        reset_critic_surrogate()
+
+        samples = SampleLog(log).read()
+        assert len(samples) == 1
+        features, scores = samples[0]
+        assert features["aria_coverage"] == 1.0 and scores["layout"] == 9.0
+
+    async def test_confident_prediction_skips_remote_critic(self):
+        """The refiner loop only calls the remote Critic when the surrogate is unsure."""
+        from gemini_mcp.agents.critic_surrogate import CriticSurrogate, SurrogateModel
+        from gemini_mcp.orchestration.context import AgentContext, QualityTarget
+
+        surrogate = CriticSurrogate(SurrogateModel.fit(_surrogate_samples()), z=2.0)
+        orchestrator, critic = _refiner_orchestrator(_VariantAlchemist(delay=0), lambda css: 9.5)
+        critic.surrogate = surrogate
+
+        context = AgentContext(html_output=RICH_HTML, quality_target=QualityTarget.PRODUCTION)
+        _, scores, iterations = await orchestrator._run_refiner_loop(context)
+        assert iterations == 1 and scores.overall > 8.0
+        critic.evaluate.assert_not_awaited()
+
+        # Confidently below: no remote call, feedback names the weakest dimensions
+        verdict = surrogate.try_skip(POOR_HTML, "", threshold=7.5)
+        assert verdict[0].overall < 5.0 and verdict[1][0].startswith("Improve ")
+
+        # Unsure (model residual larger than the distance to threshold)
+        surrogate.model.residual_std = 10.0
+        context = AgentContext(html_output=RICH_HTML, quality_target=QualityTarget.PRODUCTION)
+        await orchestrator._run_refiner_loop(context)
+        assert critic.evaluate.await_count == 1
+        assert surrogate.get_stats()["skipped_above"] == 1
+        assert surrogate.get_stats()["deferred"] == 1
+
+    def test_training_cli(self, tmp_path, capsys):
+        from gemini_mcp.agents.critic_surrogate import SampleLog, main
+        from gemini_mcp.agents.critic import CriticScores
+
+        log = SampleLog(tmp_path / "samples.jsonl")
+        for features, scores in _surrogate_samples():
+            log.append(features, CriticScores.from_dict(scores))
+
+        main(["train", "--samples", str(log.path), "--out", str(tmp_path / "m.json")])
+        main(["evaluate", "--model", str(tmp_path / "m.json"), "--samples", str(log.path)])
+
+        output = capsys.readouterr().out
+        assert output.startswith("Trained on 32 samples")
+        saved = json.loads((tmp_path / "m.json").read_text())
+        assert saved["calibration"]["holdout_samples"] == 8
+        assert '"holdout_samples": 40' in output  # evaluate on the full log
+
+
+# =============================================================================
+# Adaptive Concurrency Limiting
+# =============================================================================
+
+
+class TestAdaptiveLimiter:
+    """Tests for the AIMD per-model limiter."""
+
+    async def test_concurrency_bounded(self):
+        """No more than `limit` calls hold a slot at once."""
+        from gemini_mcp.rate_limiter import AdaptiveLimiter
+
+        limiter = AdaptiveLimiter("m", max_limit=3)
+        running = 0
+        peak = 0
+
+        async def call():
+            nonlocal running, peak
+            async with limiter.slot():
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+
+        await asyncio.gather(*(call() for _ in range(10)))
+
+        assert peak == 3
+        stats = limiter.get_stats()
+        assert stats["acquired"] == 10
+        assert stats["queued"] == 7
+        assert stats["max_queue_depth"] == 7
+        assert stats["queue_depth"] == 0
+        assert stats["max_wait_ms"] > 0
+
+    async def test_rate_limit_halves_once_per_window(self):
+        """A burst of 429s from concurrent calls counts as one decrease."""
+        from gemini_mcp.rate_limiter import AdaptiveLimiter
+
+        limiter = AdaptiveLimiter("m", max_limit=8)
+        tickets = [await limiter.acquire() for _ in range(4)]
+        for ticket in tickets:
+            limiter.release(ticket, RuntimeError("429 Too Many Requests"))
+
+        stats = limiter.get_stats()
+        assert stats["limit"] == 4
+        assert stats["rate_limited"] == 4
+        assert stats["decreases"] == 1
+
+        # A call started after the decrease can lower it again
+        ticket = await limiter.acquire()
+        limiter.release(ticket, RuntimeError("429 Too Many Requests"))
+        assert limiter.limit == 2
+
+    async def test_successes_increase_additively(self):
+        """Successful calls grow the limit back toward the ceiling."""
+        from gemini_mcp.rate_limiter import AdaptiveLimiter
+
+        limiter = AdaptiveLimiter("m", max_limit=4)
+        limiter.release(await limiter.acquire(), RuntimeError("429"))
+        assert limiter.limit == 2
+
+        # +1/limit per success: 2.0 -> 2.5 -> 2.9 -> 3.24
+        for _ in range(3):
+            limiter.release(await limiter.acquire())
+        assert limiter.limit == 3
+
+        for _ in range(50):
+            limiter.release(await limiter.acquire())
+        assert limiter.limit == 4
+
+    async def test_other_errors_do_not_adapt(self):
+        """Only RATE_LIMIT errors shrink the limit."""
+        from gemini_mcp.rate_limiter import AdaptiveLimiter
+
+        limiter = AdaptiveLimiter("m", max_limit=4)
+        with pytest.raises(ValueError):
+            async with limiter.slot():
+                raise ValueError("invalid json")
+
+        assert limiter.limit == 4
+        assert limiter.in_flight == 0
+
+    async def test_interactive_served_before_background(self):
+        """Queued interactive calls jump ahead of queued background calls."""
+        from gemini_mcp.rate_limiter import AdaptiveLimiter, Priority, priority_scope
+
+        limiter = AdaptiveLimiter("m", max_limit=1)
+        order = []
+        blocker = await limiter.acquire()
+
+        async def call(name, priority):
+            with priority_scope(priority):
+                async with limiter.slot():
+                    order.append(name)
+
+        tasks = [
+            asyncio.ensure_future(call("bg1", Priority.BACKGROUND)),
+            asyncio.ensure_future(call("bg2", Priority.BACKGROUND)),
+            asyncio.ensure_future(call("ui", Priority.INTERACTIVE)),
+        ]
+        await asyncio.sleep(0)
+        assert limiter.queue_depth == 3
+
+        limiter.release(blocker)
+        await asyncio.gather(*tasks)
+
+        assert order == ["ui", "bg1", "bg2"]
+        assert set(limiter.get_stats()["wait_ms_by_priority"]) == {"interactive", "background"}
+
+    async def test_cancelled_waiter_leaves_queue(self):
+        """Cancelling a queued caller does not leak a slot."""
+        from gemini_mcp.rate_limiter import AdaptiveLimiter
+
+        limiter = AdaptiveLimiter("m", max_limit=1)
+        blocker = await limiter.acquire()
+        waiting = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        waiting.cancel()
+        await asyncio.sleep(0)
+
+        limiter.release(blocker)
+        assert limiter.in_flight == 0
+        assert limiter.queue_depth == 0
+
+    async def test_client_calls_go_through_limiter(self, mock_genai_client):
+        """GeminiClient bounds concurrent generate_content calls per model."""
+        from gemini_mcp.client import GeminiClient
+        from gemini_mcp.config import GeminiConfig
+        from gemini_mcp.rate_limiter import reset_rate_controller
+
+        reset_rate_controller()
+        running = 0
+        peak = 0
+
+        async def generate_content(**kwargs):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return SimpleNamespace(text="ok", candidates=[], usage_metadata=None)
+
+        mock_genai_client.aio.models.generate_content = AsyncMock(side_effect=generate_content)
+        client = GeminiClient(
+            config=GeminiConfig(project_id="test-project", design_cache_path="", max_concurrency=2)
+        )
+        client._client = mock_genai_client
+
+        await asyncio.gather(*(client.generate_text(f"p{i}", model="m") for i in range(5)))
+
+        assert peak == 2
+        stats = client.get_rate_limit_stats()["m"]
+        assert stats["acquired"] == 5
+        assert stats["queued"] == 3
+        reset_rate_controller()
+
+
+# =============================================================================
+# Retry Budget
+# =============================================================================
+
+
+def _no_delay_strategy(max_retries):
+    from gemini_mcp.error_recovery import RecoveryStrategy
+
+    return RecoveryStrategy(max_retries=max_retries, base_delay_seconds=0, jitter=False)
+
+
+class _FlakyAgent:
+    """Agent stub whose output never passes validation."""
+
+    name = "flaky"
+
+    def __init__(self):
+        self.calls = 0
+
+    async def execute(self, context):
+        from gemini_mcp.agents.base import AgentResult, AgentRole
+
+        self.calls += 1
+        return AgentResult(
+            success=True, output="<div>", agent_role=AgentRole.ARCHITECT, execution_time_ms=0
+        )
+
+    def validate_output(self, output):
+        return False, ["unclosed div"]
+
+
+class TestRetryBudget:
+    """Tests for the shared retry budget."""
+
+    async def test_nested_layers_share_budget(self):
+        """Outer and inner with_retry draw on one budget instead of multiplying."""
+        from gemini_mcp.error_recovery import get_retry_stats, reset_retry_stats, retry_budget, with_retry
+
+        reset_retry_stats()
+        calls = 0
+
+        async def api_call():
+            nonlocal calls
+            calls += 1
+            raise ConnectionError("connection reset")
+
+        async def client_call():
+            return await with_retry(api_call, _no_delay_strategy(2), layer="client")
+
+        with retry_budget(max_retries=2) as budget:
+            with pytest.raises(ConnectionError):
+                await with_retry(client_call, _no_delay_strategy(3), layer="server")
+
+        # Without the budget: (3 + 1) * (2 + 1) = 12 calls
+        assert calls == 3
+        assert budget.retries_by_layer == {"client": 2}
+        assert budget.abort_reason == "budget"
+        stats = get_retry_stats()
+        assert stats["total_retries"] == 2
+        # The client hit its own cap first; the server was refused by the budget
+        assert stats["aborts"] == {"server:budget": 1}
+        reset_retry_stats()
+
+    async def test_deadline_fails_fast(self):
+        """No new attempt starts once the deadline has passed."""
+        from gemini_mcp.error_recovery import retry_budget, with_retry
+
+        calls = 0
+
+        async def slow_failure():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.03)
+            raise TimeoutError("timed out")
+
+        with retry_budget(max_retries=10, deadline_seconds=0.02) as budget:
+            with pytest.raises(TimeoutError):
+                await with_retry(slow_failure, _no_delay_strategy(5))
+
+        assert calls == 1
+        assert budget.abort_reason == "deadline"
+
+    async def test_expired_budget_rejects_new_call(self):
+        """A call started after the deadline raises RetryBudgetExhausted."""
+        from gemini_mcp.error_recovery import RetryBudgetExhausted, retry_budget, with_retry
+
+        api_call = AsyncMock(return_value="ok")
+        with retry_budget(deadline_seconds=0):
+            with pytest.raises(RetryBudgetExhausted):
+                await with_retry(api_call)
+        api_call.assert_not_called()
+
+    def test_nested_scopes_reuse_outer_budget(self):
+        """The outermost layer decides the allowance."""
+        from gemini_mcp.error_recovery import current_retry_budget, retry_budget
+
+        assert current_retry_budget() is None
+        with retry_budget(max_retries=1) as outer:
+            with retry_budget(max_retries=9) as inner:
+                assert inner is outer
+        assert current_retry_budget() is None
+
+    async def test_self_correction_consumes_budget(self):
+        """Orchestrator validation retries stop when the budget is spent."""
+        from gemini_mcp.error_recovery import retry_budget
+        from gemini_mcp.orchestration.context import AgentContext
+        from gemini_mcp.orchestration.orchestrator import AgentOrchestrator
+
+        orchestrator = AgentOrchestrator(MagicMock(), enable_validation=False)
+        agent = _FlakyAgent()
+        with retry_budget(max_retries=1) as budget:
+            result = await orchestrator._execute_with_correction(agent, AgentContext(), max_retries=2)
+
+        assert agent.calls == 2
+        assert "unclosed div" in result.warnings
+        assert budget.retries_by_layer == {"correction": 1}
+
+    async def test_agent_retries_consume_budget(self):
+        """BaseAgent.execute_with_retry gives up when the budget is gone."""
+        from gemini_mcp.agents.base import AgentConfig, AgentRole, BaseAgent
+        from gemini_mcp.error_recovery import retry_budget
+        from gemini_mcp.orchestration.context import AgentContext
+
+        class RaisingAgent(BaseAgent):
+            role = AgentRole.ARCHITECT
+            calls = 0
+
+            def get_system_prompt(self, variables=None):
+                return ""
+
+            async def execute(self, context):
+                RaisingAgent.calls += 1
+                raise ConnectionError("connection reset")
+
+            def validate_output(self, output):
+                return True, []
+
+        agent = RaisingAgent(AgentConfig(max_retries=3, retry_delay_seconds=0))
+        with retry_budget(max_retries=0):
+            result = await agent.execute_with_retry(AgentContext())
+
+        assert RaisingAgent.calls == 1
+        assert not result.success
+
+    async def test_pipeline_reports_budget(self):
+        """Pipelines run under one budget and report its usage."""
+        from gemini_mcp.orchestration.context import AgentContext
+        from gemini_mcp.orchestration.orchestrator import AgentOrchestrator
+        from gemini_mcp.orchestration.pipelines import PipelineType
+
+        orchestrator = AgentOrchestrator(MagicMock(), enable_validation=False)
+        orchestrator.register_agent("architect", _StubAgent("architect"))
+
+        result = await orchestrator.run_pipeline(PipelineType.COMPONENT, AgentContext())
+
+        assert result.retry_budget["max_retries"] >= 4
+        assert result.retry_budget["retries_used"] == 0
+
+
+# =============================================================================
+# Event-Loop-Safe Retry and Auth
+# =============================================================================
+
+
+class _SlowCredentials:
+    """Credentials whose refresh blocks like a real token HTTP call.
+
+    With a ``gate``, refresh blocks until the event loop sets it instead of
+    sleeping: it can only return (gate_seen) if the loop kept running.
+    """
+
+    def __init__(self, expires_in, refresh_seconds=0.2, gate=None):
+        from datetime import timedelta
+
+        # google-auth keeps expiry as naive UTC
+        self.expiry = self._utcnow() + timedelta(seconds=expires_in)
+        self.refresh_seconds = refresh_seconds
+        self.gate = gate
+        self.gate_seen = False
+        self.refresh_threads = []
+        self.refreshes = 0
+
+    @staticmethod
+    def _utcnow():
+        from datetime import datetime, timezone
+
+        return datetime.now(timezone.utc).replace(tzinfo=None)
+
+    @property
+    def expired(self):
+        return self.expiry <= self._utcnow()
+
+    def refresh(self, request):
+        import threading
+        import time
+        from datetime import timedelta
+
+        self.refresh_threads.append(threading.get_ident())
+        if self.gate is not None:
+            self.gate_seen = self.gate.wait(timeout=5)
+        else:
+            time.sleep(self.refresh_seconds)
+        self.refreshes += 1
+        self.expiry = self._utcnow() + timedelta(hours=1)
+
+
+class TestEventLoopSafety:
+    """Blocking retry/auth work must not stall other requests."""
+
+    async def test_pipeline_progresses_during_token_refresh(self):
+        """A pipeline finishes while a blocking refresh runs in a worker thread."""
+        from gemini_mcp.auth import AuthManager
+        from gemini_mcp.orchestration.context import AgentContext
+        from gemini_mcp.orchestration.orchestrator import AgentOrchestrator
+        from gemini_mcp.orchestration.pipelines import PipelineType
+
+        gate = threading.Event()
+        auth = AuthManager()
+        auth._credentials = _SlowCredentials(expires_in=-1, gate=gate)
+        orchestrator = AgentOrchestrator(MagicMock(), enable_validation=False)
+        orchestrator.register_agent("architect", _StubAgent("architect", delay=0.01))
+        orchestrator.register_agent("alchemist", _StubAgent("alchemist", delay=0.01))
+
+        refresh = asyncio.ensure_future(auth.ensure_fresh())
+        await asyncio.sleep(0)  # Refresh is now blocked in its worker thread
+        result = await orchestrator.run_pipeline(PipelineType.COMPONENT, AgentContext())
+        # The pipeline finished while the refresh was still waiting on the gate
+        assert not refresh.done()
+        gate.set()
+        await refresh
+        auth.stop_background_refresh()
+
+        assert result.html
+        assert auth.credentials.gate_seen
+        assert auth.credentials.refresh_threads != [threading.get_ident()]
+        assert auth.credentials.refreshes == 1
+
+    async def test_client_auth_error_refresh_keeps_loop_responsive(self, monkeypatch):
+        """A GeminiClient call that hits a 401 refreshes off the loop and retries."""
+        from gemini_mcp import client as client_module
+        from gemini_mcp.auth import AuthManager
+        from gemini_mcp.client import GeminiClient
+        from gemini_mcp.config import GeminiConfig
+
+        built = []
+
+        def fake_genai_client(**kwargs):
+            genai_client = MagicMock()
+            first = not built
+            genai_client.aio.models.generate_content = AsyncMock(
+                side_effect=RuntimeError("401 unauthorized") if first else None,
+                return_value=SimpleNamespace(text="ok", candidates=[], usage_metadata=None),
+            )
+            built.append(kwargs)
+            return genai_client
+
+        monkeypatch.setattr(client_module.genai, "Client", fake_genai_client)
+        client = GeminiClient(config=GeminiConfig(project_id="test-project", design_cache_path=""))
+        gate = threading.Event()
+        auth = AuthManager()
+        auth._credentials = _SlowCredentials(expires_in=3600, gate=gate)
+        client._auth_manager = auth
+        client._recovery_strategy = _no_delay_strategy(2)
+        context_cache = client.enable_context_cache()
+
+        async def ticker():
+            # Only runs if the loop is free while refresh() blocks on the gate
+            while not auth.credentials.refresh_threads:
+                await asyncio.sleep(0.001)
+            gate.set()
+
+        ticking = asyncio.ensure_future(ticker())
+        result = await client.generate_text("hi", model="gemini-3-flash-preview")
+        await asyncio.wait_for(ticking, timeout=5)
+        auth.stop_background_refresh()
+
+        assert result["text"] == "ok"
+        assert auth.credentials.refreshes == 1
+        # Both clients (before and after the refresh) use the AuthManager's credentials
+        assert [kwargs["credentials"] for kwargs in built] == [auth.credentials] * 2
+        # The blocking refresh ran in a worker thread while the loop set the gate
+        assert auth.credentials.gate_seen
+        assert auth.credentials.refresh_threads != [threading.get_ident()]
+        # The context cache shares the client through the async provider
+        assert await context_cache._get_client() is client._client
+
+    async def test_concurrent_refreshes_single_flight(self):
+        """Concurrent callers share one worker-thread refresh."""
+        from gemini_mcp.auth import AuthManager
+
+        auth = AuthManager()
+        auth._credentials = _SlowCredentials(expires_in=-1, refresh_seconds=0.05)
+
+        await asyncio.gather(*(auth.refresh_async() for _ in range(5)))
+
+        assert auth.credentials.refreshes == 1
+        assert auth.refresh_count == 1
+        assert not auth.needs_refresh()
+
+    async def test_background_refresh_before_expiry(self, monkeypatch):
+        """The token is refreshed proactively, before it expires."""
+        from gemini_mcp import auth as auth_module
+
+        monkeypatch.setattr(auth_module, "REFRESH_MARGIN_SECONDS", 60)
+        auth = auth_module.AuthManager()
+        auth._credentials = _SlowCredentials(expires_in=60.05, refresh_seconds=0)
+
+        await auth.ensure_fresh()
+        assert auth.credentials.refreshes == 0
+        await asyncio.sleep(0.15)
+        auth.stop_background_refresh()
+
+        assert auth.credentials.refreshes == 1
+        assert auth.seconds_until_expiry() > 3000
+
+    async def test_agent_retry_delay_does_not_block(self):
+        """execute_with_retry waits with asyncio.sleep, not time.sleep."""
+        from gemini_mcp.agents.base import AgentConfig, AgentRole, BaseAgent
+        from gemini_mcp.orchestration.context import AgentContext
+
+        class RaisingAgent(BaseAgent):
+            role = AgentRole.ARCHITECT
+
+            def get_system_prompt(self, variables=None):
+                return ""
+
+            async def execute(self, context):
+                raise ConnectionError("connection reset")
+
+            def validate_output(self, output):
+                return True, []
+
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticking = asyncio.ensure_future(ticker())
+        agent = RaisingAgent(AgentConfig(max_retries=2, retry_delay_seconds=0.1))
+        result = await agent.execute_with_retry(AgentContext())
+        ticking.cancel()
+
+        assert not result.success
+        assert ticks >= 10
+
+    async def test_async_auth_error_callback_awaited(self):
+        """with_retry awaits an async credential refresh callback."""
+        from gemini_mcp.error_recovery import with_retry
+
+        refreshed = AsyncMock()
+        api_call = AsyncMock(side_effect=[RuntimeError("401 unauthorized"), "ok"])
+
+        result = await with_retry(api_call, _no_delay_strategy(1), on_auth_error=refreshed)
+
+        assert result == "ok"
+        refreshed.assert_awaited_once()
+
+
+# =============================================================================
+# Single-Scan Section Index
+# =============================================================================
+
+
+class TestSectionedPage:
+    """Tests for SectionedPage and the section_utils functions built on it."""
+
+    def test_scan_records_offsets_and_names(self):
+        """One scan gives names, boundaries and content for every section."""
+        from gemini_mcp.section_utils import SectionedPage
+
+        page = SectionedPage(PAGE_HTML)
+        hero = page.find("hero")
+
+        assert page.names == ["navbar", "hero", "footer"]
+        assert PAGE_HTML[hero.start:hero.end].startswith("<!-- SECTION: hero -->")
+        assert page.extract("hero") == "<section>Hero</section>"
+        assert page.boundaries("footer") == (PAGE_HTML.index("<!-- SECTION: footer"), len(PAGE_HTML))
+        assert "missing" not in page and page.extract("missing") is None
+
+    def test_nested_and_duplicate_names(self):
+        """Nested same-name sections pair correctly; edits hit outermost occurrences."""
+        from gemini_mcp.section_utils import SectionedPage
+
+        html = (
+            "<!-- SECTION: features --><!-- SECTION: card -->a<!-- /SECTION: card -->"
+            "<!-- SECTION: features -->inner<!-- /SECTION: features --><!-- /SECTION: features -->\n"
+            "<!-- SECTION: card -->b<!-- /SECTION: card -->"
+        )
+        page = SectionedPage(html)
+
+        assert [(s.name, s.depth) for s in page.sections] == [
+            ("features", 0), ("card", 1), ("features", 1), ("card", 0),
+        ]
+        assert page.extract("features").endswith("inner<!-- /SECTION: features -->")
+
+        page.replace("card", "X")
+        assert page.text.count("\nX\n") == 2
+        assert page.extract("features").startswith("<!-- SECTION: card -->\nX\n")
+
+    def test_repeated_edits_only_rebuild_touched_pieces(self):
+        """Untouched top-level pieces are reused as-is across edits."""
+        from gemini_mcp.section_utils import SectionedPage
+
+        page = SectionedPage(PAGE_HTML)
+        navbar_piece = page._pieces[0]
+        for i in range(5):
+            page.replace("hero", f"<section>Hero {i}</section>")
+
+        assert page._pieces[0] is navbar_piece
+        assert page.extract("hero") == "<section>Hero 4</section>"
+        assert page.names == ["navbar", "hero", "footer"]
+
+    def test_insert_and_remove(self):
+        """insert_after and remove keep the existing output format."""
+        from gemini_mcp.section_utils import SectionedPage, insert_section_after, remove_section
+
+        inserted = insert_section_after(PAGE_HTML, "hero", "cta", "<div>CTA</div>")
+        assert "<!-- /SECTION: hero -->\n<!-- SECTION: cta -->\n<div>CTA</div>\n<!-- /SECTION: cta -->" in inserted
+
+        removed = remove_section(PAGE_HTML, "hero")
+        assert removed == (
+            "<!-- SECTION: navbar -->\n<nav>Nav</nav>\n<!-- /SECTION: navbar -->\n"
+            "<!-- SECTION: footer -->\n<footer>Foot</footer>\n<!-- /SECTION: footer -->"
+        )
+
+        page = SectionedPage(PAGE_HTML)
+        page.remove("navbar")
+        page.insert_after("footer", "legal", "<p>Legal</p>")
+        assert page.names == ["hero", "footer", "legal"]
+        with pytest.raises(ValueError):
+            page.remove("navbar")
+
+    def test_replacement_content_is_literal(self):
+        """Backslashes in new content are not treated as regex group references."""
+        from gemini_mcp.section_utils import replace_section
+
+        updated = replace_section(PAGE_HTML, "hero", r"<p>C:\1\temp</p>")
+
+        assert "<p>C:\\1\\temp</p>" in updated
+
+    def test_executor_uses_one_scan(self):
+        """Executor helpers accept a SectionedPage and keep their old results."""
+        from gemini_mcp.maestro.execution.executor import ToolExecutor
+        from gemini_mcp.section_utils import SectionedPage
+
+        executor = ToolExecutor(MagicMock())
+        page = SectionedPage(PAGE_HTML)
+
+        assert executor._extract_section(page, "hero") == "<section>Hero</section>"
+        assert "<p>New</p>" in executor._replace_section_html(page, "hero", "<p>New</p>")
+        assert executor._replace_section_html(PAGE_HTML, "missing", "x") == PAGE_HTML
+        assert executor._list_sections(PAGE_HTML + PAGE_HTML) == ["navbar", "hero", "footer"]
+
+
+# =============================================================================
+# Project Token Index
+# =============================================================================
+
+
+class TestProjectTokenIndex:
+    """Tests for the per-project design-token index used by section chains."""
+
+    HERO = '<section class="bg-blue-600 py-24"><h1 class="text-4xl font-bold text-white">Hi</h1></section>'
+    FEATURES = '<section class="bg-blue-600 py-16"><div class="rounded-xl shadow-lg p-6">F</div></section>'
+
+    def test_update_counts_and_replaces_section(self):
+        """Frequencies add up across sections; re-saving replaces the old counts."""
+        from gemini_mcp.section_utils import ProjectTokenIndex
+
+        index = ProjectTokenIndex("acme")
+        index.update_section("hero", self.HERO)
+        index.update_section("features", self.FEATURES)
+
+        assert index.sections == ["hero", "features"]
+        assert index.frequencies("colors") == {"bg-blue-600": 2, "text-white": 1}
+        assert index.summary()["colors"][0] == "bg-blue-600"
+        assert set(index.summary()["effects"]) == {"rounded-xl", "shadow-lg"}
+
+        index.update_section("hero", '<section class="bg-slate-900">')
+        assert index.frequencies("colors") == {"bg-blue-600": 1, "bg-slate-900": 1}
+        assert "text-4xl" not in index.frequencies("typography")
+        assert index.sections == ["hero", "features"]
+
+        assert index.remove_section("features") and not index.remove_section("features")
+        assert index.frequencies("effects") == {}
+
+    def test_summary_is_cached_until_next_save(self):
+        """Queries between saves return the cached summary without rescanning."""
+        from gemini_mcp.section_utils import ProjectTokenIndex
+
+        index = ProjectTokenIndex()
+        index.update_section("hero", self.HERO)
+        first = index.summary()
+
+        assert index.summary() is first
+        index.update_section("cta", self.FEATURES)
+        assert index.summary() is not first
+        assert index.summary()["sections"] == ["hero", "cta"]
+
+    def test_update_page_seeds_from_markers(self):
+        """Marked page HTML is indexed per section, unmarked HTML as one section."""
+        from gemini_mcp.section_utils import ProjectTokenIndex
+
+        marked = ProjectTokenIndex()
+        marked.update_page(
+            f"<!-- SECTION: hero -->{self.HERO}<!-- /SECTION: hero -->\n"
+            f"<!-- SECTION: features -->{self.FEATURES}<!-- /SECTION: features -->"
+        )
+        plain = ProjectTokenIndex()
+        plain.update_page(self.HERO)
+
+        assert marked.sections == ["hero", "features"]
+        assert plain.sections == ["previous"]
+
+    def test_registry_is_per_project_and_bounded(self, monkeypatch):
+        """Indexes are shared per project id and evicted least recently used."""
+        from gemini_mcp import section_utils
+
+        monkeypatch.setattr(section_utils, "MAX_PROJECT_TOKEN_INDEXES", 2)
+        section_utils.reset_project_token_indexes()
+        a = section_utils.get_project_token_index("a")
+        section_utils.get_project_token_index("b")
+        assert section_utils.get_project_token_index("a") is a
+        section_utils.get_project_token_index("c")
+
+        assert list(section_utils._project_token_indexes) == ["a", "c"]
+        section_utils.reset_project_token_indexes()
+
+    def test_prompt_size_stays_flat_as_page_grows(self):
+        """The token-summary prompt does not grow with the number of sections."""
+        from gemini_mcp.frontend_presets import build_section_prompt
+        from gemini_mcp.section_utils import ProjectTokenIndex
+
+        def prompt_for(sections: int) -> str:
+            index = ProjectTokenIndex()
+            for i in range(sections):
+                index.update_section(f"s{i}", self.HERO + self.FEATURES)
+            return build_section_prompt("pricing", token_summary=index.summary())
+
+        small, large = prompt_for(2), prompt_for(40)
+
+        assert "Previous Section HTML" not in large
+        assert '"bg-blue-600"' in large
+        # Only the section name list grows, by a few bytes per section
+        assert len(large) - len(small) < 40 * 8
+
+    async def test_design_section_chains_from_index(self, monkeypatch):
+        """The server indexes each section and sends the summary, not the HTML."""
+        from gemini_mcp import server
+        from gemini_mcp.section_utils import reset_project_token_indexes
+
+        reset_project_token_indexes()
+        client = MagicMock()
+        client.design_section = AsyncMock(side_effect=[{"html": self.HERO}, {"html": self.FEATURES}])
+        monkeypatch.setattr(server, "get_gemini_client", lambda: client)
+
+        async def passthrough(result, *args, **kwargs):
+            return result
+
+        monkeypatch.setattr(server, "_auto_save_design_output_async", passthrough)
+
+        await server.design_section("hero", project_context="Project: Acme")
+        second = await server.design_section("features", project_context="Project: Acme")
+
+        first_call, second_call = client.design_section.await_args_list
+        assert first_call.kwargs["token_summary"] is None
+        assert second_call.kwargs["token_summary"]["sections"] == ["hero"]
+        assert second["token_index"] == {
+            "project_id": "acme", "sections": ["hero", "features"], "used_for_prompt": True,
+        }
+        reset_project_token_indexes()
+
+    async def test_explicit_previous_html_reseeds_index(self, monkeypatch):
+        """previous_html is sent as given and replaces the indexed sections."""
+        from gemini_mcp import server
+        from gemini_mcp.section_utils import get_project_token_index, reset_project_token_indexes
+
+        reset_project_token_indexes()
+        client = MagicMock()
+        client.design_section = AsyncMock(return_value={"html": self.FEATURES})
+        monkeypatch.setattr(server, "get_gemini_client", lambda: client)
+
+        async def passthrough(result, *args, **kwargs):
+            return result
+
+        monkeypatch.setattr(server, "_auto_save_design_output_async", passthrough)
+        get_project_token_index("acme").update_section("stale", '<div class="bg-red-500">')
+
+        result = await server.design_section(
+            "features", previous_html=self.HERO, project_context="Project: Acme"
+        )
+
+        call = client.design_section.await_args
+        assert call.kwargs["previous_html"] == self.HERO and call.kwargs["token_summary"] is None
+        assert result["token_index"]["sections"] == ["previous", "features"]
+        assert result["token_index"]["used_for_prompt"] is False
+
+        await server.design_section("cta", project_context="Project: Acme", reset_token_index=True)
+        assert client.design_section.await_args.kwargs["token_summary"] is None
+        assert get_project_token_index("acme").sections == ["cta"]
+        reset_project_token_indexes()
+
+    async def test_replace_section_reseeds_index(self, monkeypatch):
+        from gemini_mcp import server
+        from gemini_mcp.section_utils import get_project_token_index, reset_project_token_indexes
+
+        reset_project_token_indexes()
+        client = MagicMock()
+        client.design_section = AsyncMock(return_value={"html": '<section class="bg-emerald-500">New</section>'})
+        monkeypatch.setattr(server, "get_gemini_client", lambda: client)
+
+        async def passthrough(result, *args, **kwargs):
+            return result
+
+        monkeypatch.setattr(server, "_auto_save_design_output_async", passthrough)
+        page = (
+            '<!-- SECTION: hero --><section class="bg-blue-600">Hi</section><!-- /SECTION: hero -->'
+            '<!-- SECTION: cta --><section class="bg-red-500">Go</section><!-- /SECTION: cta -->'
+        )
+
+        await server.replace_section_in_page(page, "cta", "Greener", project_context="Project: Acme")
+
+        index = get_project_token_index("acme")
+        assert index.sections == ["hero", "cta"]
+        assert "bg-emerald-500" in index.summary()["colors"]
+        assert "bg-red-500" not in index.summary()["colors"]
+        reset_project_token_indexes()
+
+
+# =============================================================================
+# Model Routing
+# =============================================================================
+
+
+class _RoutedArchitect:
+    """Architect stub that records the model it was routed to per attempt."""
+
+    name = "architect"
+
+    def __init__(self, outputs):
+        from gemini_mcp.agents.base import AgentRole
+
+        self.role = AgentRole.ARCHITECT
+        self.outputs = list(outputs)
+        self.models = []
+
+    async def execute(self, context):
+        from gemini_mcp.agents.base import AgentResult, AgentRole
+
+        self.models.append(context.model_routes["architect"].model)
+        return AgentResult(
+            success=True,
+            output=self.outputs.pop(0),
+            agent_role=AgentRole.ARCHITECT,
+            execution_time_ms=10,
+            token_usage={"input_tokens": 1000, "output_tokens": 500},
+        )
+
+    def validate_output(self, output):
+        return (True, []) if output.endswith("</div>") else (False, ["unclosed div"])
+
+
+class TestModelRouting:
+    """Tests for per-agent model routing and escalation."""
+
+    def test_route_table(self):
+        """Simple components run on Flash, complex ones and judges on Pro."""
+        from gemini_mcp.orchestration.context import QualityTarget
+        from gemini_mcp.orchestration.routing import FLASH_MODEL, PRO_MODEL, RoutingPolicy
+
+        policy = RoutingPolicy()
+        button = policy.route("architect", "button", QualityTarget.PRODUCTION)
+        assert (button.model, button.thinking_level, button.tier) == (FLASH_MODEL, "low", 1)
+
+        assert policy.route("architect", "hero", QualityTarget.PRODUCTION).model == PRO_MODEL
+        assert policy.route("critic", "button", QualityTarget.DRAFT).model == PRO_MODEL
+        assert policy.route("architect", "button", QualityTarget.PREMIUM).model == PRO_MODEL
+        assert policy.route("architect", "button", "production", tier=4).model == PRO_MODEL
+
+    def test_single_shot_route_covers_all_outputs(self):
+        """design_component gets the combined HTML/CSS/JS output cap."""
+        from gemini_mcp.orchestration.complexity import get_config_for_quality_target
+        from gemini_mcp.orchestration.routing import SINGLE_SHOT_AGENT, RoutingPolicy
+
+        route = RoutingPolicy().route(SINGLE_SHOT_AGENT, "button")
+        config = get_config_for_quality_target("button", "production")
+
+        assert route.max_output_tokens == (
+            config.max_html_tokens + config.max_css_tokens + config.max_js_tokens
+        )
+        assert set(route.generation_kwargs()) == {"model", "thinking_level", "max_output_tokens"}
+
+    def test_escalation(self):
+        """Flash routes move to Pro on failed validation or a low Critic score."""
+        from gemini_mcp.orchestration.routing import PRO_MODEL, RoutingPolicy
+
+        policy = RoutingPolicy()
+        route = policy.route("alchemist", "button")
+
+        assert policy.escalation_reason(route, critic_score=8.5, threshold=8.0) == ""
+        reason = policy.escalation_reason(route, critic_score=6.2, threshold=8.0)
+        assert reason == "critic score 6.2 < 8.0"
+        assert policy.escalation_reason(route, validation_failed=True) == "validation failed"
+
+        escalated = policy.escalate(route, reason)
+        assert (escalated.model, escalated.thinking_level, escalated.escalated) == (
+            PRO_MODEL, "high", True,
+        )
+        # Pro routes have nowhere to go
+        assert policy.escalation_reason(escalated, validation_failed=True) == ""
+        assert policy.escalate(escalated, "again") is escalated
+
+    def test_estimate_cost(self):
+        """Flash is cheaper than Pro and cached input is discounted."""
+        from gemini_mcp.orchestration.routing import FLASH_MODEL, PRO_MODEL, estimate_cost
+
+        usage = {"input_tokens": 1000, "output_tokens": 1000}
+        assert estimate_cost(PRO_MODEL, usage) == pytest.approx(0.0015)
+        assert estimate_cost(FLASH_MODEL, usage) < estimate_cost(PRO_MODEL, usage)
+        assert estimate_cost(PRO_MODEL, {**usage, "cached_tokens": 1000}) < 0.0015
+        assert estimate_cost(PRO_MODEL, None) == 0.0
+
+    async def test_invalid_output_escalates_retry(self):
+        """A Flash attempt that fails validation is retried on Pro."""
+        from gemini_mcp.orchestration.context import AgentContext
+        from gemini_mcp.orchestration.orchestrator import AgentOrchestrator
+        from gemini_mcp.orchestration.routing import FLASH_MODEL, PRO_MODEL, RoutingPolicy
+
+        orchestrator = AgentOrchestrator(
+            MagicMock(), enable_validation=False, routing_policy=RoutingPolicy()
+        )
+        agent = _RoutedArchitect(["<div>", "<div></div>"])
+        context = AgentContext(component_type="button")
+
+        result = await orchestrator._execute_with_correction(agent, context)
+
+        assert agent.models == [FLASH_MODEL, PRO_MODEL]
+        assert context.model_routes["architect"].escalated
+        calls = result.metadata["model_routes"]
+        assert [call["route"]["model"] for call in calls] == [FLASH_MODEL, PRO_MODEL]
+        assert calls[0]["cost_usd"] < calls[1]["cost_usd"]
+
+    async def test_design_component_cache_keyed_by_routed_model(self, mock_genai_client):
+        """A tier that routes to Pro does not reuse a cached Flash design."""
+        from gemini_mcp.cache import DesignCache
+        from gemini_mcp.client import GeminiClient
+        from gemini_mcp.config import GeminiConfig
+        from gemini_mcp.orchestration.routing import FLASH_MODEL, PRO_MODEL
+
+        mock_genai_client.aio.models.generate_content = AsyncMock(return_value=SimpleNamespace(
+            text=json.dumps({"component_id": "button-1", "html": "<button></button>"}),
+            candidates=[],
+            usage_metadata=None,
+        ))
+        client = GeminiClient(config=GeminiConfig(project_id="test-project", design_cache_path=""))
+        client._client = mock_genai_client
+        client._cache = DesignCache()
+
+        flash = await client.design_component("button", {"context": "CTA"})
+        pro = await client.design_component("button", {"context": "CTA"}, tier=4)
+        again = await client.design_component("button", {"context": "CTA"})
+
+        assert (flash["model_used"], pro["model_used"]) == (FLASH_MODEL, PRO_MODEL)
+        assert again["model_used"] == FLASH_MODEL
+        assert mock_genai_client.aio.models.generate_content.await_count == 2
+
+    async def test_repaired_flash_result_not_cached_before_escalation(self, mock_genai_client):
+        """A repaired Flash response is not cached when the Pro retry degrades too."""
+        from gemini_mcp.cache import DesignCache
+        from gemini_mcp.client import GeminiClient
+        from gemini_mcp.config import GeminiConfig
+
+        texts = iter([
+            '{"component_id": "button-1", "html": "<button>Go</button>",}',  # Repairable
+            "Here you go: <div><button>Go</button></div>",  # Only the HTML is recoverable
+        ] * 2)
+        mock_genai_client.aio.models.generate_content = AsyncMock(
+            side_effect=lambda **kwargs: SimpleNamespace(
+                text=next(texts), candidates=[], usage_metadata=None
+            )
+        )
+        client = GeminiClient(config=GeminiConfig(project_id="test-project", design_cache_path=""))
+        client._client = mock_genai_client
+        client._cache = DesignCache()
+
+        first = await client.design_component("button", {"context": "CTA"})
+        second = await client.design_component("button", {"context": "CTA"})
+
+        assert first.get("_recovered_html") and second.get("_recovered_html")
+        assert mock_genai_client.aio.models.generate_content.await_count == 4
+
+    async def test_routing_disabled_without_policy(self):
+        """Mock clients get no policy, so agents keep their configured model."""
+        from gemini_mcp.orchestration.context import AgentContext
+        from gemini_mcp.orchestration.orchestrator import AgentOrchestrator
+
+        orchestrator = AgentOrchestrator(MagicMock(), enable_validation=False)
+        context = AgentContext(component_type="button")
+
+        assert orchestrator.routing_policy is None
+        assert orchestrator._route_agent(_RoutedArchitect([]), context) is None
+        assert context.model_routes == {}
+
+    def test_route_stats_recorded(self):
+        """Telemetry aggregates calls, escalations, latency and cost per route."""
+        from gemini_mcp.orchestration.routing import RoutingPolicy
+        from gemini_mcp.orchestration.telemetry import get_telemetry, reset_telemetry
+
+        reset_telemetry()
+        telemetry = get_telemetry()
+        telemetry.start_pipeline(pipeline_type="component", pipeline_id="route-1")
+        policy = RoutingPolicy()
+        route = policy.route("architect", "button")
+        escalated = policy.escalate(route, "validation failed")
+
+        telemetry.record_route("route-1", route.to_dict(), 100.0, 0.001, tokens=500)
+        telemetry.record_route("route-1", route.to_dict(), 300.0, 0.003, tokens=700)
+        telemetry.record_route("", escalated.to_dict(), 900.0, 0.01)
+        metrics = telemetry.end_pipeline("route-1", True)
+
+        stats = telemetry.get_route_stats()
+        assert stats[route.key]["calls"] == 2
+        assert stats[route.key]["avg_latency_ms"] == pytest.approx(200.0)
+        assert stats[route.key]["total_cost_usd"] == pytest.approx(0.004)
+        assert stats[escalated.key]["escalations"] == 1
+        # Direct client calls count globally but not toward the pipeline
+        assert list(metrics.to_dict()["routes"]) == [route.key]
+        reset_telemetry()
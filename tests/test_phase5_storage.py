@@ -0,0 +1,681 @@
+"""Tests for Phase 5 storage-layer features.
+
+- Atomic, append-only DraftManager with an indexed manifest
+- Content-addressed, compressed blob store with retention GC
+- Streaming compile_project_drafts with deduplicated asset bundles
+- DNAStore backends: indexed SQLite/WAL store with JSON import/export
+- Vector similarity search over stored Design DNA
+"""
+
+import asyncio
+import json
+import os
+
+
+# =============================================================================
+# Draft Store
+# =============================================================================
+
+
+class TestDraftStore:
+    """DraftManager: atomic writes, manifest.jsonl, indexed queries."""
+
+    def test_save_appends_one_manifest_line(self, tmp_path):
+        """Each save appends a single JSONL line instead of rewriting."""
+        from gemini_mcp.state import DraftManager
+
+        manager = DraftManager(str(tmp_path))
+        first = manager.save_artifact("<p>1</p>", "html", "proj", component_type="hero")
+        second = manager.save_artifact("<p>2</p>", "html", "proj", component_type="hero")
+
+        lines = (tmp_path / "proj" / "manifest.jsonl").read_text().splitlines()
+        assert [json.loads(line)["path"] for line in lines] == [first, second]
+        # Same component within one second gets a distinct file
+        assert first != second
+        assert open(first).read() == "<p>1</p>"
+        assert not list((tmp_path / "proj").glob("*.tmp"))
+
+    def test_latest_and_list_are_indexed(self, tmp_path):
+        """get_latest_draft answers per component without sorting."""
+        from gemini_mcp.state import DraftManager
+
+        manager = DraftManager(str(tmp_path))
+        manager.save_artifact("a", "html", "proj", component_type="hero")
+        nav = manager.save_artifact("b", "html", "proj", component_type="navbar")
+        hero = manager.save_artifact("c", "html", "proj", component_type="hero")
+
+        assert manager.get_latest_draft("proj", "hero")["path"] == hero
+        assert manager.get_latest_draft("proj", "navbar")["path"] == nav
+        assert manager.get_latest_draft("proj")["path"] == hero
+        assert manager.get_latest_draft("proj", "footer") is None
+        assert len(manager.list_drafts("proj")) == 3
+        assert manager.list_drafts("empty") == []
+
+    def test_index_tails_other_writers(self, tmp_path):
+        """Entries appended by another manager (process) show up on query."""
+        from gemini_mcp.state import DraftManager
+
+        reader = DraftManager(str(tmp_path))
+        assert reader.list_drafts("proj") == []
+
+        writer = DraftManager(str(tmp_path))
+        path = writer.save_artifact("x", "css", "proj", component_type="styles")
+
+        assert reader.get_latest_draft("proj", "styles")["path"] == path
+
+    def test_torn_line_is_skipped(self, tmp_path):
+        """A half-written manifest line after a crash does not break loading."""
+        from gemini_mcp.state import DraftManager
+
+        project = tmp_path / "proj"
+        project.mkdir()
+        good = {"id": "a", "type": "html", "path": "a.html", "created_at": "1", "component_type": "hero"}
+        (project / "manifest.jsonl").write_text(json.dumps(good) + "\nnot json\n" + '{"id": "torn')
+
+        manager = DraftManager(str(tmp_path))
+        assert manager.list_drafts("proj") == [good]
+        manager.save_artifact("b", "html", "proj", component_type="hero")
+        assert len(manager.list_drafts("proj")) == 2
+
+    def test_legacy_manifest_is_imported(self, tmp_path):
+        """An existing manifest.json is migrated into manifest.jsonl once."""
+        from gemini_mcp.state import DraftManager
+
+        project = tmp_path / "proj"
+        project.mkdir()
+        legacy = [
+            {"id": "new", "path": "new.html", "created_at": "20250102_000000", "component_type": "hero"},
+            {"id": "old", "path": "old.html", "created_at": "20250101_000000", "component_type": "hero"},
+        ]
+        (project / "manifest.json").write_text(json.dumps({"project": "proj", "artifacts": legacy}))
+
+        manager = DraftManager(str(tmp_path))
+        assert [d["id"] for d in manager.list_drafts("proj")] == ["old", "new"]
+        assert manager.get_latest_draft("proj", "hero")["id"] == "new"
+        assert (project / "manifest.jsonl").exists()
+
+    async def test_concurrent_async_saves(self, tmp_path):
+        """Concurrent async saves lose no manifest entries or files."""
+        from gemini_mcp.state import DraftManager
+
+        manager = DraftManager(str(tmp_path))
+        paths = await asyncio.gather(*(
+            manager.save_artifact_async(f"<p>{i}</p>", "html", "proj", component_type="hero",
+                                        metadata={"model_used": "m"})
+            for i in range(20)
+        ))
+
+        assert len(set(paths)) == 20
+        drafts = manager.list_drafts("proj")
+        assert sorted(d["path"] for d in drafts) == sorted(paths)
+        assert all(d["model_used"] == "m" for d in drafts)
+        lines = (tmp_path / "proj" / "manifest.jsonl").read_text().splitlines()
+        assert len(lines) == 20
+
+    async def test_auto_save_runs_off_event_loop(self, tmp_path, monkeypatch):
+        """Design tools await the auto-save in a worker thread."""
+        import threading
+
+        from gemini_mcp import server
+        from gemini_mcp.state import DraftManager
+
+        manager = DraftManager(str(tmp_path))
+        monkeypatch.setattr(server, "draft_manager", manager)
+        threads = []
+        original = manager.save_artifact
+
+        def tracking_save(*args, **kwargs):
+            threads.append(threading.current_thread())
+            return original(*args, **kwargs)
+
+        monkeypatch.setattr(manager, "save_artifact", tracking_save)
+
+        result = await server._auto_save_design_output_async(
+            {"html": "<div>x</div>", "css_output": ".a{}"}, "design_frontend", "component_card",
+            project_name="custom",
+        )
+
+        assert result["saved_to"].startswith(str(tmp_path / "custom"))
+        assert result["saved_css_to"]
+        assert threads and threading.main_thread() not in threads
+
+
+# =============================================================================
+# Content-Addressed Blob Store
+# =============================================================================
+
+
+def _page(rev, lines=400):
+    """Large page whose revisions differ in one line."""
+    body = "".join(f'<p class="text-slate-600">Paragraph {i}</p>\n' for i in range(lines))
+    return f"<section>\n<h1>Revision {rev}</h1>\n{body}</section>\n"
+
+
+class TestBlobStore:
+    """BlobStore: dedup, compression, delta chains."""
+
+    def test_identical_content_stored_once(self, tmp_path):
+        from gemini_mcp.blob_store import BlobStore
+
+        store = BlobStore(tmp_path)
+        first = store.put(_page(1).encode())
+        second = store.put(_page(1).encode())
+
+        assert first.digest == second.digest
+        assert first.new and not second.new
+        assert first.stored_size < first.size / 5
+        assert len(list(store.iter_blobs())) == 1
+        assert store.get(first.digest) == _page(1).encode()
+
+    def test_delta_against_previous_version(self, tmp_path):
+        from gemini_mcp.blob_store import MAX_DELTA_DEPTH, BlobStore
+
+        store = BlobStore(tmp_path)
+        full = store.put(_page(0).encode())
+        digests = [full.digest]
+        for rev in range(1, MAX_DELTA_DEPTH + 2):
+            info = store.put(_page(rev).encode(), base=digests[-1])
+            digests.append(info.digest)
+            if rev <= MAX_DELTA_DEPTH:
+                assert info.base == digests[-2]
+                assert info.depth == rev
+                assert info.stored_size < full.stored_size / 2
+            else:
+                assert info.base is None  # Chain capped: full blob again
+
+        fresh = BlobStore(tmp_path)  # No in-memory cache
+        for rev, digest in enumerate(digests):
+            assert fresh.get(digest) == _page(rev).encode()
+
+
+class TestDraftRetention:
+    """DraftManager blob mode: dedup, working copies, GC and quotas."""
+
+    def _manager(self, tmp_path, **policy):
+        from gemini_mcp.state import DraftManager, RetentionPolicy
+
+        policy.setdefault("gc_interval", 0)
+        policy.setdefault("grace_seconds", 0)
+        return DraftManager(str(tmp_path), use_blobs=True, policy=RetentionPolicy(**policy))
+
+    def test_repeated_saves_share_one_blob_and_inode(self, tmp_path):
+        manager = self._manager(tmp_path)
+        paths = [manager.save_artifact(_page(1), "html", "auto_save", component_type="hero") for _ in range(3)]
+
+        drafts = manager.list_drafts("auto_save")
+        assert len({d["blob"] for d in drafts}) == 1
+        assert len({os.stat(p).st_ino for p in paths}) == 1
+        stats = manager.get_storage_stats()
+        assert stats["blobs"] == 1
+        assert stats["logical_bytes"] == 3 * len(_page(1).encode())
+        assert stats["working_copy_bytes"] == len(_page(1).encode())
+
+    def test_default_policy_deletes_nothing(self, tmp_path, monkeypatch):
+        from gemini_mcp.state import RetentionPolicy
+
+        for var in ("KEEP_FILES", "MAX_VERSIONS", "QUOTA_MB"):
+            monkeypatch.delenv(f"GEMINI_DRAFT_{var}", raising=False)
+        manager = self._manager(tmp_path)
+        paths = [manager.save_artifact(_page(rev), "html", "proj", component_type="hero") for rev in range(60)]
+
+        stats = manager.gc()
+
+        assert RetentionPolicy.from_env() == RetentionPolicy()
+        assert stats["dropped_entries"] == stats["pruned_files"] == stats["deleted_blobs"] == 0
+        assert all(os.path.exists(p) for p in paths)
+        assert len(manager.list_drafts("proj")) == 60
+
+    def test_pruned_versions_read_from_blobs(self, tmp_path):
+        manager = self._manager(tmp_path, keep_files=1, delta=True)
+        for rev in range(4):
+            manager.save_artifact(_page(rev), "html", "proj", component_type="hero")
+
+        stats = manager.gc()
+        drafts = manager.list_drafts("proj")
+
+        assert stats["pruned_files"] == 3
+        assert [os.path.exists(d["path"]) for d in drafts] == [False, False, False, True]
+        assert [manager.read_artifact(d) for d in drafts] == [_page(rev) for rev in range(4)]
+        restored = manager.restore_artifact(drafts[0])
+        assert open(restored).read() == _page(0)
+
+    def test_max_versions_drops_old_entries_and_blobs(self, tmp_path):
+        manager = self._manager(tmp_path, max_versions=2)
+        for rev in range(5):
+            manager.save_artifact(_page(rev), "html", "proj", component_type="hero")
+        manager.save_artifact(_page(0), "css", "proj", component_type="hero_styles")
+
+        stats = manager.gc()
+
+        assert stats["dropped_entries"] == 3
+        drafts = manager.list_drafts("proj")
+        assert [d["component_type"] for d in drafts] == ["hero", "hero", "hero_styles"]
+        assert manager.get_latest_draft("proj", "hero")["path"] == drafts[1]["path"]
+        # _page(0) is still referenced by the css entry
+        assert stats["deleted_blobs"] == 2
+        assert manager.get_storage_stats()["blobs"] == 3
+
+    def test_quota_keeps_latest_per_component(self, tmp_path):
+        manager = self._manager(tmp_path, max_blob_bytes=1)
+        for rev in range(6):
+            manager.save_artifact(_page(rev), "html", "proj", component_type="hero")
+        manager.save_artifact(_page(99), "html", "other", component_type="nav")
+
+        manager.gc()
+
+        assert [d["blob"] for d in manager.list_drafts("proj")] == [
+            manager.get_latest_draft("proj", "hero")["blob"]
+        ]
+        assert len(manager.list_drafts("other")) == 1
+        assert manager.read_artifact(manager.get_latest_draft("proj", "hero")) == _page(5)
+
+    def test_grace_period_protects_recent_blobs(self, tmp_path):
+        manager = self._manager(tmp_path, max_versions=1, grace_seconds=3600)
+        manager.save_artifact(_page(0), "html", "proj", component_type="hero")
+        manager.save_artifact(_page(1), "html", "proj", component_type="hero")
+
+        stats = manager.gc()
+
+        assert stats["dropped_entries"] == 1
+        assert stats["deleted_blobs"] == 0
+
+    def test_automatic_gc_interval(self, tmp_path):
+        manager = self._manager(tmp_path, keep_files=1, gc_interval=3)
+        paths = [manager.save_artifact(_page(rev), "html", "proj", component_type="hero") for rev in range(3)]
+
+        assert [os.path.exists(p) for p in paths] == [False, False, True]
+
+
+# =============================================================================
+# Streaming Project Compiler
+# =============================================================================
+
+
+def _legacy_compile(manager, project):
+    """compile_project_drafts body assembly before streaming (reference)."""
+    import re
+
+    pattern = re.compile(r'<body[^>]*>(.*?)</body>', re.DOTALL)
+    unique = {}
+    for d in sorted(manager.list_drafts(project), key=lambda x: x['created_at']):
+        if d['type'] == 'html':
+            unique[d['component_type']] = d['path']
+    parts = []
+    for c_type, path in unique.items():
+        content = open(path, encoding='utf-8').read()
+        match = pattern.search(content)
+        parts.append(f"\n<!-- SECTION: {c_type} -->\n{match.group(1) if match else content}\n")
+    return "".join(parts)
+
+
+class TestStreamingCompiler:
+    """draft_compiler: chunked body scan, index lookups, bundles."""
+
+    def _manager(self, tmp_path, **policy):
+        from gemini_mcp.state import DraftManager, RetentionPolicy
+
+        policy.setdefault("gc_interval", 0)
+        policy.setdefault("grace_seconds", 0)
+        return DraftManager(str(tmp_path), use_blobs=True, policy=RetentionPolicy(**policy))
+
+    def test_body_span_matches_regex(self):
+        """Chunked scanning agrees with the old regex on awkward inputs."""
+        import io
+        import random
+        import re
+
+        from gemini_mcp.draft_compiler import find_body_span
+
+        pattern = re.compile(rb'<body[^>]*>(.*?)</body>', re.DOTALL)
+        pieces = [b"<body", b">", b"</body>", b"<body class='x'>", b"</bod", b"y>", b"text", b"<", b"\n"]
+        rng = random.Random(7)
+        for _ in range(2000):
+            doc = b"".join(rng.choice(pieces) for _ in range(rng.randint(0, 12)))
+            match = pattern.search(doc)
+            expected = match.span(1) if match else None
+            for chunk_size in (1, 3, 64):
+                assert find_body_span(io.BytesIO(doc), chunk_size) == expected, (doc, chunk_size)
+
+    def test_output_matches_legacy_concatenation(self, tmp_path):
+        """Same sections, order and body extraction as the old compiler."""
+        from gemini_mcp.draft_compiler import PAGE_HEAD, compile_project
+
+        manager = self._manager(tmp_path)
+        manager.save_artifact("<nav>Nav v1</nav>", "html", "site", component_type="navbar")
+        manager.save_artifact(
+            '<!DOCTYPE html><html><head></head><body class="x">\n<section>Hero ü</section>\n</body></html>',
+            "html", "site", component_type="hero",
+        )
+        manager.save_artifact("<nav>Nav v2</nav>", "html", "site", component_type="navbar")
+        manager.save_artifact(".a{}", "css", "site", component_type="navbar")
+        expected = _legacy_compile(manager, "site")
+
+        result = compile_project(manager, "site")
+        page = open(result.path, encoding="utf-8").read()
+
+        assert result.components == 2
+        assert page == PAGE_HEAD + '</head><body class="bg-gray-50">' + expected + "</body></html>"
+        assert "Nav v1" not in page
+        # A second compile does not include the first compiled page
+        assert compile_project(manager, "site").components == 2
+
+    def test_reads_pruned_drafts_from_blobs(self, tmp_path):
+        """Drafts whose working copy was pruned are streamed from their blob."""
+        from gemini_mcp.draft_compiler import compile_project
+
+        manager = self._manager(tmp_path)
+        path = manager.save_artifact("<body><p>only in blob</p></body>", "html", "site", component_type="hero")
+        os.remove(path)
+
+        result = compile_project(manager, "site")
+
+        assert "<p>only in blob</p>" in open(result.path).read()
+        assert manager.read_artifact(manager.get_latest_draft("site", "compiled_full_page")) == open(
+            result.path
+        ).read()
+
+    def test_asset_bundles_are_deduplicated(self, tmp_path):
+        from gemini_mcp.draft_compiler import compile_project
+
+        manager = self._manager(tmp_path)
+        shared = ".btn { color: red; }\n@media (min-width: 640px) { .btn { padding: 1rem; } }\n"
+        manager.save_artifact("<p>a</p>", "html", "site", component_type="a")
+        manager.save_artifact("<p>b</p>", "html", "site", component_type="b")
+        manager.save_artifact(shared + ".a { content: '}'; }", "css", "site", component_type="a_styles")
+        manager.save_artifact(shared.replace(" ", "  ") + ".b {}", "css", "site", component_type="b_styles")
+        manager.save_artifact("init();", "js", "site", component_type="a_scripts")
+        manager.save_artifact("init();", "js", "site", component_type="b_scripts")
+
+        result = compile_project(manager, "site", bundle_assets=True)
+
+        assert (result.css_rules, result.css_duplicates) == (4, 2)
+        assert (result.js_files, result.js_duplicates) == (1, 1)
+        css = open(result.css_path).read()
+        assert css.count(".btn { color: red; }") == 1
+        assert ".a { content: '}'; }" in css
+        assert open(result.js_path).read().count("init();") == 1
+        page = open(result.path).read()
+        assert os.path.basename(result.css_path) in page and os.path.basename(result.js_path) in page
+
+    async def test_tool_streams_off_event_loop(self, tmp_path, monkeypatch):
+        from gemini_mcp import server
+
+        manager = self._manager(tmp_path)
+        monkeypatch.setattr(server, "draft_manager", manager)
+
+        assert await server.compile_project_drafts("empty") == "No drafts found."
+        manager.save_artifact("<p>x</p>", "html", "site", component_type="hero")
+        message = await server.compile_project_drafts("site")
+
+        assert message.startswith("Compiled 1 components into ")
+        assert manager.get_latest_draft("site", "compiled_full_page")
+
+
+# =============================================================================
+# DNAStore Backends
+# =============================================================================
+
+
+_WRITER = """
+import sys
+from gemini_mcp.orchestration.context import DesignDNA
+from gemini_mcp.orchestration.dna_store import DNAStore
+
+store = DNAStore(sys.argv[1], max_entries=10_000)
+for i in range(int(sys.argv[3])):
+    store.save("hero", "dark", DesignDNA(colors={"i": str(i)}), project_id=sys.argv[2])
+"""
+
+
+class TestDNAStoreBackends:
+    """DNAStore on SQLite (indexed, multi-process) and JSON."""
+
+    def _dna(self, primary):
+        from gemini_mcp.orchestration.context import DesignDNA
+
+        return DesignDNA(colors={"primary": primary})
+
+    def test_backends_agree(self, tmp_path):
+        from gemini_mcp.orchestration.dna_store import DNAStore
+
+        for backend in ("sqlite", "json"):
+            store = DNAStore(str(tmp_path / backend / "dna.db"), max_entries=4, backend=backend)
+            ids = [
+                store.save(component, theme, self._dna(f"#{i}"), project_id=project)
+                for i, (component, theme, project) in enumerate([
+                    ("hero", "dark", "a"), ("hero", "light", "a"), ("navbar", "dark", "a"),
+                    ("hero", "dark", "b"), ("hero", "dark", "a"),
+                ])
+            ]
+
+            assert store.get(ids[0]) is None, backend  # Oldest evicted
+            assert store.get_latest("hero", "a").colors["primary"] == "#4", backend
+            assert store.get_latest("hero", "a", theme="light").colors["primary"] == "#1", backend
+            assert store.get_latest("footer", "a") is None
+            assert [e.dna_id for e in store.search(project_id="a")] == [ids[4], ids[2], ids[1]]
+            assert [e.dna_id for e in store.search(theme="dark", limit=2)] == [ids[4], ids[3]]
+            assert sorted(store.list_components("a")) == ["hero", "navbar"]
+            assert store.clear_project("a") == 3
+            stats = store.get_stats()
+            assert (stats["total_entries"], stats["projects"], stats["backend"]) == (1, 1, backend)
+
+    def test_latest_and_search_use_indexes(self, tmp_path):
+        from gemini_mcp.orchestration.dna_store import DNAStore
+
+        backend = DNAStore(str(tmp_path / "dna.db")).backend
+        columns, order = backend._COLUMNS, backend._ORDER_NEWEST
+        for where, params in [
+            ("project_id = ? AND component_type = ?", ("a", "hero")),
+            ("project_id = ? AND component_type = ? AND theme = ?", ("a", "hero", "dark")),
+            ("project_id = ?", ("a",)),
+        ]:
+            plan = backend.explain(
+                f"SELECT {columns} FROM dna_entries WHERE {where} {order} LIMIT 1", params
+            )
+            assert "USING INDEX" in plan and "TEMP B-TREE" not in plan, plan
+
+    def test_batch_is_one_transaction(self, tmp_path):
+        import pytest
+
+        from gemini_mcp.orchestration.dna_store import DNAStore
+
+        store = DNAStore(str(tmp_path / "dna.db"), max_entries=2)
+        with store.batch():
+            for i in range(5):
+                store.save("hero", "dark", self._dna(f"#{i}"), project_id="a")
+            assert store.get_stats()["total_entries"] == 5  # Evicted once, at the end
+        assert store.get_latest("hero", "a").colors["primary"] == "#4"
+        assert store.get_stats()["total_entries"] == 2
+
+        with pytest.raises(RuntimeError):
+            with store.batch():
+                store.save("navbar", "dark", self._dna("#x"), project_id="a")
+                raise RuntimeError("abort")
+        assert store.get_latest("navbar", "a") is None
+
+    def test_legacy_json_is_imported_and_exportable(self, tmp_path):
+        from gemini_mcp.orchestration.dna_store import DNAStore
+
+        legacy = DNAStore(str(tmp_path / "dna_db.json"), backend="json")
+        first = legacy.save("hero", "dark", self._dna("#1"), project_id="a")
+        second = legacy.save("hero", "dark", self._dna("#2"), project_id="a")
+        document = json.loads((tmp_path / "dna_db.json").read_text())
+        assert set(document["index"]["by_project"]["a"]) == {first, second}
+
+        store = DNAStore(str(tmp_path / "dna_db.json"))  # Same path, SQLite backend
+        assert store.db_path == tmp_path / "dna_db.db"
+        assert store.get_latest("hero", "a").colors["primary"] == "#2"
+        store.delete(first)
+        assert DNAStore(str(tmp_path / "dna_db.db")).get(first) is None  # Imported only once
+
+        assert store.export_json(tmp_path / "export.json") == 1
+        restored = DNAStore(str(tmp_path / "export.json"), backend="json")
+        assert restored.get_entry(second).created_at == store.get_entry(second).created_at
+
+    def test_malformed_legacy_json_is_retried(self, tmp_path):
+        from gemini_mcp.orchestration.dna_store import DNAStore
+
+        legacy = DNAStore(str(tmp_path / "dna_db.json"), backend="json")
+        dna_id = legacy.save("hero", "dark", self._dna("#1"), project_id="a")
+        good = (tmp_path / "dna_db.json").read_text()
+        (tmp_path / "dna_db.json").write_text(good[:-10])
+
+        store = DNAStore(str(tmp_path / "dna_db.db"))  # Logs and starts empty
+        assert store.get_stats()["total_entries"] == 0
+        store.backend.close()
+
+        (tmp_path / "dna_db.json").write_text(good)
+        assert DNAStore(str(tmp_path / "dna_db.db")).get(dna_id) is not None
+
+    def test_default_path_is_isolated(self, tmp_path):
+        from gemini_mcp.orchestration.dna_store import get_dna_store
+
+        assert get_dna_store().db_path == tmp_path / "dna_db.db"
+
+    def test_concurrent_processes(self, tmp_path):
+        import subprocess
+        import sys
+        from pathlib import Path
+
+        import gemini_mcp
+        from gemini_mcp.orchestration.dna_store import DNAStore
+
+        db = str(tmp_path / "dna.db")
+        DNAStore(db)  # Create the schema
+        env = dict(os.environ, PYTHONPATH=str(Path(gemini_mcp.__file__).parents[1]))
+        writers = [
+            subprocess.Popen([sys.executable, "-c", _WRITER, db, f"p{n}", "40"], env=env)
+            for n in range(4)
+        ]
+        assert [w.wait(timeout=60) for w in writers] == [0, 0, 0, 0]
+
+        store = DNAStore(db, max_entries=10_000)
+        assert store.get_stats()["total_entries"] == 160
+        assert store.get_latest("hero", "p3").colors["i"] == "39"
+
+
+# =============================================================================
+# DNA Similarity Search
+# =============================================================================
+
+
+def _styled_dna(primary, mood, font="Inter"):
+    from gemini_mcp.orchestration.context import DesignDNA
+
+    return DesignDNA(
+        colors={"primary": primary, "background": "#0f172a"},
+        typography={"heading": font},
+        borders={"radius": "rounded-xl"},
+        mood=mood,
+    )
+
+
+class TestDNASimilarity:
+    """dna_index + DNAStore.find_similar and its Strategist/MAESTRO users."""
+
+    def test_index_matches_brute_force(self):
+        """Inverted-index top-k equals exhaustive cosine, with filters and removals."""
+        import random
+
+        from gemini_mcp.orchestration.dna_index import DIM, VectorIndex, hash_vector
+
+        rng = random.Random(3)
+        index = VectorIndex(use_numpy=False)
+        vectors = {}
+        for i in range(400):
+            vector = hash_vector({f"f{rng.randrange(60)}": rng.random() for _ in range(8)})
+            vectors[f"k{i}"] = vector
+            index.add(f"k{i}", vector, tags=(f"group:{i % 3}",))
+        for i in range(0, 400, 2):
+            index.remove(f"k{i}")
+            del vectors[f"k{i}"]
+
+        def cosine(a, b):
+            return sum(w * b.get(d, 0.0) for d, w in a.items())
+
+        for _ in range(20):
+            query = hash_vector({f"f{rng.randrange(60)}": 1.0 for _ in range(5)})
+            expected = sorted(vectors, key=lambda k: -cosine(query, vectors[k]))[:5]
+            assert [k for k, _ in index.search(query, 5)] == expected
+            grouped = [k for k in vectors if int(k[1:]) % 3 == 1]
+            expected = sorted(grouped, key=lambda k: -cosine(query, vectors[k]))[:3]
+            assert [k for k, _ in index.search(query, 3, tags=("group:1",))] == expected
+        assert len(index) == 200 and all(d < DIM for v in vectors.values() for d in v)
+
+    def test_find_similar_by_style_and_text(self, tmp_path):
+        from gemini_mcp.orchestration.dna_store import DNAStore
+
+        store = DNAStore(str(tmp_path / "dna.db"))
+        neon = store.save("hero", "cyberpunk", _styled_dna("#ff00aa", "cyberpunk-neon", "JetBrains Mono"), "acme")
+        store.save("hero", "minimal", _styled_dna("#2563eb", "minimal-professional"), "blog")
+        store.save("pricing", "corporate", _styled_dna("#16a34a", "corporate-clean"), "acme")
+
+        (entry, score), *_ = store.find_similar(_styled_dna("#ee11bb", "neon", "JetBrains Mono"))
+        assert entry.dna_id == neon and score > 0.5
+        assert [e.component_type for e, _ in store.find_similar("corporate pricing", k=1)] == ["pricing"]
+        assert [e.project_id for e, _ in store.find_similar("minimal", k=5, project_id="acme")] == []
+        assert store.find_similar("minimal", k=5, min_score=0.99) == []
+
+    def test_index_updates_incrementally(self, tmp_path):
+        """Saves, deletes and other processes' writes reach a built index."""
+        from gemini_mcp.orchestration.dna_store import DNAStore
+
+        store = DNAStore(str(tmp_path / "dna.db"), max_entries=3)
+        first = store.save("hero", "dark", _styled_dna("#ff0000", "bold"), "p")
+        assert len(store.similarity_index()) == 1
+
+        second = store.save("navbar", "dark", _styled_dna("#ff0000", "bold"), "p")
+        other = DNAStore(str(tmp_path / "dna.db"), max_entries=3)
+        third = other.save("footer", "dark", _styled_dna("#ff0000", "bold"), "p")
+        assert {e.dna_id for e, _ in store.find_similar("dark", k=5)} == {first, second, third}
+
+        store.delete(second)
+        other.save("cta", "dark", _styled_dna("#ff0000", "bold"), "p")
+        other.save("faq", "dark", _styled_dna("#ff0000", "bold"), "p")  # Evicts first
+        assert first not in {e.dna_id for e, _ in store.find_similar("dark", k=5)}
+        assert second not in store.similarity_index().style
+
+    async def test_strategist_reuses_exact_project_dna(self, tmp_path, monkeypatch):
+        """An explicit project's stored DNA is reused without a Pro call."""
+        from unittest.mock import AsyncMock, MagicMock
+
+        from gemini_mcp.agents import strategist
+        from gemini_mcp.orchestration.context import AgentContext
+        from gemini_mcp.orchestration.dna_store import DNAStore
+
+        store = DNAStore(str(tmp_path / "dna.db"))
+        dna_id = store.save("hero", "cyberpunk", _styled_dna("#ff00aa", "cyberpunk-neon"), "acme-saas")
+        monkeypatch.setattr(strategist, "_get_dna_store", lambda: store)
+        client = MagicMock(context_cache_enabled=False)
+        client.generate_text = AsyncMock(return_value={"text": '{"design_dna": {"mood": "new"}}'})
+        agent = strategist.StrategistAgent(client)
+
+        context = AgentContext(component_type="hero", theme="cyberpunk", project_context="Project: Acme SaaS")
+        result = await agent.execute(context)
+        assert result.success and result.metadata["dna_reused"] and result.metadata["dna_id"] == dna_id
+        assert result.metadata["design_dna"]["mood"] == "cyberpunk-neon"
+        client.generate_text.assert_not_awaited()
+
+        # Another component of the project: seeded, still planned by the model
+        context = AgentContext(component_type="navbar", theme="cyberpunk", project_context="Project: Acme SaaS")
+        await agent.execute(context)
+        prompt = client.generate_text.await_args.kwargs["prompt"]
+        assert "Existing DNA (Extend This)" in prompt and "cyberpunk-neon" in prompt
+
+    async def test_maestro_resolves_free_text_project(self, tmp_path):
+        from unittest.mock import MagicMock, patch
+
+        from gemini_mcp.maestro.core import Maestro
+        from gemini_mcp.orchestration.dna_store import DNAStore
+
+        store = DNAStore(str(tmp_path / "dna.db"))
+        store.save("pricing", "corporate", _styled_dna("#16a34a", "corporate-clean"), "acme-saas")
+        store.save("hero", "cyberpunk", _styled_dna("#ff00aa", "cyberpunk-neon"), "acme-saas")
+        store.save("pricing", "corporate", _styled_dna("#000000", "corporate-clean"), "other")
+
+        with patch("gemini_mcp.maestro.core.get_dna_store", return_value=store):
+            maestro = Maestro(MagicMock())
+            session_id, _ = await maestro.start_session(project_context="Project: Acme SaaS, new pricing page")
+
+        tokens = maestro._session_manager.get(session_id).context.design_tokens
+        assert tokens["colors"]["primary"] == "#16a34a"
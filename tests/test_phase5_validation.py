@@ -0,0 +1,468 @@
+"""Tests for Phase 5 validation-stack performance work.
+
+- Shared single-pass ParsedDocument for all HTML validators
+- Compiled anti-pattern rule engine with literal prefilter
+- Incremental per-section revalidation for section edits
+- Reversible HTML skeleton for inter-agent context
+"""
+
+import pytest
+
+
+PAGE = """<!-- SECTION: navbar -->
+<nav id="nav" class="flex items-center px-6 py-4">
+  <a href="/" class="text-xl font-bold">Brand</a>
+  <button id="menu" type="button" aria-label="Open menu" class="p-2 rounded-lg"></button>
+</nav>
+<!-- /SECTION: navbar -->
+<!-- SECTION: hero -->
+<section id="hero" class="relative min-h-screen bg-white">
+  <h1 class="text-5xl font-bold">Title</h1>
+  <img src="a.png" class="w-full">
+  <div id="cta" data-interaction="magnetic" data-intensity="0.5" class="btn inline-flex">Go</div>
+  <input id="email" type="email" class="border">
+</section>
+<!-- /SECTION: hero -->
+"""
+
+
+# =============================================================================
+# Shared ParsedDocument
+# =============================================================================
+
+
+class TestParsedDocument:
+    """Tests for the single-pass HTML index shared by validators."""
+
+    def test_indexes_elements_attributes_and_classes(self):
+        """One scan builds tag, id, class and attribute indexes."""
+        from gemini_mcp.validation import parse_document
+
+        doc = parse_document(PAGE)
+
+        assert [el.attrs["id"] for el in doc.find_all("nav", "section")] == ["nav", "hero"]
+        assert doc.ids() == ["nav", "menu", "hero", "cta", "email"]
+        assert {"rounded-lg", "min-h-screen", "btn"} <= doc.class_tokens()
+        assert len(doc.class_index["font-bold"]) == 2
+        assert [el.tag for el in doc.with_attribute("data-interaction")] == ["div"]
+        assert doc.find_all("img")[0].attrs == {"src": "a.png", "class": "w-full"}
+
+    def test_line_offsets_and_sections(self):
+        """Offsets map to 1-based lines and section markers become spans."""
+        from gemini_mcp.validation import parse_document
+
+        doc = parse_document(PAGE)
+
+        assert doc.line_of(0) == 1
+        assert doc.line_of(PAGE.index("<h1")) == PAGE[:PAGE.index("<h1")].count("\n") + 1
+        assert doc.section_names == ["navbar", "hero"]
+        hero = doc.section("hero")
+        assert PAGE[hero.content_start:hero.content_end].strip().startswith("<section")
+
+    def test_nested_and_unclosed_sections(self):
+        """Nested sections record depth; unclosed ones have no end."""
+        from gemini_mcp.validation import parse_document
+
+        html = (
+            "<!-- SECTION: outer --><!-- SECTION: inner --><p>x</p>"
+            "<!-- /SECTION: inner --><!-- /SECTION: outer --><!-- SECTION: open -->"
+        )
+        doc = parse_document(html)
+
+        outer, inner, dangling = doc.sections
+        assert (outer.depth, inner.depth) == (0, 1)
+        assert outer.end == len(html) - len("<!-- SECTION: open -->")
+        assert dangling.end is None
+        assert doc.section("open") is None
+
+    def test_validators_match_with_and_without_document(self):
+        """Passing a shared document does not change any validator result."""
+        from gemini_mcp.validation import (
+            AntiPatternValidator,
+            DensityValidator,
+            HTMLValidator,
+            IDValidator,
+            parse_document,
+        )
+        from gemini_mcp.validators import A11yValidator
+
+        js = "document.getElementById('missing').focus();"
+        doc = parse_document(PAGE)
+
+        def messages(result):
+            return [issue.message for issue in result.issues]
+
+        assert messages(HTMLValidator().validate(PAGE)) == messages(
+            HTMLValidator().validate(PAGE, document=doc)
+        )
+        assert messages(IDValidator().validate(PAGE, js)) == messages(
+            IDValidator().validate(PAGE, js, document=doc)
+        )
+        assert DensityValidator().validate(PAGE).score == DensityValidator().validate(
+            PAGE, document=doc
+        ).score
+        assert [i.line for i in AntiPatternValidator().validate(PAGE).issues] == [
+            i.line for i in AntiPatternValidator().validate(PAGE, document=doc).issues
+        ]
+        assert A11yValidator().validate(PAGE).issues == A11yValidator().validate(
+            PAGE, document=doc
+        ).issues
+
+    def test_html_validator_checks_use_parsed_elements(self):
+        """Duplicate ids, missing alt and unclosed tags come from the index."""
+        from gemini_mcp.validation import HTMLValidator
+
+        html = '<div id="a"><img src="x.png"><span id="a">t</span>'
+        messages = [i.message for i in HTMLValidator().validate(html).issues]
+
+        assert "Duplicate ID: 'a' appears 2 times" in messages
+        assert "Image missing alt attribute" in messages
+        assert "Unclosed tag: <div>" in messages
+
+    def test_density_counts_article_as_container(self):
+        """<article> is analyzed as itself, not as an <a> prefix match."""
+        from gemini_mcp.validation import DensityValidator
+
+        result = DensityValidator().validate('<article class="p-4 m-2">x</article>')
+
+        assert [d.element_type for d in result.element_details] == ["article"]
+        assert result.elements_below_minimum == 0
+
+    def test_context_caches_document_by_content_hash(self):
+        """AgentContext parses each distinct HTML once and evicts the oldest."""
+        from gemini_mcp.orchestration.context import (
+            PARSED_DOCUMENT_CACHE_SIZE,
+            AgentContext,
+        )
+
+        context = AgentContext(html_output=PAGE)
+        first = context.get_parsed_document()
+
+        assert context.get_parsed_document(str(PAGE)) is first
+        for i in range(PARSED_DOCUMENT_CACHE_SIZE):
+            context.get_parsed_document(f"<p>{i}</p>")
+        assert len(context.parsed_documents) == PARSED_DOCUMENT_CACHE_SIZE
+        assert context.get_parsed_document() is not first
+
+    def test_compress_current_output_reads_shared_document(self):
+        """Compression fills ids, classes, markers and interactions from the parse."""
+        from gemini_mcp.orchestration.context import AgentContext
+
+        context = AgentContext()
+        context.compress_current_output(PAGE, "html")
+
+        compressed = context.compressed
+        assert compressed.element_ids == ["nav", "menu", "hero", "cta", "email"]
+        assert compressed.section_markers == ["navbar", "hero"]
+        assert "min-h-screen" in compressed.tailwind_classes
+        assert compressed.interaction_map["cta"].interaction_type == "magnetic"
+        assert len(context.parsed_documents) == 1
+
+    @pytest.mark.asyncio
+    async def test_quality_guard_parses_html_once(self, monkeypatch):
+        """QualityGuard hands one cached document to every HTML check."""
+        from unittest.mock import MagicMock
+
+        from gemini_mcp.agents.quality_guard import QualityGuardAgent
+        from gemini_mcp.orchestration.context import AgentContext
+        from gemini_mcp.validation import document as document_module
+
+        calls = []
+        real_parse = document_module.parse_document
+
+        def counting_parse(html, digest=None):
+            calls.append(len(html))
+            return real_parse(html, digest)
+
+        monkeypatch.setattr(
+            "gemini_mcp.orchestration.context.parse_document", counting_parse
+        )
+
+        agent = QualityGuardAgent(MagicMock())
+        context = AgentContext(
+            html_output=PAGE,
+            js_output="document.getElementById('menu');",
+        )
+        result = await agent.execute(context)
+
+        assert result.metadata["qa_report"] is not None
+        assert calls == [len(PAGE)]
+
+
+# =============================================================================
+# Compiled Anti-Pattern Engine
+# =============================================================================
+
+
+class TestAntiPatternEngine:
+    """Tests for precompiled anti-pattern rules and bisect line mapping."""
+
+    def test_required_literals_from_regex(self):
+        """Prefilter literals come from prefixes, groups and alternations."""
+        from gemini_mcp.validation.anti_pattern_validator import required_literals
+
+        assert required_literals(r"outline:\s*none|outline:\s*0") == {"outline:"}
+        assert required_literals(r"(for\s*\(|\.forEach\s*\()") == {"for", ".foreach"}
+        assert required_literals(r"<BUTTON(?![^>]*type)") == {"<button"}
+        # Unknown leading construct: never prefiltered
+        assert required_literals(r"(?!x)abc") is None
+        assert required_literals(r"[ab]c") is None
+
+    def test_rules_compiled_once_and_shared(self):
+        """Validators share compiled regexes instead of recompiling per call."""
+        from gemini_mcp.validation.anti_pattern_validator import AntiPatternValidator
+
+        first = AntiPatternValidator()
+        second = AntiPatternValidator()
+
+        assert [r.regex for r in first._engine.rules] == [r.regex for r in second._engine.rules]
+
+    def test_prefilter_skips_rules_without_literals(self):
+        """Rules whose literals are absent never run their regex."""
+        from gemini_mcp.validation.anti_pattern_validator import AntiPatternValidator
+
+        engine = AntiPatternValidator()._engine
+        names = {rule.pattern.name for rule in engine.candidates(".a { color: red !important; }")}
+
+        assert "important-abuse" in names
+        assert "missing-button-type" not in names
+        assert "image-without-alt" not in names
+
+    def test_line_numbers_match_prefix_count(self):
+        """Bisect line mapping agrees with counting newlines before each match."""
+        import re
+
+        from gemini_mcp.validation.anti_pattern_validator import AntiPatternValidator
+
+        content = "\n".join(
+            f'<button class="p-{i}">B</button>' if i % 3 else f".x{i} {{ color: red !important; }}"
+            for i in range(60)
+        )
+        validator = AntiPatternValidator()
+
+        expected = sorted(
+            (f"{p.category.value}/{p.name}", content[:m.start()].count("\n") + 1)
+            for p in validator.patterns
+            for m in re.finditer(p.pattern, content, re.IGNORECASE | re.DOTALL)
+        )
+        actual = sorted((i.rule, i.line) for i in validator.validate(content).issues)
+
+        assert actual == expected
+        assert ("styling/important-abuse", 4) in actual
+
+    def test_severity_threshold_applied_at_compile_time(self):
+        """Rules below the threshold are not part of the engine."""
+        from gemini_mcp.validation import ValidationSeverity
+        from gemini_mcp.validation.anti_pattern_validator import AntiPatternValidator
+
+        validator = AntiPatternValidator(severity_threshold=ValidationSeverity.ERROR)
+        result = validator.validate('<div style="color: red"><button>x</button></div>')
+
+        assert all(
+            ValidationSeverity.get_order(i.severity) >= ValidationSeverity.get_order(ValidationSeverity.ERROR)
+            for i in result.issues
+        )
+        assert all(
+            ValidationSeverity.get_order(r.pattern.severity)
+            >= ValidationSeverity.get_order(ValidationSeverity.ERROR)
+            for r in validator._engine.rules
+        )
+
+
+# =============================================================================
+# Incremental Section Validation
+# =============================================================================
+
+
+def _sectioned_page(count, body="<p class=\"text-base\">Body {n}</p>"):
+    """Page wrapped in <main> with `count` marked sections."""
+    sections = "".join(
+        f"<!-- SECTION: s{n} -->\n<section id=\"s{n}\" class=\"py-12 md:py-24\">\n"
+        f"<h2 class=\"text-3xl\">S{n}</h2>\n{body.format(n=n)}\n</section>\n<!-- /SECTION: s{n} -->\n"
+        for n in range(count)
+    )
+    return f"<main id=\"main\">\n<h1 class=\"text-5xl\">Page</h1>\n{sections}</main>\n"
+
+
+class TestIncrementalValidator:
+    """Tests for per-section cached validation of sectioned pages."""
+
+    def test_only_changed_section_is_revalidated(self):
+        """A one-section edit re-runs checks for that section only."""
+        from gemini_mcp.validation import IncrementalValidator
+
+        validator = IncrementalValidator()
+        page = _sectioned_page(12)
+        first = validator.validate_page(page)
+        edited = validator.validate_page(page.replace("Body 5<", "Edited body<"))
+
+        assert len(first.revalidated) == 12 and first.reused == []
+        assert edited.revalidated == ["s5"]
+        assert len(edited.reused) == 11
+        assert edited.sections == [f"s{n}" for n in range(12)]
+        assert validator.get_stats()["hits"] >= 11
+
+    def test_matches_full_html_validation(self):
+        """Merged section results report the same HTML issues as one full pass."""
+        from gemini_mcp.validation import DensityValidator, HTMLValidator, IncrementalValidator
+
+        page = PAGE + '<div style="color: red"><span>unclosed</div>'
+        report = IncrementalValidator().validate_page(page)
+
+        full = sorted(i.message for i in HTMLValidator(strict_mode=False).validate(page).issues)
+        merged = sorted(i.message for i in report.html.issues if i.rule is None)
+
+        assert merged == full
+        assert report.density.score == DensityValidator().validate(page).score
+        assert not report.valid
+
+    def test_duplicate_ids_across_sections(self):
+        """Ids that are unique per section but repeated on the page are caught."""
+        from gemini_mcp.validation import IncrementalValidator
+
+        page = _sectioned_page(3, body='<a id="cta" href="#">Go {n}</a>')
+        messages = [i.message for i in IncrementalValidator().validate_page(page).html.issues]
+
+        assert "Duplicate ID: 'cta' appears 3 times" in messages
+
+    def test_js_selectors_checked_against_all_sections(self):
+        """JS selector → id consistency uses the merged section indexes."""
+        from gemini_mcp.validation import IncrementalValidator
+
+        validator = IncrementalValidator(strict_mode=True)
+        page = _sectioned_page(4)
+        js = "document.getElementById('s3'); document.querySelector('#missing');"
+
+        report = validator.validate_page(page, js)
+        messages = [i.message for i in report.cross_layer.issues]
+
+        assert "JS references ID 's3' not found in HTML" not in messages
+        assert "Selector '#missing' in querySelector not found in HTML" in messages
+        assert not report.valid
+
+    def test_issue_lines_are_page_lines(self):
+        """Section-relative line numbers are shifted to page lines."""
+        from gemini_mcp.validation import IncrementalValidator
+
+        body = "<p>x</p>"
+        page = _sectioned_page(3, body=body).replace(
+            "<!-- /SECTION: s2 -->", '<img src="a.png">\n<!-- /SECTION: s2 -->'
+        )
+        report = IncrementalValidator().validate_page(page)
+        img_line = page[:page.index("<img")].count("\n") + 1
+
+        lines = [i.line for i in report.html.issues if i.rule == "accessibility/image-without-alt"]
+        assert lines == [img_line]
+
+    @pytest.mark.asyncio
+    async def test_replace_section_in_page_reports_validation(self, monkeypatch):
+        """On request, replace_section_in_page validates the updated page incrementally."""
+        from gemini_mcp import server
+        from gemini_mcp.validation import get_incremental_validator, reset_incremental_validator
+
+        reset_incremental_validator()
+        page = _sectioned_page(4)
+        get_incremental_validator().validate_page(page)
+
+        async def fake_design_call(api_call, component_type, response_type):
+            return {"html": '<section id="s1" class="py-12"><h2>New</h2></section>'}
+
+        monkeypatch.setattr(server, "get_gemini_client", lambda: None)
+        monkeypatch.setattr(server, "safe_design_call", fake_design_call)
+        monkeypatch.setattr(server, "_auto_save_design_output", lambda result, *args: result)
+
+        result = await server.replace_section_in_page(page, "s1", "Shorter heading")
+        assert result["validation"] is None  # opt-in
+
+        result = await server.replace_section_in_page(
+            page, "s1", "Shorter heading", validate_page=True
+        )
+
+        assert result["modified_section"] == "s1"
+        assert result["validation"]["revalidated_sections"] == ["s1"]
+        assert len(result["validation"]["reused_sections"]) == 3
+        reset_incremental_validator()
+
+
+# =============================================================================
+# HTML Skeleton
+# =============================================================================
+
+
+class TestHTMLSkeleton:
+    """Tests for the structure-preserving HTML skeleton."""
+
+    def test_keeps_structure_and_elides_text(self):
+        """Tag tree, ids, class dictionary, data-* and sections survive; copy does not."""
+        from gemini_mcp.validation import skeletonize_html
+
+        skeleton = skeletonize_html(PAGE)
+        lines = skeleton.text.splitlines()
+
+        assert skeleton.classes[0] == "flex items-center px-6 py-4"
+        assert lines[0] == "$1 flex items-center px-6 py-4"
+        assert "@navbar" in lines and "@hero" in lines
+        assert " nav#nav$1" in lines
+        assert "  div#cta$7[interaction=magnetic intensity=0.5]~" in lines
+        assert "  img$6" in lines
+        assert "Brand" not in skeleton.text and "Title" not in skeleton.text
+        assert skeleton.source_chars == len(PAGE)
+        assert skeleton.compression_ratio > 1
+
+    def test_repeated_siblings_and_class_lists_deduplicated(self):
+        """Identical sibling subtrees collapse to *N; class lists are written once."""
+        from gemini_mcp.validation import skeletonize_html
+
+        card = '<li class="card p-4"><h3 class="font-bold">Item</h3><p class="text-sm">Text</p></li>'
+        html = f'<ul id="list" class="grid">{card * 12}<li class="card p-4 featured">Last</li></ul>'
+        text = skeletonize_html(html).text
+
+        assert text.count("card p-4") == 2  # the shared list and the featured one
+        assert " li$2*12" in text
+        assert text.count("h3$") == 1
+        assert " li$5~" in text
+
+    def test_expand_round_trips(self):
+        """expand_skeleton() rebuilds HTML whose skeleton is unchanged."""
+        from gemini_mcp.validation import expand_skeleton, parse_document, skeletonize_html
+
+        html = (
+            PAGE
+            + '<div id="a b" data-label=\'say "hi"\' class="x">'
+            + '<script>if (a < b) { go("<p>"); }</script><br></div>'
+        )
+        skeleton = skeletonize_html(html)
+        expanded = expand_skeleton(skeleton.text)
+        doc = parse_document(expanded)
+
+        assert skeletonize_html(expanded).text == skeleton.text
+        assert set(doc.ids()) == set(parse_document(html).ids())
+        assert doc.section_names == ["navbar", "hero"]
+        assert 'data-label="say &quot;hi&quot;"' in expanded
+        assert "p" not in [e.tag for e in doc.elements if not e.closing]
+
+    def test_invalid_line_raises(self):
+        """Malformed skeleton lines are rejected."""
+        from gemini_mcp.validation import expand_skeleton
+
+        with pytest.raises(ValueError, match="line 2"):
+            expand_skeleton("div\n <not a line>")
+
+    def test_agents_receive_skeleton(self):
+        """CompressedOutput and the Architect pass the skeleton instead of truncating."""
+        from unittest.mock import MagicMock
+
+        from gemini_mcp.agents import ArchitectAgent
+        from gemini_mcp.orchestration.context import CompressedOutput
+        from gemini_mcp.validation import SKELETON_LEGEND
+
+        long_page = PAGE + '<footer id="footer" class="mt-24">Footer</footer>' * 40
+        compressed = CompressedOutput.from_html(long_page)
+        architect = ArchitectAgent(MagicMock(context_cache_enabled=False))
+        context_html = architect._compress_html_context(long_page)
+
+        assert compressed.to_prompt().startswith(SKELETON_LEGEND)
+        assert "footer#footer$9~*40" in compressed.to_prompt()
+        assert compressed.to_prompt(outline=True).startswith("Sections: navbar, hero")
+        assert context_html == compressed.to_prompt()
+        assert architect._compress_html_context(PAGE) == PAGE